@@ -2,9 +2,13 @@
 from .base_agent import BaseAgent
 from .agent_registry import AgentRegistry
 from .agent_orchestrator import AgentOrchestrator
+from .mailbox import Mailbox
+from .worker_pool import AgentWorkerPool
 
 __all__ = [
     "BaseAgent",
     "AgentRegistry",
     "AgentOrchestrator",
+    "Mailbox",
+    "AgentWorkerPool",
 ]
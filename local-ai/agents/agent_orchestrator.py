@@ -10,6 +10,7 @@ from datetime import datetime
 
 from .base_agent import BaseAgent, AgentTask, AgentMessage
 from .agent_registry import AgentRegistry, get_registry
+from .worker_pool import AgentWorkerPool
 from core.context7_sync import Context7Sync
 
 
@@ -28,6 +29,7 @@ class AgentOrchestrator:
         self,
         registry: Optional[AgentRegistry] = None,
         context7: Optional[Context7Sync] = None,
+        worker_pool: Optional[AgentWorkerPool] = None,
     ):
         """
         Initialize the orchestrator.
@@ -35,9 +37,11 @@ class AgentOrchestrator:
         Args:
             registry: Agent registry
             context7: Context7 sync engine
+            worker_pool: Process pool for agents with execution_mode="process"
         """
         self.registry = registry or get_registry()
         self.context7 = context7 or Context7Sync()
+        self.worker_pool = worker_pool
         self._task_queue: List[AgentTask] = []
         self._completed_tasks: List[AgentTask] = []
         self._running = False
@@ -50,6 +54,8 @@ class AgentOrchestrator:
     async def stop(self) -> None:
         """Stop the orchestrator."""
         self._running = False
+        if self.worker_pool:
+            self.worker_pool.shutdown()
         await self.context7.save()
 
     async def submit_task(
@@ -99,6 +105,21 @@ class AgentOrchestrator:
             {"current_task": task.id, "status": "working"},
         )
 
+    async def execute_task(self, agent: BaseAgent, task: AgentTask) -> Dict[str, Any]:
+        """
+        Run a task on an agent, out of process if the agent requests it.
+
+        Args:
+            agent: Agent to run the task
+            task: Task to process
+
+        Returns:
+            Task result
+        """
+        if agent.execution_mode == "process" and self.worker_pool:
+            return await self.worker_pool.run(agent, task)
+        return await agent.process_task(task)
+
     async def process_queue(self) -> int:
         """
         Process pending tasks in the queue.
@@ -234,7 +255,7 @@ class AgentOrchestrator:
             # Wait for task completion (simplified)
             agent = self.registry.get(task.assigned_to)
             if agent:
-                result = await agent.process_task(task)
+                result = await self.execute_task(agent, task)
                 results.append({
                     "step": step,
                     "task_id": task.id,
@@ -250,4 +271,5 @@ class AgentOrchestrator:
             "queue_size": len(self._task_queue),
             "completed_tasks": len(self._completed_tasks),
             "registry_stats": self.registry.get_stats(),
+            "workers": self.worker_pool.get_health() if self.worker_pool else None,
         }
@@ -4,10 +4,29 @@ DevTeam6 Local AI - Agent Registry
 Registration and lookup for agents in the system.
 """
 
-from typing import Dict, List, Optional, Type
+from typing import Callable, Dict, Iterable, List, Optional
 from .base_agent import BaseAgent, AgentTask
 
 
+# Scorer signature: (agent, task) -> score, higher is better
+AgentScorer = Callable[[BaseAgent, AgentTask], float]
+
+
+def default_agent_scorer(agent: BaseAgent, task: AgentTask) -> float:
+    """
+    Score an agent by success rate, discounted by load and latency.
+
+    Args:
+        agent: Candidate agent
+        task: Task being routed
+
+    Returns:
+        Score (higher is better)
+    """
+    stats = agent.stats
+    return stats.success_rate / ((1 + agent.load) * (1 + stats.avg_latency))
+
+
 class AgentRegistry:
     """
     Registry for all agents in the system.
@@ -16,13 +35,25 @@ class AgentRegistry:
     - Agent registration
     - Lookup by ID, role, or capabilities
     - Task routing
+
+    Role, capability and availability are kept as inverted indexes
+    (insertion-ordered dicts used as sets), so lookups cost O(k) in the
+    number of matching agents rather than a scan of every agent.
     """
 
-    def __init__(self):
-        """Initialize the agent registry."""
+    def __init__(self, scorer: Optional[AgentScorer] = None):
+        """
+        Initialize the agent registry.
+
+        Args:
+            scorer: Agent scoring function used by find_best_agent
+        """
         self._agents: Dict[str, BaseAgent] = {}
-        self._by_role: Dict[str, List[str]] = {}
-        self._by_capability: Dict[str, List[str]] = {}
+        self._by_role: Dict[str, Dict[str, None]] = {}
+        self._by_capability: Dict[str, Dict[str, None]] = {}
+        self._available: Dict[str, None] = {}
+        self._working: Dict[str, None] = {}
+        self.scorer: AgentScorer = scorer or default_agent_scorer
 
     def register(self, agent: BaseAgent) -> None:
         """
@@ -31,18 +62,21 @@ class AgentRegistry:
         Args:
             agent: Agent to register
         """
+        if agent.id in self._agents:
+            self.unregister(agent.id)
+
         self._agents[agent.id] = agent
 
         # Index by role
-        if agent.role not in self._by_role:
-            self._by_role[agent.role] = []
-        self._by_role[agent.role].append(agent.id)
+        self._by_role.setdefault(agent.role, {})[agent.id] = None
 
         # Index by capabilities
         for capability in agent.capabilities:
-            if capability not in self._by_capability:
-                self._by_capability[capability] = []
-            self._by_capability[capability].append(agent.id)
+            self._by_capability.setdefault(capability, {})[agent.id] = None
+
+        # Track availability on status transitions
+        agent.set_availability_listener(self._on_availability_change)
+        self._on_availability_change(agent)
 
     def unregister(self, agent_id: str) -> Optional[BaseAgent]:
         """
@@ -56,21 +90,47 @@ class AgentRegistry:
         """
         agent = self._agents.pop(agent_id, None)
         if agent:
+            agent.set_availability_listener(None)
+            self._available.pop(agent_id, None)
+            self._working.pop(agent_id, None)
+
             # Remove from role index
-            if agent.role in self._by_role:
-                self._by_role[agent.role] = [
-                    aid for aid in self._by_role[agent.role] if aid != agent_id
-                ]
+            self._discard(self._by_role, agent.role, agent_id)
 
             # Remove from capability index
             for capability in agent.capabilities:
-                if capability in self._by_capability:
-                    self._by_capability[capability] = [
-                        aid for aid in self._by_capability[capability] if aid != agent_id
-                    ]
+                self._discard(self._by_capability, capability, agent_id)
 
         return agent
 
+    @staticmethod
+    def _discard(index: Dict[str, Dict[str, None]], key: str, agent_id: str) -> None:
+        """Remove an agent ID from an index bucket, dropping empty buckets."""
+        bucket = index.get(key)
+        if bucket is not None:
+            bucket.pop(agent_id, None)
+            if not bucket:
+                del index[key]
+
+    def _on_availability_change(self, agent: BaseAgent) -> None:
+        """Keep the availability and working sets in sync with an agent."""
+        if agent.id not in self._agents:
+            return
+
+        if agent.is_available:
+            self._available[agent.id] = None
+        else:
+            self._available.pop(agent.id, None)
+
+        if agent.status == "working":
+            self._working[agent.id] = None
+        else:
+            self._working.pop(agent.id, None)
+
+    def _resolve(self, agent_ids: Iterable[str]) -> List[BaseAgent]:
+        """Map agent IDs to agents."""
+        return [self._agents[aid] for aid in agent_ids]
+
     def get(self, agent_id: str) -> Optional[BaseAgent]:
         """
         Get an agent by ID.
@@ -93,8 +153,7 @@ class AgentRegistry:
         Returns:
             List of matching agents
         """
-        agent_ids = self._by_role.get(role, [])
-        return [self._agents[aid] for aid in agent_ids if aid in self._agents]
+        return self._resolve(self._by_role.get(role, ()))
 
     def get_by_capability(self, capability: str) -> List[BaseAgent]:
         """
@@ -106,8 +165,7 @@ class AgentRegistry:
         Returns:
             List of matching agents
         """
-        agent_ids = self._by_capability.get(capability, [])
-        return [self._agents[aid] for aid in agent_ids if aid in self._agents]
+        return self._resolve(self._by_capability.get(capability, ()))
 
     def get_available(self) -> List[BaseAgent]:
         """
@@ -116,16 +174,40 @@ class AgentRegistry:
         Returns:
             List of available agents
         """
-        return [a for a in self._agents.values() if a.is_available]
+        return self._resolve(self._available)
+
+    def _candidate_ids(self, capabilities: List[str]) -> Iterable[str]:
+        """
+        Get IDs of available agents holding all required capabilities.
+
+        Intersects starting from the smallest bucket, so the cost is bounded
+        by the number of agents in the rarest capability.
+        """
+        if not capabilities:
+            return self._available
+
+        buckets = []
+        for capability in capabilities:
+            bucket = self._by_capability.get(capability)
+            if not bucket:
+                return ()
+            buckets.append(bucket)
+        buckets.sort(key=len)
+
+        smallest, rest = buckets[0], buckets[1:]
+        return [
+            aid for aid in smallest
+            if aid in self._available and all(aid in b for b in rest)
+        ]
 
     def find_best_agent(self, task: AgentTask) -> Optional[BaseAgent]:
         """
         Find the best agent for a task.
 
-        Uses a simple scoring system based on:
-        - Availability
-        - Capability match
-        - Current workload
+        Candidates are available agents that hold every capability in
+        ``task.required_capabilities``. They are ranked by the registry's
+        scorer, which by default weighs success rate against current load
+        and recent latency.
 
         Args:
             task: Task to assign
@@ -133,13 +215,16 @@ class AgentRegistry:
         Returns:
             Best matching agent or None
         """
-        available = self.get_available()
-        if not available:
-            return None
+        best: Optional[BaseAgent] = None
+        best_score = float("-inf")
 
-        # Simple selection: first available
-        # TODO: Add capability matching and load balancing
-        return available[0]
+        for agent_id in self._candidate_ids(task.required_capabilities):
+            agent = self._agents[agent_id]
+            score = self.scorer(agent, task)
+            if score > best_score:
+                best, best_score = agent, score
+
+        return best
 
     def list_all(self) -> List[BaseAgent]:
         """Get all registered agents."""
@@ -147,14 +232,10 @@ class AgentRegistry:
 
     def get_stats(self) -> Dict[str, any]:
         """Get registry statistics."""
-        total = len(self._agents)
-        available = len(self.get_available())
-        working = sum(1 for a in self._agents.values() if a.status == "working")
-
         return {
-            "total_agents": total,
-            "available": available,
-            "working": working,
+            "total_agents": len(self._agents),
+            "available": len(self._available),
+            "working": len(self._working),
             "roles": list(self._by_role.keys()),
             "capabilities": list(self._by_capability.keys()),
         }
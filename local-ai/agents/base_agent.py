@@ -4,12 +4,15 @@ DevTeam6 Local AI - Base Agent
 Base class for all agents in the system.
 """
 
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Callable, Tuple, Type
 from dataclasses import dataclass, field
 from abc import ABC, abstractmethod
 from datetime import datetime
+import time
 import uuid
 
+from .mailbox import Mailbox
+
 
 @dataclass
 class AgentMessage:
@@ -37,6 +40,35 @@ class AgentTask:
     created_at: str = field(default_factory=lambda: datetime.utcnow().isoformat())
     completed_at: Optional[str] = None
     result: Optional[Dict[str, Any]] = None
+    required_capabilities: List[str] = field(default_factory=list)
+
+
+@dataclass
+class AgentStats:
+    """Rolling performance statistics used for task routing."""
+
+    tasks_completed: int = 0
+    tasks_failed: int = 0
+    avg_latency: float = 0.0  # Exponentially weighted, in seconds
+    latency_alpha: float = 0.2
+
+    @property
+    def success_rate(self) -> float:
+        """Laplace-smoothed success rate (0.5 for a fresh agent)."""
+        total = self.tasks_completed + self.tasks_failed
+        return (self.tasks_completed + 1) / (total + 2)
+
+    def record(self, latency: float, success: bool) -> None:
+        """Record the outcome of a finished task."""
+        if success:
+            self.tasks_completed += 1
+        else:
+            self.tasks_failed += 1
+
+        if self.tasks_completed + self.tasks_failed == 1:
+            self.avg_latency = latency
+        else:
+            self.avg_latency += self.latency_alpha * (latency - self.avg_latency)
 
 
 class BaseAgent(ABC):
@@ -48,14 +80,22 @@ class BaseAgent(ABC):
     - Capabilities (what they can do)
     - Rules (how they operate)
     - State (current status, tasks)
+
+    Agents whose ``process_task`` is CPU-bound can set
+    ``execution_mode = "process"`` so the orchestrator runs their tasks
+    in an ``AgentWorkerPool`` instead of on the event loop.
     """
 
+    execution_mode: str = "inline"  # inline, process
+
     def __init__(
         self,
         agent_id: str,
         name: str,
         role: str,
         capabilities: Optional[List[str]] = None,
+        mailbox_size: int = 1000,
+        overflow_policy: str = "drop_oldest",
     ):
         """
         Initialize the agent.
@@ -65,19 +105,89 @@ class BaseAgent(ABC):
             name: Display name
             role: Agent's role description
             capabilities: List of capabilities
+            mailbox_size: Maximum queued messages per priority lane
+            overflow_policy: Mailbox overflow policy (drop_oldest, reject, coalesce)
         """
         self.id = agent_id
         self.name = name
         self.role = role
         self.capabilities = capabilities or []
-        self.status = "standby"
-        self.current_task: Optional[AgentTask] = None
-        self._message_queue: List[AgentMessage] = []
+        self._mailbox_config = (mailbox_size, overflow_policy)
+        self.stats = AgentStats()
+        self._availability_listener: Optional[Callable[["BaseAgent"], None]] = None
+        self._task_started: Optional[float] = None
+        self._status = "standby"
+        self._current_task: Optional[AgentTask] = None
+        self.mailbox = Mailbox(mailbox_size, overflow_policy)
+
+    @property
+    def status(self) -> str:
+        """Current agent status."""
+        return self._status
+
+    @status.setter
+    def status(self, value: str) -> None:
+        self._status = value
+        self._notify_availability()
+
+    @property
+    def current_task(self) -> Optional[AgentTask]:
+        """Task currently being worked on."""
+        return self._current_task
+
+    @current_task.setter
+    def current_task(self, task: Optional[AgentTask]) -> None:
+        self._current_task = task
+        self._notify_availability()
 
     @property
     def is_available(self) -> bool:
         """Check if agent is available for tasks."""
-        return self.status in ("standby", "online") and self.current_task is None
+        return self._status in ("standby", "online") and self._current_task is None
+
+    @property
+    def load(self) -> int:
+        """Outstanding work: the current task plus queued messages."""
+        return (1 if self._current_task else 0) + len(self.mailbox)
+
+    def set_availability_listener(
+        self,
+        listener: Optional[Callable[["BaseAgent"], None]],
+    ) -> None:
+        """
+        Set a callback invoked whenever status or current task changes.
+
+        Used by the registry to keep its availability index current.
+
+        Args:
+            listener: Callback receiving this agent, or None to clear
+        """
+        self._availability_listener = listener
+
+    def _notify_availability(self) -> None:
+        """Notify the listener of a possible availability change."""
+        if self._availability_listener is not None:
+            self._availability_listener(self)
+
+    def worker_spec(self) -> Tuple[Type["BaseAgent"], Dict[str, Any]]:
+        """
+        Describe how to rebuild this agent in a worker process.
+
+        Subclasses that take extra constructor arguments should extend the
+        returned kwargs.
+
+        Returns:
+            (agent class, constructor kwargs)
+        """
+        mailbox_size, overflow_policy = self._mailbox_config
+        return type(self), {
+            "agent_id": self.id,
+            "name": self.name,
+            "role": self.role,
+            "capabilities": list(self.capabilities),
+            "mailbox_size": mailbox_size,
+            "overflow_policy": overflow_policy,
+        }
 
     @abstractmethod
     async def process_task(self, task: AgentTask) -> Dict[str, Any]:
@@ -115,6 +225,7 @@ class BaseAgent(ABC):
         self.current_task = task
         self.current_task.status = "in_progress"
         self.status = "working"
+        self._task_started = time.perf_counter()
 
     async def complete_task(self, result: Dict[str, Any]) -> AgentTask:
         """
@@ -130,6 +241,7 @@ class BaseAgent(ABC):
             self.current_task.status = "completed"
             self.current_task.completed_at = datetime.utcnow().isoformat()
             self.current_task.result = result
+            self._record_outcome(success=True)
 
             completed = self.current_task
             self.current_task = None
@@ -153,6 +265,7 @@ class BaseAgent(ABC):
             self.current_task.status = "failed"
             self.current_task.completed_at = datetime.utcnow().isoformat()
             self.current_task.result = {"error": error}
+            self._record_outcome(success=False)
 
             failed = self.current_task
             self.current_task = None
@@ -162,6 +275,13 @@ class BaseAgent(ABC):
 
         raise ValueError("No current task to fail")
 
+    def _record_outcome(self, success: bool) -> None:
+        """Record latency and outcome of the current task in stats."""
+        if self._task_started is not None:
+            latency = time.perf_counter() - self._task_started
+            self.stats.record(latency, success)
+            self._task_started = None
+
     async def send_message(
         self,
         to_agent: str,
@@ -189,28 +309,34 @@ class BaseAgent(ABC):
             data=data or {},
         )
 
-    def receive_message(self, message: AgentMessage) -> None:
+    def receive_message(self, message: AgentMessage) -> bool:
         """
-        Add a message to the queue.
+        Add a message to the mailbox.
 
         Args:
             message: Message to queue
+
+        Returns:
+            False if the mailbox rejected the message
         """
-        self._message_queue.append(message)
+        return self.mailbox.put(message)
 
-    async def process_messages(self) -> List[AgentMessage]:
+    async def process_messages(self, batch_size: int = 64) -> List[AgentMessage]:
         """
-        Process all queued messages.
+        Process all queued messages, high-priority first, in batches.
+
+        Args:
+            batch_size: Messages drained from the mailbox per batch
 
         Returns:
             List of response messages
         """
         responses = []
-        while self._message_queue:
-            message = self._message_queue.pop(0)
-            response = await self.handle_message(message)
-            if response:
-                responses.append(response)
+        while len(self.mailbox):
+            for message in self.mailbox.drain(batch_size):
+                response = await self.handle_message(message)
+                if response:
+                    responses.append(response)
         return responses
 
     def get_state(self) -> Dict[str, Any]:
@@ -226,5 +352,12 @@ class BaseAgent(ABC):
                 "description": self.current_task.description,
                 "status": self.current_task.status,
             } if self.current_task else None,
-            "message_queue_size": len(self._message_queue),
+            "message_queue_size": len(self.mailbox),
+            "mailbox": self.mailbox.get_stats(),
+            "stats": {
+                "tasks_completed": self.stats.tasks_completed,
+                "tasks_failed": self.stats.tasks_failed,
+                "success_rate": self.stats.success_rate,
+                "avg_latency": self.stats.avg_latency,
+            },
         }
@@ -0,0 +1,166 @@
+"""
+DevTeam6 Local AI - Agent Mailbox
+
+Bounded, prioritized message inbox for agents.
+"""
+
+from typing import Dict, Any, List, Optional, TYPE_CHECKING
+from collections import deque
+import asyncio
+
+if TYPE_CHECKING:
+    from .base_agent import AgentMessage
+
+
+OVERFLOW_POLICIES = ("drop_oldest", "reject", "coalesce")
+HIGH_PRIORITIES = ("high", "critical")
+
+
+class _Lane(asyncio.Queue):
+    """
+    Bounded queue lane indexed by message type.
+
+    Each entry is a one-element list slot so a queued message can be
+    replaced in place. ``_latest`` maps a message type to the newest slot
+    of that type, which makes coalescing O(1).
+    """
+
+    def _init(self, maxsize: int) -> None:
+        self._queue: deque = deque()
+        self._latest: Dict[str, list] = {}
+
+    def _put(self, slot: list) -> None:
+        self._queue.append(slot)
+        self._latest[slot[0].type] = slot
+
+    def _get(self) -> list:
+        slot = self._queue.popleft()
+        msg_type = slot[0].type
+        if self._latest.get(msg_type) is slot:
+            del self._latest[msg_type]
+        return slot
+
+    def replace_latest(self, message: "AgentMessage") -> bool:
+        """
+        Replace the newest queued message of the same type.
+
+        Args:
+            message: Incoming message
+
+        Returns:
+            True if a queued message was replaced
+        """
+        slot = self._latest.get(message.type)
+        if slot is None:
+            return False
+        slot[0] = message
+        return True
+
+
+class Mailbox:
+    """
+    Bounded agent mailbox with priority lanes.
+
+    Messages with priority ``high`` or ``critical`` (e.g. handoffs) go to a
+    separate lane that is always drained first. When a lane is full the
+    overflow policy decides what happens:
+
+    - ``drop_oldest``: discard the oldest message in the lane
+    - ``reject``: refuse the incoming message
+    - ``coalesce``: replace the newest queued message of the same type,
+      falling back to ``drop_oldest`` when there is none
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1000,
+        overflow_policy: str = "drop_oldest",
+        high_maxsize: Optional[int] = None,
+    ):
+        """
+        Initialize the mailbox.
+
+        Args:
+            maxsize: Capacity of the normal lane
+            overflow_policy: One of drop_oldest, reject, coalesce
+            high_maxsize: Capacity of the high-priority lane (defaults to maxsize)
+        """
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow_policy}")
+
+        self.overflow_policy = overflow_policy
+        self._high = _Lane(high_maxsize or maxsize)
+        self._normal = _Lane(maxsize)
+
+        self.received = 0
+        self.dropped = 0
+        self.rejected = 0
+        self.coalesced = 0
+
+    def __len__(self) -> int:
+        return self._high.qsize() + self._normal.qsize()
+
+    def _lane_for(self, message: "AgentMessage") -> _Lane:
+        return self._high if message.priority in HIGH_PRIORITIES else self._normal
+
+    def put(self, message: "AgentMessage") -> bool:
+        """
+        Enqueue a message without blocking.
+
+        Args:
+            message: Message to enqueue
+
+        Returns:
+            True if the message was accepted (queued or coalesced)
+        """
+        lane = self._lane_for(message)
+
+        if lane.full():
+            if self.overflow_policy == "reject":
+                self.rejected += 1
+                return False
+            if self.overflow_policy == "coalesce" and lane.replace_latest(message):
+                self.received += 1
+                self.coalesced += 1
+                return True
+            lane.get_nowait()
+            self.dropped += 1
+
+        lane.put_nowait([message])
+        self.received += 1
+        return True
+
+    def drain(self, max_items: Optional[int] = None) -> List["AgentMessage"]:
+        """
+        Remove up to max_items messages, high-priority lane first.
+
+        Args:
+            max_items: Maximum messages to return (all if None)
+
+        Returns:
+            Messages in delivery order
+        """
+        limit = len(self) if max_items is None else max_items
+        batch: List["AgentMessage"] = []
+
+        for lane in (self._high, self._normal):
+            while len(batch) < limit and not lane.empty():
+                batch.append(lane.get_nowait()[0])
+
+        return batch
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get mailbox depth and overflow counters."""
+        return {
+            "depth": len(self),
+            "high_depth": self._high.qsize(),
+            "normal_depth": self._normal.qsize(),
+            "capacity": self._normal.maxsize,
+            "overflow_policy": self.overflow_policy,
+            "received": self.received,
+            "dropped": self.dropped,
+            "rejected": self.rejected,
+            "coalesced": self.coalesced,
+        }
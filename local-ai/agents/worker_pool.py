@@ -0,0 +1,201 @@
+"""
+DevTeam6 Local AI - Agent Worker Pool
+
+Runs CPU-heavy agent tasks in worker processes so they do not block
+the API event loop.
+"""
+
+from typing import Dict, Any, Optional, Tuple, Type
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import asyncio
+import os
+import pickle
+import time
+
+from .base_agent import BaseAgent, AgentTask
+
+
+# Per-process cache of agent instances, keyed by (class, agent_id)
+_worker_agents: Dict[Tuple[Type[BaseAgent], str], BaseAgent] = {}
+
+
+def _run_in_worker(
+    agent_cls: Type[BaseAgent],
+    init_kwargs: Dict[str, Any],
+    payload: bytes,
+) -> Tuple[int, float, Optional[Exception], bytes]:
+    """
+    Execute an agent task inside a worker process.
+
+    The agent is constructed once per worker and reused, so agents that
+    load models or tokenizers only pay that cost on the first task.
+    An exception raised by the task is returned instead of raised, so
+    the parent can charge the failure to this worker.
+
+    Returns:
+        (worker pid, task duration in seconds, exception or None, pickled result)
+    """
+    start = time.perf_counter()
+    try:
+        key = (agent_cls, init_kwargs["agent_id"])
+        agent = _worker_agents.get(key)
+        if agent is None:
+            agent = agent_cls(**init_kwargs)
+            _worker_agents[key] = agent
+
+        task = AgentTask(**pickle.loads(payload))
+        start = time.perf_counter()
+        result = asyncio.run(agent.process_task(task))
+        duration = time.perf_counter() - start
+        return os.getpid(), duration, None, pickle.dumps(result, pickle.HIGHEST_PROTOCOL)
+    except Exception as e:
+        return os.getpid(), time.perf_counter() - start, _portable(e), b""
+
+
+def _portable(error: Exception) -> Exception:
+    """The exception itself if it survives pickling, else a RuntimeError describing it."""
+    try:
+        pickle.loads(pickle.dumps(error, pickle.HIGHEST_PROTOCOL))
+        return error
+    except Exception:
+        return RuntimeError(f"{type(error).__name__}: {error}")
+
+
+def _ping() -> int:
+    """Health probe executed in a worker."""
+    return os.getpid()
+
+
+class AgentWorkerPool:
+    """
+    Pool of long-lived worker processes for agent tasks.
+
+    Agents opt in by setting ``execution_mode = "process"``. The task is
+    sent as a pickled field dict and the agent is rebuilt in the worker
+    from ``BaseAgent.worker_spec()``, so live state such as the registry
+    listener never crosses the process boundary.
+
+    Per-worker health (tasks run, failures, last seen, liveness) is
+    tracked by PID. A broken pool is restarted on the next submission.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        """
+        Initialize the worker pool.
+
+        Args:
+            max_workers: Number of worker processes (defaults to CPU count)
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._workers: Dict[int, Dict[str, Any]] = {}
+        self._restarts = 0
+        self._failures = 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Get or lazily create the executor."""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    def _restart(self) -> None:
+        """Replace a broken executor."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        self._executor = None
+        self._workers.clear()
+        self._restarts += 1
+
+    def _record(self, pid: int, duration: float, success: bool) -> None:
+        """Update per-worker health counters."""
+        worker = self._workers.setdefault(pid, {
+            "tasks": 0,
+            "failures": 0,
+            "busy_time": 0.0,
+            "last_seen": 0.0,
+        })
+        worker["tasks"] += 1
+        worker["busy_time"] += duration
+        worker["last_seen"] = time.time()
+        if not success:
+            worker["failures"] += 1
+
+    async def run(self, agent: BaseAgent, task: AgentTask) -> Dict[str, Any]:
+        """
+        Run an agent's process_task in a worker process.
+
+        Args:
+            agent: Agent whose class handles the task
+            task: Task to process
+
+        Returns:
+            Task result
+
+        Raises:
+            BrokenProcessPool: If a worker died; the pool is restarted
+        """
+        agent_cls, init_kwargs = agent.worker_spec()
+        payload = pickle.dumps(task.__dict__, pickle.HIGHEST_PROTOCOL)
+        loop = asyncio.get_running_loop()
+
+        try:
+            pid, duration, error, result = await loop.run_in_executor(
+                self._get_executor(),
+                _run_in_worker,
+                agent_cls,
+                init_kwargs,
+                payload,
+            )
+        except BrokenProcessPool:
+            self._failures += 1
+            self._restart()
+            raise
+        except Exception:
+            self._failures += 1
+            raise
+
+        self._record(pid, duration, success=error is None)
+        if error is not None:
+            self._failures += 1
+            raise error
+        return pickle.loads(result)
+
+    async def ping(self) -> int:
+        """
+        Round-trip a no-op through the pool.
+
+        Returns:
+            PID of the worker that answered
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self._get_executor(), _ping)
+        except BrokenProcessPool:
+            self._restart()
+            raise
+
+    def get_health(self) -> Dict[str, Any]:
+        """Get pool and per-worker health."""
+        processes = getattr(self._executor, "_processes", None) or {}
+        alive = {pid: proc.is_alive() for pid, proc in processes.items()}
+
+        workers = {}
+        for pid in set(alive) | set(self._workers):
+            stats = dict(self._workers.get(pid, {}))
+            stats["alive"] = alive.get(pid, False)
+            workers[pid] = stats
+
+        return {
+            "max_workers": self.max_workers,
+            "running": self._executor is not None,
+            "restarts": self._restarts,
+            "failures": self._failures,
+            "workers": workers,
+        }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Shut down worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
@@ -6,17 +6,22 @@ Main API server for the Local AI system.
 
 from typing import Dict, Any, List, Optional
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, Header
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from pydantic import BaseModel
 
 from config.settings import get_settings
+from core.metrics import MetricsMiddleware, get_metrics
+from api.serialization import FastJSONResponse, embedding_response, search_results
 
 # Global service instances (singleton pattern)
 _embedding_service = None
 _memory_system = None
 _rag_pipeline = None
 _context7_sync = None
+_http_registry = None
+_shared_state = None
 
 
 # Request/Response Models
@@ -134,6 +139,10 @@ async def lifespan(app: FastAPI):
     
     Initializes all service singletons at startup and cleans them up on shutdown.
     This ensures thread-safe initialization before any requests are processed.
+
+    Nothing is created at import time, so each worker started by
+    ``api.serve`` builds its own clients and connections after the process
+    starts; state that must agree across workers lives in the shared store.
     """
     # Startup
     settings = get_settings()
@@ -143,18 +152,30 @@ async def lifespan(app: FastAPI):
     
     # Initialize all singletons (thread-safe, runs before request handling)
     global _embedding_service, _memory_system, _rag_pipeline, _context7_sync
+    global _http_registry, _shared_state
     
     try:
         from core.embedding_service import EmbeddingService
         from core.memory_system import MemorySystem
-        from core.rag_pipeline import RAGPipeline
         from core.context7_sync import Context7Sync
+        from core.http_pool import get_http_registry
+        from core.shared_state import get_shared_state
         
-        _embedding_service = EmbeddingService()
-        _memory_system = MemorySystem()
-        _rag_pipeline = RAGPipeline()
-        _context7_sync = Context7Sync()
+        # One HTTP pool, one embedding service and one RAG pipeline shared
+        # by every endpoint (the memory system owns the pipeline)
+        _http_registry = get_http_registry()
+        _shared_state = get_shared_state()
+        _shared_state.purge_expired()
+        _embedding_service = EmbeddingService(http_registry=_http_registry)
+        _memory_system = MemorySystem(
+            embedding_service=_embedding_service,
+            http_registry=_http_registry,
+            shared_state=_shared_state,
+        )
+        _rag_pipeline = _memory_system.rag_pipeline
+        _context7_sync = Context7Sync(shared_state=_shared_state)
         await _context7_sync.load()
+        _register_metrics()
         
         print("✅ Services initialized successfully")
     except Exception as e:
@@ -165,23 +186,50 @@ async def lifespan(app: FastAPI):
 
     # Shutdown - cleanup resources
     print("👋 Shutting down...")
-    if _embedding_service:
-        await _embedding_service.close()
     if _memory_system:
         await _memory_system.close()
-    if _rag_pipeline:
-        await _rag_pipeline.close()
+    if _http_registry:
+        await _http_registry.aclose()
     if _context7_sync:
         await _context7_sync.save()
+    if _shared_state:
+        _shared_state.close()
     print("✅ Resources cleaned up")
 
 
+def _register_metrics() -> None:
+    """Expose service counters through /metrics (read at scrape time)."""
+    from core.single_flight import get_single_flight
+
+    metrics = get_metrics()
+    single_flight = get_single_flight()
+    metrics.register_cache(
+        "single_flight", lambda: (single_flight.coalesced, single_flight.calls)
+    )
+    metrics.register_collector(
+        "devteam6_memory_count",
+        "gauge",
+        "Documents in the vector store",
+        lambda: [({}, _memory_system.count)],
+    )
+    metrics.register_collector(
+        "devteam6_upstream_requests_in_flight",
+        "gauge",
+        "Requests in flight to upstream hosts (Ollama, OpenAI)",
+        lambda: [
+            ({"host": host}, stats["in_flight"])
+            for host, stats in _http_registry.get_stats()["hosts"].items()
+        ],
+    )
+
+
 # Create FastAPI app
 app = FastAPI(
     title="DevTeam6 Local AI",
     description="Vector RAG Foundation - Self-hosted AI memory system",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=FastJSONResponse,
 )
 
 # CORS middleware
@@ -193,6 +241,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Outermost, so latency includes the rest of the middleware stack
+app.add_middleware(MetricsMiddleware)
+
 
 # Health endpoint
 @app.get("/health", response_model=HealthResponse)
@@ -202,7 +253,18 @@ async def health_check():
     return HealthResponse(
         status="healthy",
         version=settings.app_version,
-        memory_count=0,  # Will be updated when memory system is connected
+        memory_count=await _memory_system.get_count() if _memory_system else 0,
+    )
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """Prometheus metrics for this worker process."""
+    # Sync route: FastAPI runs it in its thread pool, so collectors that
+    # query the vector store (devteam6_memory_count) do not block the loop
+    return PlainTextResponse(
+        get_metrics().render(),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
     )
 
 
@@ -220,6 +282,7 @@ async def root():
             "query": "/query",
             "rag": "/rag",
             "agents_sync": "/agents/sync",
+            "metrics": "/metrics",
         },
         "theme": {
             "primary": "#00f0ff",
@@ -229,20 +292,33 @@ async def root():
     }
 
 
+# Hot endpoints build plain dicts and return a Response directly, so
+# FastAPI skips re-validating the response model (it is kept for the docs).
+
 # Embedding endpoint
 @app.post("/embed", response_model=EmbedResponse)
 async def generate_embedding(
     request: EmbedRequest,
-    service = Depends(get_embedding_service)
+    service = Depends(get_embedding_service),
+    accept: Optional[str] = Header(None),
 ):
-    """Generate embedding for text."""
+    """
+    Generate embedding for text.
+
+    Send ``Accept: application/vnd.devteam6.float32+json`` for a base64
+    float32 embedding, or ``Accept: application/msgpack`` for raw float32
+    bytes in MessagePack (when msgpack is installed).
+    """
     try:
         embedding = await service.embed(request.text)
 
-        return EmbedResponse(
-            embedding=embedding,
-            dimensions=len(embedding),
-            model=request.model or get_settings().embedding_model,
+        return embedding_response(
+            {
+                "embedding": embedding,
+                "dimensions": len(embedding),
+                "model": request.model or get_settings().embedding_model,
+            },
+            accept,
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -282,18 +358,10 @@ async def query_content(
             score_threshold=request.score_threshold,
         )
 
-        return QueryResponse(
-            results=[
-                SearchResult(
-                    id=r.id,
-                    content=r.content,
-                    score=r.score,
-                    metadata=r.metadata,
-                )
-                for r in results
-            ],
-            count=len(results),
-        )
+        return FastJSONResponse({
+            "results": search_results(results),
+            "count": len(results),
+        })
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -313,20 +381,12 @@ async def rag_generate(
             system_prompt=request.system_prompt,
         )
 
-        return RAGResponse(
-            answer=response.answer,
-            sources=[
-                SearchResult(
-                    id=s.id,
-                    content=s.content,
-                    score=s.score,
-                    metadata=s.metadata,
-                )
-                for s in response.sources
-            ],
-            model=response.model,
-            tokens_used=response.tokens_used,
-        )
+        return FastJSONResponse({
+            "answer": response.answer,
+            "sources": search_results(response.sources),
+            "model": response.model,
+            "tokens_used": response.tokens_used,
+        })
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -349,16 +409,24 @@ async def sync_agent_state(
 
 # Stats endpoint
 @app.get("/stats")
-async def get_stats(memory = Depends(get_memory_system)):
+async def get_stats(
+    memory = Depends(get_memory_system),
+    embedding = Depends(get_embedding_service),
+):
     """Get system statistics."""
     try:
         from core.knowledge_graph import KnowledgeGraph
+        from core.single_flight import get_single_flight
+        from core.http_pool import get_http_registry
 
         kg = KnowledgeGraph()
 
         return {
             "memory": memory.get_stats(),
+            "embedding": embedding.get_stats(),
             "knowledge_graph": kg.get_stats(),
+            "single_flight": get_single_flight().get_stats(),
+            "http": get_http_registry().get_stats(),
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,137 @@
+"""
+DevTeam6 Local AI - Response Serialization
+
+Fast JSON responses and compact embedding encodings chosen by Accept header.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence
+from array import array
+import base64
+import sys
+
+from fastapi.responses import JSONResponse, Response
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+
+JSON_MEDIA_TYPE = "application/json"
+# JSON with each embedding as base64 of little-endian float32 bytes
+BASE64_FLOAT32_MEDIA_TYPE = "application/vnd.devteam6.float32+json"
+# MessagePack with each embedding as raw little-endian float32 bytes
+MSGPACK_MEDIA_TYPES = ("application/msgpack", "application/x-msgpack")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson when it is installed."""
+
+    def render(self, content: Any) -> bytes:
+        if ORJSON_AVAILABLE:
+            return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY)
+        return super().render(content)
+
+
+def float32_bytes(values: Sequence[float]) -> bytes:
+    """
+    Pack floats as little-endian float32.
+
+    Args:
+        values: Embedding values
+
+    Returns:
+        4 bytes per value
+    """
+    packed = array("f", values)
+    if sys.byteorder == "big":
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def negotiate(accept: Optional[str]) -> str:
+    """
+    Pick the response encoding from an Accept header.
+
+    The first supported media type listed wins (quality values are not
+    weighed); anything else, including msgpack when it is not installed,
+    gets plain JSON.
+
+    Args:
+        accept: Accept header value
+
+    Returns:
+        "msgpack", "base64" or "json"
+    """
+    if accept:
+        for part in accept.split(","):
+            media_type = part.split(";", 1)[0].strip().lower()
+            if media_type == BASE64_FLOAT32_MEDIA_TYPE:
+                return "base64"
+            if media_type in MSGPACK_MEDIA_TYPES and MSGPACK_AVAILABLE:
+                return "msgpack"
+            if media_type in (JSON_MEDIA_TYPE, "*/*"):
+                return "json"
+    return "json"
+
+
+def embedding_response(
+    content: Dict[str, Any],
+    accept: Optional[str],
+    field: str = "embedding",
+) -> Response:
+    """
+    Build a response containing an embedding in the negotiated encoding.
+
+    Args:
+        content: Response body
+        accept: Request Accept header
+        field: Key of ``content`` holding the embedding
+
+    Returns:
+        JSON, base64-float32 JSON or msgpack response
+    """
+    encoding = negotiate(accept)
+    if encoding == "json":
+        return FastJSONResponse(content)
+
+    packed = float32_bytes(content[field])
+    content = {
+        **content,
+        field: base64.b64encode(packed).decode("ascii") if encoding == "base64" else packed,
+        "encoding": "float32",
+    }
+
+    if encoding == "base64":
+        return FastJSONResponse(content, media_type=BASE64_FLOAT32_MEDIA_TYPE)
+    return Response(msgpack.packb(content), media_type=MSGPACK_MEDIA_TYPES[0])
+
+
+def search_results(results: Sequence[Any]) -> List[Dict[str, Any]]:
+    """
+    Convert vector store results to response dicts.
+
+    Builds plain dicts instead of validating a Pydantic model per result;
+    the data comes from our own store and is already well-typed.
+    """
+    return [
+        {"id": r.id, "content": r.content, "score": r.score, "metadata": r.metadata}
+        for r in results
+    ]
+
+
+def decode_float32(data: bytes) -> List[float]:
+    """Decode little-endian float32 bytes (client-side helper)."""
+    values = array("f")
+    values.frombytes(data)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values.tolist()
+
@@ -0,0 +1,122 @@
+"""
+DevTeam6 Local AI - Server Launcher
+
+Runs the API with one or more uvicorn worker processes.
+"""
+
+from typing import Optional
+from pathlib import Path
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import time
+
+import httpx
+import uvicorn
+
+from config.settings import get_settings
+from core.shared_state import default_shared_state_path
+
+
+def start_chroma_server(
+    path: str,
+    port: int,
+    host: str = "127.0.0.1",
+    timeout: float = 30.0,
+) -> subprocess.Popen:
+    """
+    Start a Chroma server for the workers to share.
+
+    Args:
+        path: Chroma persist directory
+        port: Port to listen on
+        host: Interface to bind
+        timeout: Seconds to wait for the server to come up
+
+    Returns:
+        The server process
+    """
+    chroma = shutil.which("chroma")
+    if chroma is None:
+        raise RuntimeError("The chroma CLI is required for multi-worker mode (pip install chromadb)")
+
+    process = subprocess.Popen(
+        [chroma, "run", "--path", path, "--host", host, "--port", str(port)],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.time() + timeout
+    while True:
+        try:
+            httpx.get(f"http://{host}:{port}/api/v2/heartbeat").raise_for_status()
+            return process
+        except httpx.HTTPError:
+            if process.poll() is not None or time.time() > deadline:
+                process.terminate()
+                raise RuntimeError(f"Chroma server on port {port} did not start")
+            time.sleep(0.1)
+
+
+def serve(
+    workers: Optional[int] = None,
+    host: Optional[str] = None,
+    port: Optional[int] = None,
+) -> None:
+    """
+    Run the API server.
+
+    With more than one worker, every worker is a separate process started
+    with ``spawn`` (uvicorn's default), so nothing is inherited from this
+    process. The workers share:
+
+    - the memory index, agent state and caches through the SQLite shared
+      state file (``shared_state_path``)
+    - vectors through one Chroma server, started here unless
+      ``chroma_host`` points at an existing one
+
+    Settings reach the workers through environment variables.
+
+    Args:
+        workers: Number of worker processes (default ``api_workers``)
+        host: Interface to bind (default ``api_host``)
+        port: Port to listen on (default ``api_port``)
+    """
+    settings = get_settings()
+    workers = workers or settings.api_workers
+    os.environ["SHARED_STATE_PATH"] = str(Path(default_shared_state_path()).resolve())
+
+    chroma = None
+    if workers > 1 and not settings.chroma_host:
+        chroma = start_chroma_server(
+            str(Path(settings.chroma_persist_dir).resolve()), settings.chroma_port
+        )
+        os.environ["CHROMA_HOST"] = "127.0.0.1"
+        os.environ["CHROMA_PORT"] = str(settings.chroma_port)
+
+    try:
+        uvicorn.run(
+            "api.main:app",
+            host=host or settings.api_host,
+            port=port or settings.api_port,
+            workers=workers,
+            log_level=settings.log_level.lower(),
+        )
+    finally:
+        if chroma is not None:
+            chroma.terminate()
+            chroma.wait(timeout=10)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the DevTeam6 Local AI API")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--host", default=None)
+    parser.add_argument("--port", type=int, default=None)
+    args = parser.parse_args()
+    serve(workers=args.workers, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
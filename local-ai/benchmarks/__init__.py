@@ -0,0 +1 @@
+"""DevTeam6 Local AI - Benchmarks Package"""
@@ -0,0 +1,104 @@
+"""
+DevTeam6 Local AI - Agent Worker Benchmark
+
+Measures event-loop latency (a proxy for API request latency) while
+CPU-heavy agent tasks run inline versus in an AgentWorkerPool.
+
+Usage:
+    python -m benchmarks.agent_workers [--tasks 16] [--work 200000]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from agents.agent_orchestrator import AgentOrchestrator
+from agents.agent_registry import AgentRegistry
+from agents.base_agent import BaseAgent, AgentTask
+from agents.worker_pool import AgentWorkerPool
+
+
+class BusyAgent(BaseAgent):
+    """Agent whose task is pure-Python CPU work."""
+
+    async def process_task(self, task: AgentTask):
+        n = int(task.description)
+        total = 0
+        for i in range(n):
+            total += i * i % 7
+        return {"total": total}
+
+    async def handle_message(self, message):
+        return None
+
+
+class ProcessBusyAgent(BusyAgent):
+    """Same work, executed out of process."""
+
+    execution_mode = "process"
+
+
+async def _probe(stop: asyncio.Event, samples: list, interval: float = 0.005) -> None:
+    """Record how late the loop wakes up from a short sleep."""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        samples.append((time.perf_counter() - start - interval) * 1000)
+
+
+async def _run(agent: BaseAgent, orchestrator: AgentOrchestrator, tasks: int, work: int):
+    samples: list = []
+    stop = asyncio.Event()
+    probe = asyncio.create_task(_probe(stop, samples))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        orchestrator.execute_task(agent, AgentTask(description=str(work)))
+        for _ in range(tasks)
+    ))
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    await probe
+    samples.sort()
+    return {
+        "elapsed_s": elapsed,
+        "loop_lag_p50_ms": statistics.median(samples) if samples else 0.0,
+        "loop_lag_p99_ms": samples[int(len(samples) * 0.99) - 1] if samples else 0.0,
+        "loop_lag_max_ms": samples[-1] if samples else 0.0,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, default=16)
+    parser.add_argument("--work", type=int, default=200_000)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    pool = AgentWorkerPool(max_workers=args.workers)
+    orchestrator = AgentOrchestrator(registry=AgentRegistry(), worker_pool=pool)
+
+    async def bench():
+        inline = await _run(BusyAgent("@busy", "busy", "bench"), orchestrator, args.tasks, args.work)
+        agent = ProcessBusyAgent("@busy-proc", "busy", "bench")
+        await orchestrator.execute_task(agent, AgentTask(description="1"))  # warm up workers
+        pooled = await _run(agent, orchestrator, args.tasks, args.work)
+        return inline, pooled
+
+    try:
+        inline, pooled = asyncio.run(bench())
+    finally:
+        pool.shutdown()
+
+    print(f"{'mode':<10}{'elapsed s':>12}{'lag p50 ms':>14}{'lag p99 ms':>14}{'lag max ms':>14}")
+    for name, r in (("inline", inline), ("process", pooled)):
+        print(
+            f"{name:<10}{r['elapsed_s']:>12.3f}{r['loop_lag_p50_ms']:>14.2f}"
+            f"{r['loop_lag_p99_ms']:>14.2f}{r['loop_lag_max_ms']:>14.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
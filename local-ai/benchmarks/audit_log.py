@@ -0,0 +1,114 @@
+"""
+DevTeam6 Local AI - Audit Log Benchmark
+
+Appends audit entries past the log's capacity and queries the newest
+entries by event type, user, both and neither. Compares the previous
+list (trimmed by slicing on every overflow, filtered by scanning) with
+the AuditLog ring buffer, in memory and spilling to segment files.
+
+Usage:
+    python -m benchmarks.audit_log [--entries 50000] [--capacity 10000] [--queries 2000]
+"""
+
+from datetime import datetime
+from typing import Any, Callable, List, Optional
+import argparse
+import gc
+import random
+import tempfile
+import time
+
+from transformers.components.audit_log import AuditLog
+from transformers.security_transformer import AuditEventType, AuditLogEntry
+
+
+class LegacyAuditLog:
+    """The previous audit log: a list, sliced to size, filtered by scans."""
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._entries: List[AuditLogEntry] = []
+
+    def append(self, entry: AuditLogEntry) -> None:
+        self._entries.append(entry)
+        if len(self._entries) > self.capacity:
+            self._entries = self._entries[-self.capacity:]
+
+    def newest(self, limit: int, event_type: Optional[AuditEventType] = None,
+               user_id: Optional[str] = None) -> List[AuditLogEntry]:
+        entries = self._entries
+        if event_type:
+            entries = [e for e in entries if e.event_type == event_type]
+        if user_id:
+            entries = [e for e in entries if e.user_id == user_id]
+        return entries[-limit:]
+
+
+def make_entries(count: int, users: int, seed: int = 0) -> List[AuditLogEntry]:
+    """Audit entries with skewed event types and users."""
+    rng = random.Random(seed)
+    types = list(AuditEventType)
+    weights = [2 ** -i for i in range(len(types))]
+    now = datetime.utcnow()
+    return [
+        AuditLogEntry(
+            timestamp=now,
+            event_type=rng.choices(types, weights)[0],
+            user_id=f"user-{int(rng.paretovariate(1.2)) % users}",
+            details={"resource": f"/api/{i % 50}", "action": "read"},
+            request_id=str(i)
+        )
+        for i in range(count)
+    ]
+
+
+def _timed(run: Callable[[], Any]) -> float:
+    gc.collect()
+    start = time.perf_counter()
+    run()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--entries", type=int, default=50000)
+    parser.add_argument("--capacity", type=int, default=10000)
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--limit", type=int, default=100)
+    args = parser.parse_args()
+
+    entries = make_entries(args.entries, args.users)
+    rng = random.Random(1)
+    types = list(AuditEventType)
+    queries = {
+        "newest": [(None, None)] * args.queries,
+        "by type": [(rng.choice(types), None) for _ in range(args.queries)],
+        "by user": [(None, f"user-{rng.randrange(args.users)}") for _ in range(args.queries)],
+        "type+user": [(rng.choice(types), f"user-{rng.randrange(20)}") for _ in range(args.queries)],
+    }
+    print(f"{args.entries} entries into capacity {args.capacity}, "
+          f"{args.queries} queries of the newest {args.limit}")
+
+    with tempfile.TemporaryDirectory() as spill_dir:
+        logs = [
+            ("previous", LegacyAuditLog(args.capacity)),
+            ("ring", AuditLog(args.capacity)),
+            ("ring+spill", AuditLog(args.capacity, spill_dir=spill_dir, segment_bytes=2**20)),
+        ]
+        print(f"\n{'log':<12}{'appends/s':>12}" + "".join(f"{name + ' us':>14}" for name in queries))
+        for name, log in logs:
+            seconds = _timed(lambda: [log.append(entry) for entry in entries])
+            row = f"{name:<12}{len(entries) / seconds:>12,.0f}"
+            for batch in queries.values():
+                elapsed = _timed(lambda: [log.newest(args.limit, t, u) for t, u in batch])
+                row += f"{elapsed / len(batch) * 1e6:>14.1f}"
+            print(row)
+            if isinstance(log, AuditLog):
+                log.close()
+        spilled = logs[-1][1].get_stats()
+        print(f"spilled {spilled['spilled']} entries to {spilled['segments']} segments")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+DevTeam6 Local AI - Batch Transform Benchmark
+
+Classifies code snippets (the repo's top-level functions and classes,
+as the gateway receives them) with TokenTransformer and DualTransformer,
+one ``process`` call per snippet versus ``process_batch`` over batches
+of the same snippets. Every run starts with cold caches. The last
+table times only the attention and routing stage, on tokens prepared
+beforehand, since that is the part a batch shares.
+
+Usage:
+    python -m benchmarks.batch_transform [--snippets 500] [--batch 256] [--repeat 3]
+"""
+
+from typing import Callable, List
+import argparse
+import gc
+import time
+
+from benchmarks.keyword_matching import load_sources
+from transformers.components.smart_tokenizer import _top_level_statements
+from transformers.dual_transformer import DualTransformer
+from transformers.token_transformer import TokenTransformer
+
+
+def load_snippets(count: int) -> List[str]:
+    """Distinct top-level statements of at least a few lines from the repo."""
+    snippets = {}
+    for source in load_sources(1):
+        for _, text in _top_level_statements(source):
+            if text.count("\n") >= 3:
+                snippets.setdefault(text.strip(), None)
+    return list(snippets)[:count]
+
+
+def _best(run: Callable[[], None], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--snippets", type=int, default=500)
+    parser.add_argument("--batch", type=int, default=256)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    snippets = load_snippets(args.snippets)
+    batches = [snippets[i:i + args.batch] for i in range(0, len(snippets), args.batch)]
+    print(f"{len(snippets)} snippets, batches of {args.batch}")
+
+    print(f"{'transformer':<14}{'mode':<8}{'seconds':>10}{'items/s':>12}")
+    for name, factory in (
+        ("token", TokenTransformer),
+        ("dual", lambda: DualTransformer(max_cache_size=len(snippets))),
+    ):
+        def loop() -> None:
+            transformer = factory()
+            for snippet in snippets:
+                transformer.process(snippet)
+
+        def batch() -> None:
+            transformer = factory()
+            for inputs in batches:
+                transformer.process_batch(inputs)
+
+        rates = {}
+        for mode, run in (("loop", loop), ("batch", batch)):
+            elapsed = _best(run, args.repeat)
+            rates[mode] = len(snippets) / elapsed
+            print(f"{name:<14}{mode:<8}{elapsed:>10.3f}{rates[mode]:>12,.0f}")
+        print(f"{'':<14}speedup {rates['batch'] / rates['loop']:.2f}x")
+
+    transformer = TokenTransformer()
+    token_lists = [transformer.tokenizer.tokenize(snippet) for snippet in snippets]
+    token_batches = [token_lists[i:i + args.batch] for i in range(0, len(token_lists), args.batch)]
+
+    def stage_loop() -> None:
+        for tokens in token_lists:
+            transformer._route_batch([tokens], [transformer.attention.forward(tokens)])
+
+    def stage_batch() -> None:
+        for lists in token_batches:
+            transformer._route_batch(lists, transformer.attention.forward_batch(lists))
+
+    rates = {}
+    for mode, run in (("loop", stage_loop), ("batch", stage_batch)):
+        elapsed = _best(run, args.repeat)
+        rates[mode] = len(snippets) / elapsed
+        print(f"{'attn+routing':<14}{mode:<8}{elapsed:>10.3f}{rates[mode]:>12,.0f}")
+    print(f"{'':<14}speedup {rates['batch'] / rates['loop']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+DevTeam6 Local AI - Chunking Benchmark
+
+Measures throughput and peak Python memory (tracemalloc) of chunking
+multi-MB inputs: the whole-string ``chunk_text`` against the streaming
+``chunk_file`` reading from disk, for plain text, Markdown and Python.
+The generated Python input is larger than ``max_ast_chars``, so it takes
+the line-based path; the last row chunks the repo's own modules, which
+go through the AST.
+
+Usage:
+    python -m benchmarks.chunking [--mb 8] [--max-tokens 512]
+"""
+
+from pathlib import Path
+from typing import Callable, Dict
+import argparse
+import random
+import tempfile
+import time
+import tracemalloc
+
+from utils.chunking import chunk_file, chunk_text
+
+ROOT = Path(__file__).resolve().parent.parent
+
+WORDS = "the vector store returns nearest chunks for each query embedding model".split()
+
+
+def make_text(size: int, rng: random.Random) -> str:
+    """Log-like plain text: lines grouped in paragraphs."""
+    parts = []
+    total = 0
+    while total < size:
+        line = " ".join(rng.choice(WORDS) for _ in range(rng.randint(5, 20))) + "\n"
+        if rng.random() < 0.2:
+            line += "\n"
+        parts.append(line)
+        total += len(line)
+    return "".join(parts)
+
+
+def make_markdown(size: int, rng: random.Random) -> str:
+    """Markdown with nested headings, paragraphs and code fences."""
+    parts = []
+    total = 0
+    section = 0
+    while total < size:
+        section += 1
+        block = f"## Section {section}\n\n" + make_text(1500, rng) + "\n"
+        block += f"### Example {section}\n\n```python\n# comment\nprint({section})\n```\n\n"
+        parts.append(block)
+        total += len(block)
+    return "".join(parts)
+
+
+def make_python(size: int, rng: random.Random) -> str:
+    """Python module with many functions and classes."""
+    parts = ["import os\nimport sys\n\n"]
+    total = 0
+    n = 0
+    while total < size:
+        n += 1
+        body = "".join(f"        value = value + {i}  # {rng.choice(WORDS)}\n" for i in range(rng.randint(3, 30)))
+        block = (
+            f"\n\nclass Widget{n}:\n    \"\"\"Widget number {n}.\"\"\"\n\n"
+            f"    def run(self, value):\n{body}        return value\n\n"
+            f"\ndef helper_{n}(x):\n    return x * {n}\n"
+        )
+        parts.append(block)
+        total += len(block)
+    return "".join(parts)
+
+
+def _measure(run: Callable[[], int], size: int) -> Dict[str, float]:
+    # Timed and traced separately: tracemalloc slows allocation-heavy code
+    start = time.perf_counter()
+    chunks = run()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"mb_s": size / elapsed / 1e6, "peak_mb": peak / 1e6, "chunks": chunks}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--mb", type=float, default=8)
+    parser.add_argument("--max-tokens", type=int, default=512)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    size = int(args.mb * 1e6)
+    inputs = {
+        "text": (".log", make_text(size, rng)),
+        "markdown": (".md", make_markdown(size, rng)),
+        "python": (".py", make_python(size, rng)),
+    }
+    # ~4 chars per token, so equivalent character sizes for chunk_text
+    chunk_chars = args.max_tokens * 4
+    print(f"{'input':<10}{'method':<26}{'MB/s':>8}{'peak MB':>10}{'chunks':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, (suffix, text) in inputs.items():
+            path = Path(tmp) / f"input{suffix}"
+            path.write_text(text)
+            nbytes = len(text)
+            del text
+
+            def legacy() -> int:
+                # The whole file must be read into a string first
+                return len(chunk_text(path.read_text(), chunk_chars, chunk_chars // 10))
+
+            def streaming() -> int:
+                return sum(1 for _ in chunk_file(
+                    path, max_tokens=args.max_tokens, overlap_tokens=args.max_tokens // 10
+                ))
+
+            for method, run in (("chunk_text (whole string)", legacy), ("chunk_file (stream)", streaming)):
+                r = _measure(run, nbytes)
+                print(f"{name:<10}{method:<26}{r['mb_s']:>8.1f}{r['peak_mb']:>10.2f}{r['chunks']:>9}")
+
+    sources = sorted(ROOT.rglob("*.py"))
+    nbytes = sum(path.stat().st_size for path in sources)
+
+    def repo_ast() -> int:
+        return sum(1 for path in sources for _ in chunk_file(path, max_tokens=args.max_tokens))
+
+    r = _measure(repo_ast, nbytes)
+    label = f"repo .py ({len(sources)} files)"
+    print(f"{label:<36}{r['mb_s']:>8.1f}{r['peak_mb']:>10.2f}{r['chunks']:>9}")
+
+
+if __name__ == "__main__":
+    main()
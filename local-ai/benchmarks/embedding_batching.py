@@ -0,0 +1,73 @@
+"""
+DevTeam6 Local AI - Embedding Micro-Batching Benchmark
+
+Compares throughput and latency of concurrent EmbeddingService.embed()
+calls with the micro-batcher on and off, against a local stub model server.
+
+Usage:
+    python -m benchmarks.embedding_batching [--clients 64] [--requests 20]
+"""
+
+import argparse
+import asyncio
+import time
+
+from benchmarks.stub_ollama import StubServer
+from core.embedding_service import EmbeddingService
+from core.single_flight import SingleFlight
+
+
+async def _client(service: EmbeddingService, client_id: int, n: int, latencies: list) -> None:
+    for i in range(n):
+        start = time.perf_counter()
+        await service.embed(f"client {client_id} request {i}")
+        latencies.append((time.perf_counter() - start) * 1000)
+
+
+async def _run(url: str, micro_batch: bool, args) -> dict:
+    service = EmbeddingService(
+        single_flight=SingleFlight(),
+        micro_batch=micro_batch,
+        max_batch_size=args.batch_size,
+        max_batch_wait_ms=args.wait_ms,
+    )
+    service.ollama_host = url
+    latencies: list = []
+
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        _client(service, c, args.requests, latencies) for c in range(args.clients)
+    ))
+    elapsed = time.perf_counter() - start
+    await service.close()
+
+    latencies.sort()
+    return {
+        "throughput": len(latencies) / elapsed,
+        "p50": latencies[len(latencies) // 2],
+        "p99": latencies[int(len(latencies) * 0.99) - 1],
+        "batches": service.get_stats()["micro_batch"],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--wait-ms", type=float, default=2.0)
+    args = parser.parse_args()
+
+    with StubServer() as server:
+        off = asyncio.run(_run(server.url, False, args))
+        on = asyncio.run(_run(server.url, True, args))
+
+    print(f"{'batcher':<10}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}")
+    for name, r in (("off", off), ("on", on)):
+        print(f"{name:<10}{r['throughput']:>10.1f}{r['p50']:>10.2f}{r['p99']:>10.2f}")
+    if on["batches"]:
+        print(f"avg batch size: {on['batches']['avg_batch_size']:.1f}")
+
+
+if __name__ == "__main__":
+    main()
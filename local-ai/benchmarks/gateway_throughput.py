@@ -0,0 +1,147 @@
+"""
+DevTeam6 Local AI - Gateway Throughput Benchmark
+
+Requests per second through APIGateway.handle_request, with many
+requests in flight at once on one event loop, over endpoints of every
+security level and tokens of every level. Compares the gateway's checks
+(AsyncRateLimiter, AuthManager.authorize on permission bitmasks) with
+the previous ones (threaded RateLimiter, assess_request_security with
+set arithmetic), end to end and for the checks alone.
+
+Usage:
+    python -m benchmarks.gateway_throughput [--requests 50000] [--concurrency 1000] [--repeat 3]
+"""
+
+from typing import Callable, Dict, FrozenSet, List, Optional, Tuple
+import argparse
+import asyncio
+import gc
+import random
+import time
+
+from transformers.components.api_gateway import APIGateway, APIRequest, HTTPMethod
+from transformers.components.auth_manager import AuthManager, SecurityLevel
+from transformers.components.rate_limiter import RateLimiter
+
+
+class LegacyAuthManager(AuthManager):
+    """authorize() through the previous full assessment."""
+
+    def __init__(self):
+        super().__init__(cache_size=100000)
+        self._sets: Dict[int, FrozenSet[str]] = {}
+
+    def authorize(self, token_id: str, required_mask: int,
+                  required_level: SecurityLevel = SecurityLevel.AUTHENTICATED) -> Optional[str]:
+        required = self._sets.get(required_mask)
+        if required is None:
+            required = self._sets[required_mask] = frozenset(self._mask_permissions(required_mask))
+        assessment = self.assess_request_security(token_id, required, required_level)
+        return None if assessment["allowed"] else assessment["reason"]
+
+
+ENDPOINTS = [
+    ("/health", HTTPMethod.GET, set(), SecurityLevel.PUBLIC),
+    ("/profile", HTTPMethod.GET, {"read:user"}, SecurityLevel.AUTHENTICATED),
+    ("/profile", HTTPMethod.POST, {"read:user", "write:user"}, SecurityLevel.AUTHENTICATED),
+    ("/reports", HTTPMethod.GET, {"read:elevated"}, SecurityLevel.ELEVATED),
+    ("/users", HTTPMethod.DELETE, {"manage:users", "write:admin"}, SecurityLevel.ADMIN),
+]
+
+
+def build(legacy: bool, users: int) -> Tuple[APIGateway, List[str]]:
+    """Gateway with the benchmark endpoints, and tokens of every level."""
+    auth = LegacyAuthManager() if legacy else AuthManager(cache_size=100000)
+    gateway = APIGateway(auth_manager=auth, default_rate_limit=50, default_rate_window=60)
+
+    async def handler(request: APIRequest) -> None:
+        return None
+
+    for path, method, permissions, level in ENDPOINTS:
+        gateway.register_endpoint(path, method, handler, required_permissions=permissions, security_level=level)
+        if legacy:
+            key = f"{method.value}:{path}"
+            gateway._rate_limiters[key] = RateLimiter(max_requests=50, window_seconds=60)
+
+    levels = list(SecurityLevel)
+    tokens = [
+        auth.generate_token(f"user-{i}", security_level=levels[i % len(levels)]).token_id
+        for i in range(users)
+    ]
+    return gateway, tokens
+
+
+def workload(count: int, users: int, seed: int = 0) -> List[Tuple[int, int]]:
+    """(endpoint index, user index) per request."""
+    rng = random.Random(seed)
+    return [(rng.randrange(len(ENDPOINTS)), rng.randrange(users)) for _ in range(count)]
+
+
+async def serve(gateway: APIGateway, tokens: List[str], requests: List[Tuple[int, int]], concurrency: int) -> float:
+    """Handle every request, concurrency at a time; return seconds."""
+    built = [
+        (APIRequest(ENDPOINTS[e][0], ENDPOINTS[e][1], {}, client_id=f"client-{u}"), tokens[u])
+        for e, u in requests
+    ]
+    start = time.perf_counter()
+    for i in range(0, len(built), concurrency):
+        await asyncio.gather(*(gateway.handle_request(request, token) for request, token in built[i:i + concurrency]))
+    return time.perf_counter() - start
+
+
+async def checks(gateway: APIGateway, tokens: List[str], requests: List[Tuple[int, int]]) -> float:
+    """Rate limit and auth checks alone, as handle_request makes them; return seconds."""
+    keys = [f"{method.value}:{path}" for path, method, _, _ in ENDPOINTS]
+    endpoints = [gateway._endpoints[key] for key in keys]
+    limiters = [gateway._rate_limiters[key] for key in keys]
+    authorize = gateway.auth_manager.authorize
+    clients = [f"client-{u}" for u in range(len(tokens))]
+    start = time.perf_counter()
+    for e, u in requests:
+        endpoint = endpoints[e]
+        if limiters[e].allow_request(clients[u]):
+            authorize(tokens[u], endpoint.permission_mask, endpoint.security_level)
+    return time.perf_counter() - start
+
+
+def _best(run: Callable[[], float], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        best = min(best, run())
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=50000)
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    requests = workload(args.requests, args.users)
+    print(f"{args.requests} requests, {args.users} users, {len(ENDPOINTS)} endpoints, "
+          f"{args.concurrency} in flight")
+
+    print(f"\n{'checks':<10}{'end-to-end req/s':>18}{'checks only req/s':>19}")
+    rates = {}
+    for name, legacy in (("previous", True), ("current", False)):
+        # Fresh gateway per run, so every run sees the same limiter state
+        def run_serve() -> float:
+            gateway, tokens = build(legacy, args.users)
+            return asyncio.run(serve(gateway, tokens, requests, args.concurrency))
+
+        def run_checks() -> float:
+            gateway, tokens = build(legacy, args.users)
+            return asyncio.run(checks(gateway, tokens, requests))
+
+        rates[name] = (len(requests) / _best(run_serve, args.repeat), len(requests) / _best(run_checks, args.repeat))
+        print(f"{name:<10}{rates[name][0]:>18,.0f}{rates[name][1]:>19,.0f}")
+
+    print(f"speedup: end-to-end {rates['current'][0] / rates['previous'][0]:.2f}x, "
+          f"checks {rates['current'][1] / rates['previous'][1]:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
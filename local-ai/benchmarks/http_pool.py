@@ -0,0 +1,103 @@
+"""
+DevTeam6 Local AI - HTTP Connection Pool Benchmark
+
+Measures connection churn under concurrent embed + generate load against
+a local stub Ollama server:
+
+- per-service: every service owns a pool with httpx default limits
+  (the layout before the shared registry)
+- shared: all services use one tuned HTTPClientRegistry
+
+Usage:
+    python -m benchmarks.http_pool [--clients 64] [--requests 20]
+"""
+
+import argparse
+import asyncio
+import time
+
+from benchmarks.stub_ollama import StubServer
+from core.embedding_service import EmbeddingService
+from core.http_pool import HTTPClientRegistry
+from core.single_flight import SingleFlight
+
+
+async def _client(services, client_id: int, n: int) -> None:
+    api_embed, memory_embed, rag_registry, url = services
+    for i in range(n):
+        text = f"client {client_id} request {i}"
+        if i % 3 == 0:
+            await api_embed.embed(text)
+        elif i % 3 == 1:
+            await memory_embed.embed(text)
+        else:
+            client = rag_registry.get_client(url)
+            response = await client.post(f"{url}/api/generate", json={"prompt": text})
+            response.raise_for_status()
+
+
+async def _run(url: str, shared: bool, args) -> dict:
+    if shared:
+        registry = HTTPClientRegistry()
+        registries = [registry, registry, registry]
+    else:
+        # httpx defaults: 100 connections, 20 keep-alive, 5 s expiry
+        registries = [
+            HTTPClientRegistry(
+                max_connections=100,
+                max_keepalive_connections=20,
+                keepalive_expiry=5.0,
+                shards=1,
+            )
+            for _ in range(3)
+        ]
+
+    def embedding_service(registry):
+        service = EmbeddingService(
+            single_flight=SingleFlight(), micro_batch=False, http_registry=registry
+        )
+        service.ollama_host = url
+        return service
+
+    services = (
+        embedding_service(registries[0]),
+        embedding_service(registries[1]),
+        registries[2],
+        url,
+    )
+
+    start = time.perf_counter()
+    await asyncio.gather(*(_client(services, c, args.requests) for c in range(args.clients)))
+    elapsed = time.perf_counter() - start
+
+    requests = connections = 0
+    for registry in set(registries):
+        for host in registry.get_stats()["hosts"].values():
+            requests += host["requests"]
+            connections += host["connections_opened"]
+        await registry.aclose()
+
+    return {"elapsed": elapsed, "requests": requests, "connections": connections}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=20)
+    args = parser.parse_args()
+
+    with StubServer() as server:
+        before = asyncio.run(_run(server.url, False, args))
+        after = asyncio.run(_run(server.url, True, args))
+
+    print(f"{'layout':<14}{'requests':>10}{'conns':>8}{'req/conn':>10}{'req/s':>10}")
+    for name, r in (("per-service", before), ("shared", after)):
+        print(
+            f"{name:<14}{r['requests']:>10}{r['connections']:>8}"
+            f"{r['requests'] / max(r['connections'], 1):>10.1f}"
+            f"{r['requests'] / r['elapsed']:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+DevTeam6 Local AI - Import Time Benchmark
+
+Measures cold import time of the package entry points with
+``python -X importtime`` in fresh interpreters, and checks them against
+budgets. Heavy optional dependencies (chromadb, numpy) must not be
+imported by any entry point; they load when a store or model is created.
+
+Usage:
+    python -m benchmarks.import_time [--runs 5] [--top 10] [--check]
+"""
+
+from typing import Dict, List, Set, Tuple
+from pathlib import Path
+import argparse
+import statistics
+import subprocess
+import sys
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Cumulative import time budgets in milliseconds (roughly 3x measured)
+BUDGETS_MS: Dict[str, float] = {
+    "api.main": 1000.0,
+    "core.embedding_service": 600.0,
+    "mcp.memory_server": 600.0,
+    "core": 100.0,
+    "transformers": 100.0,
+    "ml": 100.0,
+}
+
+HEAVY_MODULES: Tuple[str, ...] = ("chromadb", "numpy")
+
+
+def import_profile(module: str) -> Tuple[float, Dict[str, float]]:
+    """
+    Import a module in a fresh interpreter with -X importtime.
+
+    Args:
+        module: Dotted module name
+
+    Returns:
+        (cumulative ms for the module, {imported module: self ms})
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    total = 0.0
+    modules: Dict[str, float] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = int(self_us) / 1000
+        if name.rstrip() == f" {module}":
+            total = int(cumulative_us) / 1000
+    return total, modules
+
+
+def heavy_imports(modules: Dict[str, float]) -> Set[str]:
+    """Get the heavy top-level packages among imported modules."""
+    return {name.split(".")[0] for name in modules} & set(HEAVY_MODULES)
+
+
+def measure(module: str, runs: int = 5) -> Dict[str, object]:
+    """
+    Measure a module's import time over several fresh interpreters.
+
+    Args:
+        module: Dotted module name
+        runs: Number of interpreters
+
+    Returns:
+        Median cumulative ms, heavy modules seen, and self times of the last run
+    """
+    totals: List[float] = []
+    heavy: Set[str] = set()
+    modules: Dict[str, float] = {}
+    for _ in range(runs):
+        total, modules = import_profile(module)
+        totals.append(total)
+        heavy |= heavy_imports(modules)
+    return {"median_ms": statistics.median(totals), "heavy": heavy, "modules": modules}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--check", action="store_true", help="exit 1 if a budget is exceeded")
+    args = parser.parse_args()
+
+    failed = False
+    slowest: Dict[str, float] = {}
+    print(f"{'module':<26}{'median ms':>11}{'budget':>9}  heavy imports")
+    for module, budget in BUDGETS_MS.items():
+        r = measure(module, args.runs)
+        over = r["median_ms"] > budget or r["heavy"]
+        failed |= bool(over)
+        heavy = ", ".join(sorted(r["heavy"])) or "-"
+        print(f"{module:<26}{r['median_ms']:>11.1f}{budget:>9.0f}  {heavy}{'  OVER' if over else ''}")
+        for name, ms in r["modules"].items():
+            slowest[name] = max(slowest.get(name, 0.0), ms)
+
+    print(f"\nslowest modules (self time, ms):")
+    for name, ms in sorted(slowest.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"  {ms:8.1f}  {name}")
+
+    if args.check and failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
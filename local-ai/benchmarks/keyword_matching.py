@@ -0,0 +1,150 @@
+"""
+DevTeam6 Local AI - Keyword Matching Benchmark
+
+Measures SmartTokenizer throughput (tokens/sec) on large Python files
+with the compiled KeywordMatcher against the previous per-indicator
+``indicator in name`` scans, name categorization on its own, and
+ThreatDetector pattern detection (MB/sec) the same way. The inputs
+are the repo's own modules, each repeated into one large file;
+tokenization bypasses the result cache.
+
+Usage:
+    python -m benchmarks.keyword_matching [--copies 20] [--repeat 3]
+"""
+
+from pathlib import Path
+from typing import Callable, List
+import argparse
+import gc
+import time
+
+from ml.supervised.threat_detector import ThreatDetector, ThreatIndicator
+from transformers.components.smart_tokenizer import SmartTokenizer, TokenCategory
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+class ScanningTokenizer(SmartTokenizer):
+    """SmartTokenizer with the previous indicator scans."""
+
+    def _categorize_name(self, name: str) -> TokenCategory:
+        name_lower = name.lower()
+        for category, indicators in (
+            (TokenCategory.API, self.API_INDICATORS),
+            (TokenCategory.SECURITY, self.SECURITY_INDICATORS),
+            (TokenCategory.DATA, self.DATA_INDICATORS),
+        ):
+            for indicator in indicators:
+                if indicator in name_lower:
+                    return category
+        return TokenCategory.GENERAL
+
+
+class ScanningThreatDetector(ThreatDetector):
+    """ThreatDetector with the previous find loop per pattern."""
+
+    def _detect_patterns(self, text: str) -> List[ThreatIndicator]:
+        indicators = []
+        text_lower = text.lower()
+        for threat_type, patterns in self.THREAT_PATTERNS.items():
+            for pattern in patterns:
+                pattern_lower = pattern.lower()
+                pos = text_lower.find(pattern_lower)
+                while pos != -1:
+                    confidence = self._calculate_pattern_confidence(text, pos, len(pattern), threat_type)
+                    context = text[max(0, pos - 20):pos + len(pattern) + 20]
+                    indicators.append(ThreatIndicator(
+                        pattern=pattern,
+                        threat_type=threat_type,
+                        confidence=confidence,
+                        location=(pos, pos + len(pattern)),
+                        context=context,
+                    ))
+                    pos = text_lower.find(pattern_lower, pos + 1)
+        return indicators
+
+
+def load_sources(copies: int) -> List[str]:
+    """Each repo module repeated ``copies`` times into one large source."""
+    sources = []
+    for path in sorted(ROOT.rglob("*.py")):
+        source = path.read_text(encoding="utf-8")
+        if "from __future__" in source or len(source) < 2000:
+            continue
+        sources.append("\n\n".join([source] * copies))
+    return sources
+
+
+def _best(run: Callable[[], int], repeat: int) -> tuple:
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        count = run()
+        best = min(best, time.perf_counter() - start)
+    return count, best
+
+
+def bench_tokenizer(tokenizer: SmartTokenizer, sources: List[str], repeat: int) -> tuple:
+    def run() -> int:
+        return sum(len(tokenizer._tokenize_python(source)) for source in sources)
+    return _best(run, repeat)
+
+
+def bench_categorize(tokenizer: SmartTokenizer, names: List[str], repeat: int) -> tuple:
+    def run() -> int:
+        categorize = tokenizer._categorize_name
+        for name in names:
+            categorize(name)
+        return len(names)
+    return _best(run, repeat)
+
+
+def bench_detector(detector: ThreatDetector, lines: List[str], repeat: int) -> tuple:
+    def run() -> int:
+        return sum(len(detector._detect_patterns(line)) for line in lines)
+    return _best(run, repeat)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--copies", type=int, default=20, help="repetitions of each module per file")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    sources = load_sources(args.copies)
+    size = sum(len(s) for s in sources)
+    print(f"{len(sources)} files, {size / 1e6:.1f} MB of Python")
+
+    print(f"{'tokenizer':<12}{'tokens':>10}{'seconds':>10}{'tokens/s':>12}")
+    rates = {}
+    for name, tokenizer in (("scan", ScanningTokenizer()), ("compiled", SmartTokenizer())):
+        count, elapsed = bench_tokenizer(tokenizer, sources, args.repeat)
+        rates[name] = count / elapsed
+        print(f"{name:<12}{count:>10}{elapsed:>10.2f}{rates[name]:>12,.0f}")
+    print(f"speedup {rates['compiled'] / rates['scan']:.2f}x")
+
+    # The same names, categorized without the AST walk around them
+    names = [token.value for token in SmartTokenizer().tokenize(sources[0]) if "." not in token.value] * 20
+    print(f"\n{'categorize':<12}{'names':>10}{'seconds':>10}{'names/s':>12}")
+    rates = {}
+    for name, tokenizer in (("scan", ScanningTokenizer()), ("compiled", SmartTokenizer())):
+        count, elapsed = bench_categorize(tokenizer, names, args.repeat)
+        rates[name] = count / elapsed
+        print(f"{name:<12}{count:>10}{elapsed:>10.2f}{rates[name]:>12,.0f}")
+    print(f"speedup {rates['compiled'] / rates['scan']:.2f}x")
+
+    # Threat detection runs per input line, as the gateway sees requests
+    lines = [line for source in sources[:10] for line in source.splitlines() if line.strip()]
+    mb = sum(len(line) for line in lines) / 1e6
+    print(f"\n{'detector':<12}{'matches':>10}{'seconds':>10}{'MB/s':>12}")
+    rates = {}
+    for name, detector in (("scan", ScanningThreatDetector()), ("compiled", ThreatDetector())):
+        count, elapsed = bench_detector(detector, lines, args.repeat)
+        rates[name] = mb / elapsed
+        print(f"{name:<12}{count:>10}{elapsed:>10.2f}{rates[name]:>12.2f}")
+    print(f"speedup {rates['compiled'] / rates['scan']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+DevTeam6 Local AI - Multi-Worker Scaling Benchmark
+
+Starts the API through ``api.serve`` with 1..N worker processes and drives
+concurrent /query requests against it. All runs share one Chroma server
+and a stub Ollama server, so only the number of API workers changes.
+
+After each run the shared memory index is checked: the total access count
+reported by /stats must equal the number of results returned to clients,
+whichever worker served them.
+
+Usage:
+    python -m benchmarks.multi_worker [--max-workers 4] [--clients 64]
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+from api.serve import start_chroma_server
+from benchmarks.stub_ollama import StubServer
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _start_api(workers: int, port: int, env: dict) -> subprocess.Popen:
+    process = subprocess.Popen(
+        [sys.executable, "-m", "api.serve", "--workers", str(workers),
+         "--host", "127.0.0.1", "--port", str(port)],
+        env={**os.environ, **env},
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.time() + 60
+    while True:
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/health").raise_for_status()
+            return process
+        except httpx.HTTPError:
+            if process.poll() is not None or time.time() > deadline:
+                process.terminate()
+                raise RuntimeError(f"API with {workers} workers did not start")
+            time.sleep(0.2)
+
+
+async def _client(http: httpx.AsyncClient, client_id: int, n: int, latencies: list) -> int:
+    returned = 0
+    for i in range(n):
+        start = time.perf_counter()
+        response = await http.post(
+            "/query",
+            json={"query": f"client {client_id} query {i}", "top_k": 3, "score_threshold": 0.0},
+        )
+        response.raise_for_status()
+        returned += response.json()["count"]
+        latencies.append((time.perf_counter() - start) * 1000)
+    return returned
+
+
+async def _load(url: str, args) -> dict:
+    limits = httpx.Limits(max_connections=args.clients)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=60) as http:
+        for i in range(args.docs):
+            response = await http.post("/store", json={"content": f"document {i}"})
+            response.raise_for_status()
+
+        latencies: list = []
+        start = time.perf_counter()
+        returned = await asyncio.gather(*(
+            _client(http, c, args.requests, latencies) for c in range(args.clients)
+        ))
+        elapsed = time.perf_counter() - start
+
+        memory = (await http.get("/stats")).json()["memory"]
+
+    latencies.sort()
+    return {
+        "throughput": len(latencies) / elapsed,
+        "p50": latencies[len(latencies) // 2],
+        "p99": latencies[int(len(latencies) * 0.99) - 1],
+        "consistent": memory["total_accesses"] == sum(returned),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--clients", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--docs", type=int, default=200)
+    args = parser.parse_args()
+
+    results = {}
+    with StubServer(call_ms=0.5, item_ms=0.05) as ollama:
+        for workers in range(1, args.max_workers + 1):
+            with tempfile.TemporaryDirectory() as tmp:
+                chroma_port = _free_port()
+                chroma = start_chroma_server(str(Path(tmp) / "chroma"), chroma_port)
+                api_port = _free_port()
+                env = {
+                    "OLLAMA_HOST": ollama.url,
+                    "CHROMA_HOST": "127.0.0.1",
+                    "CHROMA_PORT": str(chroma_port),
+                    "CHROMA_COLLECTION": f"bench{workers}",
+                    "SHARED_STATE_PATH": str(Path(tmp) / "shared_state.db"),
+                    "CONTEXT7_PATH": str(Path(tmp) / "agents" / "context7.agents.md"),
+                    "LOG_LEVEL": "WARNING",
+                }
+                api = _start_api(workers, api_port, env)
+                try:
+                    results[workers] = asyncio.run(_load(f"http://127.0.0.1:{api_port}", args))
+                finally:
+                    api.terminate()
+                    api.wait(timeout=30)
+                    chroma.terminate()
+                    chroma.wait(timeout=10)
+
+    base = results[1]["throughput"]
+    print(f"cpu cores: {os.cpu_count()}")
+    print(f"{'workers':<9}{'req/s':>10}{'speedup':>9}{'p50 ms':>10}{'p99 ms':>10}{'index ok':>10}")
+    for workers, r in results.items():
+        print(
+            f"{workers:<9}{r['throughput']:>10.1f}{r['throughput'] / base:>9.2f}"
+            f"{r['p50']:>10.2f}{r['p99']:>10.2f}{str(r['consistent']):>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+DevTeam6 Local AI - Parallel Tokenization Benchmark
+
+Throughput of DualTransformer.process_batch as tokenization is spread
+over more worker processes (``workers=0`` tokenizes in the calling
+process), with cold caches on every run. Also compares the cost of
+sending token lists between processes as pickled Token objects and as
+TokenBatch records. Scaling is bounded by the cores available: on one
+core the pool only adds overhead.
+
+Usage:
+    python -m benchmarks.parallel_tokenize [--snippets 500] [--batch 256] [--repeat 3]
+"""
+
+from typing import Callable, List
+import argparse
+import gc
+import os
+import pickle
+import time
+
+from benchmarks.batch_transform import load_snippets
+from transformers.components.smart_tokenizer import SmartTokenizer, TokenBatch
+from transformers.dual_transformer import DualTransformer
+
+
+def _best(run: Callable[[], None], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--snippets", type=int, default=500)
+    parser.add_argument("--batch", type=int, default=256)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    snippets = load_snippets(args.snippets)
+    cores = os.cpu_count() or 1
+    print(f"{len(snippets)} snippets, batches of {args.batch}, {cores} cores")
+
+    # Transport: what a worker sends back, and rebuilding the tokens
+    tokenizer = SmartTokenizer()
+    token_lists = [tokenizer._tokenize_uncached(snippet, "python") for snippet in snippets]
+    count = sum(map(len, token_lists))
+    print(f"\n{'transport':<12}{'bytes/token':>12}{'us/token':>10}")
+    for name, pack, unpack in (
+        ("Token", lambda tokens: tokens, lambda tokens: tokens),
+        ("TokenBatch", TokenBatch.from_tokens, TokenBatch.to_tokens),
+    ):
+        size = len(pickle.dumps([pack(tokens) for tokens in token_lists], pickle.HIGHEST_PROTOCOL))
+
+        def round_trip() -> None:
+            payload = pickle.dumps([pack(tokens) for tokens in token_lists], pickle.HIGHEST_PROTOCOL)
+            [unpack(packed) for packed in pickle.loads(payload)]
+
+        elapsed = _best(round_trip, args.repeat)
+        print(f"{name:<12}{size / count:>12.1f}{elapsed / count * 1e6:>10.2f}")
+
+    # Throughput against the number of worker processes
+    batches = [snippets[i:i + args.batch] for i in range(0, len(snippets), args.batch)]
+    print(f"\n{'workers':<12}{'seconds':>10}{'items/s':>12}{'scaling':>10}")
+    baseline = None
+    for workers in sorted({0, 1, cores} | {w for w in (2, 4, 8, 16, 32) if w <= cores}):
+        transformer = DualTransformer(max_cache_size=len(snippets), workers=workers)
+        transformer.process_batch(snippets[:8])  # start the workers
+
+        def run() -> None:
+            transformer.clear_cache()
+            for inputs in batches:
+                transformer.process_batch(inputs)
+
+        elapsed = _best(run, args.repeat)
+        transformer.shutdown()
+        rate = len(snippets) / elapsed
+        baseline = baseline or rate
+        print(f"{workers:<12}{elapsed:>10.3f}{rate:>12,.0f}{rate / baseline:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+DevTeam6 Local AI - Rate Limiter Benchmark
+
+Decisions per second of RateLimiter with 1 to 8 threads deciding for
+many clients at once, per algorithm and with one lock stripe against
+sixteen. The legacy limiter (one RLock, fixed window, cleanup scan of
+every client on the request path) is the baseline. Reports the share of
+decisions that found their lock held (contention) and the slowest single
+decision, which is where an inline cleanup shows up. Thread scaling is
+bounded by the GIL and the cores available.
+
+Usage:
+    python -m benchmarks.rate_limiter [--clients 50000] [--decisions 200000] [--repeat 3]
+"""
+
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Tuple
+import argparse
+import gc
+import random
+import threading
+import time
+
+from transformers.components.rate_limiter import RateLimitAlgorithm, RateLimiter
+
+
+@dataclass
+class _LegacyEntry:
+    request_count: int
+    window_start: float
+
+
+class LegacyRateLimiter:
+    """The previous limiter: one RLock, fixed window, inline cleanup."""
+
+    def __init__(self, max_requests: int, window_seconds: float, cleanup_interval: float):
+        self.max_requests = max_requests
+        self.window_seconds = window_seconds
+        self.cleanup_interval = cleanup_interval
+        self._clients: Dict[str, _LegacyEntry] = {}
+        self._lock = threading.RLock()
+        self._last_cleanup = time.time()
+        self.contended = 0
+
+    def allow_request(self, client_id: str) -> bool:
+        current_time = time.time()
+        if not self._lock.acquire(blocking=False):
+            self.contended += 1
+            self._lock.acquire()
+        try:
+            if current_time - self._last_cleanup >= self.cleanup_interval:
+                expired = [
+                    cid for cid, entry in self._clients.items()
+                    if current_time - entry.window_start >= self.window_seconds * 2
+                ]
+                for cid in expired:
+                    del self._clients[cid]
+                self._last_cleanup = current_time
+            entry = self._clients.get(client_id)
+            if entry is None:
+                self._clients[client_id] = _LegacyEntry(1, current_time)
+                return True
+            if current_time - entry.window_start >= self.window_seconds:
+                entry.request_count = 1
+                entry.window_start = current_time
+                return True
+            if entry.request_count < self.max_requests:
+                entry.request_count += 1
+                return True
+            return False
+        finally:
+            self._lock.release()
+
+
+def run_threads(limiter, workloads: List[List[str]]) -> Tuple[float, float]:
+    """Run one workload per thread; return (seconds, slowest decision)."""
+    barrier = threading.Barrier(len(workloads) + 1)
+    stalls = [0.0] * len(workloads)
+
+    def work(index: int) -> None:
+        allow = limiter.allow_request
+        clock = time.perf_counter
+        slowest = 0.0
+        barrier.wait()
+        for client_id in workloads[index]:
+            start = clock()
+            allow(client_id)
+            elapsed = clock() - start
+            if elapsed > slowest:
+                slowest = elapsed
+        stalls[index] = slowest
+
+    threads = [threading.Thread(target=work, args=(i,)) for i in range(len(workloads))]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start, max(stalls)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, default=50000)
+    parser.add_argument("--decisions", type=int, default=200000, help="per run, split over the threads")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    clients = [f"client-{i}" for i in range(args.clients)]
+    requests = [rng.choice(clients) for _ in range(args.decisions)]
+    print(f"{args.clients} clients, {args.decisions} decisions per run")
+
+    # Windows short enough that cleanup runs during the benchmark
+    limit, window, cleanup = 20, 0.5, 0.5
+    variants: List[Tuple[str, Callable[[], object]]] = [
+        ("legacy", lambda: LegacyRateLimiter(limit, window, cleanup)),
+        ("counter x1", lambda: RateLimiter(limit, window, cleanup, stripes=1)),
+    ] + [
+        (f"{algorithm.value.split('_')[-1]} x16", lambda algorithm=algorithm: RateLimiter(
+            limit, window, cleanup, algorithm=algorithm, stripes=16
+        ))
+        for algorithm in RateLimitAlgorithm
+    ]
+
+    print(f"\n{'limiter':<14}{'threads':>8}{'decisions/s':>14}{'contended':>11}{'slowest ms':>12}")
+    for name, build in variants:
+        for threads in (1, 2, 4, 8):
+            share = len(requests) // threads
+            workloads = [requests[i * share:(i + 1) * share] for i in range(threads)]
+            best = float("inf")
+            for _ in range(args.repeat):
+                limiter = build()
+                # Populate, then let every entry expire, so cleanup has work
+                for client_id in clients:
+                    limiter.allow_request(client_id)
+                time.sleep(window * 2)
+                gc.collect()
+                elapsed, slowest = run_threads(limiter, workloads)
+                if elapsed < best:
+                    best, stall = elapsed, slowest
+                    if isinstance(limiter, RateLimiter):
+                        contended = limiter.get_stats()["contended"] / (len(clients) + share * threads)
+                    else:
+                        contended = limiter.contended / (len(clients) + share * threads)
+            print(f"{name:<14}{threads:>8}{share * threads / best:>14,.0f}"
+                  f"{contended:>10.2%}{stall * 1e3:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+DevTeam6 Local AI - Incremental Reindex Benchmark
+
+Re-ingests a generated Markdown repository after a fraction of its files
+changed, comparing a full re-ingest (fresh ids, everything re-embedded
+through RAGPipeline.store_batch) with IncrementalIndexer. Embeddings come
+from the local stub Ollama server; Chroma runs embedded in a temp dir.
+
+Usage:
+    python -m benchmarks.reindex [--files 200] [--changed 0.05] [--item-ms 2]
+"""
+
+from pathlib import Path
+from typing import List
+import argparse
+import asyncio
+import random
+import tempfile
+import time
+
+from benchmarks.stub_ollama import StubServer
+from core.embedding_service import EmbeddingService
+from core.ingest import ChunkManifest, IncrementalIndexer
+from core.rag_pipeline import RAGPipeline
+from core.shared_state import SharedState
+from core.vector_store import VectorStore
+from utils.chunking import chunk_file
+
+WORDS = "index chunk embed vector store query manifest source hash model".split()
+
+
+class CountingEmbeddingService(EmbeddingService):
+    """EmbeddingService that counts the texts it embeds."""
+
+    texts = 0
+
+    async def embed_batch(self, texts: List[str]) -> List[List[float]]:
+        self.texts += len(texts)
+        return await super().embed_batch(texts)
+
+
+def _section(rng: random.Random, title: str) -> str:
+    words = " ".join(rng.choice(WORDS) for _ in range(rng.randint(40, 120)))
+    return f"## {title}\n\n{words}\n\n"
+
+
+def make_repo(root: Path, files: int, sections: int) -> List[Path]:
+    rng = random.Random(0)
+    paths = []
+    for i in range(files):
+        path = root / f"doc_{i:04d}.md"
+        path.write_text("".join(_section(rng, f"Doc {i} part {j}") for j in range(sections)))
+        paths.append(path)
+    return paths
+
+
+def change_files(paths: List[Path], fraction: float) -> int:
+    """Edit one section and append one in a fraction of the files."""
+    rng = random.Random(1)
+    changed = rng.sample(paths, max(1, int(len(paths) * fraction)))
+    for path in changed:
+        text = path.read_text().replace(" vector ", " edited ", 1)
+        path.write_text(text + _section(rng, "Appendix"))
+    return len(changed)
+
+
+def _service(url: str) -> CountingEmbeddingService:
+    service = CountingEmbeddingService(micro_batch=False)
+    service.ollama_host = url
+    return service
+
+
+async def full_reingest(url: str, directory: str, paths: List[Path], max_tokens: int) -> dict:
+    """The previous behaviour: drop everything and embed every chunk again."""
+    store = VectorStore(collection_name="full", persist_directory=directory)
+    service = _service(url)
+    rag = RAGPipeline(embedding_service=service, vector_store=store)
+    start = time.perf_counter()
+    store.reset()
+    for path in paths:
+        chunks = list(chunk_file(path, max_tokens=max_tokens))
+        await rag.store_batch(
+            [c.content for c in chunks],
+            [{"source": str(path), "chunk_index": c.index} for c in chunks],
+        )
+    elapsed = time.perf_counter() - start
+    await rag.close()
+    return {"seconds": elapsed, "embedded": service.texts, "chunks": store.count}
+
+
+async def incremental(indexer: IncrementalIndexer, paths: List[Path]) -> dict:
+    service = indexer.embedding_service
+    before = service.texts
+    report = await indexer.reindex_paths(paths, prune=True)
+    return {
+        "seconds": report.elapsed,
+        "embedded": service.texts - before,
+        "chunks": indexer.vector_store.count,
+        **report.to_dict(),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=200)
+    parser.add_argument("--sections", type=int, default=12)
+    parser.add_argument("--changed", type=float, default=0.05)
+    parser.add_argument("--max-tokens", type=int, default=256)
+    parser.add_argument("--item-ms", type=float, default=2.0, help="stub cost per embedded text")
+    args = parser.parse_args()
+
+    with StubServer(item_ms=args.item_ms) as server, tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "repo"
+        root.mkdir()
+        paths = make_repo(root, args.files, args.sections)
+
+        async def run() -> dict:
+            service = _service(server.url)
+            state = SharedState(str(Path(tmp) / "state.db"))
+            indexer = IncrementalIndexer(
+                embedding_service=service,
+                vector_store=VectorStore(collection_name="incremental", persist_directory=tmp),
+                manifest=ChunkManifest(state, "incremental"),
+                max_tokens=args.max_tokens,
+            )
+            results = {"initial": await incremental(indexer, paths)}
+            results["changed_files"] = change_files(paths, args.changed)
+            results["incremental"] = await incremental(indexer, paths)
+            results["full"] = await full_reingest(server.url, tmp, paths, args.max_tokens)
+            indexer.vector_store.close()
+            await service.close()
+            state.close()
+            return results
+
+        results = asyncio.run(run())
+
+    inc, full = results["incremental"], results["full"]
+    print(f"{args.files} files, {results['changed_files']} changed; "
+          f"initial index embedded {results['initial']['embedded']} chunks")
+    print(f"{'re-ingest':<14}{'seconds':>10}{'embedded':>10}{'chunks':>9}")
+    print(f"{'full':<14}{full['seconds']:>10.2f}{full['embedded']:>10}{full['chunks']:>9}")
+    print(f"{'incremental':<14}{inc['seconds']:>10.2f}{inc['embedded']:>10}{inc['chunks']:>9}")
+    print(f"incremental: {inc['skipped']} files skipped, +{inc['added']} / -{inc['removed']} chunks, "
+          f"{inc['unchanged']} kept in changed files")
+    print(f"saved {full['seconds'] - inc['seconds']:.2f} s "
+          f"({full['seconds'] / inc['seconds']:.1f}x) and "
+          f"{full['embedded'] - inc['embedded']} embeddings "
+          f"({1 - inc['embedded'] / full['embedded']:.1%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""
+DevTeam6 Local AI - Response Serialization Benchmark
+
+Measures per-response cost of /embed and /query through the ASGI stack,
+comparing the previous path (Pydantic response models, re-validated by
+FastAPI, stdlib json) with the current one (plain dicts, orjson, optional
+float32 encodings). Services are replaced by in-memory fakes, so the
+numbers are framework + serialization cost only.
+
+Usage:
+    python -m benchmarks.serialization [--dims 768] [--results 10] [--requests 2000]
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import random
+import time
+
+import httpx
+from fastapi import Depends, FastAPI
+
+import api.main as api_main
+from api.main import (
+    EmbedRequest,
+    EmbedResponse,
+    QueryRequest,
+    QueryResponse,
+    SearchResult as APISearchResult,
+    app,
+    get_embedding_service,
+    get_memory_system,
+)
+from api.serialization import BASE64_FLOAT32_MEDIA_TYPE, float32_bytes
+from core.vector_store import SearchResult
+
+
+class FakeEmbedding:
+    def __init__(self, dims: int):
+        rng = random.Random(0)
+        self.vector = [rng.uniform(-1, 1) for _ in range(dims)]
+
+    async def embed(self, text: str):
+        return self.vector
+
+
+class FakeMemory:
+    def __init__(self, n: int):
+        rng = random.Random(1)
+        self.results = [
+            SearchResult(
+                id=f"doc-{i}",
+                content="lorem ipsum dolor sit amet " * 40,
+                metadata={"category": "docs", "source": f"file{i}.md", "access_count": i},
+                score=rng.random(),
+            )
+            for i in range(n)
+        ]
+
+    async def query(self, **kwargs):
+        return self.results
+
+
+def legacy_app() -> FastAPI:
+    """The /embed and /query handlers as they were before this change."""
+    legacy = FastAPI()
+
+    @legacy.post("/embed", response_model=EmbedResponse)
+    async def embed(request: EmbedRequest, service=Depends(get_embedding_service)):
+        embedding = await service.embed(request.text)
+        return EmbedResponse(embedding=embedding, dimensions=len(embedding), model="m")
+
+    @legacy.post("/query", response_model=QueryResponse)
+    async def query(request: QueryRequest, memory=Depends(get_memory_system)):
+        results = await memory.query(query=request.query)
+        return QueryResponse(
+            results=[
+                APISearchResult(id=r.id, content=r.content, score=r.score, metadata=r.metadata)
+                for r in results
+            ],
+            count=len(results),
+        )
+
+    return legacy
+
+
+async def _measure(target: FastAPI, path: str, body: dict, headers: dict, n: int) -> dict:
+    transport = httpx.ASGITransport(app=target)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        size = len((await client.post(path, json=body, headers=headers)).content)
+        start = time.perf_counter()
+        for _ in range(n):
+            await client.post(path, json=body, headers=headers)
+        elapsed = time.perf_counter() - start
+    return {"us": elapsed / n * 1e6, "bytes": size}
+
+
+def _encode_only(vector: list, n: int) -> dict:
+    """Time encoding one embedding body alone, without the framework."""
+    import orjson
+    import msgpack
+
+    body = {"embedding": vector, "dimensions": len(vector), "model": "m"}
+    encoders = {
+        "json.dumps": lambda: json.dumps(body, separators=(",", ":")).encode(),
+        "orjson": lambda: orjson.dumps(body),
+        "base64 f32 + orjson": lambda: orjson.dumps({
+            **body, "embedding": base64.b64encode(float32_bytes(vector)).decode(),
+        }),
+        "msgpack f32": lambda: msgpack.packb({**body, "embedding": float32_bytes(vector)}),
+    }
+    timings = {}
+    for name, encode in encoders.items():
+        start = time.perf_counter()
+        for _ in range(n):
+            encode()
+        timings[name] = (time.perf_counter() - start) / n * 1e6
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--dims", type=int, default=768)
+    parser.add_argument("--results", type=int, default=10)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    embedding = FakeEmbedding(args.dims)
+    memory = FakeMemory(args.results)
+    legacy = legacy_app()
+    for target in (legacy, app):
+        target.dependency_overrides[get_embedding_service] = lambda: embedding
+        target.dependency_overrides[get_memory_system] = lambda: memory
+    # The real app reads these globals in its handlers; lifespan is not run
+    api_main._embedding_service = embedding
+    api_main._memory_system = memory
+
+    embed_body = {"text": "hello"}
+    query_body = {"query": "hello", "score_threshold": 0.0}
+    cases = [
+        ("/embed pydantic + json", legacy, "/embed", embed_body, {}),
+        ("/embed orjson", app, "/embed", embed_body, {}),
+        ("/embed base64 f32", app, "/embed", embed_body, {"accept": BASE64_FLOAT32_MEDIA_TYPE}),
+        ("/embed msgpack f32", app, "/embed", embed_body, {"accept": "application/msgpack"}),
+        ("/query pydantic + json", legacy, "/query", query_body, {}),
+        ("/query orjson", app, "/query", query_body, {}),
+    ]
+
+    print(f"per request through ASGI ({args.dims} dims, {args.results} results)")
+    print(f"{'path':<26}{'us/req':>10}{'bytes':>10}")
+    for name, target, path, body, headers in cases:
+        r = asyncio.run(_measure(target, path, body, headers, args.requests))
+        print(f"{name:<26}{r['us']:>10.1f}{r['bytes']:>10}")
+
+    print()
+    print(f"encode one /embed body only ({args.dims} dims)")
+    print(f"{'encoder':<26}{'us':>10}")
+    for name, us in _encode_only(embedding.vector, args.requests * 5).items():
+        print(f"{name:<26}{us:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
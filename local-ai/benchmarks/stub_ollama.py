@@ -0,0 +1,128 @@
+"""
+DevTeam6 Local AI - Stub Ollama Server
+
+Minimal local stand-in for the Ollama HTTP API used by benchmarks.
+Model calls are serialized (one at a time, like a single GPU) and cost a
+fixed overhead plus a per-item time.
+"""
+
+import asyncio
+import json
+import multiprocessing
+import socket
+import time
+
+import httpx
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+
+
+def create_app(
+    call_ms: float = 4.0,
+    item_ms: float = 0.1,
+    dimensions: int = 768,
+    generate_ms: float = 20.0,
+) -> FastAPI:
+    """
+    Build the stub app.
+
+    Args:
+        call_ms: Fixed cost per model call
+        item_ms: Additional cost per embedded text
+        dimensions: Embedding dimensions returned
+        generate_ms: Cost of a /api/generate call (half before the first
+            token when streaming)
+    """
+    app = FastAPI()
+    app.state.calls = 0
+    app.state.connections = set()
+    lock = asyncio.Lock()
+    vector = [0.01] * dimensions
+
+    async def run_model(seconds: float) -> None:
+        async with lock:
+            app.state.calls += 1
+            await asyncio.sleep(seconds)
+
+    @app.middleware("http")
+    async def track_connections(request: Request, call_next):
+        app.state.connections.add((request.client.host, request.client.port))
+        return await call_next(request)
+
+    @app.post("/api/embeddings")
+    async def embeddings(body: dict):
+        await run_model((call_ms + item_ms) / 1000)
+        return {"embedding": vector}
+
+    @app.post("/api/embed")
+    async def embed(body: dict):
+        texts = body["input"] if isinstance(body["input"], list) else [body["input"]]
+        await run_model((call_ms + item_ms * len(texts)) / 1000)
+        return {"embeddings": [vector for _ in texts]}
+
+    @app.post("/api/generate")
+    async def generate(body: dict):
+        if not body.get("stream", True):
+            await asyncio.sleep(generate_ms / 1000)
+            return {"response": "stub answer", "eval_count": 2}
+
+        async def chunks():
+            for i, token in enumerate(("stub ", "answer")):
+                await asyncio.sleep(generate_ms / 2000)
+                yield json.dumps({"response": token, "done": i == 1, "eval_count": i + 1}) + "\n"
+
+        return StreamingResponse(chunks(), media_type="application/x-ndjson")
+
+    @app.get("/stats")
+    async def stats():
+        return {"calls": app.state.calls, "connections": len(app.state.connections)}
+
+    return app
+
+
+def _serve(port: int, options: dict) -> None:
+    uvicorn.run(create_app(**options), host="127.0.0.1", port=port, log_level="error")
+
+
+class StubServer:
+    """
+    Run the stub app with uvicorn in a separate process.
+
+    Keeping the server out of the benchmark process means client-side
+    measurements are not skewed by the server competing for the GIL.
+    """
+
+    def __init__(self, port: int = 0, **options):
+        if not port:
+            with socket.socket() as sock:
+                sock.bind(("127.0.0.1", 0))
+                port = sock.getsockname()[1]
+        self.port = port
+        self._process = multiprocessing.Process(
+            target=_serve, args=(port, options), daemon=True
+        )
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def stats(self) -> dict:
+        """Fetch call and connection counters from the server."""
+        return httpx.get(f"{self.url}/stats").json()
+
+    def __enter__(self) -> "StubServer":
+        self._process.start()
+        deadline = time.time() + 10
+        while True:
+            try:
+                self.stats()
+                return self
+            except httpx.TransportError:
+                if time.time() > deadline:
+                    raise
+                time.sleep(0.05)
+
+    def __exit__(self, *exc) -> None:
+        self._process.terminate()
+        self._process.join(timeout=5)
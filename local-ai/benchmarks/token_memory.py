@@ -0,0 +1,115 @@
+"""
+DevTeam6 Local AI - Token Memory Benchmark
+
+Memory per 10k tokens of the repo's own modules in each representation:
+the previous Token dataclass (a __dict__ and a metadata dict per token),
+the slotted Token, and TokenBatch. Sizes are measured with deep_sizeof,
+as the caches measure their entries, and with tracemalloc. Also times
+get_category_summary and filter_by_category on a list and on a batch.
+
+Usage:
+    python -m benchmarks.token_memory [--copies 3] [--repeat 5]
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List
+import argparse
+import gc
+import time
+import tracemalloc
+
+from benchmarks.keyword_matching import load_sources
+from transformers.components.lru_cache import deep_sizeof
+from transformers.components.smart_tokenizer import SmartTokenizer, TokenBatch, TokenCategory
+
+
+@dataclass
+class DictToken:
+    """The previous Token layout."""
+
+    value: str
+    category: TokenCategory
+    clarity_score: float
+    line_number: int
+    column: int
+    context: str = ""
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+
+def _allocated(build: Callable[[], Any]) -> int:
+    """Bytes still allocated after building (and keeping) an object."""
+    gc.collect()
+    tracemalloc.start()
+    kept = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return size
+
+
+def _best(run: Callable[[], Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--copies", type=int, default=3, help="repetitions of each module per file")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    tokenizer = SmartTokenizer()
+    sources = load_sources(args.copies)
+    token_lists = [tokenizer._tokenize_uncached(source, "python") for source in sources]
+    count = sum(map(len, token_lists))
+    print(f"{len(token_lists)} files, {count} tokens; bytes per 10k tokens")
+
+    # Each representation is built from a fresh tokenization, so none
+    # shares strings or metadata with another
+    def slotted_tokens() -> List[list]:
+        return [tokenizer._tokenize_uncached(source, "python") for source in sources]
+
+    def dict_tokens() -> List[List[DictToken]]:
+        return [
+            [
+                DictToken(t.value, t.category, t.clarity_score, t.line_number, t.column,
+                          t.context, dict(t.metadata))
+                for t in tokens
+            ]
+            for tokens in slotted_tokens()
+        ]
+
+    def token_batches() -> List[TokenBatch]:
+        return [TokenBatch.from_tokens(tokens) for tokens in slotted_tokens()]
+
+    batches = [TokenBatch.from_tokens(tokens) for tokens in token_lists]
+    print(f"{'representation':<16}{'deep_sizeof':>14}{'tracemalloc':>14}")
+    sizes = {}
+    for name, build in (
+        ("Token (dict)", dict_tokens),
+        ("Token (slots)", slotted_tokens),
+        ("TokenBatch", token_batches),
+    ):
+        measured = sum(deep_sizeof(item) for item in build())
+        sizes[name] = measured
+        allocated = _allocated(build)
+        print(f"{name:<16}{measured / count * 1e4:>14,.0f}{allocated / count * 1e4:>14,.0f}")
+    print(f"slots: {sizes['Token (dict)'] / sizes['Token (slots)']:.1f}x smaller, "
+          f"TokenBatch: {sizes['Token (dict)'] / sizes['TokenBatch']:.1f}x smaller")
+
+    print(f"\n{'consumer':<24}{'list us':>10}{'batch us':>10}  (per 10k tokens)")
+    for name, consume in (
+        ("get_category_summary", tokenizer.get_category_summary),
+        ("filter_by_category", lambda tokens: tokenizer.filter_by_category(tokens, TokenCategory.API)),
+    ):
+        on_lists = _best(lambda: [consume(tokens) for tokens in token_lists], args.repeat)
+        on_batches = _best(lambda: [consume(batch) for batch in batches], args.repeat)
+        print(f"{name:<24}{on_lists / count * 1e10:>10,.0f}{on_batches / count * 1e10:>10,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+DevTeam6 Local AI - Token Store Benchmark
+
+Issues a million tokens through AuthManager, into a store large enough
+to keep them all and into one bounded well below that, and reports
+memory per token, issue rate and validate_token / authorize latency.
+The previous storage (a dict whose expired tokens were looked for by a
+scan of every token whenever it was full, and which kept growing when
+none had expired) is measured on a smaller run for comparison.
+
+Usage:
+    python -m benchmarks.token_store [--tokens 1000000] [--bounded 100000] [--legacy-tokens 20000]
+"""
+
+from typing import Dict, List, Set
+import argparse
+import gc
+import random
+import time
+import tracemalloc
+
+from transformers.components.auth_manager import AuthManager, AuthToken, SecurityLevel
+
+
+class LegacyTokenCache(AuthManager):
+    """AuthManager with the previous token bookkeeping."""
+
+    def __init__(self, cache_size: int):
+        super().__init__(cache_size=cache_size)
+        self._token_cache: Dict[str, AuthToken] = {}
+        self._user_sessions: Dict[str, List[str]] = {}
+        self._revoked_tokens: Set[str] = set()
+
+    def generate_token(self, user_id: str, **kwargs) -> AuthToken:
+        token = super().generate_token(user_id, **kwargs)
+        self._user_sessions.setdefault(user_id, []).append(token.token_id)
+        return token
+
+    def _cache_token(self, token: AuthToken) -> None:
+        if len(self._token_cache) >= self.cache_size:
+            now = token.created_at
+            expired = [tid for tid, cached in self._token_cache.items() if cached.expires_at < now]
+            for tid in expired:
+                self._token_cache.pop(tid, None)
+        self._token_cache[token.token_id] = token
+
+
+def issue(auth: AuthManager, count: int, users: int) -> float:
+    """Issue tokens for users of every level; return seconds."""
+    levels = list(SecurityLevel)
+    start = time.perf_counter()
+    for i in range(count):
+        auth.generate_token(f"user-{i % users}", security_level=levels[i % len(levels)])
+    return time.perf_counter() - start
+
+
+def percentiles(samples: List[float]) -> str:
+    samples.sort()
+    pick = lambda q: samples[min(len(samples) - 1, int(q * len(samples)))] * 1e6
+    return f"{pick(0.5):>8.2f}{pick(0.99):>8.2f}{max(samples) * 1e6:>9.1f}"
+
+
+def latencies(auth: AuthManager, token_ids: List[str], samples: int) -> None:
+    """Print validate_token and authorize latency over random live tokens."""
+    rng = random.Random(0)
+    picks = [rng.choice(token_ids) for _ in range(samples)]
+    mask = auth.permission_mask({"read:user"})
+    clock = time.perf_counter
+    for name, check in (
+        ("validate_token", auth.validate_token),
+        ("authorize", lambda token_id: auth.authorize(token_id, mask, SecurityLevel.PUBLIC)),
+    ):
+        timings = []
+        for token_id in picks:
+            start = clock()
+            check(token_id)
+            timings.append(clock() - start)
+        print(f"  {name:<16}{'p50 us':>8}{'p99 us':>8}{'max us':>9}")
+        print(f"  {'':<16}{percentiles(timings)}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tokens", type=int, default=1000000)
+    parser.add_argument("--bounded", type=int, default=100000, help="store size for the bounded run")
+    parser.add_argument("--users", type=int, default=50000)
+    parser.add_argument("--samples", type=int, default=100000)
+    parser.add_argument("--legacy-tokens", type=int, default=20000)
+    args = parser.parse_args()
+
+    for label, cache_size in (("all kept", args.tokens), ("bounded", args.bounded)):
+        gc.collect()
+        tracemalloc.start()
+        auth = AuthManager(cache_size=cache_size)
+        seconds = issue(auth, args.tokens, args.users)
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        stats = auth.get_stats()
+        live = list(auth._store._tokens)
+        print(f"\n{label}: {args.tokens:,} issued into {cache_size:,}: {stats['cached_tokens']:,} stored, "
+              f"{stats['evicted_tokens']:,} evicted, {stats['active_users']:,} users")
+        print(f"  issue {args.tokens / seconds:,.0f} tokens/s (traced), "
+              f"{memory / 2**20:,.0f} MiB, {memory / stats['cached_tokens']:,.0f} B per stored token")
+        latencies(auth, live, args.samples)
+        del auth, live
+
+    # Previous storage: full store, nothing expired, every issue scans
+    legacy = LegacyTokenCache(cache_size=args.legacy_tokens // 2)
+    seconds = issue(legacy, args.legacy_tokens, args.users)
+    current = AuthManager(cache_size=args.legacy_tokens // 2)
+    current_seconds = issue(current, args.legacy_tokens, args.users)
+    print(f"\n{args.legacy_tokens:,} issued into {args.legacy_tokens // 2:,}:")
+    print(f"  previous {args.legacy_tokens / seconds:>10,.0f} tokens/s, {len(legacy._token_cache):,} stored")
+    print(f"  current  {args.legacy_tokens / current_seconds:>10,.0f} tokens/s, {len(current._store):,} stored")
+
+
+if __name__ == "__main__":
+    main()
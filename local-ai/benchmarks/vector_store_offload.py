@@ -0,0 +1,128 @@
+"""
+DevTeam6 Local AI - Vector Store Offload Benchmark
+
+Drives concurrent /query requests through the FastAPI app and compares
+Chroma calls made inline on the event loop (the old behaviour) with the
+AsyncVectorStore thread-pool facade. Embeddings come from the local stub
+Ollama server; the collection is seeded with random vectors.
+
+Usage:
+    python -m benchmarks.vector_store_offload [--docs 20000] [--clients 32]
+"""
+
+import argparse
+import asyncio
+import random
+import tempfile
+import time
+
+import httpx
+
+from api.main import app, get_memory_system
+from benchmarks.stub_ollama import StubServer
+from core.embedding_service import EmbeddingService
+from core.memory_system import MemorySystem
+from core.vector_store import AsyncVectorStore
+
+
+class InlineVectorStore(AsyncVectorStore):
+    """Facade variant that runs Chroma calls directly on the event loop."""
+
+    async def _run(self, fn, *args, **kwargs):
+        return fn(*args, **kwargs)
+
+
+def _seed(memory: MemorySystem, docs: int, dims: int) -> None:
+    rng = random.Random(0)
+    store = memory.vector_store.store
+    for start in range(0, docs, 1000):
+        n = min(1000, docs - start)
+        store.add_batch(
+            contents=[f"document {start + i}" for i in range(n)],
+            embeddings=[[rng.random() for _ in range(dims)] for _ in range(n)],
+            metadatas=[{"category": "bench"} for _ in range(n)],
+        )
+
+
+async def _client(http: httpx.AsyncClient, client_id: int, n: int, latencies: list) -> None:
+    for i in range(n):
+        start = time.perf_counter()
+        response = await http.post(
+            "/query",
+            json={"query": f"client {client_id} query {i}", "top_k": 5, "score_threshold": 0.0},
+        )
+        response.raise_for_status()
+        latencies.append((time.perf_counter() - start) * 1000)
+
+
+async def _probe(http: httpx.AsyncClient, stop: asyncio.Event, latencies: list) -> None:
+    """Hit /health while /query load runs, to see how blocked the loop is."""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await http.get("/health")
+        latencies.append((time.perf_counter() - start) * 1000)
+        await asyncio.sleep(0.005)
+
+
+def _p(latencies: list, q: float) -> float:
+    return latencies[max(int(len(latencies) * q) - 1, 0)]
+
+
+async def _run(memory: MemorySystem, args) -> dict:
+    app.dependency_overrides[get_memory_system] = lambda: memory
+    latencies: list = []
+    health: list = []
+    stop = asyncio.Event()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+        probe = asyncio.create_task(_probe(http, stop, health))
+        start = time.perf_counter()
+        await asyncio.gather(*(
+            _client(http, c, args.requests, latencies) for c in range(args.clients)
+        ))
+        elapsed = time.perf_counter() - start
+        stop.set()
+        await probe
+
+    latencies.sort()
+    health.sort()
+    return {
+        "throughput": len(latencies) / elapsed,
+        "p50": _p(latencies, 0.5),
+        "p99": _p(latencies, 0.99),
+        "health_p99": _p(health, 0.99),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--docs", type=int, default=20_000)
+    parser.add_argument("--dims", type=int, default=768)
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=10)
+    parser.add_argument("--max-reads", type=int, default=None)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp, StubServer(dimensions=args.dims) as server:
+        embedding = EmbeddingService()
+        embedding.ollama_host = server.url
+        memory = MemorySystem(persist_directory=tmp, embedding_service=embedding)
+        _seed(memory, args.docs, args.dims)
+        store = memory.vector_store.store
+
+        results = {}
+        for name, facade in (("inline", InlineVectorStore), ("thread pool", AsyncVectorStore)):
+            memory.vector_store = facade(store, max_concurrent_reads=args.max_reads)
+            results[name] = asyncio.run(_run(memory, args))
+            memory.vector_store.close()
+
+    print(f"{'chroma calls':<14}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'/health p99':>14}")
+    for name, r in results.items():
+        print(
+            f"{name:<14}{r['throughput']:>10.1f}{r['p50']:>10.2f}"
+            f"{r['p99']:>10.2f}{r['health_p99']:>14.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -22,21 +22,37 @@ class Settings(BaseSettings):
     api_host: str = "0.0.0.0"
     api_port: int = 8000
     api_reload: bool = True
+    api_workers: int = 1  # >1 runs several processes via `python -m api.serve`
+    shared_state_path: Optional[str] = None  # Defaults to <chroma_persist_dir>/shared_state.db
 
     # Ollama Configuration
     ollama_host: str = "http://localhost:11434"
     ollama_model: str = "llama3.2"
     ollama_timeout: int = 120
 
+    # Shared HTTP Connection Pool (per upstream host)
+    http_max_connections: int = 100
+    http_max_keepalive_connections: int = 100  # Keep every pooled connection reusable
+    http_keepalive_expiry: float = 30.0  # seconds
+    http_pool_shards: int = 4  # Pools per host; limits are split across them
+    http_http2: bool = True  # Used when the h2 package is installed
+
     # Embedding Configuration
     embedding_model: str = "nomic-embed-text"
     embedding_dimensions: int = 768
     embedding_batch_size: int = 32
+    embedding_micro_batch: bool = True
+    embedding_batch_max_wait_ms: float = 2.0
 
     # ChromaDB Configuration
     chroma_persist_dir: str = "./data/chroma"
     chroma_collection: str = "devteam6"
     chroma_distance_fn: str = "cosine"
+    chroma_host: Optional[str] = None  # Use a Chroma server instead of the embedded client
+    chroma_port: int = 8001
+    vector_store_threads: int = 8
+    vector_store_max_reads: int = 8
+    vector_store_max_writes: int = 1  # Chroma serializes writes internally
 
     # OpenAI Configuration (optional)
     openai_api_key: Optional[str] = None
@@ -1,16 +1,41 @@
 """DevTeam6 Local AI - Core Package"""
-from .memory_system import MemorySystem
-from .embedding_service import EmbeddingService
-from .vector_store import VectorStore
-from .rag_pipeline import RAGPipeline
-from .context7_sync import Context7Sync
-from .knowledge_graph import KnowledgeGraph
+from typing import TYPE_CHECKING
+
+from utils.lazy_imports import lazy_exports
+
+if TYPE_CHECKING:
+    from .memory_system import MemorySystem
+    from .embedding_service import EmbeddingService
+    from .vector_store import VectorStore, AsyncVectorStore
+    from .rag_pipeline import RAGPipeline
+    from .context7_sync import Context7Sync
+    from .knowledge_graph import KnowledgeGraph
+    from .single_flight import SingleFlight
+    from .ingest import ChunkManifest, IncrementalIndexer
+
+# Submodules are imported on first attribute access
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "MemorySystem": ".memory_system",
+    "EmbeddingService": ".embedding_service",
+    "VectorStore": ".vector_store",
+    "AsyncVectorStore": ".vector_store",
+    "RAGPipeline": ".rag_pipeline",
+    "Context7Sync": ".context7_sync",
+    "KnowledgeGraph": ".knowledge_graph",
+    "SingleFlight": ".single_flight",
+    "ChunkManifest": ".ingest",
+    "IncrementalIndexer": ".ingest",
+})
 
 __all__ = [
     "MemorySystem",
     "EmbeddingService",
     "VectorStore",
+    "AsyncVectorStore",
     "RAGPipeline",
     "Context7Sync",
     "KnowledgeGraph",
+    "SingleFlight",
+    "ChunkManifest",
+    "IncrementalIndexer",
 ]
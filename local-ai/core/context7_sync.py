@@ -4,8 +4,9 @@ DevTeam6 Local AI - Context7 Sync Engine
 Synchronizes state with the Context7 multi-agent system in .github/agents/.
 """
 
-from typing import Dict, Any, List, Optional
-from dataclasses import dataclass
+from typing import Dict, Any, Iterator, List, Optional
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict
 from pathlib import Path
 import json
 import asyncio
@@ -13,6 +14,7 @@ from datetime import datetime
 import re
 
 from config.settings import get_settings
+from .shared_state import SharedState
 
 
 @dataclass
@@ -46,14 +48,24 @@ class Context7Sync:
     - .github/agents/context7.agents.md
     - .github/agents/logs/*.log.md
     - .github/agents/memory/*.json
+
+    With a shared state store, agent state updates are visible to every
+    API worker and file read-modify-writes are serialized across processes.
     """
 
-    def __init__(self, context7_path: Optional[str] = None):
+    _AGENTS_NAMESPACE = "context7.agents"
+
+    def __init__(
+        self,
+        context7_path: Optional[str] = None,
+        shared_state: Optional[SharedState] = None,
+    ):
         """
         Initialize the Context7 sync engine.
 
         Args:
             context7_path: Path to context7.agents.md
+            shared_state: Store shared with other worker processes
         """
         settings = get_settings()
         self.context7_path = Path(context7_path or settings.context7_path)
@@ -64,6 +76,22 @@ class Context7Sync:
         self._agents: Dict[str, AgentState] = {}
         self._project_state: Optional[ProjectState] = None
         self._last_sync: Optional[datetime] = None
+        self._shared = shared_state
+
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        """Serialize read-modify-write of Context7 files across workers."""
+        if self._shared is None:
+            yield
+        else:
+            with self._shared.transaction():
+                yield
+
+    def _refresh_agents(self) -> None:
+        """Apply agent state updates made by other workers."""
+        if self._shared is not None:
+            for agent_id, data in self._shared.items(self._AGENTS_NAMESPACE).items():
+                self._agents[agent_id] = AgentState(**data)
 
     def _ensure_dirs(self) -> None:
         """Ensure required directories exist."""
@@ -139,17 +167,18 @@ class Context7Sync:
         """Save state back to Context7 files."""
         self._ensure_dirs()
 
-        # Update knowledge graph with agent states
-        kg_path = self.memory_dir / "knowledge-graph.json"
-        if kg_path.exists():
-            kg_data = json.loads(kg_path.read_text())
-        else:
-            kg_data = {"version": "1.0.0", "nodes": [], "edges": []}
+        with self._file_lock():
+            # Update knowledge graph with agent states
+            kg_path = self.memory_dir / "knowledge-graph.json"
+            if kg_path.exists():
+                kg_data = json.loads(kg_path.read_text())
+            else:
+                kg_data = {"version": "1.0.0", "nodes": [], "edges": []}
 
-        # Update timestamp
-        kg_data["updated"] = datetime.utcnow().isoformat()
+            # Update timestamp
+            kg_data["updated"] = datetime.utcnow().isoformat()
 
-        kg_path.write_text(json.dumps(kg_data, indent=2))
+            kg_path.write_text(json.dumps(kg_data, indent=2))
 
     def get_agent(self, agent_id: str) -> Optional[AgentState]:
         """
@@ -161,10 +190,12 @@ class Context7Sync:
         Returns:
             AgentState or None
         """
+        self._refresh_agents()
         return self._agents.get(agent_id)
 
     def list_agents(self) -> List[AgentState]:
         """Get all agent states."""
+        self._refresh_agents()
         return list(self._agents.values())
 
     async def update_agent_state(
@@ -179,12 +210,15 @@ class Context7Sync:
             agent_id: Agent ID
             updates: State updates
         """
+        self._refresh_agents()
         if agent_id in self._agents:
             agent = self._agents[agent_id]
             for key, value in updates.items():
                 if hasattr(agent, key):
                     setattr(agent, key, value)
             agent.last_sync = datetime.utcnow().isoformat()
+            if self._shared is not None:
+                self._shared.set(self._AGENTS_NAMESPACE, agent_id, asdict(agent))
 
             # Log the update
             await self._log_agent_activity(agent_id, "state_update", updates)
@@ -202,17 +236,18 @@ class Context7Sync:
         timestamp = datetime.utcnow().isoformat()
         log_entry = f"\n[{timestamp}] [{activity_type.upper()}] {json.dumps(data)}\n"
 
-        if log_path.exists():
-            content = log_path.read_text()
-            # Insert after "## Activity Log" section
-            if "## Activity Log" in content:
-                parts = content.split("## Activity Log", 1)
-                if len(parts) == 2:
-                    # Find the code block and append
-                    new_content = parts[0] + "## Activity Log" + parts[1].replace(
-                        "```\n", f"```\n{log_entry}", 1
-                    )
-                    log_path.write_text(new_content)
+        with self._file_lock():
+            if log_path.exists():
+                content = log_path.read_text()
+                # Insert after "## Activity Log" section
+                if "## Activity Log" in content:
+                    parts = content.split("## Activity Log", 1)
+                    if len(parts) == 2:
+                        # Find the code block and append
+                        new_content = parts[0] + "## Activity Log" + parts[1].replace(
+                            "```\n", f"```\n{log_entry}", 1
+                        )
+                        log_path.write_text(new_content)
 
     def get_project_state(self) -> Optional[ProjectState]:
         """Get current project state."""
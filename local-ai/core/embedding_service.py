@@ -4,12 +4,18 @@ DevTeam6 Local AI - Embedding Service
 Generates text embeddings using Ollama or OpenAI models.
 """
 
+from typing import Any, Dict, List, Optional, Union
 import asyncio
-from typing import List, Optional, Union
+import math
+
 import httpx
 from tenacity import retry, stop_after_attempt, wait_exponential
 
 from config.settings import get_settings
+from .single_flight import SingleFlight, get_single_flight
+from .micro_batcher import MicroBatcher
+from .http_pool import HTTPClientRegistry, get_http_registry
+from .metrics import get_metrics
 
 
 class EmbeddingService:
@@ -20,6 +26,11 @@ class EmbeddingService:
         model: Optional[str] = None,
         provider: str = "ollama",
         dimensions: Optional[int] = None,
+        single_flight: Optional[SingleFlight] = None,
+        micro_batch: Optional[bool] = None,
+        max_batch_size: Optional[int] = None,
+        max_batch_wait_ms: Optional[float] = None,
+        http_registry: Optional[HTTPClientRegistry] = None,
     ):
         """
         Initialize the embedding service.
@@ -28,6 +39,11 @@ class EmbeddingService:
             model: Model name for embeddings
             provider: Provider to use ("ollama" or "openai")
             dimensions: Expected embedding dimensions
+            single_flight: Coalescing group for identical concurrent requests
+            micro_batch: Batch concurrent embed() calls into one model call
+            max_batch_size: Maximum texts per batched model call
+            max_batch_wait_ms: Maximum time a text waits for its batch to fill
+            http_registry: Shared HTTP client pool
         """
         settings = get_settings()
         self.model = model or settings.embedding_model
@@ -35,31 +51,61 @@ class EmbeddingService:
         self.dimensions = dimensions or settings.embedding_dimensions
         self.ollama_host = settings.ollama_host
         self.openai_key = settings.openai_api_key
-        self._client: Optional[httpx.AsyncClient] = None
+        self.single_flight = single_flight or get_single_flight()
+        self.batch_size = max_batch_size or settings.embedding_batch_size
+        self.http_registry = http_registry or get_http_registry()
+        self.metrics = get_metrics()
+        self.timeout = 60.0
+        # Cleared when the Ollama server predates /api/embed
+        self._ollama_embed_api = True
+
+        if micro_batch is None:
+            micro_batch = settings.embedding_micro_batch
+        self._batcher: Optional[MicroBatcher[str, List[float]]] = None
+        if micro_batch:
+            self._batcher = MicroBatcher(
+                self._embed_many,
+                max_batch_size=self.batch_size,
+                max_wait_ms=(
+                    max_batch_wait_ms
+                    if max_batch_wait_ms is not None
+                    else settings.embedding_batch_max_wait_ms
+                ),
+            )
 
-    async def _get_client(self) -> httpx.AsyncClient:
-        """Get or create HTTP client."""
-        if self._client is None:
-            self._client = httpx.AsyncClient(timeout=60.0)
-        return self._client
+    async def _get_client(self, url: str) -> httpx.AsyncClient:
+        """Get the shared HTTP client for a host."""
+        return self.http_registry.get_client(url)
 
     async def close(self) -> None:
-        """Close the HTTP client."""
-        if self._client:
-            await self._client.aclose()
-            self._client = None
+        """Release resources (the shared HTTP pool is closed by its owner)."""
 
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=1, max=10))
     async def embed(self, text: str) -> List[float]:
         """
         Generate embedding for a single text.
 
+        Concurrent calls for the same text share one model request, and
+        concurrent calls for different texts are micro-batched when enabled.
+
         Args:
             text: Text to embed
 
         Returns:
             List of floats representing the embedding
         """
+        key = ("embed", self.provider, self.model, text)
+        with self.metrics.stage("embed"):
+            return await self.single_flight.do(key, lambda: self._embed_uncoalesced(text))
+
+    async def _embed_uncoalesced(self, text: str) -> List[float]:
+        """Generate an embedding, bypassing coalescing."""
+        if self._batcher is not None:
+            return await self._batcher.submit(text)
+        return await self._embed_single(text)
+
+    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=1, max=10))
+    async def _embed_single(self, text: str) -> List[float]:
+        """Generate one embedding with one model call."""
         if self.provider == "ollama":
             return await self._embed_ollama(text)
         elif self.provider == "openai":
@@ -71,35 +117,77 @@ class EmbeddingService:
         """
         Generate embeddings for multiple texts.
 
+        Texts are sent in chunks of ``batch_size``, one model call per chunk.
+
         Args:
             texts: List of texts to embed
 
         Returns:
             List of embedding vectors
         """
-        settings = get_settings()
-        batch_size = settings.embedding_batch_size
-
         embeddings = []
-        for i in range(0, len(texts), batch_size):
-            batch = texts[i : i + batch_size]
-            batch_embeddings = await asyncio.gather(
-                *[self.embed(text) for text in batch]
-            )
-            embeddings.extend(batch_embeddings)
+        for i in range(0, len(texts), self.batch_size):
+            batch = texts[i : i + self.batch_size]
+            embeddings.extend(await self._embed_many(batch))
 
         return embeddings
 
+    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=1, max=10))
+    async def _embed_many(self, texts: List[str]) -> List[List[float]]:
+        """Generate embeddings for several texts with one model call."""
+        if self.provider == "ollama":
+            return await self._embed_ollama_batch(texts)
+        elif self.provider == "openai":
+            return await self._embed_openai_batch(texts)
+        else:
+            raise ValueError(f"Unknown provider: {self.provider}")
+
     async def _embed_ollama(self, text: str) -> List[float]:
         """Generate embedding using Ollama."""
-        client = await self._get_client()
+        return (await self._embed_ollama_batch([text]))[0]
+
+    async def _embed_ollama_batch(self, texts: List[str]) -> List[List[float]]:
+        """
+        Generate embeddings for several texts using Ollama.
+
+        Single and batched calls both use ``/api/embed``, which returns
+        L2-normalized vectors, so an embedding does not depend on whether
+        its text was micro-batched. Servers without ``/api/embed`` are
+        sent one ``/api/embeddings`` request per text, and those
+        (unnormalized) vectors are normalized to match.
+        """
+        if self._ollama_embed_api:
+            url = f"{self.ollama_host}/api/embed"
+            client = await self._get_client(url)
+
+            response = await client.post(
+                url,
+                json={
+                    "model": self.model,
+                    "input": texts,
+                },
+                timeout=self.timeout,
+            )
+            if not _endpoint_missing(response):
+                response.raise_for_status()
+                return response.json()["embeddings"]
+            self._ollama_embed_api = False
+
+        embeddings = await asyncio.gather(*(self._embed_ollama_legacy(text) for text in texts))
+        return [_normalize(embedding) for embedding in embeddings]
+
+    async def _embed_ollama_legacy(self, text: str) -> List[float]:
+        """Generate embedding using Ollama's single-text endpoint."""
+        url = f"{self.ollama_host}/api/embeddings"
+        client = await self._get_client(url)
 
         response = await client.post(
-            f"{self.ollama_host}/api/embeddings",
+            url,
             json={
                 "model": self.model,
                 "prompt": text,
             },
+            timeout=self.timeout,
         )
         response.raise_for_status()
         data = response.json()
@@ -111,21 +199,54 @@ class EmbeddingService:
         if not self.openai_key:
             raise ValueError("OpenAI API key not configured")
 
-        client = await self._get_client()
+        url = "https://api.openai.com/v1/embeddings"
+        client = await self._get_client(url)
 
         response = await client.post(
-            "https://api.openai.com/v1/embeddings",
+            url,
             headers={"Authorization": f"Bearer {self.openai_key}"},
             json={
                 "model": "text-embedding-3-small",
                 "input": text,
             },
+            timeout=self.timeout,
         )
         response.raise_for_status()
         data = response.json()
 
         return data["data"][0]["embedding"]
 
+    async def _embed_openai_batch(self, texts: List[str]) -> List[List[float]]:
+        """Generate embeddings for several texts using OpenAI."""
+        if not self.openai_key:
+            raise ValueError("OpenAI API key not configured")
+
+        url = "https://api.openai.com/v1/embeddings"
+        client = await self._get_client(url)
+
+        response = await client.post(
+            url,
+            headers={"Authorization": f"Bearer {self.openai_key}"},
+            json={
+                "model": "text-embedding-3-small",
+                "input": texts,
+            },
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        data = response.json()
+
+        items = sorted(data["data"], key=lambda d: d["index"])
+        return [item["embedding"] for item in items]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get embedding service statistics."""
+        return {
+            "model": self.model,
+            "provider": self.provider,
+            "micro_batch": self._batcher.get_stats() if self._batcher else None,
+        }
+
     def similarity(self, embedding1: List[float], embedding2: List[float]) -> float:
         """
         Calculate cosine similarity between two embeddings.
@@ -150,3 +271,21 @@ class EmbeddingService:
             return 0.0
 
         return float(dot_product / (norm1 * norm2))
+
+
+def _endpoint_missing(response: httpx.Response) -> bool:
+    """Whether a 404 means the server has no such route (not an unknown model)."""
+    if response.status_code != 404:
+        return False
+    try:
+        return "error" not in response.json()
+    except ValueError:
+        return True
+
+
+def _normalize(embedding: List[float]) -> List[float]:
+    """Scale a vector to unit L2 norm."""
+    norm = math.sqrt(sum(x * x for x in embedding))
+    if not norm:
+        return embedding
+    return [x / norm for x in embedding]
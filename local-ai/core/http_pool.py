@@ -0,0 +1,228 @@
+"""
+DevTeam6 Local AI - HTTP Connection Pool
+
+Process-wide registry of pooled HTTP clients, one per upstream host.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+import asyncio
+import itertools
+import math
+import httpx
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+from config.settings import get_settings
+
+
+class _HostStats:
+    """Connection and request counters for one host."""
+
+    __slots__ = ("requests", "errors", "connections_opened", "in_flight")
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.connections_opened = 0
+        self.in_flight = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "in_flight": self.in_flight,
+            "connections_opened": self.connections_opened,
+            "requests_per_connection": (
+                self.requests / self.connections_opened if self.connections_opened else 0.0
+            ),
+        }
+
+
+class _MeteredTransport(httpx.AsyncBaseTransport):
+    """Transport wrapper recording request and connection metrics."""
+
+    def __init__(self, inner: httpx.AsyncBaseTransport, stats: _HostStats):
+        self._inner = inner
+        self._stats = stats
+
+    async def _trace(self, event_name: str, info: Dict[str, Any]) -> None:
+        if event_name == "connection.connect_tcp.complete":
+            self._stats.connections_opened += 1
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        stats = self._stats
+        stats.requests += 1
+        stats.in_flight += 1
+        request.extensions["trace"] = self._trace
+        try:
+            return await self._inner.handle_async_request(request)
+        except Exception:
+            stats.errors += 1
+            raise
+        finally:
+            stats.in_flight -= 1
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
+
+
+class HTTPClientRegistry:
+    """
+    Shared HTTP client pool.
+
+    Every service talking to the same host (Ollama, OpenAI, ...) gets the
+    same ``httpx.AsyncClient``, so keep-alive connections are reused across
+    services instead of each service holding its own pool. Limits can be
+    set per host; HTTP/2 is enabled when the ``h2`` package is installed
+    (it only takes effect on TLS hosts).
+
+    Each host's pool is split into ``shards`` clients used round-robin,
+    with the host limits divided between them. httpcore assigns requests
+    to connections by scanning its pool, which gets slow when one pool
+    serves many concurrent requests; a few smaller pools avoid that.
+
+    Connection churn is measured with httpcore's trace extension: every
+    new TCP connection increments ``connections_opened`` for its host, so
+    ``requests_per_connection`` shows how well keep-alive is working.
+    """
+
+    def __init__(
+        self,
+        max_connections: Optional[int] = None,
+        max_keepalive_connections: Optional[int] = None,
+        keepalive_expiry: Optional[float] = None,
+        http2: Optional[bool] = None,
+        shards: Optional[int] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        """
+        Initialize the registry.
+
+        Args:
+            max_connections: Default per-host connection limit
+            max_keepalive_connections: Default per-host idle connection limit
+            keepalive_expiry: Seconds an idle connection is kept open
+            http2: Enable HTTP/2 (requires h2)
+            shards: Connection pools per host; the host limits are split across them
+            transport: Custom transport for every client (testing)
+        """
+        settings = get_settings()
+        self.default_limits = httpx.Limits(
+            max_connections=max_connections or settings.http_max_connections,
+            max_keepalive_connections=(
+                max_keepalive_connections or settings.http_max_keepalive_connections
+            ),
+            keepalive_expiry=(
+                keepalive_expiry if keepalive_expiry is not None
+                else settings.http_keepalive_expiry
+            ),
+        )
+        self.http2 = (settings.http_http2 if http2 is None else http2) and HTTP2_AVAILABLE
+        self.shards = max(1, shards or settings.http_pool_shards)
+        self._transport = transport
+        self._host_limits: Dict[str, httpx.Limits] = {}
+        self._clients: Dict[Tuple[str, asyncio.AbstractEventLoop], List[httpx.AsyncClient]] = {}
+        self._next = itertools.count()
+        self._stats: Dict[str, _HostStats] = {}
+
+    @staticmethod
+    def origin(url: str) -> str:
+        """Normalize a URL to its scheme://host:port origin."""
+        parts = urlsplit(url)
+        return f"{parts.scheme}://{parts.netloc}"
+
+    def configure_host(self, url: str, limits: httpx.Limits) -> None:
+        """
+        Set connection limits for one host.
+
+        Takes effect for clients created after the call.
+
+        Args:
+            url: Any URL on the host
+            limits: Connection limits for that host
+        """
+        self._host_limits[self.origin(url)] = limits
+
+    def get_client(self, url: str) -> httpx.AsyncClient:
+        """
+        Get a shared client for a host, creating the host's pool on first use.
+
+        Clients are bound to the running event loop, so a new one is made
+        if the registry is used from another loop (e.g. separate test runs).
+
+        Args:
+            url: Any URL on the host
+
+        Returns:
+            Pooled async client
+        """
+        origin = self.origin(url)
+        loop = asyncio.get_running_loop()
+        shards = self._clients.get((origin, loop))
+        if shards is None or shards[0].is_closed:
+            # Forget clients left behind by event loops that have shut down
+            for key in [key for key in self._clients if key[1].is_closed()]:
+                del self._clients[key]
+
+            shards = self._create_shards(origin)
+            self._clients[(origin, loop)] = shards
+        return shards[next(self._next) % len(shards)]
+
+    def _create_shards(self, origin: str) -> List[httpx.AsyncClient]:
+        """Create the clients for one host, splitting its limits evenly."""
+        stats = self._stats.setdefault(origin, _HostStats())
+        limits = self._host_limits.get(origin, self.default_limits)
+        shard_limits = httpx.Limits(
+            max_connections=(
+                math.ceil(limits.max_connections / self.shards)
+                if limits.max_connections else None
+            ),
+            max_keepalive_connections=(
+                math.ceil(limits.max_keepalive_connections / self.shards)
+                if limits.max_keepalive_connections else None
+            ),
+            keepalive_expiry=limits.keepalive_expiry,
+        )
+
+        shards = []
+        for _ in range(1 if self._transport else self.shards):
+            inner = self._transport or httpx.AsyncHTTPTransport(
+                limits=shard_limits,
+                http2=self.http2,
+            )
+            shards.append(httpx.AsyncClient(
+                transport=_MeteredTransport(inner, stats),
+                timeout=httpx.Timeout(60.0),
+            ))
+        return shards
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get per-host connection metrics."""
+        return {
+            "http2": self.http2,
+            "hosts": {origin: stats.as_dict() for origin, stats in self._stats.items()},
+        }
+
+    async def aclose(self) -> None:
+        """Close every pooled client bound to the running loop."""
+        loop = asyncio.get_running_loop()
+        for key in [key for key in self._clients if key[1] is loop]:
+            for client in self._clients.pop(key):
+                await client.aclose()
+
+
+# Global registry instance
+_http_registry: Optional[HTTPClientRegistry] = None
+
+
+def get_http_registry() -> HTTPClientRegistry:
+    """Get the process-wide HTTP client registry."""
+    global _http_registry
+    if _http_registry is None:
+        _http_registry = HTTPClientRegistry()
+    return _http_registry
@@ -0,0 +1,422 @@
+"""
+DevTeam6 Local AI - Incremental Ingestion
+
+Content-addressed chunk ids and a per-source manifest, so re-ingesting a
+repository embeds only the chunks that changed.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+from dataclasses import dataclass, field
+from pathlib import Path
+import asyncio
+import hashlib
+import time
+
+from utils.chunking import TextChunk, chunk_file, iter_chunks
+from .embedding_service import EmbeddingService
+from .shared_state import SharedState, get_shared_state
+from .vector_store import AsyncVectorStore, VectorStore
+
+
+def content_hash(content: str) -> str:
+    """SHA-256 hex digest of chunk content."""
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def file_hash(path: Union[str, Path], block_size: int = 1 << 20) -> str:
+    """SHA-256 hex digest of a file, read in blocks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def chunk_id(source: str, chunk_hash: str, occurrence: int = 0) -> str:
+    """
+    Deterministic vector store id for a chunk.
+
+    The same content in the same source always maps to the same id, so an
+    unchanged chunk is recognised without embedding it again. Repeated
+    identical chunks within one source are told apart by ``occurrence``.
+
+    Args:
+        source: Source the chunk belongs to (e.g. a file path)
+        chunk_hash: content_hash of the chunk
+        occurrence: How many identical chunks precede it in the source
+
+    Returns:
+        32 hex characters
+    """
+    key = f"{source}\0{chunk_hash}\0{occurrence}"
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:32]
+
+
+class ChunkManifest:
+    """
+    Per-source record of indexed chunks, kept in the shared SQLite store.
+
+    Stores each source's content hash (to skip unchanged files without
+    chunking them) and the id and content hash of every chunk it produced
+    (to diff a changed file against what is already embedded).
+
+    Entries are keyed by collection as well as source, so manifests of
+    several collections can share one store: the same file indexed into
+    two collections is tracked (and pruned) separately in each.
+    """
+
+    _SCHEMA = """
+    CREATE TABLE IF NOT EXISTS ingest_sources (
+        collection TEXT NOT NULL,
+        source TEXT NOT NULL,
+        content_hash TEXT NOT NULL,
+        chunk_count INTEGER NOT NULL,
+        indexed_at REAL NOT NULL,
+        PRIMARY KEY (collection, source)
+    );
+    CREATE TABLE IF NOT EXISTS ingest_chunks (
+        collection TEXT NOT NULL,
+        source TEXT NOT NULL,
+        chunk_id TEXT NOT NULL,
+        content_hash TEXT NOT NULL,
+        PRIMARY KEY (collection, source, chunk_id)
+    );
+    """
+
+    def __init__(self, state: SharedState, collection: str):
+        """
+        Initialize the manifest.
+
+        Args:
+            state: Shared state store holding the manifest tables
+            collection: Vector store collection the manifest describes
+        """
+        self.state = state
+        self.collection = collection
+        with state.transaction() as conn:
+            for statement in self._SCHEMA.split(";"):
+                if statement.strip():
+                    conn.execute(statement)
+
+    def source_hash(self, source: str) -> Optional[str]:
+        """Get the content hash a source was last indexed with."""
+        rows = self.state.execute(
+            "SELECT content_hash FROM ingest_sources WHERE collection = ? AND source = ?",
+            (self.collection, source),
+        )
+        return rows[0]["content_hash"] if rows else None
+
+    def chunks(self, source: str) -> Dict[str, str]:
+        """Get chunk id -> content hash for a source."""
+        rows = self.state.execute(
+            "SELECT chunk_id, content_hash FROM ingest_chunks WHERE collection = ? AND source = ?",
+            (self.collection, source),
+        )
+        return {row["chunk_id"]: row["content_hash"] for row in rows}
+
+    def sources(self) -> List[str]:
+        """Get every indexed source."""
+        rows = self.state.execute(
+            "SELECT source FROM ingest_sources WHERE collection = ?", (self.collection,)
+        )
+        return [row["source"] for row in rows]
+
+    def record(
+        self,
+        source: str,
+        source_hash: str,
+        added: Dict[str, str],
+        removed: Iterable[str],
+    ) -> None:
+        """
+        Apply an indexing diff to a source's entry.
+
+        Args:
+            source: Source name
+            source_hash: New content hash of the source
+            added: Chunk id -> content hash of newly indexed chunks
+            removed: Ids of chunks deleted from the vector store
+        """
+        with self.state.transaction() as conn:
+            conn.executemany(
+                "DELETE FROM ingest_chunks WHERE collection = ? AND source = ? AND chunk_id = ?",
+                [(self.collection, source, doc_id) for doc_id in removed],
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO ingest_chunks VALUES (?, ?, ?, ?)",
+                [(self.collection, source, doc_id, h) for doc_id, h in added.items()],
+            )
+            count = conn.execute(
+                "SELECT COUNT(*) FROM ingest_chunks WHERE collection = ? AND source = ?",
+                (self.collection, source),
+            ).fetchone()[0]
+            conn.execute(
+                "INSERT OR REPLACE INTO ingest_sources VALUES (?, ?, ?, ?, ?)",
+                (self.collection, source, source_hash, count, time.time()),
+            )
+
+    def forget(self, source: str) -> None:
+        """Remove a source and its chunks from the manifest."""
+        with self.state.transaction() as conn:
+            key = (self.collection, source)
+            conn.execute("DELETE FROM ingest_chunks WHERE collection = ? AND source = ?", key)
+            conn.execute("DELETE FROM ingest_sources WHERE collection = ? AND source = ?", key)
+
+
+@dataclass
+class ReindexResult:
+    """What a reindex changed for one source."""
+
+    source: str
+    added: int = 0
+    removed: int = 0
+    unchanged: int = 0
+    skipped: bool = False  # Source hash matched; not even chunked
+
+    @property
+    def embedded(self) -> int:
+        """Number of chunks sent to the embedding model."""
+        return self.added
+
+
+@dataclass
+class ReindexReport:
+    """Totals over a reindex of many sources."""
+
+    results: List[ReindexResult] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    def total(self, name: str) -> int:
+        """Sum one ReindexResult field over all sources."""
+        return sum(int(getattr(r, name)) for r in self.results)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Summarise the report."""
+        return {
+            "sources": len(self.results),
+            "skipped": self.total("skipped"),
+            "added": self.total("added"),
+            "removed": self.total("removed"),
+            "unchanged": self.total("unchanged"),
+            "elapsed": self.elapsed,
+        }
+
+
+class IncrementalIndexer:
+    """
+    Diff-based (re)indexing of sources into the vector store.
+
+    For each source the new chunks are hashed and compared with the
+    manifest: only chunks with new content are embedded and added, chunks
+    that disappeared are deleted with ``VectorStore.delete``, and
+    unchanged chunks only get their position metadata refreshed. Sources
+    whose content hash is unchanged are skipped before chunking.
+
+    Usage::
+
+        indexer = IncrementalIndexer(vector_store=VectorStore(collection_name="docs"))
+        report = await indexer.reindex_paths(Path("docs").rglob("*.md"))
+    """
+
+    def __init__(
+        self,
+        embedding_service: Optional[EmbeddingService] = None,
+        vector_store: Optional[Union[VectorStore, AsyncVectorStore]] = None,
+        manifest: Optional[ChunkManifest] = None,
+        embed_batch_size: int = 64,
+        **chunk_options: Any,
+    ):
+        """
+        Initialize the indexer.
+
+        Args:
+            embedding_service: Embedding service for new chunks
+            vector_store: Vector store (wrapped in AsyncVectorStore)
+            manifest: Chunk manifest (defaults to the vector store
+                collection's manifest in the process-wide store from
+                get_shared_state())
+            embed_batch_size: Chunks embedded per embed_batch call
+            **chunk_options: Passed to iter_chunks (max_tokens, strategy, ...)
+        """
+        self.embedding_service = embedding_service or EmbeddingService()
+        self.vector_store = AsyncVectorStore.wrap(vector_store or VectorStore())
+        self.manifest = manifest or ChunkManifest(
+            get_shared_state(), self.vector_store.store.collection_name
+        )
+        self.embed_batch_size = embed_batch_size
+        self.chunk_options = chunk_options
+
+    async def reindex_chunks(
+        self,
+        source: str,
+        chunks: Iterable[TextChunk],
+        source_hash: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> ReindexResult:
+        """
+        Bring one source's chunks in the vector store up to date.
+
+        Args:
+            source: Source name (stored as ``source`` metadata)
+            chunks: The source's current chunks
+            source_hash: Hash of the whole source; skips work if unchanged
+            metadata: Extra metadata stored on every new chunk
+
+        Returns:
+            ReindexResult for the source
+        """
+        if source_hash is not None and self.manifest.source_hash(source) == source_hash:
+            return ReindexResult(source=source, skipped=True)
+
+        known = self.manifest.chunks(source)
+        seen: Dict[str, int] = {}
+        new: List[Tuple[str, str, TextChunk]] = []
+        kept: List[Tuple[str, TextChunk]] = []
+        current = set()
+        for chunk in chunks:
+            h = content_hash(chunk.content)
+            occurrence = seen[h] = seen.get(h, -1) + 1
+            doc_id = chunk_id(source, h, occurrence)
+            current.add(doc_id)
+            if doc_id in known:
+                kept.append((doc_id, chunk))
+            else:
+                new.append((doc_id, h, chunk))
+        removed = [doc_id for doc_id in known if doc_id not in current]
+
+        for i in range(0, len(new), self.embed_batch_size):
+            batch = new[i:i + self.embed_batch_size]
+            embeddings = await self.embedding_service.embed_batch([c.content for _, _, c in batch])
+            await self.vector_store.add_batch(
+                contents=[c.content for _, _, c in batch],
+                embeddings=embeddings,
+                metadatas=[self._metadata(source, h, c, metadata) for _, h, c in batch],
+                ids=[doc_id for doc_id, _, _ in batch],
+            )
+        if removed:
+            await self.vector_store.delete(removed)
+        if kept and (new or removed):
+            # Earlier edits shift the offsets of unchanged chunks; concurrent
+            # updates are micro-batched into one Chroma call
+            await asyncio.gather(*(
+                self.vector_store.update(
+                    doc_id, metadata=self._metadata(source, known[doc_id], chunk, metadata)
+                )
+                for doc_id, chunk in kept
+            ))
+
+        self.manifest.record(
+            source,
+            source_hash or "",
+            {doc_id: h for doc_id, h, _ in new},
+            removed,
+        )
+        return ReindexResult(source=source, added=len(new), removed=len(removed), unchanged=len(kept))
+
+    @staticmethod
+    def _metadata(
+        source: str,
+        chunk_hash: str,
+        chunk: TextChunk,
+        extra: Optional[Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        metadata = {
+            **(extra or {}),
+            **{k: v for k, v in chunk.metadata.items() if v is not None},
+            "source": source,
+            "content_hash": chunk_hash,
+            "start_char": chunk.start_char,
+            "end_char": chunk.end_char,
+        }
+        metadata["content_length"] = len(chunk.content)
+        return metadata
+
+    async def reindex_text(
+        self,
+        source: str,
+        text: str,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> ReindexResult:
+        """
+        Reindex a source given as a string.
+
+        Args:
+            source: Source name
+            text: Full source text
+            metadata: Extra metadata stored on every new chunk
+
+        Returns:
+            ReindexResult for the source
+        """
+        return await self.reindex_chunks(
+            source,
+            iter_chunks(text, **self.chunk_options),
+            source_hash=content_hash(text),
+            metadata=metadata,
+        )
+
+    async def reindex_file(
+        self,
+        path: Union[str, Path],
+        source: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> ReindexResult:
+        """
+        Reindex one file, streaming its chunks.
+
+        Args:
+            path: File to index
+            source: Source name (default: the path)
+            metadata: Extra metadata stored on every new chunk
+
+        Returns:
+            ReindexResult for the file
+        """
+        return await self.reindex_chunks(
+            source or str(path),
+            chunk_file(path, **self.chunk_options),
+            source_hash=file_hash(path),
+            metadata=metadata,
+        )
+
+    async def remove_source(self, source: str) -> int:
+        """
+        Delete every chunk of a source.
+
+        Returns:
+            Number of chunks deleted
+        """
+        doc_ids = list(self.manifest.chunks(source))
+        if doc_ids:
+            await self.vector_store.delete(doc_ids)
+        self.manifest.forget(source)
+        return len(doc_ids)
+
+    async def reindex_paths(
+        self,
+        paths: Iterable[Union[str, Path]],
+        prune: bool = False,
+    ) -> ReindexReport:
+        """
+        Reindex many files.
+
+        Args:
+            paths: Files to index (source name = path)
+            prune: Also remove indexed sources not among ``paths``
+
+        Returns:
+            ReindexReport with per-file results
+        """
+        start = time.perf_counter()
+        report = ReindexReport()
+        seen = set()
+        for path in paths:
+            seen.add(str(path))
+            report.results.append(await self.reindex_file(path))
+        if prune:
+            for source in self.manifest.sources():
+                if source not in seen:
+                    removed = await self.remove_source(source)
+                    report.results.append(ReindexResult(source=source, removed=removed))
+        report.elapsed = time.perf_counter() - start
+        return report
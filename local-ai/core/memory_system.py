@@ -13,8 +13,10 @@ from pathlib import Path
 
 from config.settings import get_settings
 from .embedding_service import EmbeddingService
-from .vector_store import VectorStore, SearchResult
+from .vector_store import VectorStore, AsyncVectorStore, SearchResult
 from .rag_pipeline import RAGPipeline
+from .http_pool import HTTPClientRegistry
+from .shared_state import SharedState, get_shared_state
 
 
 @dataclass
@@ -30,6 +32,158 @@ class MemoryEntry:
     access_count: int
 
 
+class MemoryIndex:
+    """
+    Memory entry index kept in the shared SQLite store.
+
+    Replaces the per-process dict so every API worker sees the same
+    entries and access counters. Counter updates are single UPDATE
+    statements, so concurrent accesses from different workers are not lost.
+    Rows are keyed by collection, so memory systems over different
+    collections can share one store without seeing each other's entries.
+    """
+
+    _SCHEMA = """
+    CREATE TABLE IF NOT EXISTS memory_index (
+        collection TEXT NOT NULL,
+        id TEXT NOT NULL,
+        content TEXT NOT NULL,
+        category TEXT NOT NULL,
+        metadata TEXT NOT NULL,
+        created_at TEXT NOT NULL,
+        accessed_at TEXT NOT NULL,
+        access_count INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (collection, id)
+    );
+    CREATE INDEX IF NOT EXISTS memory_index_category ON memory_index (collection, category);
+    """
+
+    def __init__(self, state: SharedState, collection: str):
+        """
+        Initialize the index.
+
+        Args:
+            state: Shared state store holding the index table
+            collection: Vector store collection the entries belong to
+        """
+        self.state = state
+        self.collection = collection
+        with state.transaction() as conn:
+            for statement in self._SCHEMA.split(";"):
+                if statement.strip():
+                    conn.execute(statement)
+
+    @staticmethod
+    def _entry(row) -> MemoryEntry:
+        return MemoryEntry(
+            id=row["id"],
+            content=row["content"],
+            category=row["category"],
+            metadata=json.loads(row["metadata"]),
+            created_at=row["created_at"],
+            accessed_at=row["accessed_at"],
+            access_count=row["access_count"],
+        )
+
+    def __len__(self) -> int:
+        return self.state.execute(
+            "SELECT COUNT(*) FROM memory_index WHERE collection = ?", (self.collection,)
+        )[0][0]
+
+    def __contains__(self, doc_id: str) -> bool:
+        return bool(self.state.execute(
+            "SELECT 1 FROM memory_index WHERE collection = ? AND id = ?",
+            (self.collection, doc_id),
+        ))
+
+    def get(self, doc_id: str) -> Optional[MemoryEntry]:
+        """Get one entry."""
+        rows = self.state.execute(
+            "SELECT * FROM memory_index WHERE collection = ? AND id = ?",
+            (self.collection, doc_id),
+        )
+        return self._entry(rows[0]) if rows else None
+
+    def put(self, entry: MemoryEntry) -> None:
+        """Insert or replace an entry."""
+        self.state.execute(
+            "INSERT OR REPLACE INTO memory_index VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                self.collection,
+                entry.id,
+                entry.content,
+                entry.category,
+                json.dumps(entry.metadata),
+                entry.created_at,
+                entry.accessed_at,
+                entry.access_count,
+            ),
+        )
+
+    def remove(self, doc_ids: List[str]) -> None:
+        """Remove entries (missing ids are ignored)."""
+        with self.state.transaction() as conn:
+            conn.executemany(
+                "DELETE FROM memory_index WHERE collection = ? AND id = ?",
+                [(self.collection, doc_id) for doc_id in doc_ids],
+            )
+
+    def touch(self, doc_id: str, accessed_at: str) -> Optional[MemoryEntry]:
+        """
+        Record an access atomically.
+
+        Args:
+            doc_id: Entry ID
+            accessed_at: Access timestamp
+
+        Returns:
+            The updated entry, or None if it is not indexed
+        """
+        rows = self.state.execute(
+            "UPDATE memory_index SET accessed_at = ?, access_count = access_count + 1 "
+            "WHERE collection = ? AND id = ? RETURNING *",
+            (accessed_at, self.collection, doc_id),
+        )
+        return self._entry(rows[0]) if rows else None
+
+    def stale(
+        self,
+        cutoff: str,
+        max_access_count: int,
+        category: Optional[str] = None,
+    ) -> List[str]:
+        """Get IDs created before ``cutoff`` with at most ``max_access_count`` accesses."""
+        sql = (
+            "SELECT id FROM memory_index "
+            "WHERE collection = ? AND created_at < ? AND access_count <= ?"
+        )
+        params: tuple = (self.collection, cutoff, max_access_count)
+        if category:
+            sql += " AND category = ?"
+            params += (category,)
+        return [row["id"] for row in self.state.execute(sql, params)]
+
+    def values(self) -> List[MemoryEntry]:
+        """Get all entries."""
+        rows = self.state.execute(
+            "SELECT * FROM memory_index WHERE collection = ?", (self.collection,)
+        )
+        return [self._entry(row) for row in rows]
+
+    def summary(self) -> Dict[str, Any]:
+        """Get per-category counts and the total access count."""
+        rows = self.state.execute(
+            "SELECT category, COUNT(*) AS n, SUM(access_count) AS accesses "
+            "FROM memory_index WHERE collection = ? GROUP BY category",
+            (self.collection,),
+        )
+        return {
+            "categories": {row["category"]: row["n"] for row in rows},
+            "total_accesses": sum(row["accesses"] for row in rows),
+            "index_size": sum(row["n"] for row in rows),
+        }
+
+
 class MemorySystem:
     """
     Main AI memory manager.
@@ -45,6 +199,9 @@ class MemorySystem:
         self,
         collection_name: Optional[str] = None,
         persist_directory: Optional[str] = None,
+        embedding_service: Optional[EmbeddingService] = None,
+        http_registry: Optional[HTTPClientRegistry] = None,
+        shared_state: Optional[SharedState] = None,
     ):
         """
         Initialize the memory system.
@@ -52,29 +209,44 @@ class MemorySystem:
         Args:
             collection_name: ChromaDB collection name
             persist_directory: Directory for persistent storage
+            embedding_service: Shared embedding service
+            http_registry: Shared HTTP client pool
+            shared_state: Store for the memory index, scoped to the
+                collection (defaults to the process-wide store from
+                get_shared_state())
         """
         self.settings = get_settings()
-        self.embedding_service = EmbeddingService()
-        self.vector_store = VectorStore(
+        self.embedding_service = embedding_service or EmbeddingService(
+            http_registry=http_registry,
+        )
+        self.vector_store = AsyncVectorStore(VectorStore(
             collection_name=collection_name,
             persist_directory=persist_directory,
-        )
+        ))
         self.rag_pipeline = RAGPipeline(
             embedding_service=self.embedding_service,
             vector_store=self.vector_store,
+            http_registry=http_registry,
+        )
+        self._memory_index = MemoryIndex(
+            shared_state or get_shared_state(), self.vector_store.store.collection_name
         )
-        self._memory_index: Dict[str, MemoryEntry] = {}
 
     async def close(self) -> None:
         """Close all resources."""
         await self.embedding_service.close()
         await self.rag_pipeline.close()
+        await self.vector_store.aclose()
 
     @property
     def count(self) -> int:
-        """Get total number of memories."""
+        """Get total number of memories (blocks; use get_count in async code)."""
         return self.vector_store.count
 
+    async def get_count(self) -> int:
+        """Get total number of memories on the vector store's thread pool."""
+        return await self.vector_store.get_count()
+
     async def store(
         self,
         content: str,
@@ -102,7 +274,7 @@ class MemorySystem:
 
         # Generate embedding and store
         embedding = await self.embedding_service.embed(content)
-        doc_id = self.vector_store.add(
+        doc_id = await self.vector_store.add(
             content=content,
             embedding=embedding,
             metadata=metadata,
@@ -110,7 +282,7 @@ class MemorySystem:
         )
 
         # Update index
-        self._memory_index[doc_id] = MemoryEntry(
+        self._memory_index.put(MemoryEntry(
             id=doc_id,
             content=content,
             category=category,
@@ -118,7 +290,7 @@ class MemorySystem:
             created_at=metadata["created_at"],
             accessed_at=metadata["accessed_at"],
             access_count=0,
-        )
+        ))
 
         return doc_id
 
@@ -148,7 +320,7 @@ class MemorySystem:
         query_embedding = await self.embedding_service.embed(query)
 
         # Search
-        results = self.vector_store.query(
+        results = await self.vector_store.query(
             embedding=query_embedding,
             top_k=top_k,
             where=where,
@@ -157,9 +329,8 @@ class MemorySystem:
         # Filter by threshold
         results = [r for r in results if r.score >= score_threshold]
 
-        # Update access stats
-        for result in results:
-            await self._update_access(result.id)
+        # Update access stats (concurrent updates share one write batch)
+        await asyncio.gather(*(self._update_access(r.id) for r in results))
 
         return results
 
@@ -195,9 +366,8 @@ class MemorySystem:
         Args:
             doc_ids: List of document IDs to remove
         """
-        self.vector_store.delete(doc_ids)
-        for doc_id in doc_ids:
-            self._memory_index.pop(doc_id, None)
+        await self.vector_store.delete(doc_ids)
+        self._memory_index.remove(doc_ids)
 
     async def consolidate(
         self,
@@ -219,28 +389,19 @@ class MemorySystem:
         from datetime import timedelta
 
         cutoff = datetime.utcnow() - timedelta(days=max_age_days)
-        to_remove = []
-
-        for doc_id, entry in self._memory_index.items():
-            if category and entry.category != category:
-                continue
-
-            created = datetime.fromisoformat(entry.created_at)
-            if created < cutoff and entry.access_count <= min_access_count:
-                to_remove.append(doc_id)
+        to_remove = self._memory_index.stale(
+            cutoff.isoformat(), min_access_count, category
+        )
 
         await self.forget(to_remove)
         return len(to_remove)
 
     async def _update_access(self, doc_id: str) -> None:
         """Update access statistics for a memory."""
-        if doc_id in self._memory_index:
-            entry = self._memory_index[doc_id]
-            entry.accessed_at = datetime.utcnow().isoformat()
-            entry.access_count += 1
-
+        entry = self._memory_index.touch(doc_id, datetime.utcnow().isoformat())
+        if entry is not None:
             # Update in vector store
-            self.vector_store.update(
+            await self.vector_store.update(
                 doc_id=doc_id,
                 metadata={
                     **entry.metadata,
@@ -258,7 +419,7 @@ class MemorySystem:
         """
         export_data = {
             "exported_at": datetime.utcnow().isoformat(),
-            "count": self.count,
+            "count": await self.get_count(),
             "memories": [
                 {
                     "id": entry.id,
@@ -275,16 +436,7 @@ class MemorySystem:
 
     def get_stats(self) -> Dict[str, Any]:
         """Get memory system statistics."""
-        categories: Dict[str, int] = {}
-        total_accesses = 0
-
-        for entry in self._memory_index.values():
-            categories[entry.category] = categories.get(entry.category, 0) + 1
-            total_accesses += entry.access_count
-
         return {
             "total_memories": self.count,
-            "categories": categories,
-            "total_accesses": total_accesses,
-            "index_size": len(self._memory_index),
+            **self._memory_index.summary(),
         }
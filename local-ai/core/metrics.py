@@ -0,0 +1,433 @@
+"""
+DevTeam6 Local AI - Metrics
+
+Latency histograms, counters and gauges exposed in Prometheus text format.
+"""
+
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+from bisect import bisect_left
+import math
+import time
+
+
+# Latency buckets in seconds, from sub-millisecond cache hits to slow LLM calls
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+    0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+
+Sample = Tuple[Dict[str, str], float]
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    parts = []
+    for name, value in labels.items():
+        value = str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        parts.append(f'{name}="{value}"')
+    return "{" + ",".join(parts) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, int) or value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+class _Metric:
+    """Base for labelled metric families."""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], Any] = {}
+
+    def _new_child(self) -> Any:
+        raise NotImplementedError
+
+    def labels(self, *values: str) -> Any:
+        """
+        Get the child for one label combination.
+
+        Children are cached, so hot paths can look one up once and keep it.
+        """
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}")
+            child = self._children[values] = self._new_child()
+        return child
+
+    def _label_dict(self, values: Tuple[str, ...]) -> Dict[str, str]:
+        return dict(zip(self.labelnames, values))
+
+    def samples(self) -> Iterable[Tuple[str, Dict[str, str], float]]:
+        raise NotImplementedError
+
+
+class _CounterChild:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+
+class Counter(_Metric):
+    """Monotonically increasing count."""
+
+    kind = "counter"
+
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Increment the unlabelled counter."""
+        self.labels().inc(amount)
+
+    def samples(self):
+        for values, child in self._children.items():
+            yield self.name, self._label_dict(values), child.value
+
+
+class _GaugeChild:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+
+class Gauge(_Metric):
+    """Value that can go up and down (e.g. requests in flight)."""
+
+    kind = "gauge"
+
+    def _new_child(self) -> _GaugeChild:
+        return _GaugeChild()
+
+    def set(self, value: float) -> None:
+        """Set the unlabelled gauge."""
+        self.labels().set(value)
+
+    def samples(self):
+        for values, child in self._children.items():
+            yield self.name, self._label_dict(values), child.value
+
+
+class _HistogramChild:
+    __slots__ = ("bounds", "counts", "sum")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        # Per-bucket counts; made cumulative only when rendering
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+
+class Histogram(_Metric):
+    """Distribution of observed values over fixed buckets."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        """Record a value in the unlabelled histogram."""
+        self.labels().observe(value)
+
+    def samples(self):
+        for values, child in self._children.items():
+            labels = self._label_dict(values)
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), child.counts):
+                cumulative += count
+                yield f"{self.name}_bucket", {**labels, "le": _format_value(bound)}, cumulative
+            yield f"{self.name}_sum", labels, child.sum
+            yield f"{self.name}_count", labels, cumulative
+
+
+class _StageTimer:
+    """
+    Context manager timing one pipeline stage.
+
+    ``stop()`` may be called early (e.g. on the first streamed token);
+    leaving the block then records nothing more. Without
+    ``record_on_exit``, only ``stop()`` records a duration.
+    """
+
+    __slots__ = ("_histogram", "_in_flight", "_start", "_record_on_exit")
+
+    def __init__(
+        self,
+        histogram: _HistogramChild,
+        in_flight: _GaugeChild,
+        record_on_exit: bool = True,
+    ):
+        self._histogram = histogram
+        self._in_flight = in_flight
+        self._start: Optional[float] = None
+        self._record_on_exit = record_on_exit
+
+    def __enter__(self) -> "_StageTimer":
+        self._in_flight.value += 1
+        self._start = time.perf_counter()
+        return self
+
+    def stop(self) -> None:
+        """Record the stage duration now."""
+        if self._start is not None:
+            self._histogram.observe(time.perf_counter() - self._start)
+            self._in_flight.value -= 1
+            self._start = None
+
+    def __exit__(self, *exc) -> None:
+        if self._record_on_exit:
+            self.stop()
+        elif self._start is not None:
+            self._in_flight.value -= 1
+            self._start = None
+
+
+class MetricsRegistry:
+    """
+    Collection of metrics rendered together at ``/metrics``.
+
+    Recording is plain attribute arithmetic on pre-resolved children, with
+    no locks: metrics are updated from the event loop thread. Values that
+    already live elsewhere (cache counters, memory count) are read only at
+    scrape time through collectors, so they cost nothing on the request path.
+    """
+
+    def __init__(self, namespace: str = "devteam6"):
+        """
+        Initialize the registry.
+
+        Args:
+            namespace: Prefix for the built-in metric names
+        """
+        self.namespace = namespace
+        self._metrics: List[_Metric] = []
+        self._collectors: List[Tuple[str, str, str, Callable[[], Iterable[Sample]]]] = []
+        self._caches: Dict[str, Callable[[], Tuple[float, float]]] = {}
+        self._stage_timers: Dict[str, Tuple[_HistogramChild, _GaugeChild]] = {}
+
+        self.stage_seconds = self.histogram(
+            f"{namespace}_stage_duration_seconds",
+            "Latency of pipeline stages (embed, vector_search, prompt_build, llm_ttft, llm_total)",
+            ["stage"],
+        )
+        self.stage_in_flight = self.gauge(
+            f"{namespace}_stage_in_flight",
+            "Pipeline stage executions currently running",
+            ["stage"],
+        )
+        self.request_seconds = self.histogram(
+            f"{namespace}_http_request_duration_seconds",
+            "Latency of API requests by route",
+            ["method", "route", "status"],
+        )
+        self.requests_in_flight = self.gauge(
+            f"{namespace}_http_requests_in_flight",
+            "API requests currently being handled",
+        )
+
+    def _register(self, metric: _Metric) -> Any:
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        """Create and register a counter."""
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        """Create and register a gauge."""
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        """Create and register a histogram."""
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def stage(self, name: str, record_on_exit: bool = True) -> _StageTimer:
+        """
+        Time a pipeline stage.
+
+        Usage::
+
+            with metrics.stage("embed"):
+                embedding = await ...
+
+        Args:
+            name: Stage name (label value)
+            record_on_exit: Record the duration when the block ends; if
+                False, only an explicit ``stop()`` records one (e.g. time
+                to first token, when no token may arrive)
+
+        Returns:
+            Context manager recording duration and in-flight count
+        """
+        children = self._stage_timers.get(name)
+        if children is None:
+            children = self._stage_timers[name] = (
+                self.stage_seconds.labels(name),
+                self.stage_in_flight.labels(name),
+            )
+        return _StageTimer(*children, record_on_exit)
+
+    def register_collector(
+        self,
+        name: str,
+        kind: str,
+        documentation: str,
+        collect: Callable[[], Iterable[Sample]],
+    ) -> None:
+        """
+        Register a metric whose samples are read at scrape time.
+
+        Args:
+            name: Metric name
+            kind: Prometheus type ("gauge" or "counter")
+            documentation: Help text
+            collect: Returns (labels, value) pairs
+        """
+        self._collectors = [c for c in self._collectors if c[0] != name]
+        self._collectors.append((name, kind, documentation, collect))
+
+    def register_cache(self, cache: str, stats: Callable[[], Tuple[float, float]]) -> None:
+        """
+        Expose hit/lookup counts and hit ratio for a cache.
+
+        Args:
+            cache: Cache name (label value)
+            stats: Returns (hits, lookups)
+        """
+        self._caches[cache] = stats
+
+    def _cache_samples(self) -> List[Tuple[str, str, str, List[Sample]]]:
+        hits: List[Sample] = []
+        lookups: List[Sample] = []
+        ratios: List[Sample] = []
+        for cache, stats in self._caches.items():
+            hit, total = stats()
+            labels = {"cache": cache}
+            hits.append((labels, hit))
+            lookups.append((labels, total))
+            ratios.append((labels, hit / total if total else 0.0))
+        prefix = self.namespace
+        return [
+            (f"{prefix}_cache_hits_total", "counter", "Cache hits", hits),
+            (f"{prefix}_cache_lookups_total", "counter", "Cache lookups", lookups),
+            (f"{prefix}_cache_hit_ratio", "gauge", "Cache hits / lookups", ratios),
+        ]
+
+    def render(self) -> str:
+        """Render every metric in Prometheus text exposition format."""
+        lines: List[str] = []
+
+        def header(name: str, kind: str, documentation: str) -> None:
+            lines.append(f"# HELP {name} {documentation}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        for metric in self._metrics:
+            header(metric.name, metric.kind, metric.documentation)
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+        collected = [(n, k, d, list(c())) for n, k, d, c in self._collectors]
+        if self._caches:
+            collected += self._cache_samples()
+        for name, kind, documentation, samples in collected:
+            header(name, kind, documentation)
+            for labels, value in samples:
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+        return "\n".join(lines) + "\n"
+
+
+# Global registry instance
+_metrics: Optional[MetricsRegistry] = None
+
+
+def get_metrics() -> MetricsRegistry:
+    """Get the process-wide metrics registry."""
+    global _metrics
+    if _metrics is None:
+        _metrics = MetricsRegistry()
+    return _metrics
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording per-route request latency and in-flight count.
+
+    Requests are labelled by route template (``/query``, not the raw path)
+    so the number of series stays bounded; unrouted requests share one
+    ``unmatched`` label.
+    """
+
+    def __init__(self, app: Any, registry: Optional[MetricsRegistry] = None):
+        self.app = app
+        self.registry = registry or get_metrics()
+        self._in_flight = self.registry.requests_in_flight.labels()
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message: Dict[str, Any]) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        self._in_flight.value += 1
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            self._in_flight.value -= 1
+            # The router stores the matched route in the (shared) scope
+            route = getattr(scope.get("route"), "path", "unmatched")
+            self.registry.request_seconds.labels(
+                scope["method"], route, str(status)
+            ).observe(time.perf_counter() - start)
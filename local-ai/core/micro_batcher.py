@@ -0,0 +1,131 @@
+"""
+DevTeam6 Local AI - Micro Batcher
+
+Collects concurrent single-item requests into batched calls.
+"""
+
+from typing import Any, Awaitable, Callable, Dict, Generic, List, Optional, Tuple, TypeVar
+import asyncio
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class MicroBatcher(Generic[T, R]):
+    """
+    Micro-batching scheduler.
+
+    Items submitted by concurrent callers are buffered until either
+    ``max_batch_size`` items are waiting or ``max_wait_ms`` has passed
+    since the first one arrived. The batch is then sent through one call
+    to ``batch_fn`` and each caller receives its own result. If the batch
+    call fails, every caller in that batch receives the exception.
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[List[T]], Awaitable[List[R]]],
+        max_batch_size: int = 32,
+        max_wait_ms: float = 2.0,
+    ):
+        """
+        Initialize the batcher.
+
+        Args:
+            batch_fn: Coroutine mapping a list of items to a list of results
+            max_batch_size: Flush as soon as this many items are queued
+            max_wait_ms: Maximum time the first queued item waits for a flush
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self._pending: List[Tuple[T, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: set = set()
+
+        self.items = 0
+        self.batches = 0
+        self.errors = 0
+
+    async def submit(self, item: T) -> R:
+        """
+        Queue an item and wait for its result.
+
+        Args:
+            item: Item to process
+
+        Returns:
+            Result for this item
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+
+        return await future
+
+    def _flush(self) -> None:
+        """Hand the pending items to a batch task."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+
+        task = asyncio.ensure_future(self._run(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: List[Tuple[T, asyncio.Future]]) -> None:
+        """Execute one batch and scatter results to waiters."""
+        # Skip callers that were cancelled while queued
+        batch = [(item, fut) for item, fut in batch if not fut.done()]
+        if not batch:
+            return
+
+        self.batches += 1
+        self.items += len(batch)
+
+        try:
+            results = await self.batch_fn([item for item, _ in batch])
+            if len(results) != len(batch):
+                raise RuntimeError(
+                    f"Batch returned {len(results)} results for {len(batch)} items"
+                )
+        except Exception as e:
+            self.errors += 1
+            for _, fut in batch:
+                if not fut.done():
+                    fut.set_exception(e)
+            return
+
+        for (_, fut), result in zip(batch, results):
+            if not fut.done():
+                fut.set_result(result)
+
+    async def drain(self) -> None:
+        """Flush queued items and wait for every running batch to finish."""
+        self._flush()
+        while self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get batching counters."""
+        return {
+            "items": self.items,
+            "batches": self.batches,
+            "avg_batch_size": self.items / self.batches if self.batches else 0.0,
+            "errors": self.errors,
+            "pending": len(self._pending),
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000.0,
+        }
@@ -4,14 +4,18 @@ DevTeam6 Local AI - RAG Pipeline
 Retrieval-Augmented Generation pipeline for context-aware responses.
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Union
 from dataclasses import dataclass
+import json
 import httpx
 
 from config.settings import get_settings
 from config.models import RAGConfig
 from .embedding_service import EmbeddingService
-from .vector_store import VectorStore, SearchResult
+from .vector_store import VectorStore, AsyncVectorStore, SearchResult
+from .single_flight import SingleFlight, get_single_flight
+from .http_pool import HTTPClientRegistry, get_http_registry
+from .metrics import get_metrics
 
 
 @dataclass
@@ -32,35 +36,41 @@ class RAGPipeline:
     def __init__(
         self,
         embedding_service: Optional[EmbeddingService] = None,
-        vector_store: Optional[VectorStore] = None,
+        vector_store: Optional[Union[VectorStore, AsyncVectorStore]] = None,
         config: Optional[RAGConfig] = None,
+        single_flight: Optional[SingleFlight] = None,
+        http_registry: Optional[HTTPClientRegistry] = None,
     ):
         """
         Initialize the RAG pipeline.
 
         Args:
             embedding_service: Embedding service for queries
-            vector_store: Vector store for retrieval
+            vector_store: Vector store for retrieval (wrapped in AsyncVectorStore,
+                which the pipeline then owns and closes)
             config: RAG configuration
+            single_flight: Coalescing group for identical concurrent requests
+            http_registry: Shared HTTP client pool
         """
         self.embedding_service = embedding_service or EmbeddingService()
-        self.vector_store = vector_store or VectorStore()
+        self._owns_vector_store = not isinstance(vector_store, AsyncVectorStore)
+        self.vector_store = AsyncVectorStore.wrap(vector_store or VectorStore())
         self.config = config or RAGConfig()
         self.settings = get_settings()
-        self._client: Optional[httpx.AsyncClient] = None
+        self.single_flight = single_flight or get_single_flight()
+        self.http_registry = http_registry or get_http_registry()
+        self.metrics = get_metrics()
+        self.timeout = 120.0
 
-    async def _get_client(self) -> httpx.AsyncClient:
-        """Get or create HTTP client."""
-        if self._client is None:
-            self._client = httpx.AsyncClient(timeout=120.0)
-        return self._client
+    async def _get_client(self, url: str) -> httpx.AsyncClient:
+        """Get the shared HTTP client for a host."""
+        return self.http_registry.get_client(url)
 
     async def close(self) -> None:
         """Close resources."""
-        if self._client:
-            await self._client.aclose()
-            self._client = None
         await self.embedding_service.close()
+        if self._owns_vector_store:
+            await self.vector_store.aclose()
 
     async def retrieve(
         self,
@@ -72,6 +82,8 @@ class RAGPipeline:
         """
         Retrieve relevant documents for a query.
 
+        Concurrent identical retrievals against the same store are coalesced.
+
         Args:
             query: Search query
             top_k: Number of results
@@ -84,11 +96,32 @@ class RAGPipeline:
         top_k = top_k or self.config.top_k
         score_threshold = score_threshold or self.config.score_threshold
 
+        key = (
+            "retrieve",
+            id(self.vector_store),
+            query,
+            top_k,
+            score_threshold,
+            json.dumps(where, sort_keys=True, default=str) if where else None,
+        )
+        return await self.single_flight.do(
+            key,
+            lambda: self._retrieve(query, top_k, score_threshold, where),
+        )
+
+    async def _retrieve(
+        self,
+        query: str,
+        top_k: int,
+        score_threshold: float,
+        where: Optional[Dict[str, Any]],
+    ) -> List[SearchResult]:
+        """Retrieve documents without coalescing."""
         # Generate query embedding
         query_embedding = await self.embedding_service.embed(query)
 
         # Search vector store
-        results = self.vector_store.query(
+        results = await self.vector_store.query(
             embedding=query_embedding,
             top_k=top_k,
             where=where,
@@ -109,6 +142,9 @@ class RAGPipeline:
         """
         Generate a response using RAG.
 
+        Concurrent identical requests share one retrieval and LLM call and
+        receive the same RAGResponse object, which callers must not mutate.
+
         Args:
             query: User query
             context_sources: Optional filter by source category
@@ -118,6 +154,27 @@ class RAGPipeline:
         Returns:
             RAGResponse with answer and sources
         """
+        key = (
+            "generate",
+            id(self),
+            query,
+            tuple(context_sources) if context_sources else None,
+            top_k,
+            system_prompt,
+        )
+        return await self.single_flight.do(
+            key,
+            lambda: self._generate(query, context_sources, top_k, system_prompt),
+        )
+
+    async def _generate(
+        self,
+        query: str,
+        context_sources: Optional[List[str]],
+        top_k: Optional[int],
+        system_prompt: Optional[str],
+    ) -> RAGResponse:
+        """Run retrieval and generation without coalescing."""
         # Build metadata filter
         where = None
         if context_sources:
@@ -126,17 +183,18 @@ class RAGPipeline:
         # Retrieve relevant documents
         sources = await self.retrieve(query, top_k=top_k, where=where)
 
-        # Build context from sources
-        context_parts = []
-        for i, source in enumerate(sources, 1):
-            context_parts.append(f"[{i}] {source.content}")
-        context = "\n\n".join(context_parts)
-
-        # Format prompt
-        prompt = self.config.context_template.format(
-            context=context or "No relevant context found.",
-            question=query,
-        )
+        with self.metrics.stage("prompt_build"):
+            # Build context from sources
+            context_parts = []
+            for i, source in enumerate(sources, 1):
+                context_parts.append(f"[{i}] {source.content}")
+            context = "\n\n".join(context_parts)
+
+            # Format prompt
+            prompt = self.config.context_template.format(
+                context=context or "No relevant context found.",
+                question=query,
+            )
 
         # Generate response
         answer, tokens_used = await self._generate_llm(prompt, system_prompt)
@@ -166,6 +224,9 @@ class RAGPipeline:
         """
         Generate response using LLM.
 
+        The response is streamed so time-to-first-token can be recorded;
+        the chunks are joined into one answer.
+
         Args:
             prompt: User prompt
             system_prompt: System prompt
@@ -173,26 +234,41 @@ class RAGPipeline:
         Returns:
             Tuple of (response text, tokens used)
         """
-        client = await self._get_client()
+        url = f"{self.settings.ollama_host}/api/generate"
+        client = await self._get_client(url)
 
         # Use Ollama by default
-        response = await client.post(
-            f"{self.settings.ollama_host}/api/generate",
-            json={
-                "model": self.settings.ollama_model,
-                "prompt": prompt,
-                "system": system_prompt or "You are a helpful AI assistant for DevTeam6.",
-                "stream": False,
-                "options": {
-                    "temperature": self.config.temperature,
-                    "num_predict": self.config.max_tokens,
+        parts: List[str] = []
+        tokens_used = 0
+        # Time to first token is only recorded if a token arrives
+        ttft = self.metrics.stage("llm_ttft", record_on_exit=False)
+        with self.metrics.stage("llm_total"), ttft:
+            async with client.stream(
+                "POST",
+                url,
+                json={
+                    "model": self.settings.ollama_model,
+                    "prompt": prompt,
+                    "system": system_prompt or "You are a helpful AI assistant for DevTeam6.",
+                    "stream": True,
+                    "options": {
+                        "temperature": self.config.temperature,
+                        "num_predict": self.config.max_tokens,
+                    },
                 },
-            },
-        )
-        response.raise_for_status()
-        data = response.json()
-
-        return data["response"], data.get("eval_count", 0)
+                timeout=self.timeout,
+            ) as response:
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    if not line:
+                        continue
+                    data = json.loads(line)
+                    if data.get("response"):
+                        ttft.stop()
+                        parts.append(data["response"])
+                    tokens_used = data.get("eval_count", tokens_used)
+
+        return "".join(parts), tokens_used
 
     async def store(
         self,
@@ -210,7 +286,7 @@ class RAGPipeline:
             Document ID
         """
         embedding = await self.embedding_service.embed(content)
-        doc_id = self.vector_store.add(
+        doc_id = await self.vector_store.add(
             content=content,
             embedding=embedding,
             metadata=metadata,
@@ -221,21 +297,28 @@ class RAGPipeline:
         self,
         contents: List[str],
         metadatas: Optional[List[Dict[str, Any]]] = None,
+        ids: Optional[List[str]] = None,
     ) -> List[str]:
         """
         Store multiple contents in the vector store.
 
+        New random IDs are minted unless ``ids`` is given; to re-ingest
+        sources without re-embedding unchanged content, use
+        ``core.ingest.IncrementalIndexer`` instead.
+
         Args:
             contents: List of contents
             metadatas: Optional list of metadata dicts
+            ids: Optional document IDs (e.g. from ``core.ingest.chunk_id``)
 
         Returns:
             List of document IDs
         """
         embeddings = await self.embedding_service.embed_batch(contents)
-        doc_ids = self.vector_store.add_batch(
+        doc_ids = await self.vector_store.add_batch(
             contents=contents,
             embeddings=embeddings,
             metadatas=metadatas,
+            ids=ids,
         )
         return doc_ids
@@ -0,0 +1,213 @@
+"""
+DevTeam6 Local AI - Shared State
+
+SQLite (WAL mode) store for state that must agree across API worker processes.
+"""
+
+from typing import Any, Dict, Iterator, Optional, Tuple
+from contextlib import contextmanager
+from pathlib import Path
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from config.settings import get_settings
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS kv (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    expires_at REAL,
+    PRIMARY KEY (namespace, key)
+);
+"""
+
+
+class SharedState:
+    """
+    Process-shared key/value store backed by one SQLite file.
+
+    Every worker process opens its own connection to the same database;
+    WAL journaling lets readers run while one writer commits, so small
+    frequent writes (access counters, agent state) from several workers
+    do not block each other for long.
+
+    Connections are never inherited across ``fork()``: the owning PID is
+    checked on every use and a child process transparently reconnects.
+    Within a process one connection is shared by all threads behind a lock.
+
+    Other components can create their own tables through ``execute`` and
+    ``transaction`` (see ``MemoryIndex`` in memory_system).
+    """
+
+    def __init__(self, path: str, busy_timeout_ms: int = 5000):
+        """
+        Initialize the shared state store.
+
+        Args:
+            path: SQLite database file (":memory:" for a private in-process store)
+            busy_timeout_ms: How long a writer waits for another process's lock
+        """
+        self.path = path
+        self.busy_timeout_ms = busy_timeout_ms
+        self._lock = threading.RLock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Connections and locks stay with the process that opened them
+        return {"path": self.path, "busy_timeout_ms": self.busy_timeout_ms}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__(**state)
+
+    def _connection(self) -> sqlite3.Connection:
+        """Get this process's connection, opening it on first use."""
+        if self._conn is None or self._pid != os.getpid():
+            if self.path != ":memory:":
+                Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(
+                self.path,
+                timeout=self.busy_timeout_ms / 1000,
+                isolation_level=None,  # explicit transactions only
+                check_same_thread=False,
+            )
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            # A connection inherited from the parent is dropped, not closed:
+            # closing it here could disturb the parent's open transaction.
+            self._conn = conn
+            self._pid = os.getpid()
+        return self._conn
+
+    def execute(self, sql: str, params: Tuple = ()) -> list:
+        """
+        Run one statement in its own transaction.
+
+        Args:
+            sql: SQL statement
+            params: Statement parameters
+
+        Returns:
+            Fetched rows (empty for statements without results)
+        """
+        with self._lock:
+            return self._connection().execute(sql, params).fetchall()
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """
+        Hold the database write lock for a block of statements.
+
+        ``BEGIN IMMEDIATE`` takes the write lock up front, so the block is
+        serialized against every other process using the same file. This
+        also makes it usable as a cross-process mutex around non-SQL work
+        (e.g. read-modify-write of a shared file).
+        """
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def get(self, namespace: str, key: str, default: Any = None) -> Any:
+        """
+        Get a value.
+
+        Args:
+            namespace: Key namespace
+            key: Key within the namespace
+            default: Returned when the key is missing or expired
+
+        Returns:
+            Stored value (JSON-decoded)
+        """
+        rows = self.execute(
+            "SELECT value FROM kv WHERE namespace = ? AND key = ? "
+            "AND (expires_at IS NULL OR expires_at > ?)",
+            (namespace, key, time.time()),
+        )
+        return json.loads(rows[0]["value"]) if rows else default
+
+    def set(
+        self,
+        namespace: str,
+        key: str,
+        value: Any,
+        ttl: Optional[float] = None,
+    ) -> None:
+        """
+        Set a value.
+
+        Args:
+            namespace: Key namespace
+            key: Key within the namespace
+            value: JSON-serializable value
+            ttl: Seconds until the value expires (None for no expiry)
+        """
+        expires_at = time.time() + ttl if ttl is not None else None
+        self.execute(
+            "INSERT OR REPLACE INTO kv (namespace, key, value, expires_at) "
+            "VALUES (?, ?, ?, ?)",
+            (namespace, key, json.dumps(value), expires_at),
+        )
+
+    def delete(self, namespace: str, key: str) -> None:
+        """Delete a value."""
+        self.execute("DELETE FROM kv WHERE namespace = ? AND key = ?", (namespace, key))
+
+    def items(self, namespace: str) -> Dict[str, Any]:
+        """Get all live values in a namespace."""
+        rows = self.execute(
+            "SELECT key, value FROM kv WHERE namespace = ? "
+            "AND (expires_at IS NULL OR expires_at > ?)",
+            (namespace, time.time()),
+        )
+        return {row["key"]: json.loads(row["value"]) for row in rows}
+
+    def purge_expired(self) -> int:
+        """Delete expired values; returns how many were removed."""
+        with self.transaction() as conn:
+            cursor = conn.execute(
+                "DELETE FROM kv WHERE expires_at IS NOT NULL AND expires_at <= ?",
+                (time.time(),),
+            )
+            return cursor.rowcount
+
+    def close(self) -> None:
+        """Close this process's connection."""
+        with self._lock:
+            if self._conn is not None and self._pid == os.getpid():
+                self._conn.close()
+            self._conn = None
+            self._pid = None
+
+
+def default_shared_state_path() -> str:
+    """Resolve the shared state file from settings."""
+    settings = get_settings()
+    return settings.shared_state_path or str(
+        Path(settings.chroma_persist_dir) / "shared_state.db"
+    )
+
+
+# Global shared state instance
+_shared_state: Optional[SharedState] = None
+
+
+def get_shared_state() -> SharedState:
+    """Get the process-wide shared state store."""
+    global _shared_state
+    if _shared_state is None:
+        _shared_state = SharedState(default_shared_state_path())
+    return _shared_state
@@ -0,0 +1,109 @@
+"""
+DevTeam6 Local AI - Single Flight
+
+Request coalescing: concurrent calls with the same key share one execution.
+"""
+
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+import asyncio
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent identical async calls.
+
+    The first caller for a key starts the work as a task; callers that
+    arrive while it is in flight await the same task instead of starting
+    their own. Results and exceptions are delivered to every waiter.
+
+    A cancelled waiter only cancels the shared task when no other waiter
+    is left, so one client disconnecting does not fail the others. The
+    cancelled task leaves the table at once: a caller arriving while it
+    winds down starts a fresh call rather than inheriting the cancellation.
+    """
+
+    def __init__(self):
+        """Initialize the single-flight group."""
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self._waiters: Dict[Hashable, int] = {}
+        self.calls = 0
+        self.executions = 0
+        self.coalesced = 0
+        self.errors = 0
+        self.cancelled = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run fn once per key among concurrent callers.
+
+        Args:
+            key: Hashable key identifying identical requests
+            fn: Zero-argument coroutine factory performing the work
+
+        Returns:
+            Result of fn
+        """
+        self.calls += 1
+        task = self._inflight.get(key)
+
+        if task is None:
+            self.executions += 1
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            self._waiters[key] = 0
+            task.add_done_callback(lambda t, k=key: self._finish(k, t))
+        else:
+            self.coalesced += 1
+
+        self._waiters[key] += 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            last = self._inflight.get(key) is task and self._waiters[key] == 1
+            if last and not task.done():
+                task.cancel()
+                del self._inflight[key]
+                del self._waiters[key]
+            raise
+        finally:
+            if key in self._waiters and self._inflight.get(key) is task:
+                self._waiters[key] -= 1
+
+    def _finish(self, key: Hashable, task: asyncio.Task) -> None:
+        """Drop a completed task from the in-flight table."""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+            del self._waiters[key]
+
+        if task.cancelled():
+            self.cancelled += 1
+        elif task.exception() is not None:
+            self.errors += 1
+
+    @property
+    def inflight(self) -> int:
+        """Number of distinct calls currently in flight."""
+        return len(self._inflight)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get coalescing counters."""
+        return {
+            "calls": self.calls,
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "errors": self.errors,
+            "cancelled": self.cancelled,
+            "inflight": self.inflight,
+        }
+
+
+# Global single-flight group shared by embedding and RAG services
+_single_flight: Optional[SingleFlight] = None
+
+
+def get_single_flight() -> SingleFlight:
+    """Get the global single-flight group."""
+    global _single_flight
+    if _single_flight is None:
+        _single_flight = SingleFlight()
+    return _single_flight
@@ -4,17 +4,18 @@ DevTeam6 Local AI - Vector Store
 ChromaDB wrapper for persistent vector storage and semantic search.
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Callable, Tuple, TypeVar, Union
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+import asyncio
+import functools
 import uuid
 
-try:
-    import chromadb
-    from chromadb.config import Settings as ChromaSettings
-except ImportError:
-    chromadb = None
-
 from config.settings import get_settings
+from .micro_batcher import MicroBatcher
+from .metrics import get_metrics
+
+T = TypeVar("T")
 
 
 @dataclass
@@ -42,21 +43,36 @@ class VectorStore:
             collection_name: Name of the ChromaDB collection
             persist_directory: Directory for persistent storage
         """
-        if chromadb is None:
+        # Imported here: chromadb takes ~0.4 s to import and most users of
+        # this module (SearchResult, type hints) never open a store
+        try:
+            import chromadb
+            from chromadb.config import Settings as ChromaSettings
+        except ImportError:
             raise ImportError("chromadb is required. Install with: pip install chromadb")
 
         settings = get_settings()
         self.collection_name = collection_name or settings.chroma_collection
         self.persist_directory = persist_directory or settings.chroma_persist_dir
 
-        # Initialize ChromaDB client
-        self._client = chromadb.PersistentClient(
-            path=self.persist_directory,
-            settings=ChromaSettings(
-                anonymized_telemetry=False,
-                allow_reset=True,
-            ),
+        # Initialize ChromaDB client. The embedded client keeps its HNSW
+        # index in process memory, so several API workers must share one
+        # Chroma server instead of each opening the directory themselves.
+        chroma_settings = ChromaSettings(
+            anonymized_telemetry=False,
+            allow_reset=True,
         )
+        if settings.chroma_host:
+            self._client = chromadb.HttpClient(
+                host=settings.chroma_host,
+                port=settings.chroma_port,
+                settings=chroma_settings,
+            )
+        else:
+            self._client = chromadb.PersistentClient(
+                path=self.persist_directory,
+                settings=chroma_settings,
+            )
 
         # Get or create collection
         self._collection = self._client.get_or_create_collection(
@@ -220,6 +236,29 @@ class VectorStore:
 
         self._collection.update(**update_kwargs)
 
+    def update_batch(
+        self,
+        doc_ids: List[str],
+        contents: Optional[List[str]] = None,
+        embeddings: Optional[List[List[float]]] = None,
+        metadatas: Optional[List[Dict[str, Any]]] = None,
+    ) -> None:
+        """
+        Update multiple documents in one call.
+
+        Args:
+            doc_ids: Document IDs
+            contents: New contents (optional, one per ID)
+            embeddings: New embeddings (optional, one per ID)
+            metadatas: New metadata (optional, one per ID)
+        """
+        self._collection.update(
+            ids=doc_ids,
+            documents=contents,
+            embeddings=embeddings,
+            metadatas=metadatas,
+        )
+
     def reset(self) -> None:
         """Reset the collection (delete all documents)."""
         self._client.delete_collection(self.collection_name)
@@ -252,3 +291,183 @@ class VectorStore:
             )
 
         return None
+
+
+class AsyncVectorStore:
+    """
+    Async facade over VectorStore.
+
+    Chroma calls are synchronous, so calling them from ``async def``
+    handlers blocks the event loop. This facade runs them on a bounded
+    thread pool instead:
+
+    - reads (query, get_by_id) are limited by ``max_concurrent_reads``
+    - writes are limited by ``max_concurrent_writes``
+    - concurrent add/update/delete calls are micro-batched into one
+      Chroma call per kind, so a burst of writes costs one round trip
+    """
+
+    def __init__(
+        self,
+        store: VectorStore,
+        max_workers: Optional[int] = None,
+        max_concurrent_reads: Optional[int] = None,
+        max_concurrent_writes: Optional[int] = None,
+        write_batch_size: int = 256,
+        write_batch_wait_ms: float = 2.0,
+    ):
+        """
+        Initialize the facade.
+
+        Args:
+            store: Underlying synchronous vector store
+            max_workers: Thread pool size
+            max_concurrent_reads: Maximum queries running at once
+            max_concurrent_writes: Maximum write batches running at once
+            write_batch_size: Maximum writes merged into one Chroma call
+            write_batch_wait_ms: Maximum time a write waits for its batch
+        """
+        settings = get_settings()
+        self.store = store
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or settings.vector_store_threads,
+            thread_name_prefix="vector-store",
+        )
+        self._read_limit = asyncio.Semaphore(
+            max_concurrent_reads or settings.vector_store_max_reads
+        )
+        self._write_limit = asyncio.Semaphore(
+            max_concurrent_writes or settings.vector_store_max_writes
+        )
+        self._adds = MicroBatcher(self._add_many, write_batch_size, write_batch_wait_ms)
+        self._updates = MicroBatcher(self._update_many, write_batch_size, write_batch_wait_ms)
+        self._deletes = MicroBatcher(self._delete_many, write_batch_size, write_batch_wait_ms)
+        self.metrics = get_metrics()
+
+    @classmethod
+    def wrap(cls, store: Union[VectorStore, "AsyncVectorStore"]) -> "AsyncVectorStore":
+        """Return the store as an AsyncVectorStore, wrapping it if needed."""
+        return store if isinstance(store, AsyncVectorStore) else cls(store)
+
+    @property
+    def count(self) -> int:
+        """Get the number of items in the collection."""
+        return self.store.count
+
+    async def get_count(self) -> int:
+        """Get the number of items in the collection, off the event loop."""
+        return await self._read(lambda: self.store.count)
+
+    async def _run(self, fn: Callable[..., T], *args, **kwargs) -> T:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, functools.partial(fn, *args, **kwargs)
+        )
+
+    async def _read(self, fn: Callable[..., T], *args, **kwargs) -> T:
+        async with self._read_limit:
+            return await self._run(fn, *args, **kwargs)
+
+    async def _write(self, fn: Callable[..., T], *args, **kwargs) -> T:
+        async with self._write_limit:
+            return await self._run(fn, *args, **kwargs)
+
+    async def add(
+        self,
+        content: str,
+        embedding: List[float],
+        metadata: Optional[Dict[str, Any]] = None,
+        doc_id: Optional[str] = None,
+    ) -> str:
+        """Add a document (see VectorStore.add)."""
+        doc_id = doc_id or str(uuid.uuid4())
+        await self._adds.submit((content, embedding, metadata or {}, doc_id))
+        return doc_id
+
+    async def add_batch(
+        self,
+        contents: List[str],
+        embeddings: List[List[float]],
+        metadatas: Optional[List[Dict[str, Any]]] = None,
+        ids: Optional[List[str]] = None,
+    ) -> List[str]:
+        """Add multiple documents (see VectorStore.add_batch)."""
+        return await self._write(self.store.add_batch, contents, embeddings, metadatas, ids)
+
+    async def _add_many(self, items: List[Tuple[str, List[float], Dict[str, Any], str]]) -> List[None]:
+        contents, embeddings, metadatas, ids = (list(col) for col in zip(*items))
+        await self._write(self.store.add_batch, contents, embeddings, metadatas, ids)
+        return [None] * len(items)
+
+    async def query(
+        self,
+        embedding: List[float],
+        top_k: int = 5,
+        where: Optional[Dict[str, Any]] = None,
+        where_document: Optional[Dict[str, Any]] = None,
+    ) -> List[SearchResult]:
+        """Query for similar documents (see VectorStore.query)."""
+        with self.metrics.stage("vector_search"):
+            return await self._read(self.store.query, embedding, top_k, where, where_document)
+
+    async def get_by_id(self, doc_id: str) -> Optional[SearchResult]:
+        """Get a document by ID (see VectorStore.get_by_id)."""
+        return await self._read(self.store.get_by_id, doc_id)
+
+    async def update(
+        self,
+        doc_id: str,
+        content: Optional[str] = None,
+        embedding: Optional[List[float]] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Update a document (see VectorStore.update)."""
+        await self._updates.submit((doc_id, content, embedding, metadata))
+
+    async def _update_many(self, items: List[Tuple]) -> List[None]:
+        # One Chroma call per combination of fields being updated;
+        # a later update of the same document wins.
+        groups: Dict[Tuple[bool, bool, bool], Dict[str, Tuple]] = {}
+        for doc_id, content, embedding, metadata in items:
+            shape = (content is not None, embedding is not None, metadata is not None)
+            groups.setdefault(shape, {})[doc_id] = (content, embedding, metadata)
+
+        for (has_content, has_embedding, has_metadata), docs in groups.items():
+            values = list(docs.values())
+            await self._write(
+                self.store.update_batch,
+                list(docs),
+                [v[0] for v in values] if has_content else None,
+                [v[1] for v in values] if has_embedding else None,
+                [v[2] for v in values] if has_metadata else None,
+            )
+
+        return [None] * len(items)
+
+    async def delete(self, doc_ids: List[str]) -> None:
+        """Delete documents (see VectorStore.delete)."""
+        if doc_ids:
+            await self._deletes.submit(list(doc_ids))
+
+    async def _delete_many(self, batches: List[List[str]]) -> List[None]:
+        ids = list(dict.fromkeys(doc_id for batch in batches for doc_id in batch))
+        await self._write(self.store.delete, ids)
+        return [None] * len(batches)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get write batching statistics."""
+        return {
+            "adds": self._adds.get_stats(),
+            "updates": self._updates.get_stats(),
+            "deletes": self._deletes.get_stats(),
+        }
+
+    def close(self) -> None:
+        """Shut down the thread pool."""
+        self._executor.shutdown(wait=True)
+
+    async def aclose(self) -> None:
+        """Finish queued writes, then shut down the thread pool."""
+        for batcher in (self._adds, self._updates, self._deletes):
+            await batcher.drain()
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
@@ -1,7 +1,19 @@
 """DevTeam6 Local AI - MCP (Model Context Protocol) Package"""
-from .base_server import BaseMCPServer
-from .memory_server import MemoryMCPServer
-from .rag_server import RAGMCPServer
+from typing import TYPE_CHECKING
+
+from utils.lazy_imports import lazy_exports
+
+if TYPE_CHECKING:
+    from .base_server import BaseMCPServer
+    from .memory_server import MemoryMCPServer
+    from .rag_server import RAGMCPServer
+
+# Submodules are imported on first attribute access
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "BaseMCPServer": ".base_server",
+    "MemoryMCPServer": ".memory_server",
+    "RAGMCPServer": ".rag_server",
+})
 
 __all__ = [
     "BaseMCPServer",
@@ -15,7 +15,26 @@ Modules:
 - advanced: Swarm intelligence, neuromorphic concepts
 """
 
-from .config import MLConfig, get_ml_config
+from typing import TYPE_CHECKING
+
+from utils.lazy_imports import lazy_exports
+
+if TYPE_CHECKING:
+    from .config import MLConfig, get_ml_config
+
+# Config and the ML subpackages are imported on first attribute access
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "MLConfig": ".config",
+    "get_ml_config": ".config",
+    "supervised": ".supervised",
+    "reinforcement": ".reinforcement",
+    "contrastive": ".contrastive",
+    "online": ".online",
+    "anomaly": ".anomaly",
+    "finetuning": ".finetuning",
+    "meta": ".meta",
+    "advanced": ".advanced",
+})
 
 __all__ = [
     "MLConfig",
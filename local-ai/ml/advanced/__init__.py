@@ -4,9 +4,23 @@ DevTeam6 Advanced ML Module
 Swarm intelligence, neuromorphic concepts, and ensemble systems.
 """
 
-from .swarm_optimizer import SwarmOptimizer, Particle
-from .neuromorphic import SpikingNeuron, SpikingNetwork
-from .ensemble_system import EnsembleSystem
+from typing import TYPE_CHECKING
+
+from utils.lazy_imports import lazy_exports
+
+if TYPE_CHECKING:
+    from .swarm_optimizer import SwarmOptimizer, Particle
+    from .neuromorphic import SpikingNeuron, SpikingNetwork
+    from .ensemble_system import EnsembleSystem
+
+# Submodules are imported on first attribute access
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "SwarmOptimizer": ".swarm_optimizer",
+    "Particle": ".swarm_optimizer",
+    "SpikingNeuron": ".neuromorphic",
+    "SpikingNetwork": ".neuromorphic",
+    "EnsembleSystem": ".ensemble_system",
+})
 
 __all__ = [
     "SwarmOptimizer",
@@ -4,9 +4,22 @@ DevTeam6 Anomaly Detection Module
 Security threat identification using multiple detection methods.
 """
 
-from .anomaly_detector import AnomalyDetector, AnomalyResult
-from .isolation_forest import IsolationForest
-from .autoencoder_detector import AutoencoderDetector
+from typing import TYPE_CHECKING
+
+from utils.lazy_imports import lazy_exports
+
+if TYPE_CHECKING:
+    from .anomaly_detector import AnomalyDetector, AnomalyResult
+    from .isolation_forest import IsolationForest
+    from .autoencoder_detector import AutoencoderDetector
+
+# Submodules are imported on first attribute access
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "AnomalyDetector": ".anomaly_detector",
+    "AnomalyResult": ".anomaly_detector",
+    "IsolationForest": ".isolation_forest",
+    "AutoencoderDetector": ".autoencoder_detector",
+})
 
 __all__ = [
     "AnomalyDetector",
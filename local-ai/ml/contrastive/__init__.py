@@ -4,9 +4,21 @@ DevTeam6 Contrastive Learning Module
 Improved embeddings via triplet loss and contrastive learning.
 """
 
-from .embedding_learner import EmbeddingLearner
-from .triplet_loss import TripletLoss
-from .negative_sampler import NegativeSampler
+from typing import TYPE_CHECKING
+
+from utils.lazy_imports import lazy_exports
+
+if TYPE_CHECKING:
+    from .embedding_learner import EmbeddingLearner
+    from .triplet_loss import TripletLoss
+    from .negative_sampler import NegativeSampler
+
+# Submodules are imported on first attribute access
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "EmbeddingLearner": ".embedding_learner",
+    "TripletLoss": ".triplet_loss",
+    "NegativeSampler": ".negative_sampler",
+})
 
 __all__ = [
     "EmbeddingLearner",
@@ -4,9 +4,22 @@ DevTeam6 Fine-tuning Module
 LoRA/QLoRA model adapters for efficient fine-tuning.
 """
 
-from .lora_adapter import LoRAAdapter, LoRAConfig
-from .qlora_adapter import QLoRAAdapter
-from .adapter_manager import AdapterManager
+from typing import TYPE_CHECKING
+
+from utils.lazy_imports import lazy_exports
+
+if TYPE_CHECKING:
+    from .lora_adapter import LoRAAdapter, LoRAConfig
+    from .qlora_adapter import QLoRAAdapter
+    from .adapter_manager import AdapterManager
+
+# Submodules are imported on first attribute access
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "LoRAAdapter": ".lora_adapter",
+    "LoRAConfig": ".lora_adapter",
+    "QLoRAAdapter": ".qlora_adapter",
+    "AdapterManager": ".adapter_manager",
+})
 
 __all__ = [
     "LoRAAdapter",
@@ -4,9 +4,21 @@ DevTeam6 Meta-Learning Module
 Self-optimizing hyperparameters and model selection.
 """
 
-from .hyperparameter_optimizer import HyperparameterOptimizer
-from .model_selector import ModelSelector
-from .auto_tuner import AutoTuner
+from typing import TYPE_CHECKING
+
+from utils.lazy_imports import lazy_exports
+
+if TYPE_CHECKING:
+    from .hyperparameter_optimizer import HyperparameterOptimizer
+    from .model_selector import ModelSelector
+    from .auto_tuner import AutoTuner
+
+# Submodules are imported on first attribute access
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "HyperparameterOptimizer": ".hyperparameter_optimizer",
+    "ModelSelector": ".model_selector",
+    "AutoTuner": ".auto_tuner",
+})
 
 __all__ = [
     "HyperparameterOptimizer",
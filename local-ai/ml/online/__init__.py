@@ -4,9 +4,22 @@ DevTeam6 Online Learning Module
 Continuous adaptation with drift detection.
 """
 
-from .drift_detector import DriftDetector, DriftType
-from .incremental_learner import IncrementalLearner
-from .adaptation_manager import AdaptationManager
+from typing import TYPE_CHECKING
+
+from utils.lazy_imports import lazy_exports
+
+if TYPE_CHECKING:
+    from .drift_detector import DriftDetector, DriftType
+    from .incremental_learner import IncrementalLearner
+    from .adaptation_manager import AdaptationManager
+
+# Submodules are imported on first attribute access
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "DriftDetector": ".drift_detector",
+    "DriftType": ".drift_detector",
+    "IncrementalLearner": ".incremental_learner",
+    "AdaptationManager": ".adaptation_manager",
+})
 
 __all__ = [
     "DriftDetector",
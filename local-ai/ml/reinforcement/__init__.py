@@ -4,11 +4,27 @@ DevTeam6 Reinforcement Learning Module
 PPO-based routing optimization for the Dual Transformer.
 """
 
-from .routing_agent import RoutingAgent, RoutingAction
-from .reward_calculator import RewardCalculator
-from .policy_network import PolicyNetwork
-from .experience_buffer import ExperienceBuffer, Experience
-from .ppo_trainer import PPOTrainer
+from typing import TYPE_CHECKING
+
+from utils.lazy_imports import lazy_exports
+
+if TYPE_CHECKING:
+    from .routing_agent import RoutingAgent, RoutingAction
+    from .reward_calculator import RewardCalculator
+    from .policy_network import PolicyNetwork
+    from .experience_buffer import ExperienceBuffer, Experience
+    from .ppo_trainer import PPOTrainer
+
+# Submodules are imported on first attribute access
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "RoutingAgent": ".routing_agent",
+    "RoutingAction": ".routing_agent",
+    "RewardCalculator": ".reward_calculator",
+    "PolicyNetwork": ".policy_network",
+    "ExperienceBuffer": ".experience_buffer",
+    "Experience": ".experience_buffer",
+    "PPOTrainer": ".ppo_trainer",
+})
 
 __all__ = [
     "RoutingAgent",
@@ -5,9 +5,21 @@ Neural network-based classification for token categorization,
 threat detection, and intent recognition.
 """
 
-from .token_classifier import TokenClassifier
-from .threat_detector import ThreatDetector
-from .intent_recognizer import IntentRecognizer
+from typing import TYPE_CHECKING
+
+from utils.lazy_imports import lazy_exports
+
+if TYPE_CHECKING:
+    from .token_classifier import TokenClassifier
+    from .threat_detector import ThreatDetector
+    from .intent_recognizer import IntentRecognizer
+
+# Submodules are imported on first attribute access
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "TokenClassifier": ".token_classifier",
+    "ThreatDetector": ".threat_detector",
+    "IntentRecognizer": ".intent_recognizer",
+})
 
 __all__ = [
     "TokenClassifier",
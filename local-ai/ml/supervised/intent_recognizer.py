@@ -13,6 +13,8 @@ import hashlib
 import json
 from datetime import datetime
 
+from utils.keyword_matcher import compiled_keywords
+
 
 class Intent(Enum):
     """Recognized intent categories."""
@@ -148,6 +150,16 @@ class IntentRecognizer:
     # Urgency indicators
     URGENCY_WORDS = {"urgent", "asap", "immediately", "now", "critical", "emergency", "quick", "fast", "hurry"}
     
+    # Context indicators (substrings), checked in this order
+    CONTEXT_INDICATORS = {
+        IntentContext.API_CALL: ["api", "endpoint", "request", "response"],
+        IntentContext.WEBHOOK: ["webhook", "callback", "hook"],
+        IntentContext.SCHEDULED_TASK: ["schedule", "cron", "timer", "interval"],
+        IntentContext.SYSTEM_EVENT: ["system", "service", "daemon"],
+        IntentContext.INTERNAL: ["internal", "private", "self"]
+    }
+    _contexts = compiled_keywords(lambda cls: cls.CONTEXT_INDICATORS)
+    
     def __init__(
         self,
         embedding_dim: int = 128,
@@ -323,20 +335,7 @@ class IntentRecognizer:
     
     def _determine_context(self, text: str) -> IntentContext:
         """Determine the context of the intent."""
-        text_lower = text.lower()
-        
-        if any(w in text_lower for w in ["api", "endpoint", "request", "response"]):
-            return IntentContext.API_CALL
-        elif any(w in text_lower for w in ["webhook", "callback", "hook"]):
-            return IntentContext.WEBHOOK
-        elif any(w in text_lower for w in ["schedule", "cron", "timer", "interval"]):
-            return IntentContext.SCHEDULED_TASK
-        elif any(w in text_lower for w in ["system", "service", "daemon"]):
-            return IntentContext.SYSTEM_EVENT
-        elif any(w in text_lower for w in ["internal", "private", "self"]):
-            return IntentContext.INTERNAL
-        else:
-            return IntentContext.USER_INPUT
+        return self._contexts.first_category(text, IntentContext.USER_INPUT)
     
     def recognize(self, text: str) -> IntentResult:
         """
@@ -13,6 +13,8 @@ import hashlib
 import json
 from datetime import datetime
 
+from utils.keyword_matcher import compiled_keywords
+
 
 class ThreatLevel(Enum):
     """Security threat levels."""
@@ -104,6 +106,9 @@ class ThreatDetector:
         ]
     }
     
+    # THREAT_PATTERNS compiled into one case-insensitive matcher
+    _patterns = compiled_keywords(lambda cls: cls.THREAT_PATTERNS)
+    
     # Risk weight by threat type
     THREAT_WEIGHTS = {
         ThreatType.INJECTION: 0.9,
@@ -173,36 +178,26 @@ class ThreatDetector:
     def _detect_patterns(self, text: str) -> List[ThreatIndicator]:
         """Detect threat patterns in text."""
         indicators = []
-        text_lower = text.lower()
-        
-        for threat_type, patterns in self.THREAT_PATTERNS.items():
-            for pattern in patterns:
-                pattern_lower = pattern.lower()
-                start = 0
-                while True:
-                    pos = text_lower.find(pattern_lower, start)
-                    if pos == -1:
-                        break
-                    
-                    # Calculate confidence based on context
-                    confidence = self._calculate_pattern_confidence(
-                        text, pos, len(pattern), threat_type
-                    )
-                    
-                    # Get surrounding context
-                    context_start = max(0, pos - 20)
-                    context_end = min(len(text), pos + len(pattern) + 20)
-                    context = text[context_start:context_end]
-                    
-                    indicators.append(ThreatIndicator(
-                        pattern=pattern,
-                        threat_type=threat_type,
-                        confidence=confidence,
-                        location=(pos, pos + len(pattern)),
-                        context=context
-                    ))
-                    
-                    start = pos + 1
+        
+        # Every occurrence of every pattern, in one pass over the text
+        for pattern, threat_type, pos, end in self._patterns.finditer(text):
+            # Calculate confidence based on context
+            confidence = self._calculate_pattern_confidence(
+                text, pos, len(pattern), threat_type
+            )
+            
+            # Get surrounding context
+            context_start = max(0, pos - 20)
+            context_end = min(len(text), end + 20)
+            context = text[context_start:context_end]
+            
+            indicators.append(ThreatIndicator(
+                pattern=pattern,
+                threat_type=threat_type,
+                confidence=confidence,
+                location=(pos, end),
+                context=context
+            ))
         
         return indicators
     
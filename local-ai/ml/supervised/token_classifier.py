@@ -13,6 +13,8 @@ import hashlib
 import json
 from datetime import datetime
 
+from utils.keyword_matcher import compiled_keywords
+
 
 class TokenCategory(Enum):
     """Token category classifications."""
@@ -135,6 +137,9 @@ class TokenClassifier:
         }
     }
     
+    # CATEGORY_KEYWORDS compiled into one matcher
+    _keywords = compiled_keywords(lambda cls: cls.CATEGORY_KEYWORDS)
+    
     def __init__(
         self,
         embedding_dim: int = 256,
@@ -191,14 +196,8 @@ class TokenClassifier:
     
     def _extract_features(self, token: str) -> TokenFeatures:
         """Extract features from a token for classification."""
-        token_lower = token.lower()
-        
-        # Check for keywords
-        is_keyword = False
-        for keywords in self.CATEGORY_KEYWORDS.values():
-            if token_lower in keywords or any(kw in token_lower for kw in keywords):
-                is_keyword = True
-                break
+        # Check for keywords (an exact match is also a substring match)
+        is_keyword = self._keywords.contains_any(token)
         
         return TokenFeatures(
             token=token,
@@ -231,9 +230,9 @@ class TokenClassifier:
         embedding[70] = features.char_entropy / 4.0  # Normalized entropy
         
         # Category keyword presence scores
-        token_lower = features.token.lower()
+        found = self._keywords.found(features.token)
         for idx, (category, keywords) in enumerate(self.CATEGORY_KEYWORDS.items()):
-            score = sum(1 for kw in keywords if kw in token_lower) / len(keywords)
+            score = len(found[category]) / len(keywords)
             if 71 + idx < self.embedding_dim:
                 embedding[71 + idx] = score
         
@@ -253,6 +252,7 @@ class TokenClassifier:
         # Extract features
         features = self._extract_features(token)
         embedding = self._features_to_embedding(features)
+        found = self._keywords.found(token)
         
         # Forward pass through neural network
         h1 = self.layer1.forward(embedding)
@@ -270,7 +270,7 @@ class TokenClassifier:
                 if token_lower in keywords:
                     adjustments[idx] += 0.3
                 # Check partial match
-                elif any(kw in token_lower for kw in keywords):
+                elif found[category]:
                     adjustments[idx] += 0.15
                 # Check if token contains keyword
                 elif any(token_lower in kw for kw in keywords):
@@ -9,6 +9,8 @@ from dataclasses import dataclass
 import httpx
 import asyncio
 
+from core.http_pool import HTTPClientRegistry, get_http_registry
+
 
 @dataclass
 class ChatMessage:
@@ -51,7 +53,8 @@ class OllamaService:
         self,
         host: str = "http://localhost:11434",
         default_model: str = "llama3.2",
-        timeout: int = 120
+        timeout: int = 120,
+        http_registry: Optional[HTTPClientRegistry] = None
     ):
         """
         Initialize Ollama service.
@@ -60,26 +63,19 @@ class OllamaService:
             host: Ollama API host
             default_model: Default model to use
             timeout: Request timeout in seconds
+            http_registry: Shared HTTP client pool
         """
         self.host = host.rstrip("/")
         self.default_model = default_model
         self.timeout = timeout
-        self._client: Optional[httpx.AsyncClient] = None
+        self.http_registry = http_registry or get_http_registry()
     
     async def _get_client(self) -> httpx.AsyncClient:
-        """Get or create async HTTP client."""
-        if self._client is None or self._client.is_closed:
-            self._client = httpx.AsyncClient(
-                timeout=httpx.Timeout(self.timeout),
-                limits=httpx.Limits(max_connections=10)
-            )
-        return self._client
+        """Get the shared HTTP client for the Ollama host."""
+        return self.http_registry.get_client(self.host)
     
     async def close(self) -> None:
-        """Close the HTTP client."""
-        if self._client and not self._client.is_closed:
-            await self._client.aclose()
-            self._client = None
+        """Release resources (the shared HTTP pool is closed by its owner)."""
     
     async def generate(
         self,
@@ -121,7 +117,8 @@ class OllamaService:
         
         response = await client.post(
             f"{self.host}/api/generate",
-            json=payload
+            json=payload,
+            timeout=self.timeout
         )
         response.raise_for_status()
         data = response.json()
@@ -171,7 +168,8 @@ class OllamaService:
         
         response = await client.post(
             f"{self.host}/api/chat",
-            json=payload
+            json=payload,
+            timeout=self.timeout
         )
         response.raise_for_status()
         data = response.json()
@@ -212,7 +210,8 @@ class OllamaService:
             json={
                 "model": embed_model,
                 "prompt": text
-            }
+            },
+            timeout=self.timeout
         )
         response.raise_for_status()
         data = response.json()
@@ -231,7 +230,7 @@ class OllamaService:
         """
         client = await self._get_client()
         
-        response = await client.get(f"{self.host}/api/tags")
+        response = await client.get(f"{self.host}/api/tags", timeout=self.timeout)
         response.raise_for_status()
         data = response.json()
         
@@ -251,7 +250,8 @@ class OllamaService:
         
         response = await client.post(
             f"{self.host}/api/pull",
-            json={"name": model, "stream": False}
+            json={"name": model, "stream": False},
+            timeout=self.timeout
         )
         
         return response.status_code == 200
@@ -270,7 +270,8 @@ class OllamaService:
         
         response = await client.post(
             f"{self.host}/api/show",
-            json={"name": model}
+            json={"name": model},
+            timeout=self.timeout
         )
         response.raise_for_status()
         
@@ -285,7 +286,7 @@ class OllamaService:
         """
         try:
             client = await self._get_client()
-            response = await client.get(self.host)
+            response = await client.get(self.host, timeout=self.timeout)
             return response.status_code == 200
         except Exception:
             return False
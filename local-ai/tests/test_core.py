@@ -4,9 +4,12 @@ DevTeam6 Local AI - Unit Tests
 Tests for core functionality.
 """
 
+import asyncio
+
 import pytest
-from utils.chunking import chunk_text, chunk_document, TextChunk
+from utils.chunking import chunk_text, chunk_document, iter_chunks, TextChunk
 from utils.formatting import truncate_text, format_sources
+from agents.base_agent import BaseAgent
 
 
 class TestChunking:
@@ -54,6 +57,48 @@ class TestChunking:
         assert all("metadata" in c for c in result)
         assert result[0]["metadata"]["title"] == "Test Doc"
 
+    def test_iter_chunks_stream_token_limit(self):
+        """Test streaming chunks respect the token limit and map back to the input."""
+        import io
+
+        text = "\n\n".join(f"Paragraph {i} " + "word " * 40 for i in range(30))
+        text += "\n\n" + "x" * 3000  # one oversized "word"
+        chunks = list(iter_chunks(io.StringIO(text), max_tokens=64, overlap_tokens=0))
+        assert len(chunks) > 30
+        for chunk in chunks:
+            assert chunk.metadata["token_count"] <= 64
+            assert text[chunk.start_char:chunk.end_char].strip() == chunk.content
+
+    def test_iter_chunks_markdown_sections(self):
+        """Test Markdown chunks split at headings but not inside code fences."""
+        text = "# Guide\n\nIntro.\n\n## Install\n\n```sh\n# not a heading\n\npip install x\n```\n\n## Usage\n\nRun it.\n"
+        chunks = list(iter_chunks(text, max_tokens=200, strategy="markdown"))
+        assert [c.metadata["section"] for c in chunks] == ["Guide", "Guide > Install", "Guide > Usage"]
+        assert "# not a heading" in chunks[1].content
+
+    def test_iter_chunks_python_definitions(self):
+        """Test Python chunks split between top-level definitions, with or without the AST."""
+        body = "".join(f"    x = {i}\n" for i in range(12))
+        source = f"import os\n\n\ndef a():\n{body}\n\n# b\n@property\ndef b():\n{body}"
+        for max_ast_chars in (1_000_000, 10):
+            chunks = list(iter_chunks(
+                source, max_tokens=60, overlap_tokens=0, strategy="python", max_ast_chars=max_ast_chars,
+            ))
+            assert [c.metadata.get("symbol") for c in chunks] == ["a", "b"]
+            assert chunks[0].content.startswith("import os")
+            assert "@property\ndef b" in chunks[1].content
+            assert "".join(source[c.start_char:c.end_char] for c in chunks) == source
+
+    def test_iter_chunks_python_form_feeds(self):
+        """Test form feeds between definitions do not shift chunk boundaries."""
+        body = "".join(f"    x = {i}\n" for i in range(12))
+        source = f"def a():\n{body}\n\x0c\ndef b():\n{body}\n\x0c\ndef c():\n{body}"
+        chunks = list(iter_chunks(source, max_tokens=60, overlap_tokens=0, strategy="python"))
+        assert [c.metadata.get("symbol") for c in chunks] == ["a", "b", "c"]
+        for chunk in chunks:
+            assert chunk.content.startswith(f"def {chunk.metadata['symbol']}():")
+        assert "".join(source[c.start_char:c.end_char] for c in chunks) == source
+
 
 class TestFormatting:
     """Tests for formatting utilities."""
@@ -79,6 +124,27 @@ class TestFormatting:
         assert "..." in result
 
 
+class PidAgent(BaseAgent):
+    """Process-mode agent reporting the worker PID (module-level so it pickles)."""
+
+    execution_mode = "process"
+
+    async def process_task(self, task):
+        import os
+        return {"pid": os.getpid(), "description": task.description}
+
+    async def handle_message(self, message):
+        return None
+
+
+class FailingPidAgent(PidAgent):
+    """Process-mode agent whose tasks fail in the worker."""
+
+    async def process_task(self, task):
+        import os
+        raise ValueError(f"failed in {os.getpid()}")
+
+
 class TestAgents:
     """Tests for agent system."""
 
@@ -97,6 +163,140 @@ class TestAgents:
         assert "total_agents" in stats
         assert stats["total_agents"] == 0
 
+    @staticmethod
+    def _make_agent(agent_id, role="dev", capabilities=None):
+        from agents.base_agent import BaseAgent
+
+        class EchoAgent(BaseAgent):
+            async def process_task(self, task):
+                return {"echo": task.description}
+
+            async def handle_message(self, message):
+                return None
+
+        return EchoAgent(agent_id, agent_id, role, capabilities)
+
+    def test_agent_registry_indexes(self):
+        """Test capability/role indexes and availability tracking."""
+        from agents.agent_registry import AgentRegistry
+        from agents.base_agent import AgentTask
+        registry = AgentRegistry()
+        a = self._make_agent("@a", capabilities=["python", "sql"])
+        b = self._make_agent("@b", role="ops", capabilities=["python"])
+        registry.register(a)
+        registry.register(b)
+
+        assert registry.get_by_capability("python") == [a, b]
+        assert registry.get_by_role("ops") == [b]
+        assert len(registry.get_available()) == 2
+
+        asyncio.run(a.receive_task(AgentTask(description="work")))
+        assert registry.get_available() == [b]
+        assert registry.get_stats()["working"] == 1
+
+        asyncio.run(a.complete_task({}))
+        assert a in registry.get_available()
+
+        registry.unregister("@a")
+        assert registry.get_by_capability("sql") == []
+        assert registry.get_available() == [b]
+
+    def test_find_best_agent_scoring(self):
+        """Test capability filtering and scored selection."""
+        from agents.agent_registry import AgentRegistry
+        from agents.base_agent import AgentTask
+        registry = AgentRegistry()
+        a = self._make_agent("@a", capabilities=["python"])
+        b = self._make_agent("@b", capabilities=["python", "sql"])
+        registry.register(a)
+        registry.register(b)
+
+        task = AgentTask(required_capabilities=["sql"])
+        assert registry.find_best_agent(task) is b
+        assert registry.find_best_agent(AgentTask(required_capabilities=["go"])) is None
+
+        b.stats.record(0.1, success=False)
+        assert registry.find_best_agent(AgentTask()) is a
+
+        registry.scorer = lambda agent, task: agent.stats.tasks_failed
+        assert registry.find_best_agent(AgentTask()) is b
+
+    def test_mailbox_overflow_policies(self):
+        """Test bounded mailbox overflow handling and priority lanes."""
+        from agents.base_agent import AgentMessage
+        from agents.mailbox import Mailbox
+
+        box = Mailbox(maxsize=2, overflow_policy="drop_oldest")
+        for i in range(3):
+            box.put(AgentMessage(content=str(i)))
+        box.put(AgentMessage(type="handoff", priority="high", content="h"))
+        assert [m.content for m in box.drain()] == ["h", "1", "2"]
+        assert box.get_stats()["dropped"] == 1
+
+        box = Mailbox(maxsize=1, overflow_policy="reject")
+        assert box.put(AgentMessage(content="a"))
+        assert not box.put(AgentMessage(content="b"))
+        assert box.get_stats()["rejected"] == 1
+
+        box = Mailbox(maxsize=2, overflow_policy="coalesce")
+        box.put(AgentMessage(type="status", content="s1"))
+        box.put(AgentMessage(type="request", content="r1"))
+        box.put(AgentMessage(type="status", content="s2"))
+        assert [m.content for m in box.drain(1)] == ["s2"]
+        assert box.get_stats()["coalesced"] == 1
+
+    def test_worker_pool_runs_task_out_of_process(self):
+        """Test process-mode agents run in the worker pool."""
+        import os
+        from agents.agent_orchestrator import AgentOrchestrator
+        from agents.agent_registry import AgentRegistry
+        from agents.base_agent import AgentTask
+        from agents.worker_pool import AgentWorkerPool
+
+        pool = AgentWorkerPool(max_workers=1)
+        orchestrator = AgentOrchestrator(registry=AgentRegistry(), worker_pool=pool)
+        agent = PidAgent("@pid", "pid", "dev")
+        try:
+            result = asyncio.run(orchestrator.execute_task(agent, AgentTask(description="x")))
+            assert result["pid"] != os.getpid()
+            assert result["description"] == "x"
+            health = pool.get_health()
+            assert health["workers"][result["pid"]]["tasks"] == 1
+        finally:
+            pool.shutdown()
+
+    def test_worker_pool_charges_failures_to_worker(self):
+        """Test a task failing in a worker is counted against that worker's PID."""
+        from agents.base_agent import AgentTask
+        from agents.worker_pool import AgentWorkerPool
+
+        pool = AgentWorkerPool(max_workers=1)
+
+        async def main():
+            ok = await pool.run(PidAgent("@ok", "ok", "dev"), AgentTask(description="x"))
+            with pytest.raises(ValueError, match=f"failed in {ok['pid']}"):
+                await pool.run(FailingPidAgent("@bad", "bad", "dev"), AgentTask(description="y"))
+            return ok["pid"]
+
+        try:
+            pid = asyncio.run(main())
+            health = pool.get_health()
+            assert health["failures"] == 1
+            assert health["workers"][pid]["tasks"] == 2
+            assert health["workers"][pid]["failures"] == 1
+        finally:
+            pool.shutdown()
+
+    def test_agent_process_messages_batches(self):
+        """Test agents drain their mailbox and report its depth."""
+        from agents.base_agent import AgentMessage
+        agent = self._make_agent("@a")
+        for i in range(5):
+            agent.receive_message(AgentMessage(content=str(i)))
+        assert agent.get_state()["mailbox"]["depth"] == 5
+        asyncio.run(agent.process_messages(batch_size=2))
+        assert agent.get_state()["message_queue_size"] == 0
+
 
 class TestConfig:
     """Tests for configuration."""
@@ -114,3 +314,1322 @@ class TestConfig:
         config = get_model_config("default")
         assert isinstance(config, ModelConfig)
         assert config.llm_provider == "ollama"
+
+
+class TestSingleFlight:
+    """Tests for request coalescing."""
+
+    def test_concurrent_calls_share_one_execution(self):
+        """Test identical in-flight calls are coalesced."""
+        from core.single_flight import SingleFlight
+        group = SingleFlight()
+        runs = []
+
+        async def work():
+            runs.append(1)
+            await asyncio.sleep(0.01)
+            return [0.1, 0.2]
+
+        async def main():
+            return await asyncio.gather(*(group.do("k", work) for _ in range(5)))
+
+        results = asyncio.run(main())
+        assert len(runs) == 1
+        assert all(r == [0.1, 0.2] for r in results)
+        assert group.get_stats()["coalesced"] == 4
+        assert group.inflight == 0
+
+    def test_errors_propagate_to_all_waiters(self):
+        """Test a failing call raises in every waiter."""
+        from core.single_flight import SingleFlight
+        group = SingleFlight()
+
+        async def work():
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        async def main():
+            return await asyncio.gather(
+                *(group.do("k", work) for _ in range(3)),
+                return_exceptions=True,
+            )
+
+        results = asyncio.run(main())
+        assert all(isinstance(r, ValueError) for r in results)
+        assert group.get_stats()["errors"] == 1
+
+    def test_cancelled_waiter_does_not_cancel_others(self):
+        """Test cancellation only stops the shared call when nobody waits."""
+        from core.single_flight import SingleFlight
+        group = SingleFlight()
+
+        async def work():
+            await asyncio.sleep(0.02)
+            return "done"
+
+        async def main():
+            first = asyncio.ensure_future(group.do("k", work))
+            second = asyncio.ensure_future(group.do("k", work))
+            await asyncio.sleep(0)
+            first.cancel()
+            return await second
+
+        assert asyncio.run(main()) == "done"
+
+        async def main_all_cancelled():
+            waiter = asyncio.ensure_future(group.do("x", work))
+            await asyncio.sleep(0)
+            waiter.cancel()
+            await asyncio.sleep(0.001)
+            return group.inflight
+
+        assert asyncio.run(main_all_cancelled()) == 0
+        assert group.get_stats()["cancelled"] == 1
+
+    def test_call_after_cancellation_starts_fresh(self):
+        """Test a caller arriving while a cancelled call winds down is not cancelled."""
+        import contextlib
+        from core.single_flight import SingleFlight
+        group = SingleFlight()
+
+        async def slow_to_cancel():
+            try:
+                await asyncio.sleep(0.05)
+            except asyncio.CancelledError:
+                await asyncio.sleep(0.01)  # cleanup before the cancellation lands
+                raise
+            return "done"
+
+        async def main():
+            waiter = asyncio.ensure_future(group.do("k", slow_to_cancel))
+            await asyncio.sleep(0)
+            waiter.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await waiter
+            return await group.do("k", slow_to_cancel)
+
+        assert asyncio.run(main()) == "done"
+        assert group.get_stats()["executions"] == 2
+        assert group.get_stats()["cancelled"] == 1
+
+
+class TestMicroBatching:
+    """Tests for embedding micro-batching."""
+
+    def test_batcher_splits_by_size(self):
+        """Test items are grouped up to max_batch_size per call."""
+        from core.micro_batcher import MicroBatcher
+        calls = []
+
+        async def double(items):
+            calls.append(list(items))
+            return [i * 2 for i in items]
+
+        batcher = MicroBatcher(double, max_batch_size=4, max_wait_ms=5)
+
+        async def main():
+            return await asyncio.gather(*(batcher.submit(i) for i in range(10)))
+
+        assert asyncio.run(main()) == [i * 2 for i in range(10)]
+        assert [len(c) for c in calls] == [4, 4, 2]
+        assert batcher.get_stats()["batches"] == 3
+
+    def test_batcher_propagates_errors(self):
+        """Test a failed batch fails every caller in it."""
+        from core.micro_batcher import MicroBatcher
+
+        async def fail(items):
+            raise RuntimeError("model down")
+
+        batcher = MicroBatcher(fail, max_batch_size=8, max_wait_ms=1)
+
+        async def main():
+            return await asyncio.gather(
+                *(batcher.submit(i) for i in range(3)),
+                return_exceptions=True,
+            )
+
+        assert all(isinstance(r, RuntimeError) for r in asyncio.run(main()))
+
+    def test_embedding_service_batches_concurrent_calls(self):
+        """Test concurrent embed() calls reach the model as one request."""
+        import httpx
+        import json as jsonlib
+        from core.embedding_service import EmbeddingService
+        from core.http_pool import HTTPClientRegistry
+        from core.single_flight import SingleFlight
+        requests_seen = []
+
+        def handler(request):
+            body = jsonlib.loads(request.content)
+            requests_seen.append(body)
+            return httpx.Response(
+                200, json={"embeddings": [[float(len(t))] for t in body["input"]]}
+            )
+
+        async def main():
+            registry = HTTPClientRegistry(transport=httpx.MockTransport(handler))
+            service = EmbeddingService(
+                single_flight=SingleFlight(),
+                micro_batch=True,
+                max_batch_wait_ms=5,
+                http_registry=registry,
+            )
+            try:
+                return await asyncio.gather(*(service.embed("x" * n) for n in range(1, 6)))
+            finally:
+                await registry.aclose()
+
+        assert asyncio.run(main()) == [[1.0], [2.0], [3.0], [4.0], [5.0]]
+        assert len(requests_seen) == 1
+
+    def test_embedding_service_falls_back_without_embed_endpoint(self):
+        """Test servers without /api/embed get per-text requests, normalized to match."""
+        import httpx
+        from core.embedding_service import EmbeddingService
+        from core.http_pool import HTTPClientRegistry
+        from core.single_flight import SingleFlight
+        paths = []
+
+        def handler(request):
+            paths.append(request.url.path)
+            if request.url.path == "/api/embed":
+                return httpx.Response(404, text="404 page not found")
+            return httpx.Response(200, json={"embedding": [3.0, 4.0]})
+
+        async def main():
+            registry = HTTPClientRegistry(transport=httpx.MockTransport(handler))
+            service = EmbeddingService(
+                single_flight=SingleFlight(), micro_batch=False, http_registry=registry,
+            )
+            try:
+                return await service.embed("a"), await service.embed_batch(["b", "c"])
+            finally:
+                await registry.aclose()
+
+        single, batch = asyncio.run(main())
+        assert single == [0.6, 0.8]
+        assert batch == [[0.6, 0.8], [0.6, 0.8]]
+        assert paths == ["/api/embed"] + ["/api/embeddings"] * 3
+
+
+class TestHTTPPool:
+    """Tests for the shared HTTP client registry."""
+
+    def test_clients_shared_per_host(self):
+        """Test services on the same host share one client and its metrics."""
+        import httpx
+        from core.http_pool import HTTPClientRegistry
+        registry = HTTPClientRegistry(
+            transport=httpx.MockTransport(lambda request: httpx.Response(200, json={}))
+        )
+
+        async def main():
+            a = registry.get_client("http://localhost:11434/api/embed")
+            b = registry.get_client("http://localhost:11434/api/generate")
+            c = registry.get_client("https://api.openai.com/v1/embeddings")
+            assert a is b
+            assert a is not c
+            await a.post("http://localhost:11434/api/embed", json={})
+            await b.post("http://localhost:11434/api/generate", json={})
+            await registry.aclose()
+
+        asyncio.run(main())
+        host = registry.get_stats()["hosts"]["http://localhost:11434"]
+        assert host["requests"] == 2
+        assert host["in_flight"] == 0
+
+
+class TestAsyncVectorStore:
+    """Tests for the async vector store facade."""
+
+    def test_batched_writes_and_queries(self, tmp_path):
+        """Test concurrent writes are batched and reads run off the loop."""
+        pytest.importorskip("chromadb")
+        from core.vector_store import VectorStore, AsyncVectorStore
+
+        store = AsyncVectorStore(
+            VectorStore(collection_name="test", persist_directory=str(tmp_path)),
+            write_batch_wait_ms=5,
+        )
+
+        async def main():
+            ids = await asyncio.gather(*(
+                store.add(f"doc {i}", [float(i == j) for j in range(4)], {"n": i})
+                for i in range(4)
+            ))
+            results = await store.query([1.0, 0.0, 0.0, 0.0], top_k=1)
+            await asyncio.gather(*(store.update(doc_id, metadata={"n": 9}) for doc_id in ids))
+            updated = await store.get_by_id(ids[2])
+            await asyncio.gather(store.delete(ids[:2]), store.delete(ids[1:3]))
+            return ids, results, updated
+
+        try:
+            ids, results, updated = asyncio.run(main())
+        finally:
+            store.close()
+
+        assert results[0].id == ids[0]
+        assert updated.metadata["n"] == 9
+        assert store.count == 1
+        stats = store.get_stats()
+        assert stats["adds"]["batches"] == 1
+        assert stats["updates"]["batches"] == 1
+        assert stats["deletes"]["batches"] == 1
+
+    def test_pipeline_closes_store_it_wraps(self, tmp_path):
+        """Test RAGPipeline.close finishes queued writes and closes only a facade it created."""
+        pytest.importorskip("chromadb")
+        from core.rag_pipeline import RAGPipeline
+        from core.vector_store import VectorStore, AsyncVectorStore
+
+        store = VectorStore(collection_name="test", persist_directory=str(tmp_path))
+        owned = RAGPipeline(vector_store=store)
+        shared = AsyncVectorStore(store)
+        borrowed = RAGPipeline(vector_store=shared)
+
+        async def main():
+            write = asyncio.ensure_future(owned.vector_store.add("doc", [1.0, 0.0], doc_id="d"))
+            await asyncio.sleep(0)  # queued in the write batcher
+            await owned.close()
+            await borrowed.close()
+            return write.done(), shared._executor._shutdown
+
+        try:
+            assert asyncio.run(main()) == (True, False)
+        finally:
+            shared.close()
+        assert store.count == 1
+        assert owned.vector_store._executor._shutdown
+
+    def test_memory_system_close_drains_writes(self, tmp_path):
+        """Test MemorySystem counts off the loop and finishes queued writes on close."""
+        pytest.importorskip("chromadb")
+        from core.memory_system import MemorySystem
+        from core.shared_state import SharedState
+
+        state = SharedState(str(tmp_path / "state.db"))
+        memory = MemorySystem(
+            collection_name="test", persist_directory=str(tmp_path), shared_state=state,
+        )
+
+        async def main():
+            before = await memory.get_count()
+            write = asyncio.ensure_future(memory.vector_store.add("doc", [1.0, 0.0], doc_id="d"))
+            await asyncio.sleep(0)  # queued in the write batcher
+            await memory.close()
+            return before, write.done()
+
+        try:
+            assert asyncio.run(main()) == (0, True)
+        finally:
+            state.close()
+        assert memory.count == 1
+        assert memory.vector_store._executor._shutdown
+
+
+class TestIncrementalIndexing:
+    """Tests for diff-based reindexing."""
+
+    def test_reindex_embeds_only_changed_chunks(self, tmp_path):
+        """Test unchanged files are skipped and vanished chunks are deleted."""
+        pytest.importorskip("chromadb")
+        from core.ingest import ChunkManifest, IncrementalIndexer, chunk_id, content_hash
+        from core.shared_state import SharedState
+        from core.vector_store import VectorStore
+
+        class CountingEmbedding:
+            def __init__(self):
+                self.embedded = 0
+
+            async def embed_batch(self, texts):
+                self.embedded += len(texts)
+                return [[float(len(t)), 1.0, 0.0] for t in texts]
+
+        docs = tmp_path / "docs"
+        docs.mkdir()
+        for name in ("a", "b"):
+            (docs / f"{name}.md").write_text(
+                "".join(f"## {name} {i}\n\nbody {name} {i}\n\n" for i in range(3))
+            )
+
+        embedding = CountingEmbedding()
+        state = SharedState(str(tmp_path / "state.db"))
+        store = VectorStore(collection_name="test", persist_directory=str(tmp_path / "chroma"))
+        indexer = IncrementalIndexer(
+            embedding_service=embedding,
+            vector_store=store,
+            manifest=ChunkManifest(state, "test"),
+            max_tokens=32,
+        )
+        paths = lambda: sorted(docs.glob("*.md"))
+
+        try:
+            first = asyncio.run(indexer.reindex_paths(paths())).to_dict()
+            assert first["added"] == 6 and embedding.embedded == 6
+
+            # Same ids for same content: nothing is embedded again
+            again = asyncio.run(indexer.reindex_paths(paths())).to_dict()
+            assert again["skipped"] == 2 and embedding.embedded == 6
+
+            (docs / "a.md").write_text("## a 0\n\nbody a 0\n\n## a 1\n\nedited\n\n")
+            (docs / "b.md").unlink()
+            report = asyncio.run(indexer.reindex_paths(paths(), prune=True)).to_dict()
+            assert (report["added"], report["removed"], report["unchanged"]) == (1, 5, 1)
+            assert embedding.embedded == 7
+            assert store.count == 2
+
+            kept = store.get_by_id(chunk_id(str(docs / "a.md"), content_hash("## a 0\n\nbody a 0")))
+            assert kept.metadata["section"] == "a 0"
+        finally:
+            indexer.vector_store.close()
+            state.close()
+
+    def test_manifest_is_scoped_to_collection(self, tmp_path):
+        """Test a source indexed into two collections is tracked and pruned separately."""
+        pytest.importorskip("chromadb")
+        from core.ingest import ChunkManifest, IncrementalIndexer
+        from core.shared_state import SharedState
+        from core.vector_store import VectorStore
+
+        class FixedEmbedding:
+            async def embed_batch(self, texts):
+                return [[float(len(t)), 1.0, 0.0] for t in texts]
+
+        doc = tmp_path / "doc.md"
+        doc.write_text("## a\n\nbody a\n\n## b\n\nbody b\n\n")
+        state = SharedState(str(tmp_path / "state.db"))
+        indexers = [
+            IncrementalIndexer(
+                embedding_service=FixedEmbedding(),
+                vector_store=VectorStore(collection_name=name, persist_directory=str(tmp_path / name)),
+                manifest=ChunkManifest(state, name),
+                max_tokens=32,
+            )
+            for name in ("first", "second")
+        ]
+
+        try:
+            for indexer in indexers:
+                report = asyncio.run(indexer.reindex_paths([doc])).to_dict()
+                assert (report["skipped"], report["added"]) == (0, 2)
+                assert indexer.vector_store.count == 2
+
+            report = asyncio.run(indexers[1].reindex_paths([], prune=True)).to_dict()
+            assert report["removed"] == 2
+            assert indexers[1].vector_store.count == 0
+            assert indexers[0].vector_store.count == 2
+            assert indexers[0].manifest.sources() == [str(doc)]
+        finally:
+            for indexer in indexers:
+                indexer.vector_store.close()
+            state.close()
+
+
+class TestTransformerCache:
+    """Tests for the transformer result caches."""
+
+    def test_lru_eviction_ttl_and_stats(self):
+        """Test LRU order, lazy expiry and counters."""
+        from transformers.components.lru_cache import LRUCache
+
+        now = [0.0]
+        cache = LRUCache(max_entries=2, ttl_seconds=10, clock=lambda: now[0])
+        cache.put("a", [1, 2, 3])
+        cache.put("b", "bee")
+        assert cache.get("a") == [1, 2, 3]  # "b" is now least recently used
+        cache.put("c", "sea")
+        assert "b" not in cache and cache.get("b") is None
+        now[0] = 11.0
+        assert cache.get("a") is None
+
+        stats = cache.get_stats()
+        assert (stats["hits"], stats["misses"], stats["evictions"], stats["expirations"]) == (1, 2, 1, 1)
+        assert stats["entries"] == 1 and stats["memory_bytes"] > 0
+        assert cache.purge_expired() == 1
+        assert cache.memory_bytes == 0
+
+    def test_dual_transformer_cached_results_are_not_shared_mutably(self):
+        """Test a cache hit returns a CACHED copy and leaves the first result alone."""
+        import dataclasses
+        import pickle
+        from transformers.dual_transformer import DualTransformer, ProcessingStatus
+
+        dual = DualTransformer(max_cache_size=8)
+        source = "def add(a, b):\n    return a + b\n"
+        first = dual.process(source)
+        second = dual.process(source)
+
+        assert first.status == ProcessingStatus.SUCCESS
+        assert second.status == ProcessingStatus.CACHED
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            second.status = ProcessingStatus.SUCCESS
+
+        # Each hit owns its containers, and converts like a miss
+        first.metadata["language"] = "go"
+        second.metadata["language"] = "go"
+        second.token_result.tokens.clear()
+        third = dual.process(source)
+        assert third.metadata["language"] == "python"
+        assert len(third.token_result.tokens) == len(first.token_result.tokens)
+        assert dataclasses.asdict(third)["metadata"] == third.metadata
+        assert pickle.loads(pickle.dumps(third)).metadata == third.metadata
+        assert dual.get_metrics()["cache"]["hits"] == 2
+
+    def test_token_caches_keyed_by_language(self):
+        """Test the tokenizer and transformer caches include the language in their key."""
+        from transformers.token_transformer import TokenTransformer
+
+        transformer = TokenTransformer()
+        code = "def fetch_token(url):\n    return url\n"
+        python_tokens = transformer.tokenizer.tokenize(code, "python")
+        other_tokens = transformer.tokenizer.tokenize(code, "javascript")
+        assert python_tokens is not other_tokens
+        assert transformer.tokenizer.tokenize(code, "python") is python_tokens
+
+        first = transformer.process(code, "python")
+        assert transformer.process(code, "javascript") is not first
+        assert transformer.process(code, "python") is first
+
+    def test_token_cache_memory_bounded_under_unique_inputs(self):
+        """Test memory stays flat while every request is a new input."""
+        import gc
+        import tracemalloc
+        from transformers.token_transformer import TokenTransformer
+
+        max_bytes = 512 * 1024
+        transformer = TokenTransformer(cache_size=10_000, cache_max_bytes=max_bytes)
+
+        def run(start, n):
+            for i in range(start, start + n):
+                transformer.process(f"def handler_{i}(request):\n    return request.get('token_{i}')\n")
+
+        tracemalloc.start()
+        try:
+            run(0, 400)  # fill the caches
+            gc.collect()
+            baseline = tracemalloc.get_traced_memory()[0]
+            samples = []
+            for block in range(1, 5):
+                run(block * 400, 400)
+                gc.collect()
+                samples.append(tracemalloc.get_traced_memory()[0] - baseline)
+        finally:
+            tracemalloc.stop()
+
+        stats = transformer.get_metrics()
+        assert stats["cache"]["memory_bytes"] <= max_bytes
+        assert stats["tokenizer_cache"]["memory_bytes"] <= max_bytes // 2
+        assert stats["cache"]["evictions"] > 0
+        # 1600 more unique inputs after the caches filled: no growth trend
+        assert max(samples) < 256 * 1024, samples
+
+
+class TestKeywordMatcher:
+    """Tests for the compiled keyword matcher."""
+
+    def test_first_category_keeps_precedence(self):
+        """Test categorization matches the previous chain of substring scans."""
+        from transformers.components.smart_tokenizer import SmartTokenizer, TokenCategory
+
+        tokenizer = SmartTokenizer()
+        groups = [
+            (TokenCategory.API, tokenizer.API_INDICATORS),
+            (TokenCategory.SECURITY, tokenizer.SECURITY_INDICATORS),
+            (TokenCategory.DATA, tokenizer.DATA_INDICATORS),
+        ]
+
+        def scan(name):
+            lower = name.lower()
+            for category, indicators in groups:
+                if any(indicator in lower for indicator in indicators):
+                    return category
+            return TokenCategory.GENERAL
+
+        names = ["get_user_token", "hash_password", "parse_csv", "DBSession", "tokenize",
+                 "x", "", "update_record", "load_database", "AuthClient", "compute"]
+        for name in names:
+            assert tokenizer._categorize_name(name) == scan(name), name
+        # "delete" is both an API and a data indicator: API wins
+        assert tokenizer._categorize_name("delete_row") == TokenCategory.API
+
+    def test_finditer_reports_overlapping_positions(self):
+        """Test every occurrence is found, overlapping and shared keywords included."""
+        from utils.keyword_matcher import KeywordMatcher
+
+        matcher = KeywordMatcher({"a": ["db", "database"], "b": ["base", "DB"]})
+        matches = sorted(matcher.finditer("my_Database.db"))
+        assert matches == sorted([
+            ("database", "a", 3, 11), ("db", "a", 12, 14), ("DB", "b", 12, 14), ("base", "b", 7, 11),
+        ])
+        assert matcher.found("database") == {"a": {"database"}, "b": {"base"}}
+        assert matcher.first_category("BASE") == "b"
+        assert matcher.first_category("none", default="-") == "-"
+        assert not matcher.contains_any("none")
+
+    def test_threat_patterns_located(self):
+        """Test threat detection reports each pattern as listed, at its position."""
+        from ml.supervised.threat_detector import ThreatDetector, ThreatType
+
+        text = "x.INNERHTML = '<script>'"
+        found = {(t.pattern, t.threat_type, t.location) for t in ThreatDetector()._detect_patterns(text)}
+        assert ("innerHTML", ThreatType.XSS, (2, 11)) in found
+        assert ("<script", ThreatType.XSS, (15, 22)) in found
+
+
+class TestSmartTokenizer:
+    """Tests for AST token extraction."""
+
+    def test_every_assignment_target_extracted(self):
+        """Test chained and unpacked targets each become a token at their own position."""
+        from transformers.components.smart_tokenizer import SmartTokenizer
+
+        tokens = SmartTokenizer().tokenize("a = b = 1\nx, (y, *rest) = data\nself.url = u\n")
+        targets = [(t.value, t.line_number, t.column) for t in tokens if t.context == "assignment"]
+        assert targets == [("a", 1, 0), ("b", 1, 4), ("x", 2, 0), ("y", 2, 4), ("rest", 2, 8), ("self.url", 3, 0)]
+
+    def test_deeply_nested_expression(self):
+        """Test extraction does not recurse per nesting level."""
+        from transformers.components.smart_tokenizer import SmartTokenizer
+
+        code = "total = " + " + ".join(f"f{i}()" for i in range(2000)) + "\n"
+        tokens = SmartTokenizer().tokenize(code)
+        assert len([t for t in tokens if t.context == "function_call"]) == 2000
+
+    def test_incremental_retokenizes_changed_statements_only(self):
+        """Test a resubmitted document matches a full pass and reuses unchanged statements."""
+        from transformers.components.smart_tokenizer import SmartTokenizer
+
+        def fields(tokens):
+            return [(t.value, t.category, t.line_number, t.column, t.context, t.metadata) for t in tokens]
+
+        functions = [f"def handler_{i}(request):\n    return fetch_data(request)\n" for i in range(10)]
+        code = '"""Module.\n\ndef not_code():\n"""\nimport os\n\n@route("/x")\n' + "\n".join(functions)
+        tokenizer = SmartTokenizer()
+        assert fields(tokenizer.tokenize(code, document_id="app.py")) == fields(tokenizer.tokenize(code))
+
+        edited = code.replace("import os\n", "import os\nimport sys\n\n").replace(
+            "def handler_3(request):", "def handler_3(request, token):"
+        )
+        tokenizer.segments_reused = tokenizer.segments_tokenized = 0
+        incremental = tokenizer.tokenize(edited, document_id="app.py")
+        assert fields(incremental) == fields(SmartTokenizer().tokenize(edited))
+        assert tokenizer.segments_tokenized == 2  # the new import and handler_3
+        assert tokenizer.get_cache_stats()["segments_reused"] == 11
+
+
+class TestAttention:
+    """Tests for multi-head attention."""
+
+    @staticmethod
+    def _tokens(n):
+        from transformers.components.smart_tokenizer import Token, TokenCategory
+
+        categories = list(TokenCategory)
+        return [
+            Token(value=f"name_{i % 13}", category=categories[i % len(categories)],
+                  clarity_score=(i % 10) / 10, line_number=i, column=0)
+            for i in range(n)
+        ]
+
+    def test_blocked_multi_head_matches_full_attention(self):
+        """Test query blocks give the same result as one (heads, n, n) computation."""
+        import numpy as np
+        from transformers.components.multi_head_attention import MultiHeadAttention
+
+        tokens = self._tokens(50)
+        attention = MultiHeadAttention(embedding_dim=32, num_heads=4, block_size=7)
+        embeddings = attention.embed_tokens(tokens)
+        assert embeddings.dtype == np.float32 and embeddings.shape == (50, 32)
+
+        heads = [attention._split_heads(embeddings @ w) for w in (attention.W_q, attention.W_k, attention.W_v)]
+        assert heads[0].shape == (4, 50, 8)
+        reference, weights = attention.attention(*heads)
+        expected = reference.transpose(1, 0, 2).reshape(50, 32) @ attention.W_o
+
+        output, received, _ = attention._multi_head(embeddings)
+        assert np.allclose(output, expected, atol=1e-5)
+        assert np.allclose(received, weights.mean(axis=(0, 1)), atol=1e-6)
+        assert np.allclose(attention.get_attention_matrix(tokens), weights.mean(axis=0), atol=1e-6)
+
+        result = attention.forward(tokens)
+        assert abs(sum(w for _, w in result.weighted_tokens) - 1.0) < 1e-4
+        assert 0.0 <= result.confidence <= 1.0
+
+    def test_windowed_attention_stays_local(self):
+        """Test windowed mode attends only to nearby tokens."""
+        import numpy as np
+        from transformers.components.multi_head_attention import MultiHeadAttention
+
+        tokens = self._tokens(40)
+        weights = MultiHeadAttention(window=3, block_size=8).get_attention_matrix(tokens)
+        offsets = np.abs(np.arange(40)[:, None] - np.arange(40)[None, :])
+        assert np.all(weights[offsets > 3] == 0)
+        assert np.all(weights[offsets <= 3] > 0)
+        assert np.allclose(weights.sum(axis=1), 1.0, atol=1e-5)
+
+    def test_name_hash_is_stable(self):
+        """Test name hashes come from the characters, not the per-process hash() seed."""
+        from transformers.components.multi_head_attention import MultiHeadAttention
+
+        def expected(name):
+            return sum(ord(c) * 1000003 ** i for i, c in enumerate(name)) % 2 ** 64 % 1000 / 1000
+
+        names = ["fetch_user", "token", ""]
+        hashes = MultiHeadAttention()._name_hashes(names).tolist()
+        assert hashes == pytest.approx([expected(name) for name in names])
+
+
+class TestBatchProcessing:
+    """Tests for batch processing in the transformers."""
+
+    SNIPPETS = [
+        "import requests\n\ndef fetch(url):\n    return requests.get(url)\n",
+        "password = get_password()\nauth_token = login(password)\n",
+        "rows = db.query('select 1')\n",
+        "x = 1\n",
+        "",
+        "def broken(:\n",
+        "class Handler:\n    def handle(self, request):\n    " + "    value = request.data\n    " * 300,
+    ]
+
+    def test_token_batch_matches_single_processing(self):
+        """Test process_batch gives process()'s routing, confidence and metrics."""
+        import numpy as np
+        from transformers.token_transformer import TokenTransformer
+
+        inputs = self.SNIPPETS + self.SNIPPETS[:2]
+        single, batched = TokenTransformer(), TokenTransformer()
+        expected = [single.process(text) for text in inputs]
+        results = batched.process_batch(inputs)
+
+        assert results[-2] is results[0]  # repeats are processed once
+        for want, got in zip(expected, results):
+            assert got.original_input == want.original_input
+            assert got.routing_decision.route_type == want.routing_decision.route_type
+            assert got.routing_decision.indicators == want.routing_decision.indicators
+            assert got.routing_decision.metadata["category_summary"] == want.routing_decision.metadata["category_summary"]
+            assert got.confidence == pytest.approx(want.confidence, abs=1e-6)
+            assert np.allclose(got.attention_output.context_vector, want.attention_output.context_vector, atol=1e-5)
+        assert batched.get_metrics()["total_processed"] == single.get_metrics()["total_processed"] == len(self.SNIPPETS)
+        for key in ("hits", "misses"):
+            assert batched.get_metrics()["cache"][key] == single.get_metrics()["cache"][key]
+
+        # Everything is cached now
+        assert [r.original_input for r in batched.process_batch(inputs[::-1])] == inputs[::-1]
+        assert batched.get_metrics()["total_processed"] == len(self.SNIPPETS)
+
+    def test_dual_batch_caches_and_counts_per_item(self):
+        """Test DualTransformer.process_batch keeps per-item caching and metrics."""
+        from transformers.dual_transformer import DualTransformer, ProcessingStatus
+
+        inputs = self.SNIPPETS[:4] + self.SNIPPETS[:1]
+        single, batched = DualTransformer(), DualTransformer()
+        expected = [single.process(text, bypass_security=True) for text in inputs]
+        results = batched.process_batch(inputs, bypass_security=True)
+
+        assert [r.status for r in results] == [r.status for r in expected]
+        assert results[-1].status == ProcessingStatus.CACHED
+        assert [r.final_route for r in results] == [r.final_route for r in expected]
+        for key in ("total_requests", "cache_hits", "token_only"):
+            assert batched._metrics[key] == single._metrics[key]
+
+        again = batched.process_batch(inputs[:2], bypass_security=True)
+        assert all(r.status == ProcessingStatus.CACHED for r in again)
+        assert batched._metrics["cache_hits"] == single._metrics["cache_hits"] + 2
+
+
+class TestParallelTokenization:
+    """Tests for tokenization in worker processes."""
+
+    SOURCES = [
+        "import os\nfrom api import client\n\nclass Auth(Base):\n    def login(self, password):\n        return client.post(url)\n",
+        "a, (b, *c) = fetch_data()\n",
+        "def broken(:\n",
+        "",
+    ]
+
+    def test_token_batch_round_trip(self):
+        """Test TokenBatch packs and unpacks token lists unchanged."""
+        import pickle
+        from transformers.components.smart_tokenizer import SmartTokenizer, TokenBatch
+
+        tokenizer = SmartTokenizer()
+        for source in self.SOURCES:
+            tokens = tokenizer.tokenize(source)
+            batch = pickle.loads(pickle.dumps(TokenBatch.from_tokens(tokens)))
+            assert len(batch) == len(tokens)
+            assert batch.to_tokens() == tokens
+
+    def test_pool_tokenizes_like_the_parent_and_caches_there(self):
+        """Test worker-process tokenization gives the same tokens, cached in the parent."""
+        from transformers.components.smart_tokenizer import SmartTokenizer
+        from transformers.token_transformer import TokenTransformer
+
+        expected = [SmartTokenizer().tokenize(source) for source in self.SOURCES]
+        transformer = TokenTransformer(workers=2)
+        try:
+            results = transformer.process_batch(self.SOURCES)
+            assert [r.tokens for r in results] == expected
+            stats = transformer.get_metrics()["tokenizer_pool"]
+            assert sum(w["sources"] for w in stats["workers"].values()) == len(self.SOURCES)
+
+            transformer.clear_cache()
+            transformer.process_batch(self.SOURCES)
+            assert transformer.tokenizer.get_cache_stats()["hits"] == 0
+            assert transformer.tokenizer.tokenize_batch(self.SOURCES, pool=transformer.pool) == expected
+            assert transformer.tokenizer.get_cache_stats()["hits"] == len(self.SOURCES)
+        finally:
+            transformer.shutdown()
+
+
+class TestCompactTokens:
+    """Tests for the compact token representations."""
+
+    SOURCE = (
+        "import os\n\nclass Client(Base):\n    def fetch(self, url):\n"
+        "        token = auth(url, key)\n        data = query(token)\n        return send(data)\n"
+    )
+
+    def test_tokens_are_slotted_and_share_metadata(self):
+        """Test tokens have no __dict__ and common metadata is one shared mapping."""
+        from transformers.components.smart_tokenizer import SmartTokenizer
+
+        tokens = SmartTokenizer().tokenize(self.SOURCE * 2)
+        assert not hasattr(tokens[0], "__dict__")
+        calls = [t for t in tokens if t.context == "function_call" and t.metadata["arg_count"] == 1]
+        assigns = [t for t in tokens if t.context == "assignment"]
+        assert len(calls) == 4 and calls[0].metadata is calls[-1].metadata
+        assert assigns[0].metadata == {} and assigns[0].metadata is assigns[-1].metadata
+        with pytest.raises(TypeError):
+            assigns[0].metadata["x"] = 1
+
+    def test_tokens_pickle_copy_and_convert(self):
+        """Test tokens with shared metadata survive pickle, deepcopy and asdict."""
+        import copy
+        import dataclasses
+        import pickle
+        from transformers.token_transformer import TokenTransformer
+
+        result = TokenTransformer().process(self.SOURCE)
+        assert pickle.loads(pickle.dumps(result)).tokens == result.tokens
+        assert copy.deepcopy(result.tokens) == result.tokens
+        as_dicts = [dataclasses.asdict(t) for t in result.tokens]
+        assert {"arg_count": 2} in [d["metadata"] for d in as_dicts]
+        call = next(t for t in pickle.loads(pickle.dumps(result.tokens)) if t.context == "function_call")
+        with pytest.raises(TypeError):
+            call.metadata["x"] = 1
+
+    def test_consumers_accept_token_batches(self):
+        """Test category summary and filters give the same answers for a TokenBatch."""
+        from transformers.components.smart_tokenizer import SmartTokenizer, TokenBatch, TokenCategory
+
+        tokenizer = SmartTokenizer()
+        tokens = tokenizer.tokenize(self.SOURCE)
+        batch = TokenBatch.from_tokens(tokens)
+        assert len(batch.metadata) < len(tokens)  # distinct metadata only
+
+        summary = tokenizer.get_category_summary(batch)
+        assert summary == tokenizer.get_category_summary(tokens)
+        assert list(summary) == list(tokenizer.get_category_summary(tokens))
+        for category in TokenCategory:
+            selected = tokenizer.filter_by_category(batch, category)
+            assert isinstance(selected, TokenBatch)
+            assert selected.to_tokens() == tokenizer.filter_by_category(tokens, category)
+        for threshold in (0, 0.7, 1):
+            high = tokenizer.get_high_clarity_tokens(batch, threshold)
+            assert high.to_tokens() == tokenizer.get_high_clarity_tokens(tokens, threshold)
+
+
+class _Clock:
+    """Settable clock for time-dependent tests."""
+
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class TestRateLimiter:
+    """Tests for the lock-striped rate limiter."""
+
+    def _limiter(self, algorithm, clock, **kwargs):
+        from transformers.components.rate_limiter import RateLimiter
+
+        return RateLimiter(3, 10, cleanup_interval=5, algorithm=algorithm,
+                           background_cleanup=False, clock=clock, **kwargs)
+
+    def test_sliding_windows_do_not_reset_at_window_edges(self):
+        """Test the sliding algorithms keep counting requests across a window boundary."""
+        from transformers.components.rate_limiter import RateLimitAlgorithm
+
+        for algorithm in (RateLimitAlgorithm.SLIDING_LOG, RateLimitAlgorithm.SLIDING_COUNTER):
+            clock = _Clock()
+            limiter = self._limiter(algorithm, clock)
+            clock.now += 9
+            assert [limiter.allow_request("a") for _ in range(4)] == [True, True, True, False]
+
+            # A fixed window would start over here
+            clock.now += 2
+            assert not limiter.allow_request("a")
+            assert limiter.get_retry_after("a") > 0
+
+            clock.now += 10
+            assert limiter.allow_request("a")
+
+        clock = _Clock()
+        fixed = self._limiter(RateLimitAlgorithm.FIXED_WINDOW, clock)
+        assert [fixed.allow_request("a") for _ in range(4)] == [True, True, True, False]
+        clock.now += 10
+        assert fixed.allow_request("a")
+
+    def test_token_bucket_allows_burst_then_refills_evenly(self):
+        """Test GCRA allows max_requests at once, then one per window / max_requests."""
+        from transformers.components.rate_limiter import RateLimitAlgorithm
+
+        clock = _Clock()
+        limiter = self._limiter(RateLimitAlgorithm.TOKEN_BUCKET, clock)
+        assert [limiter.allow_request("a") for _ in range(4)] == [True, True, True, False]
+        assert limiter.get_remaining("a") == 0
+        assert abs(limiter.get_retry_after("a") - 10 / 3) < 1e-6
+
+        clock.now += 10 / 3
+        assert [limiter.allow_request("a") for _ in range(2)] == [True, False]
+        assert limiter.get_remaining("b") == 3
+
+    def test_time_wheel_sweep_removes_only_expired_clients(self):
+        """Test sweep drops clients whose limit has reset and keeps active ones."""
+        from transformers.components.rate_limiter import RateLimitAlgorithm
+
+        clock = _Clock()
+        limiter = self._limiter(RateLimitAlgorithm.SLIDING_LOG, clock, stripes=4)
+        for i in range(20):
+            limiter.allow_request(f"idle-{i}")
+        clock.now += 8
+        limiter.allow_request("active")
+        assert limiter.sweep() == 0
+
+        clock.now += 7  # idle clients' windows are over, "active" has 1s left
+        assert limiter.sweep() == 20
+        assert limiter.get_stats()["tracked_clients"] == 1
+        assert limiter.get_client_info("active")["request_count"] == 1
+
+        clock.now += 10
+        assert limiter.sweep() == 1
+        assert limiter.get_stats()["tracked_clients"] == 0
+
+    def test_time_wheel_keeps_clients_expiring_beyond_one_turn(self):
+        """Test clients due more than a wheel turn ahead survive sweeps until they expire."""
+        from transformers.components.rate_limiter import RateLimiter
+
+        clock = _Clock()
+        limiter = RateLimiter(max_requests=10, window_seconds=3600, cleanup_interval=1,
+                              background_cleanup=False, clock=clock)
+        limiter.allow_request("a")
+        assert limiter.WHEEL_SLOTS * limiter.cleanup_interval < limiter.window_seconds
+        # The sliding counter keeps an entry for two windows
+        for _ in range(2 * 3600 - 10):
+            clock.now += 1
+            limiter.sweep()
+        assert limiter.get_client_info("a")["request_count"] == 1
+
+        for _ in range(20):
+            clock.now += 1
+            limiter.sweep()
+        assert limiter.get_stats()["tracked_clients"] == 0
+
+
+class TestAsyncGateway:
+    """Tests for the gateway's non-blocking rate limit and auth checks."""
+
+    def test_authorize_matches_full_assessment(self):
+        """Test permission bitmask checks give the same decisions as assess_request_security."""
+        from transformers.components.auth_manager import AuthManager, SecurityLevel
+
+        auth = AuthManager()
+        tokens = [auth.generate_token(f"user-{level.value}", security_level=level).token_id
+                  for level in SecurityLevel]
+        tokens.append(auth.generate_token("custom", permissions={"deploy"}).token_id)
+        revoked = auth.generate_token("gone").token_id
+        auth.revoke_token(revoked)
+
+        for required, level in [
+            (set(), SecurityLevel.AUTHENTICATED),
+            ({"write:admin"}, SecurityLevel.ELEVATED),
+            ({"deploy", "unknown"}, SecurityLevel.PUBLIC),
+            ({"deploy"}, SecurityLevel.AUTHENTICATED),
+        ]:
+            mask = auth.permission_mask(required)
+            for token_id in tokens + [revoked, "missing"]:
+                assessment = auth.assess_request_security(token_id, required, level)
+                denied = auth.authorize(token_id, mask, level)
+                assert denied == (None if assessment["allowed"] else assessment["reason"])
+
+        missing = auth.assess_request_security(tokens[-1], {"deploy", "unknown"}, SecurityLevel.PUBLIC)
+        assert missing["missing_permissions"] == ["unknown"]
+
+    def test_async_limiter_in_gateway(self):
+        """Test the gateway limits per client on the loop and acquire waits for capacity."""
+        from transformers.components.auth_manager import SecurityLevel
+        from transformers.components.api_gateway import APIGateway, APIRequest, HTTPMethod
+        from transformers.components.rate_limiter import AsyncRateLimiter, RateLimitAlgorithm
+        import time
+
+        gateway = APIGateway()
+        admin = gateway.auth_manager.generate_token("admin", security_level=SecurityLevel.ADMIN).token_id
+        user = gateway.auth_manager.generate_token("user").token_id
+
+        async def handler(request):
+            return "ok"
+
+        gateway.register_endpoint("/users", HTTPMethod.DELETE, handler, required_permissions={"manage:users"},
+                                  security_level=SecurityLevel.AUTHENTICATED, rate_limit=2)
+
+        async def main():
+            request = APIRequest("/users", HTTPMethod.DELETE, {}, client_id="a")
+            codes = [(await gateway.handle_request(request, token)).status_code for token in (admin, user, admin)]
+            other = await gateway.handle_request(APIRequest("/users", HTTPMethod.DELETE, {}, client_id="b"), admin)
+
+            limiter = AsyncRateLimiter(2, 0.1, cleanup_interval=1, algorithm=RateLimitAlgorithm.TOKEN_BUCKET)
+            start = time.perf_counter()
+            results = [await limiter.acquire("c") for _ in range(3)]
+            waited = time.perf_counter() - start
+            timed_out = await limiter.acquire("c", timeout=0)
+            limiter.close()
+            return codes, other.status_code, results, waited, timed_out
+
+        codes, other, results, waited, timed_out = asyncio.run(main())
+        assert codes == [200, 403, 429]
+        assert other == 200
+        assert results == [True, True, True] and waited >= 0.04
+        assert timed_out is False
+
+
+class TestTokenStore:
+    """Tests for the expiry-ordered, bounded token store."""
+
+    def test_expiry_revocation_and_user_index(self):
+        """Test expired tokens and revocations are pruned in expiry order with the user index."""
+        from transformers.components.token_store import TokenStore
+
+        clock = _Clock()
+        store = TokenStore(max_tokens=10, clock=clock)
+        for i in range(6):
+            store.add(f"t{i}", f"user-{i % 2}", clock.now + 10 * (i + 1), i)
+        assert store.user_tokens("user-0") == ["t0", "t2", "t4"]
+        assert store.revoke("t2") and store.is_revoked("t2")
+        assert store.get("t2") is None and not store.revoke("t2")
+
+        clock.now += 35  # t0 and t1 expired; t2 would have
+        assert store.prune() == 2
+        assert not store.is_revoked("t2")
+        assert store.user_tokens("user-0") == ["t4"]
+        assert store.user_tokens("user-1") == ["t3", "t5"]
+        assert store.get("t4") == (4, clock.now + 15)
+
+        clock.now += 100
+        assert store.prune() == 3
+        stats = store.get_stats()
+        assert stats["tokens"] == stats["users"] == stats["revoked"] == stats["heap_entries"] == 0
+
+    def test_auth_manager_stays_within_cache_size(self):
+        """Test AuthManager evicts least recently used tokens once full, even if none expired."""
+        from transformers.components.auth_manager import AuthManager
+
+        auth = AuthManager(cache_size=5)
+        tokens = [auth.generate_token(f"user-{i % 3}").token_id for i in range(5)]
+        assert auth.validate_token(tokens[0]).success  # now most recently used
+        for i in range(3):
+            auth.generate_token("late")
+
+        stats = auth.get_stats()
+        assert stats["cached_tokens"] == 5 and stats["evicted_tokens"] == 3
+        assert [auth.validate_token(t).success for t in tokens] == [True, False, False, False, True]
+        assert auth.validate_token(tokens[1]).error == "Token not found"
+
+        assert auth.revoke_user_tokens("late") == 3
+        assert auth.revoke_user_tokens("user-0") == 1
+        stats = auth.get_stats()
+        assert stats["cached_tokens"] == 1 and stats["revoked_tokens"] == 4
+        assert stats["active_users"] == 1
+
+
+class TestAuditLog:
+    """Tests for the ring-buffer audit log."""
+
+    @staticmethod
+    def _entry(event_type, user_id, n):
+        from datetime import datetime
+        from transformers.security_transformer import AuditLogEntry
+
+        return AuditLogEntry(datetime.utcnow(), event_type, user_id, {"n": n})
+
+    def test_ring_buffer_indexed_queries(self):
+        """Test queries return the newest matching entries once the ring has wrapped."""
+        from transformers.security_transformer import AuditEventType, SecurityTransformer
+
+        transformer = SecurityTransformer(audit_log_size=5)
+        log = transformer._audit_log
+        for n in range(12):
+            event = AuditEventType.ACCESS_DENIED if n % 3 == 0 else AuditEventType.ACCESS_GRANTED
+            log.append(self._entry(event, f"user-{n % 2}", n))
+
+        numbers = lambda entries: [e["details"]["n"] for e in entries]
+        assert numbers(transformer.get_audit_log(limit=100)) == [7, 8, 9, 10, 11]
+        assert numbers(transformer.get_audit_log(limit=2)) == [10, 11]
+        assert numbers(transformer.get_audit_log(AuditEventType.ACCESS_DENIED)) == [9]
+        assert numbers(transformer.get_audit_log(user_id="user-0")) == [8, 10]
+        assert numbers(transformer.get_audit_log(AuditEventType.ACCESS_GRANTED, "user-1", limit=1)) == [11]
+        assert transformer.get_audit_log(AuditEventType.TOKEN_REVOKED) == []
+        assert log.counts()["users"] == {"user-0": 2, "user-1": 3}
+        assert transformer.get_metrics()["audit_log_size"] == 5
+
+    def test_spill_to_segments(self, tmp_path):
+        """Test entries leaving the ring are kept in rotated segment files."""
+        from transformers.components.audit_log import AuditLog
+        from transformers.security_transformer import AuditEventType
+
+        log = AuditLog(capacity=3, spill_dir=str(tmp_path), segment_bytes=1)
+        for n in range(10):
+            log.append(self._entry(AuditEventType.AUTH_SUCCESS, "user", n))
+        spilled = list(log.read_spilled())
+        assert [record["details"]["n"] for record in spilled] == list(range(7))
+        assert spilled[0]["event_type"] == "auth_success" and spilled[0]["seq"] == 0
+        assert len(log.segments()) == 7
+        log.close()
+
+        # A later log keeps the old segments and numbers after them
+        bounded = AuditLog(capacity=1, spill_dir=str(tmp_path), segment_bytes=1, max_segments=2)
+        for n in range(10, 13):
+            bounded.append(self._entry(AuditEventType.AUTH_FAILURE, None, n))
+        assert [record["details"]["n"] for record in bounded.read_spilled()] == [10, 11]
+        bounded.close()
+
+
+def _touch_memory(state, doc_id, times):
+    """Record accesses from another process (module-level so it pickles)."""
+    from core.memory_system import MemoryIndex
+
+    index = MemoryIndex(state, "memories")
+    for _ in range(times):
+        index.touch(doc_id, "2026-01-02T00:00:00")
+
+
+class TestSharedState:
+    """Tests for the SQLite shared state store."""
+
+    def test_kv_and_ttl(self, tmp_path):
+        """Test values round-trip and expire."""
+        from core.shared_state import SharedState
+
+        state = SharedState(str(tmp_path / "state.db"))
+        state.set("ns", "a", {"x": 1})
+        state.set("ns", "b", [1, 2], ttl=-1)
+        assert state.get("ns", "a") == {"x": 1}
+        assert state.get("ns", "b", "gone") == "gone"
+        assert state.items("ns") == {"a": {"x": 1}}
+        assert state.purge_expired() == 1
+        state.close()
+
+    def test_memory_index_shared_across_processes(self, tmp_path):
+        """Test a forked worker reconnects and its updates are not lost."""
+        import multiprocessing
+        from core.memory_system import MemoryEntry, MemoryIndex
+        from core.shared_state import SharedState
+
+        state = SharedState(str(tmp_path / "state.db"))
+        index = MemoryIndex(state, "memories")
+        index.put(MemoryEntry(
+            id="m1", content="c", category="notes", metadata={"k": "v"},
+            created_at="2026-01-01T00:00:00", accessed_at="2026-01-01T00:00:00",
+            access_count=0,
+        ))
+
+        method = "fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn"
+        ctx = multiprocessing.get_context(method)
+        workers = [ctx.Process(target=_touch_memory, args=(state, "m1", 25)) for _ in range(2)]
+        for worker in workers:
+            worker.start()
+        _touch_memory(state, "m1", 25)
+        for worker in workers:
+            worker.join(timeout=30)
+            assert worker.exitcode == 0
+
+        entry = index.get("m1")
+        assert entry.access_count == 75
+        assert entry.metadata == {"k": "v"}
+        assert index.summary() == {
+            "categories": {"notes": 1}, "total_accesses": 75, "index_size": 1,
+        }
+        assert index.stale("2026-06-01", 100) == ["m1"]
+
+        # Another collection's index shares the table but not the entries
+        other = MemoryIndex(state, "other")
+        assert other.get("m1") is None and other.values() == []
+        other.put(entry)
+        other.remove(["m1"])
+        assert index.get("m1").access_count == 75
+
+        index.remove(["m1", "missing"])
+        assert len(index) == 0
+        state.close()
+
+
+class TestMetrics:
+    """Tests for the metrics registry and /metrics rendering."""
+
+    def test_histogram_and_collectors_render(self):
+        """Test Prometheus text output for histograms, gauges and caches."""
+        from core.metrics import MetricsRegistry
+
+        registry = MetricsRegistry()
+        registry.stage_seconds.labels("embed").observe(0.003)
+        registry.stage_seconds.labels("embed").observe(2.0)
+        with registry.stage("vector_search") as timer:
+            assert registry.stage_in_flight.labels("vector_search").value == 1
+            timer.stop()
+        assert registry.stage_in_flight.labels("vector_search").value == 0
+        registry.register_cache("demo", lambda: (3, 4))
+
+        text = registry.render()
+        assert '# TYPE devteam6_stage_duration_seconds histogram' in text
+        assert 'devteam6_stage_duration_seconds_bucket{stage="embed",le="0.0025"} 0' in text
+        assert 'devteam6_stage_duration_seconds_bucket{stage="embed",le="0.005"} 1' in text
+        assert 'devteam6_stage_duration_seconds_bucket{stage="embed",le="+Inf"} 2' in text
+        assert 'devteam6_stage_duration_seconds_count{stage="vector_search"} 1' in text
+        assert 'devteam6_cache_hit_ratio{cache="demo"} 0.75' in text
+
+    def test_middleware_and_llm_stages(self, tmp_path):
+        """Test per-route request metrics and streamed LLM TTFT recording."""
+        pytest.importorskip("chromadb")
+        import httpx
+        from fastapi import FastAPI
+        from core.http_pool import HTTPClientRegistry
+        from core.metrics import MetricsMiddleware, MetricsRegistry
+        from core.rag_pipeline import RAGPipeline
+        from core.vector_store import VectorStore
+
+        registry = MetricsRegistry()
+        app = FastAPI()
+        app.add_middleware(MetricsMiddleware, registry=registry)
+
+        @app.get("/items/{item_id}")
+        async def item(item_id: int):
+            return {"id": item_id}
+
+        bodies = [
+            b'{"response": "Hel"}\n{"response": "lo", "done": true, "eval_count": 2}\n',
+            b'{"response": "", "done": true, "eval_count": 0}\n',
+        ]
+
+        def handler(request):
+            return httpx.Response(200, content=bodies.pop(0))
+
+        pipeline = RAGPipeline(
+            vector_store=VectorStore(collection_name="test", persist_directory=str(tmp_path)),
+            http_registry=HTTPClientRegistry(transport=httpx.MockTransport(handler)),
+        )
+        pipeline.metrics = registry
+
+        async def main():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://t") as client:
+                await client.get("/items/1")
+                await client.get("/items/2")
+                await client.get("/missing")
+            return await pipeline._generate_llm("prompt"), await pipeline._generate_llm("prompt")
+
+        try:
+            answer, empty = asyncio.run(main())
+        finally:
+            pipeline.vector_store.close()
+        assert answer == ("Hello", 2)
+        assert empty == ("", 0)
+
+        text = registry.render()
+        assert (
+            'devteam6_http_request_duration_seconds_count'
+            '{method="GET",route="/items/{item_id}",status="200"} 2'
+        ) in text
+        assert 'route="unmatched",status="404"} 1' in text
+        assert 'devteam6_http_requests_in_flight 0' in text
+        # The empty reply has no time to first token
+        assert 'devteam6_stage_duration_seconds_count{stage="llm_ttft"} 1' in text
+        assert 'devteam6_stage_duration_seconds_count{stage="llm_total"} 2' in text
+        assert 'devteam6_stage_in_flight{stage="llm_ttft"} 0' in text
+
+
+class TestSerialization:
+    """Tests for API response encodings."""
+
+    def test_negotiate_and_float32_round_trip(self):
+        """Test Accept negotiation and float32 packing."""
+        from api.serialization import (
+            BASE64_FLOAT32_MEDIA_TYPE, MSGPACK_AVAILABLE, decode_float32, float32_bytes, negotiate,
+        )
+
+        assert negotiate(None) == "json"
+        assert negotiate("text/html, */*") == "json"
+        assert negotiate(f"{BASE64_FLOAT32_MEDIA_TYPE};q=1, application/json") == "base64"
+        assert negotiate("application/msgpack") == ("msgpack" if MSGPACK_AVAILABLE else "json")
+        assert decode_float32(float32_bytes([0.5, -2.0, 1.25])) == [0.5, -2.0, 1.25]
+
+    def test_embed_endpoint_encodings(self):
+        """Test /embed returns JSON or base64 float32 depending on Accept."""
+        import base64
+        import httpx
+        import api.main as api_main
+        from api.serialization import BASE64_FLOAT32_MEDIA_TYPE, decode_float32
+
+        class FakeEmbedding:
+            async def embed(self, text):
+                return [0.25, 0.5, 1.0]
+
+        api_main.app.dependency_overrides[api_main.get_embedding_service] = FakeEmbedding
+
+        async def main():
+            transport = httpx.ASGITransport(app=api_main.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://t") as client:
+                plain = await client.post("/embed", json={"text": "x"})
+                packed = await client.post(
+                    "/embed", json={"text": "x"}, headers={"accept": BASE64_FLOAT32_MEDIA_TYPE}
+                )
+            return plain, packed
+
+        try:
+            plain, packed = asyncio.run(main())
+        finally:
+            api_main.app.dependency_overrides.clear()
+
+        assert plain.json()["embedding"] == [0.25, 0.5, 1.0]
+        assert packed.headers["content-type"].startswith(BASE64_FLOAT32_MEDIA_TYPE)
+        body = packed.json()
+        assert body["encoding"] == "float32"
+        assert body["dimensions"] == 3
+        assert decode_float32(base64.b64decode(body["embedding"])) == [0.25, 0.5, 1.0]
+
+
+class TestImportTime:
+    """Tests for lazy package imports and the import time budget."""
+
+    def test_lazy_exports_resolve(self):
+        """Test lazily exported names resolve to the submodule objects."""
+        import core
+        import ml
+        from core.single_flight import SingleFlight
+
+        assert core.SingleFlight is SingleFlight
+        assert "AsyncVectorStore" in dir(core)
+        assert ml.supervised.__name__ == "ml.supervised"
+        with pytest.raises(AttributeError):
+            core.DoesNotExist
+
+    def test_entry_points_within_budget(self):
+        """Test entry points import without heavy deps and within budget."""
+        from benchmarks.import_time import BUDGETS_MS, measure
+
+        for module, budget in BUDGETS_MS.items():
+            result = measure(module, runs=1)
+            assert not result["heavy"], f"{module} imports {result['heavy']}"
+            assert result["median_ms"] < budget, f"{module}: {result['median_ms']:.0f} ms"
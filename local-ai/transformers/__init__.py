@@ -2,9 +2,21 @@
 
 Dual Transformer system for deterministic token routing.
 """
-from .dual_transformer import DualTransformer
-from .token_transformer import TokenTransformer
-from .security_transformer import SecurityTransformer
+from typing import TYPE_CHECKING
+
+from utils.lazy_imports import lazy_exports
+
+if TYPE_CHECKING:
+    from .dual_transformer import DualTransformer
+    from .token_transformer import TokenTransformer
+    from .security_transformer import SecurityTransformer
+
+# Submodules are imported on first attribute access
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "DualTransformer": ".dual_transformer",
+    "TokenTransformer": ".token_transformer",
+    "SecurityTransformer": ".security_transformer",
+})
 
 __all__ = [
     "DualTransformer",
@@ -1,15 +1,46 @@
 """DevTeam6 Local AI - Transformer Components Package"""
-from .smart_tokenizer import SmartTokenizer, Token
-from .multi_head_attention import MultiHeadAttention
-from .auth_manager import AuthManager
-from .api_gateway import APIGateway
-from .rate_limiter import RateLimiter
+from typing import TYPE_CHECKING
+
+from utils.lazy_imports import lazy_exports
+
+if TYPE_CHECKING:
+    from .smart_tokenizer import SmartTokenizer, Token, TokenBatch
+    from .tokenizer_pool import TokenizerPool
+    from .multi_head_attention import MultiHeadAttention
+    from .auth_manager import AuthManager
+    from .token_store import TokenStore
+    from .audit_log import AuditLog
+    from .api_gateway import APIGateway
+    from .rate_limiter import RateLimiter, RateLimitAlgorithm
+    from .lru_cache import LRUCache
+
+# Submodules are imported on first attribute access
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "SmartTokenizer": ".smart_tokenizer",
+    "Token": ".smart_tokenizer",
+    "TokenBatch": ".smart_tokenizer",
+    "TokenizerPool": ".tokenizer_pool",
+    "MultiHeadAttention": ".multi_head_attention",
+    "AuthManager": ".auth_manager",
+    "TokenStore": ".token_store",
+    "AuditLog": ".audit_log",
+    "APIGateway": ".api_gateway",
+    "RateLimiter": ".rate_limiter",
+    "RateLimitAlgorithm": ".rate_limiter",
+    "LRUCache": ".lru_cache",
+})
 
 __all__ = [
     "SmartTokenizer",
     "Token",
+    "TokenBatch",
+    "TokenizerPool",
     "MultiHeadAttention",
     "AuthManager",
+    "TokenStore",
+    "AuditLog",
     "APIGateway",
     "RateLimiter",
+    "RateLimitAlgorithm",
+    "LRUCache",
 ]
@@ -10,11 +10,12 @@ from datetime import datetime
 from enum import Enum
 import hashlib
 import hmac
+import math
 import time
 import asyncio
 
 from .auth_manager import AuthManager, SecurityLevel
-from .rate_limiter import RateLimiter
+from .rate_limiter import AsyncRateLimiter
 
 
 class HTTPMethod(Enum):
@@ -38,6 +39,7 @@ class APIEndpoint:
     rate_window: int = 60  # window in seconds
     handler: Optional[Callable[..., Awaitable[Any]]] = None
     description: str = ""
+    permission_mask: int = 0  # required_permissions as an AuthManager bitmask
 
 
 @dataclass
@@ -73,6 +75,11 @@ class APIGateway:
     - Request signing and verification
     - Rate limit tracking
     - Security level enforcement
+    - Non-blocking checks: rate limits and permissions are decided
+      without OS locks or per-request set arithmetic, so handle_request
+      never stalls the event loop
+    
+    Rate limiter state belongs to the event loop the gateway serves.
     """
     
     def __init__(
@@ -100,7 +107,7 @@ class APIGateway:
         self._endpoints: Dict[str, APIEndpoint] = {}
         
         # Rate limiters per endpoint
-        self._rate_limiters: Dict[str, RateLimiter] = {}
+        self._rate_limiters: Dict[str, AsyncRateLimiter] = {}
         
         # Request metrics
         self._metrics: Dict[str, int] = {
@@ -145,13 +152,14 @@ class APIGateway:
             rate_limit=rate_limit or self.default_rate_limit,
             rate_window=rate_window or self.default_rate_window,
             handler=handler,
-            description=description
+            description=description,
+            permission_mask=self.auth_manager.permission_mask(required_permissions or ())
         )
         
         self._endpoints[endpoint_key] = endpoint
         
         # Create rate limiter for endpoint
-        self._rate_limiters[endpoint_key] = RateLimiter(
+        self._rate_limiters[endpoint_key] = AsyncRateLimiter(
             max_requests=endpoint.rate_limit,
             window_seconds=endpoint.rate_window
         )
@@ -250,7 +258,8 @@ class APIGateway:
         self._metrics["total_requests"] += 1
         
         # Validate endpoint
-        endpoint = self.validate_endpoint(request.endpoint, request.method)
+        endpoint_key = f"{request.method.value}:{request.endpoint}"
+        endpoint = self._endpoints.get(endpoint_key)
         if endpoint is None:
             self._metrics["failed_requests"] += 1
             return APIResponse(
@@ -259,8 +268,6 @@ class APIGateway:
                 error=f"Endpoint not found: {request.method.value} {request.endpoint}"
             )
         
-        endpoint_key = f"{request.method.value}:{request.endpoint}"
-        
         # Check rate limit
         client_id = request.client_id or "anonymous"
         rate_limiter = self._rate_limiters.get(endpoint_key)
@@ -272,7 +279,7 @@ class APIGateway:
                 status_code=429,
                 error="Rate limit exceeded",
                 headers={
-                    "Retry-After": str(rate_limiter.window_seconds),
+                    "Retry-After": str(max(1, math.ceil(rate_limiter.get_retry_after(client_id)))),
                     "X-RateLimit-Limit": str(rate_limiter.max_requests),
                     "X-RateLimit-Remaining": "0"
                 }
@@ -289,18 +296,18 @@ class APIGateway:
                 )
             
             # Validate token and permissions
-            assessment = self.auth_manager.assess_request_security(
+            denied = self.auth_manager.authorize(
                 token_id,
-                endpoint.required_permissions,
+                endpoint.permission_mask,
                 endpoint.security_level
             )
             
-            if not assessment["allowed"]:
+            if denied is not None:
                 self._metrics["unauthorized_requests"] += 1
                 return APIResponse(
                     success=False,
                     status_code=403,
-                    error=assessment["reason"]
+                    error=denied
                 )
         
         # Execute handler
@@ -0,0 +1,256 @@
+"""
+DevTeam6 Local AI - Audit Log
+
+Fixed-capacity audit log: a ring buffer indexed by event type and user,
+with optional spill of older entries to append-only segment files.
+"""
+
+from typing import Any, Dict, Hashable, Iterator, List, Optional
+from collections import deque
+from itertools import islice
+from pathlib import Path
+import json
+import threading
+
+
+class AuditLog:
+    """
+    Ring buffer of audit entries with secondary indexes.
+    
+    Entries are numbered in order; entry n lives in slot n % capacity,
+    so appending never moves or copies the others. Each event type and
+    each user id keeps a deque of its entries' numbers, oldest first.
+    The entry being overwritten is always the oldest of its deques, so
+    keeping the indexes current costs one popleft each.
+    
+    Features:
+    - O(1) append, whatever the capacity
+    - Newest N entries by event type, user, both or neither, read from
+      the end of an index without scanning the log
+    - Optional spill: entries leaving the ring are appended (as JSON
+      lines) to segment files in a directory, rotated by size, with an
+      optional limit on the number of segments kept
+    - Thread-safe operations
+    
+    Entries are objects with ``event_type`` and ``user_id`` attributes,
+    and a ``to_dict()`` method when spilling.
+    """
+    
+    def __init__(
+        self,
+        capacity: int = 10000,
+        spill_dir: Optional[str] = None,
+        segment_bytes: int = 16 * 2**20,
+        max_segments: Optional[int] = None
+    ):
+        """
+        Initialize the audit log.
+        
+        Args:
+            capacity: Entries kept in memory
+            spill_dir: Directory for segment files (None: older entries
+                are dropped)
+            segment_bytes: Size at which a new segment file is started
+            max_segments: Segment files kept, oldest deleted first
+                (None: all)
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self.segment_bytes = segment_bytes
+        self.max_segments = max_segments
+        
+        self._slots: List[Any] = [None] * capacity
+        self._next = 0  # number of the next entry
+        self._by_type: Dict[Hashable, deque] = {}
+        self._by_user: Dict[Hashable, deque] = {}
+        self._lock = threading.Lock()
+        
+        self._spill_dir = Path(spill_dir) if spill_dir else None
+        self._segment = None
+        self._segment_size = 0
+        self._segment_number = 0
+        self.spilled = 0
+        if self._spill_dir is not None:
+            self._spill_dir.mkdir(parents=True, exist_ok=True)
+            # Continue after the segments of earlier runs
+            existing = self.segments()
+            if existing:
+                self._segment_number = int(existing[-1].stem.split("-")[1]) + 1
+    
+    def __len__(self) -> int:
+        return min(self._next, self.capacity)
+    
+    def append(self, entry: Any) -> int:
+        """
+        Add an entry, overwriting (and spilling) the oldest if full.
+        
+        Args:
+            entry: Audit entry
+        
+        Returns:
+            Sequence number of the entry
+        """
+        with self._lock:
+            seq = self._next
+            slot = seq % self.capacity
+            old = self._slots[slot]
+            if old is not None:
+                old_seq = seq - self.capacity
+                self._unindex(self._by_type, old.event_type, old_seq)
+                self._unindex(self._by_user, old.user_id, old_seq)
+                if self._spill_dir is not None:
+                    self._spill(old_seq, old)
+            
+            self._slots[slot] = entry
+            self._next = seq + 1
+            self._index(self._by_type, entry.event_type, seq)
+            self._index(self._by_user, entry.user_id, seq)
+            return seq
+    
+    @staticmethod
+    def _index(index: Dict[Hashable, deque], key: Hashable, seq: int) -> None:
+        numbers = index.get(key)
+        if numbers is None:
+            numbers = index[key] = deque()
+        numbers.append(seq)
+    
+    @staticmethod
+    def _unindex(index: Dict[Hashable, deque], key: Hashable, seq: int) -> None:
+        numbers = index[key]
+        numbers.popleft()  # always seq: the oldest entry of every index
+        if not numbers:
+            del index[key]
+    
+    def newest(
+        self,
+        limit: int = 100,
+        event_type: Optional[Hashable] = None,
+        user_id: Optional[Hashable] = None
+    ) -> List[Any]:
+        """
+        Get the newest entries, optionally of one event type and/or user.
+        
+        Args:
+            limit: Maximum entries to return
+            event_type: Only entries of this event type
+            user_id: Only entries of this user
+        
+        Returns:
+            Up to limit entries, oldest first
+        """
+        if limit <= 0:
+            return []
+        with self._lock:
+            slots, capacity = self._slots, self.capacity
+            if event_type is None and user_id is None:
+                count = min(limit, self._next, capacity)
+                end = self._next % capacity
+                if count <= end:
+                    return slots[end - count:end]
+                return slots[capacity - (count - end):] + slots[:end]
+            
+            by_type = self._by_type.get(event_type, ()) if event_type is not None else None
+            by_user = self._by_user.get(user_id, ()) if user_id is not None else None
+            if by_type is None or (by_user is not None and len(by_user) < len(by_type)):
+                numbers, check = by_user, event_type
+                attr = "event_type"
+            else:
+                numbers, check = by_type, user_id
+                attr = "user_id"
+            
+            # Walk the shorter index from its newest end
+            if check is None:
+                found = [slots[seq % capacity] for seq in islice(reversed(numbers), limit)]
+            else:
+                found = []
+                for seq in reversed(numbers):
+                    entry = slots[seq % capacity]
+                    if getattr(entry, attr) == check:
+                        found.append(entry)
+                        if len(found) == limit:
+                            break
+            found.reverse()
+            return found
+    
+    def counts(self) -> Dict[str, Dict[Hashable, int]]:
+        """Get the number of entries in memory per event type and per user."""
+        with self._lock:
+            return {
+                "event_types": {key: len(numbers) for key, numbers in self._by_type.items()},
+                "users": {key: len(numbers) for key, numbers in self._by_user.items()}
+            }
+    
+    def _spill(self, seq: int, entry: Any) -> None:
+        """Append an entry leaving the ring to the current segment (locked)."""
+        if self._segment is None or self._segment_size >= self.segment_bytes:
+            self._rotate()
+        record = entry.to_dict()
+        record["seq"] = seq
+        line = json.dumps(record, default=str) + "\n"
+        self._segment.write(line)
+        self._segment_size += len(line)
+        self.spilled += 1
+    
+    def _rotate(self) -> None:
+        """Start a new segment file (locked)."""
+        if self._segment is not None:
+            self._segment.close()
+        path = self._spill_dir / f"audit-{self._segment_number:08d}.jsonl"
+        self._segment_number += 1
+        self._segment = open(path, "w", encoding="utf-8")
+        self._segment_size = 0
+        
+        if self.max_segments is not None:
+            segments = self.segments()
+            for old in segments[:max(0, len(segments) - self.max_segments)]:
+                old.unlink()
+    
+    def segments(self) -> List[Path]:
+        """Get the segment files, oldest first."""
+        if self._spill_dir is None:
+            return []
+        return sorted(self._spill_dir.glob("audit-*.jsonl"))
+    
+    def read_spilled(self) -> Iterator[Dict[str, Any]]:
+        """
+        Read spilled entries, oldest first.
+        
+        Yields:
+            Entry dicts (as ``to_dict()`` gave), with their ``seq`` (the
+            entry's number in the run that wrote it)
+        """
+        with self._lock:
+            if self._segment is not None:
+                self._segment.flush()
+            segments = self.segments()
+        for path in segments:
+            with open(path, encoding="utf-8") as segment:
+                for line in segment:
+                    yield json.loads(line)
+    
+    def flush(self) -> None:
+        """Flush the current segment file."""
+        with self._lock:
+            if self._segment is not None:
+                self._segment.flush()
+    
+    def close(self) -> None:
+        """Close the current segment file."""
+        with self._lock:
+            if self._segment is not None:
+                self._segment.close()
+                self._segment = None
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get audit log statistics."""
+        with self._lock:
+            return {
+                "entries": min(self._next, self.capacity),
+                "capacity": self.capacity,
+                "total_appended": self._next,
+                "event_types": len(self._by_type),
+                "users": len(self._by_user),
+                "spilled": self.spilled,
+                "segments": len(self.segments())
+            }
@@ -4,14 +4,16 @@ DevTeam6 Local AI - Authentication Manager
 Handles token validation, caching, and permission extraction.
 """
 
-from typing import Dict, Any, Optional, List, Set
+from typing import AbstractSet, Dict, Any, FrozenSet, Iterable, Optional, List, Set
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from enum import Enum
 import hashlib
 import secrets
 import time
 
+from .token_store import TokenStore
+
 
 class SecurityLevel(Enum):
     """Security levels for access control."""
@@ -22,13 +24,13 @@ class SecurityLevel(Enum):
     SYSTEM = 4
 
 
-@dataclass
+@dataclass(slots=True)
 class AuthToken:
     """Authentication token with metadata."""
     
     token_id: str
     user_id: str
-    permissions: Set[str]
+    permissions: AbstractSet[str]
     security_level: SecurityLevel
     created_at: datetime
     expires_at: datetime
@@ -63,6 +65,8 @@ class AuthManager:
     - Token validation and caching
     - Permission extraction
     - Security level assessment
+    - Permission sets as bitmasks: each permission name gets a bit, each
+      cached token a precomputed mask, so a permission check is an AND
     - Session management
     """
     
@@ -81,14 +85,16 @@ class AuthManager:
         self.token_ttl_hours = token_ttl_hours
         self.cache_size = cache_size
         
-        # Token cache: token_id -> AuthToken
-        self._token_cache: Dict[str, AuthToken] = {}
+        # Tokens, user sessions and revocations:
+        # token_id -> ((AuthToken, permission mask, security level value), expiry timestamp)
+        self._store = TokenStore(max_tokens=cache_size)
         
-        # User sessions: user_id -> List[token_id]
-        self._user_sessions: Dict[str, List[str]] = {}
+        # Frozen hierarchy permissions, shared by the tokens of each level
+        self._level_permissions: Dict[SecurityLevel, FrozenSet[str]] = {}
         
-        # Revoked tokens
-        self._revoked_tokens: Set[str] = set()
+        # Permission name -> bit, and bit position -> name
+        self._permission_bits: Dict[str, int] = {}
+        self._permission_names: List[str] = []
         
         # Permission definitions
         self._permission_hierarchy: Dict[SecurityLevel, Set[str]] = {
@@ -137,11 +143,13 @@ class AuthManager:
         # Generate secure token ID
         token_id = secrets.token_urlsafe(32)
         
-        # Get permissions from hierarchy or use explicit
+        # Get permissions from hierarchy or use explicit; tokens of a
+        # level share one frozen set instead of a copy each
         if permissions is None:
-            permissions = self._permission_hierarchy.get(
-                security_level, set()
-            ).copy()
+            permissions = self._level_permissions.get(security_level)
+            if permissions is None:
+                permissions = frozenset(self._permission_hierarchy.get(security_level, ()))
+                self._level_permissions[security_level] = permissions
         
         now = datetime.utcnow()
         ttl = ttl_hours or self.token_ttl_hours
@@ -156,14 +164,9 @@ class AuthManager:
             metadata=metadata or {}
         )
         
-        # Cache token
+        # Cache token (also tracks the user session)
         self._cache_token(token)
         
-        # Track user session
-        if user_id not in self._user_sessions:
-            self._user_sessions[user_id] = []
-        self._user_sessions[user_id].append(token_id)
-        
         return token
     
     def validate_token(self, token_id: str) -> AuthResult:
@@ -177,22 +180,23 @@ class AuthManager:
             AuthResult with validation status
         """
         # Check if revoked
-        if token_id in self._revoked_tokens:
+        if self._store.is_revoked(token_id):
             return AuthResult(
                 success=False,
                 error="Token has been revoked"
             )
         
         # Check cache
-        token = self._token_cache.get(token_id)
+        stored = self._store.get(token_id)
         
-        if token is None:
+        if stored is None:
             return AuthResult(
                 success=False,
                 error="Token not found"
             )
         
-        if token.is_expired:
+        (token, _, _), expires = stored
+        if time.time() > expires:
             # Remove expired token
             self._remove_token(token_id)
             return AuthResult(
@@ -228,6 +232,70 @@ class AuthManager:
         
         return required_permission in result.token.permissions
     
+    def permission_mask(self, permissions: Iterable[str]) -> int:
+        """
+        Get the bitmask of a set of permissions.
+        
+        Permission names not seen before are given new bits, so masks
+        stay comparable with every token's.
+        
+        Args:
+            permissions: Permission names
+        
+        Returns:
+            Bitmask with one bit per permission
+        """
+        bits = self._permission_bits
+        mask = 0
+        for permission in permissions:
+            bit = bits.get(permission)
+            if bit is None:
+                bit = bits[permission] = 1 << len(self._permission_names)
+                self._permission_names.append(permission)
+            mask |= bit
+        return mask
+    
+    def _mask_permissions(self, mask: int) -> List[str]:
+        """Get the permission names of a bitmask."""
+        return [name for i, name in enumerate(self._permission_names) if mask >> i & 1]
+    
+    def authorize(
+        self,
+        token_id: str,
+        required_mask: int,
+        required_level: SecurityLevel = SecurityLevel.AUTHENTICATED
+    ) -> Optional[str]:
+        """
+        Check a token against a security level and a permission mask.
+        
+        The request-path form of assess_request_security: no token
+        lookup beyond one dict access, no set arithmetic, no result dict.
+        
+        Args:
+            token_id: Request token
+            required_mask: Mask of required permissions (permission_mask)
+            required_level: Required security level
+        
+        Returns:
+            None if access is granted, otherwise the reason it is denied
+        """
+        if self._store.is_revoked(token_id):
+            return "Token has been revoked"
+        
+        stored = self._store.get(token_id)
+        if stored is None:
+            return "Token not found"
+        
+        (_, mask, level), expires = stored
+        if time.time() > expires:
+            self._remove_token(token_id)
+            return "Token has expired"
+        if level < required_level.value:
+            return "Insufficient security level"
+        if required_mask & ~mask:
+            return "Missing required permissions"
+        return None
+    
     def check_security_level(
         self,
         token_id: str,
@@ -265,7 +333,7 @@ class AuthManager:
         if not result.success or result.token is None:
             return set()
         
-        return result.token.permissions.copy()
+        return set(result.token.permissions)
     
     def revoke_token(self, token_id: str) -> bool:
         """
@@ -277,11 +345,7 @@ class AuthManager:
         Returns:
             True if token was revoked
         """
-        if token_id in self._token_cache:
-            self._revoked_tokens.add(token_id)
-            self._remove_token(token_id)
-            return True
-        return False
+        return self._store.revoke(token_id)
     
     def revoke_user_tokens(self, user_id: str) -> int:
         """
@@ -293,14 +357,12 @@ class AuthManager:
         Returns:
             Number of tokens revoked
         """
-        token_ids = self._user_sessions.get(user_id, [])
         count = 0
         
-        for token_id in token_ids:
+        for token_id in self._store.user_tokens(user_id):
             if self.revoke_token(token_id):
                 count += 1
         
-        self._user_sessions[user_id] = []
         return count
     
     def get_security_level(self, token_id: str) -> SecurityLevel:
@@ -366,14 +428,15 @@ class AuthManager:
             }
         
         # Check permissions
-        missing = required_permissions - token.permissions
+        (_, mask, _), _ = self._store.get(token.token_id)
+        missing = self.permission_mask(required_permissions) & ~mask
         if missing:
             return {
                 "allowed": False,
                 "reason": "Missing required permissions",
                 "current_level": token.security_level.name,
                 "required_level": required_level.name,
-                "missing_permissions": list(missing)
+                "missing_permissions": self._mask_permissions(missing)
             }
         
         return {
@@ -385,32 +448,31 @@ class AuthManager:
         }
     
     def _cache_token(self, token: AuthToken) -> None:
-        """Add token to cache, evicting old tokens if needed."""
-        # Evict if cache is full
-        if len(self._token_cache) >= self.cache_size:
-            self._evict_expired_tokens()
-        
-        self._token_cache[token.token_id] = token
+        """Add token to cache, removing expired and least recently used tokens if needed."""
+        self._store.add(
+            token.token_id,
+            token.user_id,
+            token.expires_at.replace(tzinfo=timezone.utc).timestamp(),
+            (token, self.permission_mask(token.permissions), token.security_level.value)
+        )
     
     def _remove_token(self, token_id: str) -> None:
         """Remove token from cache."""
-        self._token_cache.pop(token_id, None)
+        self._store.remove(token_id)
     
     def _evict_expired_tokens(self) -> None:
         """Remove expired tokens from cache."""
-        now = datetime.utcnow()
-        expired = [
-            tid for tid, token in self._token_cache.items()
-            if token.expires_at < now
-        ]
-        for tid in expired:
-            self._remove_token(tid)
+        self._store.prune()
     
     def get_stats(self) -> Dict[str, Any]:
         """Get auth manager statistics."""
+        store = self._store.get_stats()
         return {
-            "cached_tokens": len(self._token_cache),
-            "active_users": len(self._user_sessions),
-            "revoked_tokens": len(self._revoked_tokens),
-            "cache_limit": self.cache_size
+            "cached_tokens": store["tokens"],
+            "active_users": store["users"],
+            "revoked_tokens": store["revoked"],
+            "known_permissions": len(self._permission_names),
+            "cache_limit": self.cache_size,
+            "evicted_tokens": store["evictions"],
+            "expired_tokens": store["expirations"]
         }
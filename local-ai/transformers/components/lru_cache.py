@@ -0,0 +1,281 @@
+"""
+DevTeam6 Local AI - LRU Cache
+
+Bounded least-recently-used cache with TTL, hit/miss counters and size tracking.
+"""
+
+from typing import Any, Callable, Dict, Generic, Hashable, Optional, Tuple, TypeVar
+from collections import OrderedDict
+from dataclasses import fields, is_dataclass
+from enum import Enum
+from types import MappingProxyType
+import hashlib
+import sys
+import threading
+import time
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+_MISSING = object()
+
+
+def digest_key(*parts: str) -> bytes:
+    """
+    Stable cache key for a tuple of strings.
+    
+    A 128-bit BLAKE2b digest: unlike ``hash()`` it is the same in every
+    process, and a collision (which would return another input's result)
+    is practically impossible. Parts are length-prefixed, so
+    ("ab", "c") and ("a", "bc") differ.
+    
+    Args:
+        *parts: Strings identifying the input (e.g. text and language)
+    
+    Returns:
+        16-byte digest
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        data = part.encode("utf-8", "surrogatepass")
+        digest.update(len(data).to_bytes(8, "little"))
+        digest.update(data)
+    return digest.digest()
+
+
+def deep_sizeof(obj: Any) -> int:
+    """
+    Approximate the memory footprint of an object graph in bytes.
+    
+    Follows containers, dataclass fields and ``__dict__``/``__slots__``.
+    Objects reachable twice are counted once; enum members, classes and
+    functions are not counted.
+    
+    Args:
+        obj: Object to measure
+    
+    Returns:
+        Total of sys.getsizeof over reachable objects
+    """
+    seen = set()
+    total = 0
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        # Shared singletons (enum members, classes, functions) are not owned
+        if id(item) in seen or isinstance(item, Enum) or callable(item):
+            continue
+        seen.add(id(item))
+        total += sys.getsizeof(item)
+        
+        if item is None or isinstance(item, (str, bytes, int, float)):
+            continue
+        if isinstance(item, (dict, MappingProxyType)):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+        elif is_dataclass(item):
+            stack.extend(getattr(item, f.name) for f in fields(item))
+            if hasattr(item, "__dict__"):
+                # The instance dict itself; its values are the fields
+                total += sys.getsizeof(vars(item))
+        else:
+            if hasattr(item, "__dict__"):
+                stack.append(vars(item))
+            for slot in getattr(type(item), "__slots__", ()):
+                stack.append(getattr(item, slot, None))
+    return total
+
+
+class LRUCache(Generic[K, V]):
+    """
+    Bounded LRU cache with per-entry TTL.
+    
+    Features:
+    - O(1) get/put: an OrderedDict kept in recency order, so the least
+      recently used entry is always first
+    - Entry count limit and optional byte limit (approximate, via size_of);
+      a value larger than the byte limit on its own is not cached
+    - Lazy expiry: an expired entry is dropped when it is next looked up
+      (or by purge_expired), never by scanning on the request path
+    - Hit/miss/eviction/expiry counters
+    - Approximate memory footprint of cached values
+    - Thread-safe operations
+    
+    Values are stored as given; callers that hand them out should treat
+    them as immutable.
+    """
+    
+    def __init__(
+        self,
+        max_entries: int = 1000,
+        max_bytes: Optional[int] = None,
+        ttl_seconds: Optional[float] = None,
+        size_of: Optional[Callable[[Any], int]] = deep_sizeof,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize the cache.
+        
+        Args:
+            max_entries: Maximum number of entries
+            max_bytes: Maximum footprint of cached values (None: unlimited)
+            ttl_seconds: Entry lifetime from insertion (None: no expiry)
+            size_of: Measures an entry for the footprint (None: not tracked)
+            clock: Time source (monotonic seconds)
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        if max_bytes is not None and size_of is None:
+            raise ValueError("max_bytes requires size_of")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.size_of = size_of
+        self.clock = clock
+        
+        # key -> (value, expires_at, size_bytes), least recently used first
+        self._entries: "OrderedDict[K, Tuple[V, float, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.rejected = 0
+    
+    def get(self, key: K, default: Any = None) -> Any:
+        """
+        Look up a value and mark it as recently used.
+        
+        Args:
+            key: Cache key
+            default: Returned on a miss
+        
+        Returns:
+            Cached value or default
+        """
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+            
+            value, expires_at, size = entry
+            if expires_at <= self.clock():
+                del self._entries[key]
+                self._bytes -= size
+                self.expirations += 1
+                self.misses += 1
+                return default
+            
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+    
+    def put(self, key: K, value: V) -> None:
+        """
+        Insert or replace a value, evicting least recently used entries if full.
+        
+        Args:
+            key: Cache key
+            value: Value to cache
+        """
+        size = self.size_of(value) if self.size_of else 0
+        expires_at = (
+            self.clock() + self.ttl_seconds if self.ttl_seconds is not None else float("inf")
+        )
+        
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[2]
+            
+            max_bytes = self.max_bytes
+            if max_bytes is not None and size > max_bytes:
+                self.rejected += 1
+                return
+            
+            while self._entries and (
+                len(self._entries) >= self.max_entries
+                or (max_bytes is not None and self._bytes + size > max_bytes)
+            ):
+                _, (_, _, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+            
+            self._entries[key] = (value, expires_at, size)
+            self._bytes += size
+    
+    def pop(self, key: K, default: Any = None) -> Any:
+        """Remove an entry and return its value (expired or not)."""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return default
+            self._bytes -= entry[2]
+            return entry[0]
+    
+    def __contains__(self, key: K) -> bool:
+        """Check for a live entry without counting a lookup."""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and entry[1] > self.clock()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def purge_expired(self) -> int:
+        """
+        Drop every expired entry.
+        
+        This scans the whole cache; use it from maintenance tasks, not the
+        request path.
+        
+        Returns:
+            Number of entries removed
+        """
+        now = self.clock()
+        with self._lock:
+            expired = [key for key, entry in self._entries.items() if entry[1] <= now]
+            for key in expired:
+                self._bytes -= self._entries.pop(key)[2]
+            self.expirations += len(expired)
+            return len(expired)
+    
+    def clear(self) -> int:
+        """
+        Remove every entry.
+        
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            count = len(self._entries)
+            self._entries.clear()
+            self._bytes = 0
+            return count
+    
+    @property
+    def memory_bytes(self) -> int:
+        """Approximate footprint of the cached values."""
+        return self._bytes
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "rejected": self.rejected,
+            "memory_bytes": self._bytes
+        }
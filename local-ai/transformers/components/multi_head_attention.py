@@ -1,7 +1,7 @@
 """
 DevTeam6 Local AI - Multi-Head Attention
 
-Simple attention mechanism for context-aware token processing.
+Multi-head attention mechanism for context-aware token processing.
 """
 
 from typing import List, Dict, Any, Optional, Tuple
@@ -28,47 +28,97 @@ class MultiHeadAttention:
     
     Creates embeddings for tokens and applies self-attention
     to understand relationships and calculate confidence scores.
+    
+    Features:
+    - Batched embeddings: category rows gathered from a precomputed
+      table, names hashed together (stable across processes)
+    - True multi-head attention over (heads, n, head_dim), float32
+    - Queries processed in blocks, so memory grows with
+      block_size x n rather than n x n
+    - Optional windowed (local) attention: each token attends only to
+      its neighbours, O(n x window) time and memory
+    - Batches of inputs: short inputs padded into one stacked matmul
     """
     
+    # Characters of a token value that feed its name hash
+    HASH_CHARS = 64
+    
+    # Largest padded score stack (batch x heads x length x length) per
+    # forward_batch matmul, 16 MB of float32
+    BATCH_SCORES = 1 << 22
+    
+    # Padding allowed per stack, as a fraction of the scores it holds
+    PADDING_WASTE = 0.25
+    
     def __init__(
         self,
         embedding_dim: int = 64,
         num_heads: int = 4,
-        dropout: float = 0.1
+        dropout: float = 0.1,
+        block_size: int = 256,
+        window: Optional[int] = None
     ):
         """
         Initialize multi-head attention.
         
         Args:
             embedding_dim: Dimension of token embeddings
-            num_heads: Number of attention heads
+            num_heads: Number of attention heads (must divide embedding_dim)
             dropout: Dropout rate (for training)
+            block_size: Queries per block of attention scores
+            window: Attend only to tokens at most this many positions away
+                (None: every token attends to every token)
         """
+        if embedding_dim % num_heads:
+            raise ValueError("embedding_dim must be divisible by num_heads")
+        if block_size < 1:
+            raise ValueError("block_size must be at least 1")
         self.embedding_dim = embedding_dim
         self.num_heads = num_heads
         self.head_dim = embedding_dim // num_heads
         self.dropout = dropout
-        
-        # Initialize projection matrices (simplified)
-        np.random.seed(42)  # For reproducibility
-        self.W_q = np.random.randn(embedding_dim, embedding_dim) * 0.1
-        self.W_k = np.random.randn(embedding_dim, embedding_dim) * 0.1
-        self.W_v = np.random.randn(embedding_dim, embedding_dim) * 0.1
-        self.W_o = np.random.randn(embedding_dim, embedding_dim) * 0.1
-        
-        # Category embeddings
-        self._category_embeddings: Dict[TokenCategory, np.ndarray] = {}
-        self._init_category_embeddings()
+        self.block_size = block_size
+        self.window = window
+        
+        # Initialize projection matrices (simplified), without touching
+        # the global numpy random state
+        rng = np.random.RandomState(42)  # For reproducibility
+        self.W_q = (rng.randn(embedding_dim, embedding_dim) * 0.1).astype(np.float32)
+        self.W_k = (rng.randn(embedding_dim, embedding_dim) * 0.1).astype(np.float32)
+        self.W_v = (rng.randn(embedding_dim, embedding_dim) * 0.1).astype(np.float32)
+        self.W_o = (rng.randn(embedding_dim, embedding_dim) * 0.1).astype(np.float32)
+        
+        # Category embeddings: one row per category, indexed by category code
+        self._categories = list(TokenCategory)
+        self._category_codes = {category: i for i, category in enumerate(self._categories)}
+        self._category_table = self._init_category_embeddings()
+        
+        # Per-position multipliers for the polynomial name hash
+        self._hash_weights = np.power(
+            np.uint64(1000003), np.arange(self.HASH_CHARS, dtype=np.uint64)
+        )
     
-    def _init_category_embeddings(self) -> None:
-        """Initialize embeddings for each token category."""
-        for i, category in enumerate(TokenCategory):
-            # Create distinct embedding for each category
-            embedding = np.zeros(self.embedding_dim)
-            start = i * (self.embedding_dim // len(TokenCategory))
-            end = start + (self.embedding_dim // len(TokenCategory))
-            embedding[start:end] = 1.0
-            self._category_embeddings[category] = embedding
+    def _init_category_embeddings(self) -> np.ndarray:
+        """Build the embedding table, one distinct row per token category."""
+        table = np.zeros((len(self._categories), self.embedding_dim), dtype=np.float32)
+        width = self.embedding_dim // len(self._categories)
+        for i in range(len(self._categories)):
+            table[i, i * width:(i + 1) * width] = 1.0
+        return table
+    
+    def _name_hashes(self, values: List[str]) -> np.ndarray:
+        """
+        Hash token values into [0, 1), all at once.
+        
+        Values become a fixed-width (n, HASH_CHARS) array of code points;
+        each row's polynomial hash is one multiply-and-sum. Unlike hash(),
+        the result is the same in every process.
+        """
+        chars = np.array(values, dtype=f"<U{self.HASH_CHARS}")
+        codes = chars.view(np.uint32).reshape(len(values), -1).astype(np.uint64)
+        with np.errstate(over="ignore"):
+            hashes = codes @ self._hash_weights[:codes.shape[1]]
+        return (hashes % np.uint64(1000)).astype(np.float32) / np.float32(1000.0)
     
     def embed_token(self, token: Token) -> np.ndarray:
         """
@@ -79,34 +129,31 @@ class MultiHeadAttention:
         - Clarity score
         - Name hash (for uniqueness)
         """
-        # Start with category embedding
-        embedding = self._category_embeddings[token.category].copy()
-        
-        # Add clarity score influence
-        embedding *= (0.5 + token.clarity_score * 0.5)
-        
-        # Add name hash for uniqueness
-        name_hash = hash(token.value) % 1000 / 1000.0
-        embedding[0] = name_hash
-        
-        # Normalize
-        norm = np.linalg.norm(embedding)
-        if norm > 0:
-            embedding = embedding / norm
-        
-        return embedding
+        return self.embed_tokens([token])[0]
     
     def embed_tokens(self, tokens: List[Token]) -> np.ndarray:
         """
         Create embeddings for a list of tokens.
         
         Returns:
-            Matrix of shape (num_tokens, embedding_dim)
+            float32 matrix of shape (num_tokens, embedding_dim)
         """
         if not tokens:
-            return np.zeros((1, self.embedding_dim))
+            return np.zeros((1, self.embedding_dim), dtype=np.float32)
         
-        embeddings = np.array([self.embed_token(t) for t in tokens])
+        n = len(tokens)
+        category_codes = self._category_codes
+        codes = np.fromiter((category_codes[t.category] for t in tokens), dtype=np.intp, count=n)
+        clarity = np.fromiter((t.clarity_score for t in tokens), dtype=np.float32, count=n)
+        
+        # Category row scaled by clarity, first component set to the name hash
+        embeddings = self._category_table[codes]
+        embeddings *= (0.5 + clarity * 0.5)[:, None]
+        embeddings[:, 0] = self._name_hashes([t.value for t in tokens])
+        
+        # Normalize rows
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        np.divide(embeddings, norms, out=embeddings, where=norms > 0)
         return embeddings
     
     def attention(
@@ -119,21 +166,25 @@ class MultiHeadAttention:
         """
         Compute scaled dot-product attention.
         
+        Works on single matrices (n, d) or stacks of heads (h, n, d).
+        This materializes the full score matrix; forward() uses blocks.
+        
         Args:
             query: Query matrix
             key: Key matrix
             value: Value matrix
-            mask: Optional attention mask
+            mask: Optional attention mask (True where attention is allowed)
             
         Returns:
             Tuple of (output, attention_weights)
         """
         # Scaled dot-product attention
         d_k = query.shape[-1]
-        scores = np.matmul(query, key.T) / math.sqrt(d_k)
+        scores = np.matmul(query, np.swapaxes(key, -1, -2))
+        scores *= np.float32(1.0 / math.sqrt(d_k))
         
         if mask is not None:
-            scores = np.where(mask, scores, -1e9)
+            scores = np.where(mask, scores, np.float32(-1e9))
         
         # Softmax
         attention_weights = self._softmax(scores)
@@ -144,9 +195,124 @@ class MultiHeadAttention:
         return output, attention_weights
     
     def _softmax(self, x: np.ndarray) -> np.ndarray:
-        """Compute softmax."""
-        exp_x = np.exp(x - np.max(x, axis=-1, keepdims=True))
-        return exp_x / np.sum(exp_x, axis=-1, keepdims=True)
+        """Compute softmax over the last axis (in place)."""
+        x -= np.max(x, axis=-1, keepdims=True)
+        np.exp(x, out=x)
+        x /= np.sum(x, axis=-1, keepdims=True)
+        return x
+    
+    def _split_heads(self, x: np.ndarray) -> np.ndarray:
+        """Reshape (n, embedding_dim) into (num_heads, n, head_dim)."""
+        return x.reshape(x.shape[0], self.num_heads, self.head_dim).transpose(1, 0, 2)
+    
+    def _project(self, embeddings: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Project embeddings to per-head queries, keys and values (num_heads, n, head_dim)."""
+        return (
+            self._split_heads(embeddings @ self.W_q),
+            self._split_heads(embeddings @ self.W_k),
+            self._split_heads(embeddings @ self.W_v)
+        )
+    
+    def _multi_head(
+        self,
+        embeddings: np.ndarray,
+        with_weights: bool = False
+    ) -> Tuple[np.ndarray, np.ndarray, Optional[np.ndarray]]:
+        """
+        Run multi-head self-attention, one block of queries at a time.
+        
+        Args:
+            embeddings: Token embeddings (n, embedding_dim)
+            with_weights: Also return the head-averaged (n, n) weights
+        
+        Returns:
+            Tuple of (output (n, embedding_dim), attention received per
+            token averaged over heads and queries (n,), weights or None)
+        """
+        return self._attend(*self._project(embeddings), with_weights=with_weights)
+    
+    def _attend(
+        self,
+        Q: np.ndarray,
+        K: np.ndarray,
+        V: np.ndarray,
+        with_weights: bool = False
+    ) -> Tuple[np.ndarray, np.ndarray, Optional[np.ndarray]]:
+        """Blocked attention over projected (num_heads, n, head_dim) inputs; see _multi_head."""
+        n = Q.shape[1]
+        scale = np.float32(1.0 / math.sqrt(self.head_dim))
+        
+        heads_out = np.empty(Q.shape, dtype=np.float32)
+        received = np.zeros(n, dtype=np.float32)
+        weights = np.zeros((n, n), dtype=np.float32) if with_weights else None
+        window = self.window
+        
+        for start in range(0, n, self.block_size):
+            end = min(start + self.block_size, n)
+            
+            # Keys this block can see: all of them, or its window
+            k_start, k_end = (0, n) if window is None else (max(0, start - window), min(n, end + window))
+            scores = np.matmul(Q[:, start:end], K[:, k_start:k_end].transpose(0, 2, 1))
+            scores *= scale
+            if window is not None:
+                offsets = (
+                    np.arange(k_start, k_end)[None, :] - np.arange(start, end)[:, None]
+                )
+                scores[:, np.abs(offsets) > window] = -np.inf
+            
+            block_weights = self._softmax(scores)
+            heads_out[:, start:end] = np.matmul(block_weights, V[:, k_start:k_end])
+            
+            averaged = block_weights.mean(axis=0)
+            received[k_start:k_end] += averaged.sum(axis=0)
+            if weights is not None:
+                weights[start:end, k_start:k_end] = averaged
+        
+        # Concatenate heads and project output
+        output = heads_out.transpose(1, 0, 2).reshape(n, self.embedding_dim) @ self.W_o
+        return output, received / np.float32(n), weights
+    
+    def _attend_padded(
+        self,
+        Q: np.ndarray,
+        K: np.ndarray,
+        V: np.ndarray,
+        lengths: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Attention over a padded stack of inputs (batch, num_heads, L, head_dim).
+        
+        Padding keys are masked out, so each input's rows equal _attend on
+        that input alone; padding query rows are computed but ignored.
+        
+        Returns:
+            Tuple of (output (batch, L, embedding_dim), attention received
+            per token (batch, L), zero at padding)
+        """
+        batch, _, length, _ = Q.shape
+        positions = np.arange(length)
+        valid = positions[None, :] < lengths[:, None]
+        
+        # (batch, L queries, L keys): padding keys are never attended to;
+        # padding queries skip the window so they keep a finite row
+        invalid = ~valid[:, None, :]
+        if self.window is not None:
+            outside = np.abs(positions[:, None] - positions[None, :]) > self.window
+            invalid = invalid | (outside[None] & valid[:, :, None])
+        bias = np.where(invalid, np.float32(-np.inf), np.float32(0.0))
+        
+        scores = np.matmul(Q, K.transpose(0, 1, 3, 2))
+        scores *= np.float32(1.0 / math.sqrt(self.head_dim))
+        scores += bias[:, None]
+        weights = self._softmax(scores)
+        heads_out = np.matmul(weights, V)
+        
+        averaged = weights.mean(axis=1)
+        averaged *= valid[:, :, None]
+        received = averaged.sum(axis=1) / lengths[:, None].astype(np.float32)
+        
+        output = heads_out.transpose(0, 2, 1, 3).reshape(batch, length, self.embedding_dim) @ self.W_o
+        return output, received
     
     def forward(self, tokens: List[Token]) -> AttentionOutput:
         """
@@ -159,40 +325,117 @@ class MultiHeadAttention:
             AttentionOutput with weighted tokens and confidence
         """
         if not tokens:
-            return AttentionOutput(
-                weighted_tokens=[],
-                context_vector=np.zeros(self.embedding_dim),
-                confidence=0.0,
-                dominant_category=TokenCategory.GENERAL
-            )
-        
-        # Get embeddings
-        embeddings = self.embed_tokens(tokens)
+            return self._empty_output()
         
-        # Project to Q, K, V
-        Q = np.matmul(embeddings, self.W_q)
-        K = np.matmul(embeddings, self.W_k)
-        V = np.matmul(embeddings, self.W_v)
+        # Multi-head attention; token weights are the attention each token
+        # receives, averaged over heads and query positions
+        output, token_weights, _ = self._multi_head(self.embed_tokens(tokens))
+        return self._build_output(tokens, output, token_weights)
+    
+    def forward_batch(self, token_lists: List[List[Token]]) -> List[AttentionOutput]:
+        """
+        Process several token lists; equivalent to forward() on each.
         
-        # Multi-head attention (simplified - single head for efficiency)
-        output, attention_weights = self.attention(Q, K, V)
+        Every token of every list is embedded and projected in one pass.
+        Lists of at most block_size tokens are sorted by length and
+        padded into (batch, heads, length, head_dim) stacks, so one
+        matmul serves many short inputs with little padding; longer
+        lists take the blocked path on their slice of the projections.
         
-        # Project output
-        output = np.matmul(output, self.W_o)
+        Args:
+            token_lists: Token lists to process independently
         
+        Returns:
+            One AttentionOutput per list, in order
+        """
+        results: List[Optional[AttentionOutput]] = [None] * len(token_lists)
+        lengths = [len(tokens) for tokens in token_lists]
+        starts = np.cumsum([0] + lengths).tolist()
+        
+        flat = [token for tokens in token_lists for token in tokens]
+        if flat:
+            Q, K, V = self._project(self.embed_tokens(flat))
+        
+        short = []
+        for i, n in enumerate(lengths):
+            if n == 0:
+                results[i] = self._empty_output()
+            elif n > self.block_size:
+                s, e = starts[i], starts[i + 1]
+                output, token_weights, _ = self._attend(Q[:, s:e], K[:, s:e], V[:, s:e])
+                results[i] = self._build_output(token_lists[i], output, token_weights)
+            else:
+                short.append(i)
+        
+        # Groups of similar lengths: each stack stays within BATCH_SCORES
+        # score elements, and padding adds at most PADDING_WASTE of the
+        # scores the group's inputs need on their own
+        short.sort(key=lengths.__getitem__)
+        group: List[int] = []
+        needed = 0
+        for position, i in enumerate(short):
+            group.append(i)
+            needed += lengths[i] ** 2
+            following = short[position + 1] if position + 1 < len(short) else None
+            if following is not None:
+                padded = (len(group) + 1) * lengths[following] ** 2
+                if (
+                    padded * self.num_heads <= self.BATCH_SCORES
+                    and padded <= (needed + lengths[following] ** 2) * (1 + self.PADDING_WASTE)
+                ):
+                    continue
+            self._forward_group(group, token_lists, starts, Q, K, V, results)
+            group = []
+            needed = 0
+        
+        return results
+    
+    def _forward_group(
+        self,
+        group: List[int],
+        token_lists: List[List[Token]],
+        starts: List[int],
+        Q: np.ndarray,
+        K: np.ndarray,
+        V: np.ndarray,
+        results: List[Optional[AttentionOutput]]
+    ) -> None:
+        """Pad one group of short inputs, attend, and store their outputs."""
+        lengths = np.array([len(token_lists[i]) for i in group])
+        length = int(lengths.max())
+        shape = (len(group), self.num_heads, length, self.head_dim)
+        padded = [np.zeros(shape, dtype=np.float32) for _ in range(3)]
+        for row, i in enumerate(group):
+            s, e = starts[i], starts[i + 1]
+            for target, source in zip(padded, (Q, K, V)):
+                target[row, :, :e - s] = source[:, s:e]
+        
+        output, received = self._attend_padded(*padded, lengths)
+        for row, i in enumerate(group):
+            n = int(lengths[row])
+            results[i] = self._build_output(token_lists[i], output[row, :n], received[row, :n])
+    
+    def _empty_output(self) -> AttentionOutput:
+        """Attention output for an empty token list."""
+        return AttentionOutput(
+            weighted_tokens=[],
+            context_vector=np.zeros(self.embedding_dim, dtype=np.float32),
+            confidence=0.0,
+            dominant_category=TokenCategory.GENERAL
+        )
+    
+    def _build_output(
+        self,
+        tokens: List[Token],
+        output: np.ndarray,
+        token_weights: np.ndarray
+    ) -> AttentionOutput:
+        """Summarize attention output and per-token weights for one input."""
         # Calculate context vector (mean pooling)
         context_vector = np.mean(output, axis=0)
         
-        # Get attention weights for each token (average across positions)
-        token_weights = np.mean(attention_weights, axis=0)
-        
-        # Create weighted tokens list
-        weighted_tokens = [
-            (token, float(weight))
-            for token, weight in zip(tokens, token_weights)
-        ]
-        
-        # Sort by weight
+        # Create weighted tokens list, sorted by weight
+        weighted_tokens = list(zip(tokens, token_weights.tolist()))
         weighted_tokens.sort(key=lambda x: x[1], reverse=True)
         
         # Calculate confidence based on attention distribution
@@ -224,8 +467,9 @@ class MultiHeadAttention:
         max_entropy = np.log(len(weights)) if len(weights) > 1 else 1
         normalized_entropy = entropy / max_entropy if max_entropy > 0 else 0
         
-        # Convert to confidence (lower entropy = higher confidence)
-        confidence = 1.0 - normalized_entropy
+        # Convert to confidence (lower entropy = higher confidence);
+        # float32 rounding can put a uniform distribution just below 0
+        confidence = max(1.0 - normalized_entropy, 0.0)
         
         return float(confidence)
     
@@ -235,40 +479,57 @@ class MultiHeadAttention:
         weights: np.ndarray
     ) -> TokenCategory:
         """Get the dominant category based on weighted tokens."""
-        category_weights: Dict[TokenCategory, float] = {}
+        if not tokens:
+            return TokenCategory.GENERAL
         
-        for token, weight in zip(tokens, weights):
-            category_weights[token.category] = (
-                category_weights.get(token.category, 0) + weight
-            )
+        category_codes = self._category_codes
+        codes = np.fromiter((category_codes[t.category] for t in tokens), dtype=np.intp, count=len(tokens))
+        totals = np.bincount(codes, weights=weights, minlength=len(self._categories))
+        return self._categories[int(np.argmax(totals))]
+    
+    def get_attention_matrix(self, tokens: List[Token]) -> np.ndarray:
+        """
+        Get token-to-token attention weights, averaged over heads.
         
-        if not category_weights:
-            return TokenCategory.GENERAL
+        Row i holds the attention token i pays to each token (zero outside
+        the window in windowed mode).
         
-        return max(category_weights, key=category_weights.get)
+        Returns:
+            float32 matrix of shape (num_tokens, num_tokens)
+        """
+        if not tokens:
+            return np.zeros((0, 0), dtype=np.float32)
+        _, _, weights = self._multi_head(self.embed_tokens(tokens), with_weights=True)
+        return weights
     
     def get_attention_map(
         self,
-        tokens: List[Token]
+        tokens: List[Token],
+        top_k: Optional[int] = None
     ) -> Dict[str, Dict[str, float]]:
         """
         Get attention map showing token-to-token attention.
         
+        Tokens with the same value share an entry (the later one wins).
+        For large inputs pass top_k, or use get_attention_matrix.
+        
+        Args:
+            tokens: Tokens to map
+            top_k: Keep only the k most attended tokens per token (None: all)
+        
         Returns:
             Dict mapping token pairs to attention weights
         """
-        embeddings = self.embed_tokens(tokens)
-        Q = np.matmul(embeddings, self.W_q)
-        K = np.matmul(embeddings, self.W_k)
-        
-        _, attention_weights = self.attention(Q, K, embeddings)
-        
-        attention_map: Dict[str, Dict[str, float]] = {}
-        for i, token_i in enumerate(tokens):
-            attention_map[token_i.value] = {}
-            for j, token_j in enumerate(tokens):
-                attention_map[token_i.value][token_j.value] = float(
-                    attention_weights[i, j]
-                )
-        
-        return attention_map
+        weights = self.get_attention_matrix(tokens)
+        values = [t.value for t in tokens]
+        
+        if top_k is not None and top_k < len(tokens):
+            top = np.argpartition(-weights, top_k - 1, axis=1)[:, :top_k]
+            return {
+                values[i]: {values[j]: float(weights[i, j]) for j in row}
+                for i, row in enumerate(top.tolist())
+            }
+        return {
+            values[i]: dict(zip(values, row))
+            for i, row in enumerate(weights.tolist())
+        }
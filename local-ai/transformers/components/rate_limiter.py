@@ -1,18 +1,31 @@
 """
 DevTeam6 Local AI - Rate Limiter
 
-Window-based rate limiting with client tracking and automatic cleanup.
+Lock-striped rate limiting (sliding window, token bucket, fixed window)
+with time-wheel cleanup of idle clients.
 """
 
-from typing import Dict, Any, Optional
-from dataclasses import dataclass, field
-from datetime import datetime, timedelta
-from collections import defaultdict
-import time
+from typing import Callable, Dict, Any, List, Optional
+from bisect import bisect_right
+from collections import deque
+from dataclasses import dataclass
+from enum import Enum
+import asyncio
+import math
 import threading
+import time
+import weakref
+
+
+class RateLimitAlgorithm(Enum):
+    """Rate limiting algorithms."""
+    FIXED_WINDOW = "fixed_window"  # Counter reset at the end of each window
+    SLIDING_LOG = "sliding_log"  # Exact: timestamps of the requests in the last window
+    SLIDING_COUNTER = "sliding_counter"  # This window's count plus the previous one's, weighted
+    TOKEN_BUCKET = "token_bucket"  # GCRA: bursts of max_requests, refilled evenly over the window
 
 
-@dataclass
+@dataclass(slots=True)
 class RateLimitEntry:
     """Rate limit tracking entry for a client."""
     
@@ -20,24 +33,286 @@ class RateLimitEntry:
     request_count: int
     window_start: float
     last_request: float
+    previous_count: int = 0  # Sliding counter: requests in the previous window
+    timestamps: Optional[deque] = None  # Sliding log: allowed request times
+    tat: float = 0.0  # Token bucket: theoretical arrival time (GCRA)
+    wheel_tick: int = -1  # Time wheel tick the entry is scheduled at
+
+
+class _FixedWindow:
+    """Fixed window: a counter that restarts when the window has passed."""
+    
+    @staticmethod
+    def allow(entry: RateLimitEntry, now: float, limit: int, window: float) -> bool:
+        if now - entry.window_start >= window:
+            entry.window_start = now
+            entry.request_count = 0
+        if entry.request_count < limit:
+            entry.request_count += 1
+            return True
+        return False
+    
+    @staticmethod
+    def remaining(entry: RateLimitEntry, now: float, limit: int, window: float) -> int:
+        if now - entry.window_start >= window:
+            return limit
+        return max(0, limit - entry.request_count)
+    
+    @staticmethod
+    def retry_after(entry: RateLimitEntry, now: float, limit: int, window: float) -> float:
+        if _FixedWindow.remaining(entry, now, limit, window) > 0:
+            return 0.0
+        return entry.window_start + window - now
+    
+    @staticmethod
+    def expires_at(entry: RateLimitEntry, window: float) -> float:
+        return entry.window_start + window
+
+
+class _SlidingLog:
+    """Sliding log: at most limit requests in any window-long interval."""
+    
+    @staticmethod
+    def _prune(entry: RateLimitEntry, now: float, window: float) -> deque:
+        log = entry.timestamps
+        cutoff = now - window
+        while log and log[0] <= cutoff:
+            log.popleft()
+        return log
+    
+    @staticmethod
+    def allow(entry: RateLimitEntry, now: float, limit: int, window: float) -> bool:
+        if entry.timestamps is None:
+            entry.timestamps = deque()
+        log = _SlidingLog._prune(entry, now, window)
+        if len(log) < limit:
+            log.append(now)
+            entry.request_count = len(log)
+            return True
+        return False
+    
+    @staticmethod
+    def remaining(entry: RateLimitEntry, now: float, limit: int, window: float) -> int:
+        log = entry.timestamps or ()
+        live = len(log) - bisect_right(log, now - window)
+        return max(0, limit - live)
+    
+    @staticmethod
+    def retry_after(entry: RateLimitEntry, now: float, limit: int, window: float) -> float:
+        if _SlidingLog.remaining(entry, now, limit, window) > 0:
+            return 0.0
+        log = entry.timestamps
+        # The request that has to leave the window to make room
+        return max(0.0, log[len(log) - limit] + window - now)
+    
+    @staticmethod
+    def expires_at(entry: RateLimitEntry, window: float) -> float:
+        if entry.timestamps:
+            return entry.timestamps[-1] + window
+        return entry.window_start
+
+
+class _SlidingCounter:
+    """
+    Sliding window counter.
+    
+    Counts per fixed window, and estimates the requests in the last
+    window-long interval as this window's count plus the previous
+    window's, weighted by how much of it the interval still covers.
+    """
+    
+    @staticmethod
+    def allow(entry: RateLimitEntry, now: float, limit: int, window: float) -> bool:
+        elapsed = now - entry.window_start
+        if elapsed >= window:
+            # Roll forward; after an idle window the previous count is 0
+            periods = int(elapsed // window)
+            entry.previous_count = entry.request_count if periods == 1 else 0
+            entry.request_count = 0
+            entry.window_start += periods * window
+            elapsed -= periods * window
+        if entry.previous_count * (1.0 - elapsed / window) + entry.request_count < limit:
+            entry.request_count += 1
+            return True
+        return False
+    
+    @staticmethod
+    def remaining(entry: RateLimitEntry, now: float, limit: int, window: float) -> int:
+        # Read-only: roll a copy of the counters
+        start, current, previous = entry.window_start, entry.request_count, entry.previous_count
+        elapsed = now - start
+        if elapsed >= window:
+            periods = int(elapsed // window)
+            previous = current if periods == 1 else 0
+            current = 0
+            start += periods * window
+        estimate = previous * (1.0 - (now - start) / window) + current
+        return max(0, math.ceil(limit - estimate))
+    
+    @staticmethod
+    def retry_after(entry: RateLimitEntry, now: float, limit: int, window: float) -> float:
+        if _SlidingCounter.remaining(entry, now, limit, window) > 0:
+            return 0.0
+        elapsed = now - entry.window_start
+        current, previous = entry.request_count, entry.previous_count
+        if current < limit:
+            # Wait for the previous window's weight to drop far enough
+            return max(0.0, window * (1.0 - (limit - current) / previous) - elapsed)
+        # Wait for the next window, then for this one's weight to drop
+        return (window - elapsed) + window * (1.0 - limit / current)
+    
+    @staticmethod
+    def expires_at(entry: RateLimitEntry, window: float) -> float:
+        if entry.request_count:
+            return entry.window_start + 2 * window
+        return entry.window_start + window
+
+
+# Slack, in emission intervals, for float rounding of epoch timestamps
+_TOLERANCE = 1e-3
+
+
+class _TokenBucket:
+    """
+    Token bucket, as the generic cell rate algorithm (GCRA).
+    
+    Holds one timestamp per client, the theoretical arrival time (TAT):
+    requests are spaced window / limit apart, and up to limit of them
+    may arrive at once.
+    """
+    
+    @staticmethod
+    def allow(entry: RateLimitEntry, now: float, limit: int, window: float) -> bool:
+        interval = window / limit
+        tat = max(entry.tat, now)
+        if tat - now > window - interval + interval * _TOLERANCE:
+            return False
+        entry.tat = tat + interval
+        entry.request_count += 1
+        return True
+    
+    @staticmethod
+    def remaining(entry: RateLimitEntry, now: float, limit: int, window: float) -> int:
+        backlog = max(0.0, entry.tat - now)
+        return max(0, min(limit, int((window - backlog) / (window / limit) + _TOLERANCE)))
+    
+    @staticmethod
+    def retry_after(entry: RateLimitEntry, now: float, limit: int, window: float) -> float:
+        if _TokenBucket.remaining(entry, now, limit, window) > 0:
+            return 0.0
+        return max(0.0, entry.tat - now - (window - window / limit))
+    
+    @staticmethod
+    def expires_at(entry: RateLimitEntry, window: float) -> float:
+        return entry.tat
+
+
+_ALGORITHMS = {
+    RateLimitAlgorithm.FIXED_WINDOW: _FixedWindow,
+    RateLimitAlgorithm.SLIDING_LOG: _SlidingLog,
+    RateLimitAlgorithm.SLIDING_COUNTER: _SlidingCounter,
+    RateLimitAlgorithm.TOKEN_BUCKET: _TokenBucket,
+}
+
+
+class _Stripe:
+    """One lock stripe: its clients, its slots of the time wheel, its counters."""
+    
+    __slots__ = ("lock", "clients", "wheel", "allowed", "denied", "contended")
+    
+    def __init__(self, wheel_slots: int, lock: Any = None):
+        self.lock = lock or threading.Lock()
+        self.clients: Dict[str, RateLimitEntry] = {}
+        # Each slot is an insertion-ordered set of client ids
+        self.wheel: List[Dict[str, None]] = [{} for _ in range(wheel_slots)]
+        self.allowed = 0
+        self.denied = 0
+        self.contended = 0
+
+
+class _NoLock:
+    """Lock interface that never blocks, for state confined to one event loop."""
+    
+    __slots__ = ()
+    
+    def __enter__(self) -> bool:
+        return True
+    
+    def __exit__(self, *exc_info: Any) -> None:
+        return None
+    
+    def locked(self) -> bool:
+        return False
+
+
+_NO_LOCK = _NoLock()
+
+
+class _Sweeper:
+    """
+    One daemon thread advancing the time wheels of every live RateLimiter.
+    
+    Limiters are held weakly, so the thread never keeps one alive.
+    """
+    
+    INTERVAL = 1.0
+    
+    def __init__(self):
+        self._limiters: "weakref.WeakSet[RateLimiter]" = weakref.WeakSet()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+    
+    def register(self, limiter: "RateLimiter") -> None:
+        with self._lock:
+            self._limiters.add(limiter)
+            # Also restarts the thread in a forked child, where it is gone
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="rate-limiter-sweeper", daemon=True
+                )
+                self._thread.start()
+    
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.INTERVAL)
+            with self._lock:
+                limiters = list(self._limiters)
+            for limiter in limiters:
+                limiter.sweep()
+            del limiters
+
+
+_sweeper = _Sweeper()
 
 
 class RateLimiter:
     """
-    Window-based rate limiter.
+    Lock-striped rate limiter.
     
     Features:
-    - Sliding window rate limiting
-    - Per-client tracking
-    - Automatic cleanup of expired entries
+    - Algorithms: sliding window counter (default), exact sliding log,
+      token bucket (GCRA) and fixed window
+    - Per-client tracking, spread over lock stripes by client hash, so
+      concurrent requests from different clients rarely share a lock
+    - No cleanup on the request path: idle clients are removed by a
+      background thread through a time wheel, touching only the entries
+      due in each tick
+    - Decision, contention and cleanup counters
     - Thread-safe operations
     """
     
+    # Slots in each stripe's time wheel
+    WHEEL_SLOTS = 64
+    
     def __init__(
         self,
         max_requests: int = 100,
         window_seconds: int = 60,
-        cleanup_interval: int = 300
+        cleanup_interval: int = 300,
+        algorithm: RateLimitAlgorithm = RateLimitAlgorithm.SLIDING_COUNTER,
+        stripes: int = 16,
+        background_cleanup: bool = True,
+        clock: Callable[[], float] = time.time
     ):
         """
         Initialize rate limiter.
@@ -45,20 +320,48 @@ class RateLimiter:
         Args:
             max_requests: Maximum requests per window
             window_seconds: Window duration in seconds
-            cleanup_interval: Interval for cleanup in seconds
+            cleanup_interval: Time wheel tick: idle clients are removed at
+                most this many seconds after their limit has fully reset
+            algorithm: Rate limiting algorithm
+            stripes: Number of lock stripes
+            background_cleanup: Sweep the time wheel from the shared
+                background thread (False: only when sweep() is called)
+            clock: Time source (seconds)
         """
+        if max_requests < 1:
+            raise ValueError("max_requests must be at least 1")
+        if stripes < 1:
+            raise ValueError("stripes must be at least 1")
         self.max_requests = max_requests
         self.window_seconds = window_seconds
         self.cleanup_interval = cleanup_interval
+        self.algorithm = algorithm
+        self.clock = clock
         
-        # Client tracking: client_id -> RateLimitEntry
-        self._clients: Dict[str, RateLimitEntry] = {}
+        self._algorithm = _ALGORITHMS[algorithm]
+        self._allow = self._algorithm.allow
+        self._stripes = [_Stripe(self.WHEEL_SLOTS) for _ in range(stripes)]
+        self._stripe_count = stripes
         
-        # Lock for thread safety
-        self._lock = threading.RLock()
+        # Time wheel position: the last tick swept
+        self._sweep_lock = threading.Lock()
+        self._last_tick = self._tick(clock())
+        self._expired = 0
         
-        # Last cleanup time
-        self._last_cleanup = time.time()
+        if background_cleanup:
+            _sweeper.register(self)
+    
+    def _stripe(self, client_id: str) -> _Stripe:
+        """Get the stripe holding a client."""
+        return self._stripes[hash(client_id) % self._stripe_count]
+    
+    def _tick(self, timestamp: float) -> int:
+        """Time wheel tick at or after a timestamp."""
+        return math.ceil(timestamp / self.cleanup_interval)
+    
+    def _limit(self, client_id: str) -> int:
+        """Request limit for a client."""
+        return self.max_requests
     
     def allow_request(self, client_id: str) -> bool:
         """
@@ -66,47 +369,99 @@ class RateLimiter:
         
         Args:
             client_id: Client identifier
-            
+        
         Returns:
             True if request is allowed
         """
-        current_time = time.time()
-        
-        with self._lock:
-            # Run cleanup if needed
-            self._maybe_cleanup(current_time)
+        limit = self._limit(client_id)
+        stripe = self._stripes[hash(client_id) % self._stripe_count]
+        lock = stripe.lock
+        busy = lock.locked()
+        with lock:
+            if busy:
+                stripe.contended += 1
+            return self._decide(stripe, client_id, limit)
             
-            # Get or create client entry
-            entry = self._clients.get(client_id)
+    def _decide(self, stripe: _Stripe, client_id: str, limit: int) -> bool:
+        """Count a request against a limit and decide it (stripe locked)."""
+        current_time = self.clock()
+        entry = stripe.clients.get(client_id)
+        if entry is None:
+            entry = RateLimitEntry(
+                client_id=client_id,
+                request_count=0,
+                window_start=current_time,
+                last_request=current_time
+            )
+            stripe.clients[client_id] = entry
             
-            if entry is None:
-                # New client
-                self._clients[client_id] = RateLimitEntry(
-                    client_id=client_id,
-                    request_count=1,
-                    window_start=current_time,
-                    last_request=current_time
-                )
-                return True
-            
-            # Check if window has expired
-            window_age = current_time - entry.window_start
-            
-            if window_age >= self.window_seconds:
-                # Start new window
-                entry.request_count = 1
-                entry.window_start = current_time
-                entry.last_request = current_time
-                return True
-            
-            # Check if within limit
-            if entry.request_count < self.max_requests:
-                entry.request_count += 1
-                entry.last_request = current_time
-                return True
-            
-            # Rate limited
-            return False
+        allowed = self._allow(entry, current_time, limit, self.window_seconds)
+        if allowed:
+            entry.last_request = current_time
+            stripe.allowed += 1
+        else:
+            stripe.denied += 1
+        
+        # Each entry sits in the wheel once; the sweep moves it along
+        if entry.wheel_tick < 0:
+            self._schedule(stripe, entry)
+        return allowed
+    
+    def _schedule(self, stripe: _Stripe, entry: RateLimitEntry) -> None:
+        """Put an entry in the wheel slot of the tick it expires by (stripe locked)."""
+        tick = max(self._tick(self._algorithm.expires_at(entry, self.window_seconds)), self._last_tick + 1)
+        entry.wheel_tick = tick
+        stripe.wheel[tick % self.WHEEL_SLOTS][entry.client_id] = None
+    
+    def sweep(self) -> int:
+        """
+        Advance the time wheel to now, removing clients whose limit has reset.
+        
+        Only the wheel slots of the elapsed ticks are visited; an entry
+        still in use is moved to the slot of its new expiry. Called from
+        the background thread; safe to call directly.
+        
+        Returns:
+            Number of entries removed
+        """
+        removed = 0
+        with self._sweep_lock:
+            now = self.clock()
+            target = self._tick(now)
+            if now < target * self.cleanup_interval:
+                target -= 1  # the current tick has not ended yet
+            first = max(self._last_tick + 1, target - self.WHEEL_SLOTS + 1)
+            for tick in range(first, target + 1):
+                slot = tick % self.WHEEL_SLOTS
+                for stripe in self._stripes:
+                    with stripe.lock:
+                        removed += self._sweep_slot(stripe, slot, tick, now)
+                self._last_tick = tick
+            self._expired += removed
+        return removed
+    
+    def _sweep_slot(self, stripe: _Stripe, slot: int, tick: int, now: float) -> int:
+        """Process one wheel slot of a stripe (stripe locked)."""
+        due = stripe.wheel[slot]
+        if not due:
+            return 0
+        stripe.wheel[slot] = {}
+        removed = 0
+        for client_id in due:
+            entry = stripe.clients.get(client_id)
+            # Stale slot entries (client reset, or recreated in another slot) are dropped
+            if entry is None or (entry.wheel_tick > tick and entry.wheel_tick % self.WHEEL_SLOTS != slot):
+                continue
+            if entry.wheel_tick > tick:
+                # Due a later lap of the wheel (expires over WHEEL_SLOTS ticks ahead)
+                stripe.wheel[slot][client_id] = None
+                continue
+            if self._algorithm.expires_at(entry, self.window_seconds) <= now:
+                del stripe.clients[client_id]
+                removed += 1
+            else:
+                self._schedule(stripe, entry)
+        return removed
     
     def get_remaining(self, client_id: str) -> int:
         """
@@ -114,25 +469,35 @@ class RateLimiter:
         
         Args:
             client_id: Client identifier
-            
+        
         Returns:
             Number of remaining requests
         """
-        current_time = time.time()
+        limit = self._limit(client_id)
+        stripe = self._stripe(client_id)
+        with stripe.lock:
+            entry = stripe.clients.get(client_id)
+            if entry is None:
+                return limit
+            return self._algorithm.remaining(entry, self.clock(), limit, self.window_seconds)
+    
+    def get_retry_after(self, client_id: str) -> float:
+        """
+        Get time until a client's next request would be allowed.
         
-        with self._lock:
-            entry = self._clients.get(client_id)
-            
+        Args:
+            client_id: Client identifier
+        
+        Returns:
+            Seconds to wait (0 if a request is allowed now)
+        """
+        limit = self._limit(client_id)
+        stripe = self._stripe(client_id)
+        with stripe.lock:
+            entry = stripe.clients.get(client_id)
             if entry is None:
-                return self.max_requests
-            
-            # Check if window has expired
-            window_age = current_time - entry.window_start
-            
-            if window_age >= self.window_seconds:
-                return self.max_requests
-            
-            return max(0, self.max_requests - entry.request_count)
+                return 0.0
+            return self._algorithm.retry_after(entry, self.clock(), limit, self.window_seconds)
     
     def get_reset_time(self, client_id: str) -> float:
         """
@@ -140,24 +505,16 @@ class RateLimiter:
         
         Args:
             client_id: Client identifier
-            
+        
         Returns:
-            Seconds until reset
+            Seconds until the client's full limit is available again
         """
-        current_time = time.time()
-        
-        with self._lock:
-            entry = self._clients.get(client_id)
-            
+        stripe = self._stripe(client_id)
+        with stripe.lock:
+            entry = stripe.clients.get(client_id)
             if entry is None:
                 return 0
-            
-            window_age = current_time - entry.window_start
-            
-            if window_age >= self.window_seconds:
-                return 0
-            
-            return self.window_seconds - window_age
+            return max(0.0, self._algorithm.expires_at(entry, self.window_seconds) - self.clock())
     
     def reset_client(self, client_id: str) -> None:
         """
@@ -166,72 +523,66 @@ class RateLimiter:
         Args:
             client_id: Client to reset
         """
-        with self._lock:
-            self._clients.pop(client_id, None)
-    
-    def _maybe_cleanup(self, current_time: float) -> None:
-        """Run cleanup if interval has passed."""
-        if current_time - self._last_cleanup >= self.cleanup_interval:
-            self._cleanup(current_time)
-            self._last_cleanup = current_time
-    
-    def _cleanup(self, current_time: float) -> int:
-        """
-        Remove expired entries.
-        
-        Args:
-            current_time: Current timestamp
-            
-        Returns:
-            Number of entries removed
-        """
-        expired = []
-        
-        for client_id, entry in self._clients.items():
-            window_age = current_time - entry.window_start
-            
-            # Remove if window is very old (2x window size)
-            if window_age >= self.window_seconds * 2:
-                expired.append(client_id)
-        
-        for client_id in expired:
-            del self._clients[client_id]
-        
-        return len(expired)
+        stripe = self._stripe(client_id)
+        with stripe.lock:
+            stripe.clients.pop(client_id, None)
     
     def force_cleanup(self) -> int:
         """
-        Force cleanup of expired entries.
+        Remove every client whose limit has fully reset, scanning all of them.
         
         Returns:
             Number of entries removed
         """
-        with self._lock:
-            return self._cleanup(time.time())
+        removed = 0
+        now = self.clock()
+        for stripe in self._stripes:
+            with stripe.lock:
+                expired = [
+                    client_id for client_id, entry in stripe.clients.items()
+                    if self._algorithm.expires_at(entry, self.window_seconds) <= now
+                ]
+                for client_id in expired:
+                    del stripe.clients[client_id]
+                removed += len(expired)
+        return removed
     
     def get_stats(self) -> Dict[str, Any]:
         """Get rate limiter statistics."""
-        with self._lock:
-            current_time = time.time()
-            
-            active_clients = 0
-            limited_clients = 0
-            
-            for entry in self._clients.values():
-                window_age = current_time - entry.window_start
-                
-                if window_age < self.window_seconds:
-                    active_clients += 1
-                    if entry.request_count >= self.max_requests:
-                        limited_clients += 1
-            
-            return {
-                "tracked_clients": len(self._clients),
-                "active_clients": active_clients,
-                "limited_clients": limited_clients,
-                "max_requests": self.max_requests,
-                "window_seconds": self.window_seconds
-            }
+        current_time = self.clock()
+        tracked = active = limited = 0
+        allowed = denied = contended = 0
+        
+        for stripe in self._stripes:
+            with stripe.lock:
+                tracked += len(stripe.clients)
+                allowed += stripe.allowed
+                denied += stripe.denied
+                contended += stripe.contended
+                for client_id, entry in stripe.clients.items():
+                    if self._algorithm.expires_at(entry, self.window_seconds) > current_time:
+                        active += 1
+                        remaining = self._algorithm.remaining(
+                            entry, current_time, self._limit(client_id), self.window_seconds
+                        )
+                        if remaining == 0:
+                            limited += 1
+        
+        decisions = allowed + denied
+        return {
+            "tracked_clients": tracked,
+            "active_clients": active,
+            "limited_clients": limited,
+            "max_requests": self.max_requests,
+            "window_seconds": self.window_seconds,
+            "algorithm": self.algorithm.value,
+            "stripes": len(self._stripes),
+            "allowed": allowed,
+            "denied": denied,
+            "contended": contended,
+            "contention_rate": contended / decisions if decisions else 0.0,
+            "expired_by_sweep": self._expired
+        }
     
     def get_client_info(self, client_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -239,27 +590,32 @@ class RateLimiter:
         
         Args:
             client_id: Client identifier
-            
+        
         Returns:
             Client info dict or None
         """
-        with self._lock:
-            entry = self._clients.get(client_id)
+        limit = self._limit(client_id)
+        stripe = self._stripe(client_id)
+        with stripe.lock:
+            entry = stripe.clients.get(client_id)
             
             if entry is None:
                 return None
             
-            current_time = time.time()
-            window_age = current_time - entry.window_start
+            current_time = self.clock()
+            window = self.window_seconds
+            remaining = self._algorithm.remaining(entry, current_time, limit, window)
             
             return {
                 "client_id": entry.client_id,
+                "algorithm": self.algorithm.value,
                 "request_count": entry.request_count,
-                "remaining": max(0, self.max_requests - entry.request_count),
+                "remaining": remaining,
                 "window_start": entry.window_start,
-                "window_age": window_age,
-                "reset_in": max(0, self.window_seconds - window_age),
-                "is_limited": entry.request_count >= self.max_requests
+                "window_age": current_time - entry.window_start,
+                "reset_in": max(0.0, self._algorithm.expires_at(entry, window) - current_time),
+                "retry_after": self._algorithm.retry_after(entry, current_time, limit, window),
+                "is_limited": remaining == 0
             }
 
 
@@ -279,7 +635,8 @@ class AdaptiveRateLimiter(RateLimiter):
         window_seconds: int = 60,
         min_requests: int = 10,
         max_requests: int = 1000,
-        adjustment_factor: float = 0.1
+        adjustment_factor: float = 0.1,
+        **kwargs: Any
     ):
         """
         Initialize adaptive rate limiter.
@@ -290,8 +647,9 @@ class AdaptiveRateLimiter(RateLimiter):
             min_requests: Minimum allowed limit
             max_requests: Maximum allowed limit
             adjustment_factor: Rate of adjustment
+            **kwargs: Passed to RateLimiter (algorithm, stripes, ...)
         """
-        super().__init__(base_requests, window_seconds)
+        super().__init__(base_requests, window_seconds, **kwargs)
         self.base_requests = base_requests
         self.min_requests = min_requests
         self._max_requests = max_requests
@@ -303,40 +661,147 @@ class AdaptiveRateLimiter(RateLimiter):
         # Violation counts
         self._violations: Dict[str, int] = {}
     
+    def _limit(self, client_id: str) -> int:
+        """Request limit for a client (its adjusted one, if any)."""
+        return self._client_limits.get(client_id, self.base_requests)
+    
     def allow_request(self, client_id: str) -> bool:
         """Check if request is allowed with adaptive limits."""
-        # Use client-specific limit if available
-        self.max_requests = self._client_limits.get(
-            client_id, self.base_requests
-        )
-        
         allowed = super().allow_request(client_id)
         
-        if not allowed:
-            # Track violation
-            self._violations[client_id] = self._violations.get(client_id, 0) + 1
-            
-            # Decrease limit for repeat offenders
-            if self._violations[client_id] >= 3:
-                current = self._client_limits.get(client_id, self.base_requests)
-                new_limit = max(
-                    self.min_requests,
-                    int(current * (1 - self.adjustment_factor))
-                )
-                self._client_limits[client_id] = new_limit
-        else:
-            # Gradually increase limit for good behavior
-            if client_id in self._client_limits:
-                current = self._client_limits[client_id]
-                if current < self.base_requests:
-                    new_limit = min(
-                        self.base_requests,
-                        int(current * (1 + self.adjustment_factor * 0.5))
+        # The client's stripe also guards its adaptive state
+        with self._stripe(client_id).lock:
+            if not allowed:
+                # Track violation
+                self._violations[client_id] = self._violations.get(client_id, 0) + 1
+                
+                # Decrease limit for repeat offenders
+                if self._violations[client_id] >= 3:
+                    current = self._client_limits.get(client_id, self.base_requests)
+                    new_limit = max(
+                        self.min_requests,
+                        int(current * (1 - self.adjustment_factor))
                     )
                     self._client_limits[client_id] = new_limit
+            else:
+                # Gradually increase limit for good behavior
+                if client_id in self._client_limits:
+                    current = self._client_limits[client_id]
+                    if current < self.base_requests:
+                        new_limit = min(
+                            self.base_requests,
+                            int(current * (1 + self.adjustment_factor * 0.5))
+                        )
+                        self._client_limits[client_id] = new_limit
         
         return allowed
     
     def get_client_limit(self, client_id: str) -> int:
         """Get the current limit for a client."""
         return self._client_limits.get(client_id, self.base_requests)
+
+
+def _sweep_later(ref: "weakref.ref[AsyncRateLimiter]") -> None:
+    """Loop timer callback: sweep a limiter that is still alive, and re-arm."""
+    limiter = ref()
+    if limiter is not None:
+        limiter._sweep_handle = None
+        limiter.sweep()
+        limiter._arm_sweep()
+
+
+class AsyncRateLimiter(RateLimiter):
+    """
+    Rate limiter for use from one asyncio event loop.
+    
+    Features:
+    - Same algorithms, per-client state and statistics as RateLimiter
+    - No OS locks: a decision never awaits, so the event loop already
+      runs decisions one at a time
+    - Idle clients swept by a timer on the running loop instead of the
+      background thread
+    - acquire() waits (asyncio.sleep) for capacity instead of refusing
+    
+    Not thread-safe: use it only from the loop it first runs on.
+    """
+    
+    def __init__(
+        self,
+        max_requests: int = 100,
+        window_seconds: int = 60,
+        cleanup_interval: int = 300,
+        algorithm: RateLimitAlgorithm = RateLimitAlgorithm.SLIDING_COUNTER,
+        clock: Callable[[], float] = time.time
+    ):
+        """
+        Initialize async rate limiter.
+        
+        Args:
+            max_requests: Maximum requests per window
+            window_seconds: Window duration in seconds
+            cleanup_interval: Time wheel tick (and sweep timer period)
+            algorithm: Rate limiting algorithm
+            clock: Time source (seconds)
+        """
+        super().__init__(
+            max_requests,
+            window_seconds,
+            cleanup_interval,
+            algorithm=algorithm,
+            stripes=1,
+            background_cleanup=False,
+            clock=clock
+        )
+        self._stripe0 = self._stripes[0] = _Stripe(self.WHEEL_SLOTS, _NO_LOCK)
+        self._sweep_lock = _NO_LOCK
+        self._sweep_handle: Optional[asyncio.TimerHandle] = None
+    
+    def allow_request(self, client_id: str) -> bool:
+        """
+        Check if a request is allowed for a client.
+        
+        Args:
+            client_id: Client identifier
+        
+        Returns:
+            True if request is allowed
+        """
+        if self._sweep_handle is None:
+            self._arm_sweep()
+        return self._decide(self._stripe0, client_id, self._limit(client_id))
+    
+    async def acquire(self, client_id: str, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until a request is allowed for a client, then count it.
+        
+        Args:
+            client_id: Client identifier
+            timeout: Longest time to wait in seconds (None: no limit)
+        
+        Returns:
+            True if the request was allowed, False if the wait would
+            exceed the timeout
+        """
+        deadline = None if timeout is None else self.clock() + timeout
+        while not self.allow_request(client_id):
+            delay = max(self.get_retry_after(client_id), 1e-3)
+            if deadline is not None and self.clock() + delay > deadline:
+                return False
+            await asyncio.sleep(delay)
+        return True
+    
+    def _arm_sweep(self) -> None:
+        """Start the sweep timer on the running loop (no-op outside one)."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._sweep_handle = loop.call_later(
+            self.cleanup_interval, _sweep_later, weakref.ref(self)
+        )
+    
+    def close(self) -> None:
+        """Cancel the sweep timer."""
+        if self._sweep_handle is not None:
+            self._sweep_handle.cancel()
+            self._sweep_handle = None
@@ -6,10 +6,21 @@ No regex guessing - uses Python's ast module for accurate parsing.
 """
 
 import ast
-from typing import List, Dict, Any, Optional, Set
+from typing import TYPE_CHECKING, Callable, Iterable, List, Dict, Any, Mapping, Optional, Set, Tuple, Union
+from array import array
+from collections import Counter
 from dataclasses import dataclass, field
 from enum import Enum
+from itertools import compress, count
+from operator import attrgetter, itemgetter
 import re
+import sys
+
+from utils.keyword_matcher import compiled_keywords
+from .lru_cache import LRUCache, digest_key
+
+if TYPE_CHECKING:
+    from .tokenizer_pool import TokenizerPool
 
 
 class TokenCategory(Enum):
@@ -24,9 +35,58 @@ class TokenCategory(Enum):
     IMPORT = "import"
 
 
-@dataclass
+class _FrozenDict(dict):
+    """
+    Read-only dict for metadata shared between tokens.
+    
+    Unlike a mappingproxy it pickles, copies and goes through
+    dataclasses.asdict like the plain dict it equals.
+    """
+    
+    __slots__ = ()
+    
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("token metadata is read-only")
+    
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+    
+    def __reduce__(self):
+        return type(self), (dict(self),)
+    
+    def __copy__(self) -> "_FrozenDict":
+        return self
+    
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "_FrozenDict":
+        return self
+
+
+# Metadata of every token that has none: one shared, read-only mapping
+_NO_METADATA: Mapping[str, Any] = _FrozenDict()
+
+# Call tokens share their metadata too, for the usual argument counts
+_CALL_METADATA: Tuple[Mapping[str, Any], ...] = tuple(
+    _FrozenDict(arg_count=n) for n in range(16)
+)
+
+
+def _call_metadata(arg_count: int) -> Mapping[str, Any]:
+    """Metadata of a function call token."""
+    if arg_count < len(_CALL_METADATA):
+        return _CALL_METADATA[arg_count]
+    return _FrozenDict(arg_count=arg_count)
+
+
+@dataclass(slots=True)
 class Token:
-    """A meaningful token extracted from code."""
+    """
+    A meaningful token extracted from code.
+    
+    Slotted (no per-instance __dict__), and tokens with common metadata
+    (none, or a call's argument count) share one read-only mapping
+    instead of each owning a dict, so large token lists stay small.
+    Treat metadata as read-only.
+    """
     
     value: str
     category: TokenCategory
@@ -34,7 +94,121 @@ class Token:
     line_number: int
     column: int
     context: str = ""
-    metadata: Dict[str, Any] = field(default_factory=dict)
+    metadata: Mapping[str, Any] = field(default_factory=lambda: _NO_METADATA)
+
+
+# TokenCategory by code (its position in the enum), and the reverse
+_CATEGORIES: Tuple[TokenCategory, ...] = tuple(TokenCategory)
+_CATEGORY_CODES: Dict[TokenCategory, int] = {category: i for i, category in enumerate(_CATEGORIES)}
+
+
+def _gather(indices: List[int]) -> Callable[[Any], Tuple[Any, ...]]:
+    """Build a function picking the items at the given positions, as a tuple."""
+    if len(indices) > 1:
+        return itemgetter(*indices)
+    if indices:
+        return lambda sequence: (sequence[indices[0]],)
+    return lambda sequence: ()
+
+
+@dataclass
+class TokenBatch:
+    """
+    A token list stored as parallel arrays (struct-of-arrays).
+    
+    One array per Token field instead of one object per token, so it is
+    small to keep and to pickle: this is how token lists come back from
+    tokenizer worker processes. Distinct values, contexts and metadata
+    are stored once, in tables indexed by per-token ids.
+    
+    SmartTokenizer's get_category_summary, filter_by_category and
+    get_high_clarity_tokens accept a TokenBatch as well as a token list,
+    and answer from the arrays without building Token objects.
+    """
+    
+    values: List[str]
+    value_ids: array  # "I": index into values
+    categories: bytes  # TokenCategory codes
+    clarity_scores: array  # "d"
+    line_numbers: array  # "i"
+    columns: array  # "i"
+    contexts: List[str]
+    context_ids: array  # "H": index into contexts
+    metadata: List[Dict[str, Any]]  # distinct metadata, the empty one first
+    metadata_ids: array  # "I": index into metadata
+    
+    @classmethod
+    def from_tokens(cls, tokens: List[Token]) -> "TokenBatch":
+        """Pack a token list."""
+        value_index: Dict[str, int] = {}
+        context_index: Dict[str, int] = {}
+        # Metadata is shared by identity (see Token), so it is tabled by id
+        metadata_index: Dict[int, int] = {id(_NO_METADATA): 0}
+        metadata: List[Dict[str, Any]] = [{}]
+        metadata_ids = array("I", [0]) * len(tokens)
+        for i, token in enumerate(tokens):
+            if token.metadata:
+                position = metadata_index.setdefault(id(token.metadata), len(metadata))
+                if position == len(metadata):
+                    metadata.append(dict(token.metadata))
+                metadata_ids[i] = position
+        return cls(
+            value_ids=array("I", [value_index.setdefault(t.value, len(value_index)) for t in tokens]),
+            values=list(value_index),
+            categories=bytes([_CATEGORY_CODES[t.category] for t in tokens]),
+            clarity_scores=array("d", [t.clarity_score for t in tokens]),
+            line_numbers=array("i", [t.line_number for t in tokens]),
+            columns=array("i", [t.column for t in tokens]),
+            context_ids=array("H", [context_index.setdefault(t.context, len(context_index)) for t in tokens]),
+            contexts=list(context_index),
+            metadata=metadata,
+            metadata_ids=metadata_ids
+        )
+    
+    def to_tokens(self) -> List[Token]:
+        """Unpack into Token objects (equal to the packed ones, metadata read-only and shared)."""
+        values = self.values
+        contexts = self.contexts
+        metadata = [_NO_METADATA] + [_FrozenDict(m) for m in self.metadata[1:]]
+        return [
+            Token(values[v], _CATEGORIES[c], clarity, line, column, contexts[x], metadata[m])
+            for v, c, clarity, line, column, x, m in zip(
+                self.value_ids, self.categories, self.clarity_scores,
+                self.line_numbers, self.columns, self.context_ids, self.metadata_ids
+            )
+        ]
+    
+    def take(self, indices: Iterable[int]) -> "TokenBatch":
+        """
+        Select tokens by position.
+        
+        Args:
+            indices: Positions of the tokens to keep, in the order wanted
+        
+        Returns:
+            New batch sharing this one's value, context and metadata tables
+        """
+        indices = list(indices)
+        pick = _gather(indices)
+        return TokenBatch(
+            values=self.values,
+            value_ids=array("I", pick(self.value_ids)),
+            categories=bytes(pick(self.categories)),
+            clarity_scores=array("d", pick(self.clarity_scores)),
+            line_numbers=array("i", pick(self.line_numbers)),
+            columns=array("i", pick(self.columns)),
+            contexts=self.contexts,
+            context_ids=array("H", pick(self.context_ids)),
+            metadata=self.metadata,
+            metadata_ids=array("I", pick(self.metadata_ids))
+        )
+    
+    def category_counts(self) -> Dict[TokenCategory, int]:
+        """Count tokens per category, in order of first occurrence."""
+        return {_CATEGORIES[code]: count for code, count in Counter(self.categories).items()}
+    
+    def __len__(self) -> int:
+        return len(self.value_ids)
 
 
 class SmartTokenizer:
@@ -65,156 +239,246 @@ class SmartTokenizer:
         "json", "xml", "csv", "file", "read", "write", "parse"
     }
     
-    def __init__(self):
-        """Initialize the smart tokenizer."""
-        self._cache: Dict[str, List[Token]] = {}
+    # All three sets compiled into one matcher; earlier categories win
+    _indicators = compiled_keywords(lambda cls: {
+        TokenCategory.API: cls.API_INDICATORS,
+        TokenCategory.SECURITY: cls.SECURITY_INDICATORS,
+        TokenCategory.DATA: cls.DATA_INDICATORS
+    })
     
-    def tokenize(self, code: str, language: str = "python") -> List[Token]:
+    def __init__(
+        self,
+        cache_size: int = 1024,
+        cache_max_bytes: Optional[int] = 32 * 1024 * 1024,
+        cache_ttl_seconds: Optional[float] = None,
+        max_documents: int = 64
+    ):
+        """
+        Initialize the smart tokenizer.
+        
+        Args:
+            cache_size: Maximum cached token lists
+            cache_max_bytes: Maximum footprint of cached token lists
+            cache_ttl_seconds: Lifetime of cached token lists (None: no expiry)
+            max_documents: Documents remembered for incremental tokenization
+        """
+        # Token lists keyed by digest of (code, language)
+        self._cache: LRUCache[bytes, List[Token]] = LRUCache(
+            max_entries=cache_size,
+            max_bytes=cache_max_bytes,
+            ttl_seconds=cache_ttl_seconds
+        )
+        
+        # Per document: top-level statement key -> (first line, tokens)
+        self._documents: LRUCache[str, Dict[bytes, Tuple[int, List[Token]]]] = LRUCache(
+            max_entries=max_documents,
+            size_of=None
+        )
+        self.segments_reused = 0
+        self.segments_tokenized = 0
+    
+    def tokenize(
+        self,
+        code: str,
+        language: str = "python",
+        document_id: Optional[str] = None
+    ) -> List[Token]:
         """
         Tokenize code using AST analysis.
         
+        With a document_id, Python code is tokenized incrementally: when the
+        same document is submitted again, only the top-level statements
+        (functions, classes, ...) whose source changed are re-tokenized;
+        the rest reuse their previous tokens, moved to their new lines.
+        
         Args:
             code: Source code to tokenize
             language: Programming language (currently supports python)
+            document_id: Identifies resubmissions of the same file (e.g. its path)
             
         Returns:
             List of Token objects
         """
-        cache_key = hash(code)
-        if cache_key in self._cache:
-            return self._cache[cache_key]
+        cache_key = digest_key(code, language)
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            return cached
         
+        tokens = self._tokenize_uncached(code, language, document_id)
+        self._cache.put(cache_key, tokens)
+        return tokens
+    
+    def tokenize_batch(
+        self,
+        codes: List[str],
+        language: str = "python",
+        document_ids: Optional[List[Optional[str]]] = None,
+        pool: Optional["TokenizerPool"] = None
+    ) -> List[List[Token]]:
+        """
+        Tokenize several sources; equivalent to tokenize() on each.
+        
+        With a pool, the sources missing from the cache are tokenized in
+        its worker processes, in parallel. The cache stays in this process;
+        sources with a document_id are tokenized here, incrementally.
+        
+        Args:
+            codes: Source code to tokenize
+            language: Programming language
+            document_ids: Per-source document ids (see tokenize), or None
+            pool: Worker processes to tokenize in (None: this process)
+            
+        Returns:
+            One token list per source, in order
+        """
+        results: List[Optional[List[Token]]] = [None] * len(codes)
+        cache_keys = [digest_key(code, language) for code in codes]
+        remote: List[int] = []
+        
+        for i, (code, cache_key) in enumerate(zip(codes, cache_keys)):
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                results[i] = cached
+                continue
+            document_id = document_ids[i] if document_ids else None
+            if pool is None or document_id is not None:
+                results[i] = self._tokenize_uncached(code, language, document_id)
+                self._cache.put(cache_key, results[i])
+            else:
+                remote.append(i)
+        
+        if remote:
+            token_lists = pool.tokenize([codes[i] for i in remote], language)
+            for i, tokens in zip(remote, token_lists):
+                results[i] = tokens
+                self._cache.put(cache_keys[i], tokens)
+        
+        return results
+    
+    def _tokenize_uncached(
+        self,
+        code: str,
+        language: str,
+        document_id: Optional[str] = None
+    ) -> List[Token]:
+        """Tokenize without consulting the token cache."""
         if language == "python":
-            tokens = self._tokenize_python(code)
-        else:
-            # Fallback to simple tokenization for other languages
-            tokens = self._tokenize_simple(code)
+            return self._tokenize_python(code, document_id)
+        # Fallback to simple tokenization for other languages
+        return self._tokenize_simple(code)
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get token cache and incremental tokenization statistics."""
+        return {
+            **self._cache.get_stats(),
+            "documents": len(self._documents),
+            "segments_reused": self.segments_reused,
+            "segments_tokenized": self.segments_tokenized
+        }
+    
+    def clear_cache(self) -> int:
+        """
+        Clear the token cache and the incremental document state.
         
-        self._cache[cache_key] = tokens
-        return tokens
+        Returns:
+            Number of token cache entries removed
+        """
+        self._documents.clear()
+        return self._cache.clear()
     
-    def _tokenize_python(self, code: str) -> List[Token]:
+    def _tokenize_python(self, code: str, document_id: Optional[str] = None) -> List[Token]:
         """Tokenize Python code using AST."""
-        tokens: List[Token] = []
+        if document_id is not None:
+            tokens = self._tokenize_incremental(code, document_id)
+            if tokens is not None:
+                return tokens
         
         try:
             tree = ast.parse(code)
-            tokens.extend(self._extract_from_ast(tree, code))
         except SyntaxError:
             # Fallback to simple tokenization if AST fails
-            tokens = self._tokenize_simple(code)
-        
-        return tokens
+            return self._tokenize_simple(code)
+        return self._extract_from_ast(tree, code)
     
     def _extract_from_ast(self, tree: ast.AST, source: str) -> List[Token]:
-        """Extract tokens from AST nodes."""
-        tokens: List[Token] = []
-        
-        for node in ast.walk(tree):
-            token = self._node_to_token(node, source)
-            if token:
-                tokens.append(token)
-        
-        return tokens
+        """Extract tokens from AST nodes in a single pass."""
+        extractor = _TokenExtractor(self)
+        extractor.visit(tree)
+        return extractor.tokens
     
-    def _node_to_token(self, node: ast.AST, source: str) -> Optional[Token]:
-        """Convert an AST node to a Token."""
-        
-        # Function definitions
-        if isinstance(node, ast.FunctionDef):
-            category = self._categorize_name(node.name)
-            return Token(
-                value=node.name,
-                category=category,
-                clarity_score=self._calculate_clarity(node.name),
-                line_number=node.lineno,
-                column=node.col_offset,
-                context="function_definition",
-                metadata={"args": [arg.arg for arg in node.args.args]}
-            )
+    def _tokenize_incremental(self, code: str, document_id: str) -> Optional[List[Token]]:
+        """
+        Tokenize a document, reusing the tokens of unchanged top-level statements.
         
-        # Class definitions
-        elif isinstance(node, ast.ClassDef):
-            category = self._categorize_name(node.name)
-            return Token(
-                value=node.name,
-                category=category,
-                clarity_score=self._calculate_clarity(node.name),
-                line_number=node.lineno,
-                column=node.col_offset,
-                context="class_definition",
-                metadata={"bases": [self._get_name(b) for b in node.bases]}
-            )
+        The source is split into top-level statements without parsing it;
+        only statements whose text is new are parsed and tokenized, the
+        rest reuse their previous tokens, moved to their new lines. Parsing
+        is most of the cost of tokenizing, so an edit to one function costs
+        about as much as tokenizing that function.
         
-        # Imports
-        elif isinstance(node, ast.Import):
-            names = [alias.name for alias in node.names]
-            return Token(
-                value=", ".join(names),
-                category=TokenCategory.IMPORT,
-                clarity_score=1.0,
-                line_number=node.lineno,
-                column=node.col_offset,
-                context="import",
-                metadata={"modules": names}
-            )
+        Returns:
+            Tokens (as a full parse would give), or None if a statement
+            does not parse on its own (the caller then parses the whole
+            source); the previous state is kept in that case
+        """
+        previous = self._documents.get(document_id) or {}
+        segments: Dict[bytes, Tuple[int, List[Token]]] = {}
+        tokens: List[Token] = []
+        extractor = _TokenExtractor(self)
+        reused = tokenized = 0
         
-        # From imports
-        elif isinstance(node, ast.ImportFrom):
-            module = node.module or ""
-            names = [alias.name for alias in node.names]
-            return Token(
-                value=f"{module}.{', '.join(names)}",
-                category=TokenCategory.IMPORT,
-                clarity_score=1.0,
-                line_number=node.lineno,
-                column=node.col_offset,
-                context="from_import",
-                metadata={"module": module, "names": names}
-            )
+        for first_line, text in _top_level_statements(code):
+            # Blank lines after a statement do not change its tokens
+            key = digest_key(text.rstrip())
+            known = segments.get(key) or previous.get(key)
+            if known is not None:
+                old_line, old_tokens = known
+                shift = first_line - old_line
+                segment_tokens = old_tokens if not shift else [
+                    Token(t.value, t.category, t.clarity_score, t.line_number + shift, t.column, t.context, t.metadata)
+                    for t in old_tokens
+                ]
+                reused += 1
+            else:
+                try:
+                    tree = ast.parse(text)
+                except SyntaxError:
+                    return None
+                start = len(extractor.tokens)
+                extractor.line_offset = first_line - 1
+                extractor.visit(tree)
+                segment_tokens = extractor.tokens[start:]
+                tokenized += 1
+            
+            segments[key] = (first_line, segment_tokens)
+            tokens.extend(segment_tokens)
         
-        # Function calls
-        elif isinstance(node, ast.Call):
-            func_name = self._get_call_name(node)
-            if func_name:
-                category = self._categorize_name(func_name)
-                return Token(
-                    value=func_name,
-                    category=category,
-                    clarity_score=self._calculate_clarity(func_name),
-                    line_number=node.lineno if hasattr(node, 'lineno') else 0,
-                    column=node.col_offset if hasattr(node, 'col_offset') else 0,
-                    context="function_call",
-                    metadata={"arg_count": len(node.args)}
-                )
-        
-        # Variable assignments
-        elif isinstance(node, ast.Assign):
-            for target in node.targets:
-                name = self._get_name(target)
-                if name:
-                    category = self._categorize_name(name)
-                    return Token(
-                        value=name,
-                        category=category,
-                        clarity_score=self._calculate_clarity(name),
-                        line_number=node.lineno,
-                        column=node.col_offset,
-                        context="assignment",
-                        metadata={}
-                    )
-        
-        return None
+        self.segments_reused += reused
+        self.segments_tokenized += tokenized
+        self._documents.put(document_id, segments)
+        return tokens
     
     def _get_name(self, node: ast.AST) -> str:
-        """Get the name from various node types."""
+        """Get the (dotted) name from various node types."""
         if isinstance(node, ast.Name):
             return node.id
-        elif isinstance(node, ast.Attribute):
-            return f"{self._get_name(node.value)}.{node.attr}"
+        
+        # Walk an attribute chain (a.b.c) without recursing
+        parts = []
+        while isinstance(node, ast.Attribute):
+            parts.append(node.attr)
+            node = node.value
+        if not parts:
+            return str(node.value) if isinstance(node, ast.Constant) else ""
+        
+        if isinstance(node, ast.Name):
+            parts.append(node.id)
         elif isinstance(node, ast.Constant):
-            return str(node.value)
-        return ""
+            parts.append(str(node.value))
+        else:
+            parts.append("")
+        parts.reverse()
+        return ".".join(parts)
     
     def _get_call_name(self, node: ast.Call) -> str:
         """Get the function name from a Call node."""
@@ -225,25 +489,8 @@ class SmartTokenizer:
         return ""
     
     def _categorize_name(self, name: str) -> TokenCategory:
-        """Categorize a name based on indicators."""
-        name_lower = name.lower()
-        
-        # Check for API indicators
-        for indicator in self.API_INDICATORS:
-            if indicator in name_lower:
-                return TokenCategory.API
-        
-        # Check for security indicators
-        for indicator in self.SECURITY_INDICATORS:
-            if indicator in name_lower:
-                return TokenCategory.SECURITY
-        
-        # Check for data indicators
-        for indicator in self.DATA_INDICATORS:
-            if indicator in name_lower:
-                return TokenCategory.DATA
-        
-        return TokenCategory.GENERAL
+        """Categorize a name based on indicators (API, then security, then data)."""
+        return self._indicators.first_category(name, TokenCategory.GENERAL)
     
     def _calculate_clarity(self, name: str) -> float:
         """
@@ -299,25 +546,258 @@ class SmartTokenizer:
         
         return tokens
     
-    def get_category_summary(self, tokens: List[Token]) -> Dict[TokenCategory, int]:
-        """Get a summary of token categories."""
-        summary: Dict[TokenCategory, int] = {}
-        for token in tokens:
-            summary[token.category] = summary.get(token.category, 0) + 1
-        return summary
+    def get_category_summary(self, tokens: Union[List[Token], TokenBatch]) -> Dict[TokenCategory, int]:
+        """Get a summary of token categories (in order of first occurrence)."""
+        if isinstance(tokens, TokenBatch):
+            return tokens.category_counts()
+        return dict(Counter(map(attrgetter("category"), tokens)))
     
     def filter_by_category(
         self,
-        tokens: List[Token],
+        tokens: Union[List[Token], TokenBatch],
         category: TokenCategory
-    ) -> List[Token]:
-        """Filter tokens by category."""
+    ) -> Union[List[Token], TokenBatch]:
+        """Filter tokens by category (a TokenBatch gives a TokenBatch)."""
+        if isinstance(tokens, TokenBatch):
+            code = re.escape(bytes([_CATEGORY_CODES[category]]))
+            return tokens.take(match.start() for match in re.finditer(code, tokens.categories))
         return [t for t in tokens if t.category == category]
     
     def get_high_clarity_tokens(
         self,
-        tokens: List[Token],
+        tokens: Union[List[Token], TokenBatch],
         threshold: float = 0.7
-    ) -> List[Token]:
-        """Get tokens with clarity score above threshold."""
+    ) -> Union[List[Token], TokenBatch]:
+        """Get tokens with clarity score above threshold (a TokenBatch gives a TokenBatch)."""
+        if isinstance(tokens, TokenBatch):
+            return tokens.take(compress(count(), map(float(threshold).__le__, tokens.clarity_scores)))
         return [t for t in tokens if t.clarity_score >= threshold]
+
+
+# Everything that can hide a line break from the statement structure
+# (strings, comments, brackets, backslash continuations), and line
+# breaks followed by code in column 0. String prefixes (r, b, f) do not
+# change where a string ends, so they are not matched; the leading
+# lookahead lets the engine skip to candidate characters quickly.
+_SCAN = re.compile(r"""
+    (?=["'\#()\[\]{}\\\n])
+    (?:
+        (?P<string>
+            \"\"\"[^"\\]*(?:(?:\\.|"(?!""))[^"\\]*)*\"\"\"
+          | '''[^'\\]*(?:(?:\\.|'(?!''))[^'\\]*)*'''
+          | "[^"\\\n]*(?:\\.[^"\\\n]*)*"
+          | '[^'\\\n]*(?:\\.[^'\\\n]*)*'
+        )
+      | (?P<comment>\#[^\n]*)
+      | (?P<open>[(\[{])
+      | (?P<close>[)\]}])
+      | (?P<continuation>\\\n)
+      | \n(?=[^\s#])
+    )
+""", re.VERBOSE | re.DOTALL)
+
+# Column-0 lines that continue the statement above them
+_CONTINUATION = re.compile(r"(?:else|elif|except|finally)\b")
+_DEFINITION = re.compile(r"(?:def|class|async)\b")
+
+
+def _top_level_statements(source: str) -> List[Tuple[int, str]]:
+    """
+    Split Python source into top-level statements without parsing it.
+    
+    A statement starts at a line with code in column 0 that is outside
+    any string or bracket; decorators stay with their definition and
+    else/elif/except/finally with their block. Each piece carries the
+    comments and blank lines that follow it. The split is only a
+    candidate: a piece that does not parse on its own means it was wrong.
+    
+    Args:
+        source: Python source
+    
+    Returns:
+        (first line number, text) per statement, in order
+    """
+    if "\r" in source:
+        # The parser reads \r\n and \r as \n too
+        source = source.replace("\r\n", "\n").replace("\r", "\n")
+    
+    starts = [0]
+    depth = 0
+    decorated = source.startswith("@")
+    for match in _SCAN.finditer(source):
+        kind = match.lastgroup
+        if kind == "open":
+            depth += 1
+        elif kind == "close":
+            depth = max(depth - 1, 0)
+        elif kind is None and depth == 0:
+            start = match.end()
+            if decorated:
+                decorated = source.startswith("@", start) or not _DEFINITION.match(source, start)
+            elif source.startswith("@", start):
+                starts.append(start)
+                decorated = True
+            elif not _CONTINUATION.match(source, start):
+                starts.append(start)
+    
+    statements = []
+    line = 1
+    starts.append(len(source))
+    for start, end in zip(starts, starts[1:]):
+        statements.append((line, source[start:end]))
+        line += source.count("\n", start, end)
+    return statements
+
+
+# Fields that never contain tokens (expression contexts and operators)
+_SKIPPED_FIELDS = frozenset({"ctx", "op", "ops"})
+
+
+class _TokenExtractor(ast.NodeVisitor):
+    """
+    Single-pass token extractor for SmartTokenizer.
+    
+    Features:
+    - visit_* handlers dispatched through a table keyed by node type,
+      instead of an isinstance ladder per node
+    - Iterative pre-order traversal (parents first, children in field
+      order), so deeply nested expressions cannot hit the recursion limit
+    - Every assignment target becomes a token, tuple unpacking included,
+      at the target's own position
+    - Names repeated in a pass share one interned string and are
+      categorized and scored once
+    """
+    
+    def __init__(self, tokenizer: SmartTokenizer):
+        self.tokenizer = tokenizer
+        self.tokens: List[Token] = []
+        # Added to line numbers (when visiting a statement parsed on its own)
+        self.line_offset = 0
+        
+        # name -> (interned name, category, clarity)
+        self._names: Dict[str, Tuple[str, TokenCategory, float]] = {}
+        self._dispatch: Dict[type, Callable[[Any], None]] = {
+            node_type: getattr(self, "visit_" + node_type.__name__)
+            for node_type in (
+                ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef, ast.Import,
+                ast.ImportFrom, ast.Call, ast.Assign
+            )
+        }
+        self._fields: Dict[type, Tuple[str, ...]] = {}
+    
+    def visit(self, node: ast.AST) -> None:
+        """Extract tokens from a node and everything below it."""
+        dispatch = self._dispatch
+        fields_by_type = self._fields
+        stack = [node]
+        
+        while stack:
+            node = stack.pop()
+            node_type = type(node)
+            handler = dispatch.get(node_type)
+            if handler is not None:
+                handler(node)
+            
+            fields = fields_by_type.get(node_type)
+            if fields is None:
+                fields = tuple(f for f in node_type._fields if f not in _SKIPPED_FIELDS)
+                fields_by_type[node_type] = fields
+            
+            children = []
+            for name in fields:
+                value = getattr(node, name, None)
+                if isinstance(value, list):
+                    children.extend(item for item in value if isinstance(item, ast.AST))
+                elif isinstance(value, ast.AST):
+                    children.append(value)
+            children.reverse()
+            stack.extend(children)
+    
+    def _add(
+        self,
+        name: str,
+        line_number: int,
+        column: int,
+        context: str,
+        metadata: Mapping[str, Any]
+    ) -> None:
+        """Append a token for a name, scoring each distinct name once."""
+        info = self._names.get(name)
+        if info is None:
+            tokenizer = self.tokenizer
+            info = (
+                sys.intern(name),
+                tokenizer._categorize_name(name),
+                tokenizer._calculate_clarity(name)
+            )
+            self._names[name] = info
+        
+        self.tokens.append(Token(
+            value=info[0],
+            category=info[1],
+            clarity_score=info[2],
+            line_number=line_number + self.line_offset,
+            column=column,
+            context=context,
+            metadata=metadata
+        ))
+    
+    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
+        self._add(
+            node.name, node.lineno, node.col_offset, "function_definition",
+            {"args": [arg.arg for arg in node.args.args]}
+        )
+    
+    visit_AsyncFunctionDef = visit_FunctionDef
+    
+    def visit_ClassDef(self, node: ast.ClassDef) -> None:
+        self._add(
+            node.name, node.lineno, node.col_offset, "class_definition",
+            {"bases": [self.tokenizer._get_name(b) for b in node.bases]}
+        )
+    
+    def visit_Import(self, node: ast.Import) -> None:
+        names = [alias.name for alias in node.names]
+        self.tokens.append(Token(
+            value=", ".join(names),
+            category=TokenCategory.IMPORT,
+            clarity_score=1.0,
+            line_number=node.lineno + self.line_offset,
+            column=node.col_offset,
+            context="import",
+            metadata={"modules": names}
+        ))
+    
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
+        module = node.module or ""
+        names = [alias.name for alias in node.names]
+        self.tokens.append(Token(
+            value=f"{module}.{', '.join(names)}",
+            category=TokenCategory.IMPORT,
+            clarity_score=1.0,
+            line_number=node.lineno + self.line_offset,
+            column=node.col_offset,
+            context="from_import",
+            metadata={"module": module, "names": names}
+        ))
+    
+    def visit_Call(self, node: ast.Call) -> None:
+        func_name = self.tokenizer._get_call_name(node)
+        if func_name:
+            self._add(
+                func_name, node.lineno, node.col_offset, "function_call",
+                _call_metadata(len(node.args))
+            )
+    
+    def visit_Assign(self, node: ast.Assign) -> None:
+        targets = list(node.targets)
+        while targets:
+            target = targets.pop(0)
+            if isinstance(target, (ast.Tuple, ast.List)):
+                targets[:0] = target.elts
+                continue
+            if isinstance(target, ast.Starred):
+                target = target.value
+            name = self.tokenizer._get_name(target)
+            if name:
+                self._add(name, target.lineno, target.col_offset, "assignment", _NO_METADATA)
@@ -0,0 +1,204 @@
+"""
+DevTeam6 Local AI - Token Store
+
+Bounded token storage ordered by expiry and by recency, with revocation
+tracking and a per-user index.
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from collections import OrderedDict
+import heapq
+import time
+
+
+class TokenStore:
+    """
+    Bounded store of authentication tokens.
+    
+    Features:
+    - O(1) lookup, tokens kept in recency order: when full, the least
+      recently used token is evicted, so the store never exceeds
+      max_tokens
+    - Expiry heap: expired tokens are removed in O(log n) each as time
+      passes, with no scan of the live tokens
+    - Revoked ids remembered only until the token would have expired
+      (an expired token is refused anyway), then forgotten
+    - Per-user index of live token ids, pruned as tokens leave
+    - Eviction, expiry and revocation counters
+    
+    Entries are opaque records stored with their token id, user id and
+    expiry. Not thread-safe: it is AuthManager's storage and shares its
+    usage from one thread or event loop.
+    """
+    
+    # Rebuild the heap when stale entries outnumber live ones by this factor
+    COMPACT_RATIO = 2
+    
+    def __init__(self, max_tokens: int = 1000, clock: Callable[[], float] = time.time):
+        """
+        Initialize the token store.
+        
+        Args:
+            max_tokens: Maximum number of live tokens
+            clock: Time source (epoch seconds, as expiries are)
+        """
+        if max_tokens < 1:
+            raise ValueError("max_tokens must be at least 1")
+        self.max_tokens = max_tokens
+        self.clock = clock
+        
+        # token_id -> (entry, user_id, expires), least recently used first
+        self._tokens: "OrderedDict[str, Tuple[Any, str, float]]" = OrderedDict()
+        
+        # Revoked token_id -> expiry
+        self._revoked: Dict[str, float] = {}
+        
+        # user_id -> token ids, as an insertion-ordered set
+        self._users: Dict[str, Dict[str, None]] = {}
+        
+        # (expires, token_id) for live and revoked tokens; entries of
+        # tokens removed early are stale and skipped when popped
+        self._expiry: List[Tuple[float, str]] = []
+        
+        self.evictions = 0
+        self.expirations = 0
+        self.revocations = 0
+    
+    def __len__(self) -> int:
+        return len(self._tokens)
+    
+    def __contains__(self, token_id: str) -> bool:
+        return token_id in self._tokens
+    
+    def add(self, token_id: str, user_id: str, expires: float, entry: Any) -> None:
+        """
+        Store a token, removing expired ones and evicting if full.
+        
+        Args:
+            token_id: Token identifier
+            user_id: Owner of the token
+            expires: Expiry (epoch seconds)
+            entry: Record returned by get()
+        """
+        self.prune()
+        if token_id in self._tokens:
+            self._discard(token_id)
+        while len(self._tokens) >= self.max_tokens:
+            oldest = next(iter(self._tokens))
+            self._discard(oldest)
+            self.evictions += 1
+        
+        self._tokens[token_id] = (entry, user_id, expires)
+        self._users.setdefault(user_id, {})[token_id] = None
+        heapq.heappush(self._expiry, (expires, token_id))
+        self._maybe_compact()
+    
+    def get(self, token_id: str) -> Optional[Tuple[Any, float]]:
+        """
+        Look up a token and mark it as recently used.
+        
+        Expired tokens are returned until pruned, so callers can tell an
+        expired token from an unknown one.
+        
+        Args:
+            token_id: Token identifier
+        
+        Returns:
+            (entry, expires), or None if the token is not stored
+        """
+        stored = self._tokens.get(token_id)
+        if stored is None:
+            return None
+        self._tokens.move_to_end(token_id)
+        return stored[0], stored[2]
+    
+    def remove(self, token_id: str) -> bool:
+        """
+        Remove a token.
+        
+        Returns:
+            True if the token was stored
+        """
+        if token_id not in self._tokens:
+            return False
+        self._discard(token_id)
+        return True
+    
+    def revoke(self, token_id: str) -> bool:
+        """
+        Remove a token and refuse its id until it would have expired.
+        
+        Returns:
+            True if the token was stored
+        """
+        stored = self._tokens.get(token_id)
+        if stored is None:
+            return False
+        self._discard(token_id)
+        # Its expiry heap entry now stands for the revocation
+        self._revoked[token_id] = stored[2]
+        self.revocations += 1
+        return True
+    
+    def is_revoked(self, token_id: str) -> bool:
+        """Check whether a token id was revoked and has not expired yet."""
+        return token_id in self._revoked
+    
+    def user_tokens(self, user_id: str) -> List[str]:
+        """Get the ids of a user's stored tokens, oldest first."""
+        return list(self._users.get(user_id, ()))
+    
+    def prune(self) -> int:
+        """
+        Remove expired tokens and forget expired revocations.
+        
+        Returns:
+            Number of tokens removed
+        """
+        heap = self._expiry
+        now = self.clock()
+        removed = 0
+        while heap and heap[0][0] <= now:
+            expires, token_id = heapq.heappop(heap)
+            stored = self._tokens.get(token_id)
+            if stored is not None and stored[2] == expires:
+                self._discard(token_id)
+                removed += 1
+            elif self._revoked.get(token_id) == expires:
+                del self._revoked[token_id]
+        self.expirations += removed
+        return removed
+    
+    def _discard(self, token_id: str) -> None:
+        """Remove a stored token and its user index entry."""
+        _, user_id, _ = self._tokens.pop(token_id)
+        tokens = self._users.get(user_id)
+        if tokens is not None:
+            tokens.pop(token_id, None)
+            if not tokens:
+                del self._users[user_id]
+    
+    def _maybe_compact(self) -> None:
+        """Drop stale heap entries once they dominate the heap."""
+        live = len(self._tokens) + len(self._revoked)
+        if len(self._expiry) > self.COMPACT_RATIO * live + 64:
+            tokens, revoked = self._tokens, self._revoked
+            self._expiry = [
+                (expires, token_id) for expires, token_id in self._expiry
+                if (token_id in tokens and tokens[token_id][2] == expires)
+                or revoked.get(token_id) == expires
+            ]
+            heapq.heapify(self._expiry)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get store statistics."""
+        return {
+            "tokens": len(self._tokens),
+            "max_tokens": self.max_tokens,
+            "users": len(self._users),
+            "revoked": len(self._revoked),
+            "heap_entries": len(self._expiry),
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "revocations": self.revocations
+        }
@@ -0,0 +1,172 @@
+"""
+DevTeam6 Local AI - Tokenizer Pool
+
+Runs SmartTokenizer in worker processes, so tokenizing many inputs is
+not serialized on the GIL.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import heapq
+import os
+import threading
+import time
+
+from .smart_tokenizer import SmartTokenizer, Token, TokenBatch
+
+
+# Per-process tokenizer, built on the first task a worker runs
+_worker_tokenizer: Optional[SmartTokenizer] = None
+
+
+def _tokenize_in_worker(codes: List[str], language: str) -> Tuple[int, float, List[TokenBatch]]:
+    """
+    Tokenize sources inside a worker process.
+    
+    The worker's tokenizer does not cache: every source sent here has
+    already missed the parent's cache.
+    
+    Returns:
+        (worker pid, duration in seconds, one TokenBatch per source)
+    """
+    global _worker_tokenizer
+    if _worker_tokenizer is None:
+        _worker_tokenizer = SmartTokenizer(cache_size=1, max_documents=1)
+    
+    start = time.perf_counter()
+    batches = [
+        TokenBatch.from_tokens(_worker_tokenizer._tokenize_uncached(code, language))
+        for code in codes
+    ]
+    return os.getpid(), time.perf_counter() - start, batches
+
+
+class TokenizerPool:
+    """
+    Pool of long-lived worker processes for tokenization.
+    
+    Features:
+    - Sources split into chunks of similar total size, a few per worker,
+      so one large file does not leave the other workers idle
+    - Token lists sent back as TokenBatch records (parallel arrays), not
+      pickled Token objects with a dict each
+    - Safe to call from several threads at once
+    - A broken pool is restarted; the sources it was tokenizing are
+      tokenized in the calling process instead
+    - Per-worker task counts and busy time
+    """
+    
+    def __init__(self, max_workers: Optional[int] = None, chunks_per_worker: int = 2):
+        """
+        Initialize the tokenizer pool.
+        
+        Args:
+            max_workers: Number of worker processes (defaults to CPU count)
+            chunks_per_worker: Chunks each call is split into, per worker
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.chunks_per_worker = max(1, chunks_per_worker)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._workers: Dict[int, Dict[str, Any]] = {}
+        self._restarts = 0
+        self._local_fallbacks = 0
+    
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Get or lazily create the executor."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            return self._executor
+    
+    def _restart(self, broken: ProcessPoolExecutor) -> None:
+        """Replace a broken executor (once, if several callers saw it break)."""
+        with self._lock:
+            if self._executor is not broken:
+                return
+            broken.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            self._workers.clear()
+            self._restarts += 1
+    
+    def _chunks(self, codes: List[str]) -> List[List[int]]:
+        """Split source indices into chunks of similar total length."""
+        count = min(len(codes), self.max_workers * self.chunks_per_worker)
+        chunks: List[List[int]] = [[] for _ in range(count)]
+        
+        # Longest first, each to the currently smallest chunk
+        heap = [(0, c) for c in range(count)]
+        for i in sorted(range(len(codes)), key=lambda i: len(codes[i]), reverse=True):
+            size, c = heapq.heappop(heap)
+            chunks[c].append(i)
+            heapq.heappush(heap, (size + len(codes[i]), c))
+        return chunks
+    
+    def tokenize(self, codes: List[str], language: str = "python") -> List[List[Token]]:
+        """
+        Tokenize sources in the worker processes.
+        
+        Args:
+            codes: Source code to tokenize
+            language: Programming language
+        
+        Returns:
+            One token list per source, in order (as SmartTokenizer.tokenize
+            would give)
+        """
+        results: List[Optional[List[Token]]] = [None] * len(codes)
+        if not codes:
+            return results
+        
+        executor = self._get_executor()
+        chunks = self._chunks(codes)
+        try:
+            futures = [
+                executor.submit(_tokenize_in_worker, [codes[i] for i in chunk], language)
+                for chunk in chunks
+            ]
+            for chunk, future in zip(chunks, futures):
+                pid, duration, batches = future.result()
+                self._record(pid, duration, len(chunk))
+                for i, batch in zip(chunk, batches):
+                    results[i] = batch.to_tokens()
+        except BrokenProcessPool:
+            self._restart(executor)
+            self._local_fallbacks += 1
+            tokenizer = SmartTokenizer(cache_size=1, max_documents=1)
+            for i, tokens in enumerate(results):
+                if tokens is None:
+                    results[i] = tokenizer._tokenize_uncached(codes[i], language)
+        
+        return results
+    
+    def _record(self, pid: int, duration: float, sources: int) -> None:
+        """Update per-worker counters."""
+        with self._lock:
+            worker = self._workers.setdefault(pid, {
+                "tasks": 0,
+                "sources": 0,
+                "busy_time": 0.0
+            })
+            worker["tasks"] += 1
+            worker["sources"] += sources
+            worker["busy_time"] += duration
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool and per-worker statistics."""
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "running": self._executor is not None,
+                "restarts": self._restarts,
+                "local_fallbacks": self._local_fallbacks,
+                "workers": {pid: dict(stats) for pid, stats in self._workers.items()}
+            }
+    
+    def shutdown(self, wait: bool = True) -> None:
+        """Shut down worker processes."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait, cancel_futures=True)
+                self._executor = None
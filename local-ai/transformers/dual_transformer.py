@@ -5,15 +5,15 @@ Orchestration layer that routes between token and security transformers.
 """
 
 from typing import Dict, Any, List, Optional
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from datetime import datetime
 from enum import Enum
-import hashlib
 import time
 
 from .token_transformer import TokenTransformer, TokenTransformResult, RouteType
 from .security_transformer import SecurityTransformer, SecurityValidationResult
 from .components.auth_manager import AuthManager, SecurityLevel
+from .components.lru_cache import LRUCache, digest_key
 
 
 class ProcessingStatus(Enum):
@@ -25,9 +25,16 @@ class ProcessingStatus(Enum):
     CACHED = "cached"
 
 
-@dataclass
+@dataclass(frozen=True)
 class DualTransformResult:
-    """Result from dual transformer processing."""
+    """
+    Result from dual transformer processing.
+    
+    Frozen, and each cache hit gets its own copy of the mutable parts
+    (metadata, token list, security result), so callers cannot change
+    the cached result. Tokens and attention arrays are shared; treat them
+    as read-only.
+    """
     
     status: ProcessingStatus
     token_result: TokenTransformResult
@@ -50,14 +57,16 @@ class DualTransformer:
     - Intelligent routing based on content analysis
     - Security enforcement
     - Metrics tracking
-    - Result caching
+    - Result caching (O(1) LRU with TTL)
+    - Batch processing (process_batch) sharing one token transformer pass
     """
     
     def __init__(
         self,
         auth_manager: Optional[AuthManager] = None,
         cache_ttl_seconds: int = 300,
-        max_cache_size: int = 1000
+        max_cache_size: int = 1000,
+        workers: Optional[int] = None
     ):
         """
         Initialize dual transformer.
@@ -66,19 +75,25 @@ class DualTransformer:
             auth_manager: Shared auth manager
             cache_ttl_seconds: Cache time-to-live
             max_cache_size: Maximum cache entries
+            workers: Worker processes for tokenization (None or 0: tokenize
+                in this process); pays off with process_batch or with
+                process() called from several threads
         """
         self.auth_manager = auth_manager or AuthManager()
         self.cache_ttl_seconds = cache_ttl_seconds
         self.max_cache_size = max_cache_size
         
         # Initialize sub-transformers
-        self.token_transformer = TokenTransformer()
+        self.token_transformer = TokenTransformer(workers=workers)
         self.security_transformer = SecurityTransformer(
             auth_manager=self.auth_manager
         )
         
-        # Result cache: hash -> (result, timestamp)
-        self._cache: Dict[str, tuple] = {}
+        # Result cache: hash -> immutable DualTransformResult
+        self._cache: LRUCache[bytes, DualTransformResult] = LRUCache(
+            max_entries=max_cache_size,
+            ttl_seconds=cache_ttl_seconds
+        )
         
         # Metrics
         self._metrics = {
@@ -116,16 +131,145 @@ class DualTransformer:
         self._metrics["total_requests"] += 1
         
         # Check cache
-        cache_key = self._make_cache_key(input_text, token_id)
-        cached = self._get_cached(cache_key)
-        if cached:
+        cache_key = self._make_cache_key(input_text, token_id, language, bypass_security)
+        cached = self._cache.get(cache_key)
+        if cached is not None:
             self._metrics["cache_hits"] += 1
-            cached.status = ProcessingStatus.CACHED
-            return cached
+            return self._detached(cached, ProcessingStatus.CACHED)
+        
+        return self._process_uncached(
+            input_text, cache_key, token_id, language, bypass_security, request_metadata, start_time
+        )
+    
+    def process_batch(
+        self,
+        inputs: List[str],
+        token_id: Optional[str] = None,
+        language: str = "python",
+        bypass_security: bool = False,
+        request_metadata: Optional[Dict[str, Any]] = None
+    ) -> List[DualTransformResult]:
+        """
+        Process several inputs; equivalent to process() on each in turn.
+        
+        Cache hits are answered as in process(). The misses go through
+        TokenTransformer.process_batch together, then security validation,
+        caching and metrics per input. Repeats of an input in the batch
+        are cache hits on its first result, as they would be in a loop.
+        
+        Args:
+            inputs: Texts to process
+            token_id: Authentication token (optional), for every input
+            language: Programming language
+            bypass_security: Skip security checks (for testing)
+            request_metadata: Additional request info, for every input
+            
+        Returns:
+            One DualTransformResult per input, in order
+        """
+        start_time = time.time()
+        results: List[Optional[DualTransformResult]] = [None] * len(inputs)
+        
+        # Check cache; cache misses -> positions of every copy in the batch
+        pending: Dict[bytes, List[int]] = {}
+        for i, input_text in enumerate(inputs):
+            cache_key = self._make_cache_key(input_text, token_id, language, bypass_security)
+            if cache_key in pending:
+                pending[cache_key].append(i)
+                continue
+            self._metrics["total_requests"] += 1
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                self._metrics["cache_hits"] += 1
+                results[i] = self._detached(cached, ProcessingStatus.CACHED)
+            else:
+                pending[cache_key] = [i]
+        
+        if not pending:
+            return results
+        
+        # Step 1: Token transformation, one pass for every miss; if it
+        # fails, each input is retried alone so the error stays with it
+        first = [positions[0] for positions in pending.values()]
+        try:
+            token_results = self.token_transformer.process_batch(
+                [inputs[i] for i in first], language
+            )
+        except Exception:
+            token_results = [None] * len(first)
+        
+        # Each result's processing time includes an equal share of the batch
+        share = (time.time() - start_time) / len(first)
+        
+        for (cache_key, positions), token_result in zip(pending.items(), token_results):
+            results[positions[0]] = self._process_uncached(
+                inputs[positions[0]], cache_key, token_id, language, bypass_security,
+                request_metadata, time.time() - share, token_result
+            )
+            for i in positions[1:]:
+                self._metrics["total_requests"] += 1
+                cached = self._cache.get(cache_key)
+                if cached is not None:
+                    self._metrics["cache_hits"] += 1
+                    results[i] = self._detached(cached, ProcessingStatus.CACHED)
+                else:
+                    results[i] = self._process_uncached(
+                        inputs[i], cache_key, token_id, language, bypass_security,
+                        request_metadata, time.time()
+                    )
+        
+        return results
+    
+    @staticmethod
+    def _detached(result: DualTransformResult, status: ProcessingStatus) -> DualTransformResult:
+        """
+        Copy a result with its own metadata, token list and security result.
+        
+        Args:
+            result: Result to copy
+            status: Status of the copy
+            
+        Returns:
+            DualTransformResult sharing no mutable container with result
+        """
+        security = result.security_result
+        if security is not None:
+            security = replace(
+                security,
+                permissions=set(security.permissions),
+                errors=list(security.errors),
+                warnings=list(security.warnings),
+                audit_entries=list(security.audit_entries)
+            )
+        return replace(
+            result,
+            status=status,
+            token_result=replace(result.token_result, tokens=list(result.token_result.tokens)),
+            security_result=security,
+            metadata=dict(result.metadata)
+        )
+    
+    def _process_uncached(
+        self,
+        input_text: str,
+        cache_key: bytes,
+        token_id: Optional[str],
+        language: str,
+        bypass_security: bool,
+        request_metadata: Optional[Dict[str, Any]],
+        start_time: float,
+        token_result: Optional[TokenTransformResult] = None
+    ) -> DualTransformResult:
+        """
+        Run the transformers on an input missing from the cache, and cache it.
         
+        Args:
+            token_result: Token transformation already done (None: run it here)
+        """
         try:
             # Step 1: Token transformation
-            token_result = self.token_transformer.process(input_text, language)
+            if token_result is None:
+                token_result = self.token_transformer.process(input_text, language)
             
             # Step 2: Determine if security validation is needed
             needs_security = self._needs_security_validation(token_result)
@@ -174,8 +318,8 @@ class DualTransformer:
                 }
             )
             
-            # Cache result
-            self._cache_result(cache_key, result)
+            # Cache a snapshot the caller's copy does not share containers with
+            self._cache.put(cache_key, self._detached(result, result.status))
             
             return result
             
@@ -240,49 +384,20 @@ class DualTransformer:
         
         return min(token_confidence + security_boost, 1.0)
     
-    def _make_cache_key(self, input_text: str, token_id: Optional[str]) -> str:
-        """Create cache key from input and token."""
-        key_material = f"{input_text}:{token_id or 'anon'}"
-        return hashlib.sha256(key_material.encode()).hexdigest()[:16]
-    
-    def _get_cached(self, key: str) -> Optional[DualTransformResult]:
-        """Get result from cache if valid."""
-        if key not in self._cache:
-            return None
-        
-        result, timestamp = self._cache[key]
-        
-        # Check TTL
-        age = time.time() - timestamp
-        if age > self.cache_ttl_seconds:
-            del self._cache[key]
-            return None
-        
-        return result
-    
-    def _cache_result(self, key: str, result: DualTransformResult) -> None:
-        """Cache a result."""
-        # Evict old entries if cache is full
-        if len(self._cache) >= self.max_cache_size:
-            self._evict_oldest()
-        
-        self._cache[key] = (result, time.time())
-    
-    def _evict_oldest(self) -> None:
-        """Evict oldest cache entries."""
-        if not self._cache:
-            return
-        
-        # Find oldest entries
-        sorted_entries = sorted(
-            self._cache.items(),
-            key=lambda x: x[1][1]
+    def _make_cache_key(
+        self,
+        input_text: str,
+        token_id: Optional[str],
+        language: str,
+        bypass_security: bool
+    ) -> bytes:
+        """Create cache key from everything that affects the result."""
+        return digest_key(
+            input_text,
+            token_id or "anon",
+            language,
+            "bypass" if bypass_security else "checked"
         )
-        
-        # Remove oldest 10%
-        to_remove = max(1, len(sorted_entries) // 10)
-        for key, _ in sorted_entries[:to_remove]:
-            del self._cache[key]
     
     def route_to_handler(
         self,
@@ -347,17 +462,21 @@ class DualTransformer:
                 "cache_size": len(self._cache),
                 "avg_processing_time_ms": avg_time
             },
+            "cache": self._cache.get_stats(),
             "token_transformer": token_metrics,
             "security_transformer": security_metrics
         }
     
     def clear_cache(self) -> int:
         """Clear all caches."""
-        count = len(self._cache)
-        self._cache.clear()
+        count = self._cache.clear()
         self.token_transformer.clear_cache()
         return count
     
+    def shutdown(self) -> None:
+        """Shut down the tokenizer worker processes, if any."""
+        self.token_transformer.shutdown()
+    
     def create_token(
         self,
         user_id: str,
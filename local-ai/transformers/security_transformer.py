@@ -11,6 +11,7 @@ from enum import Enum
 import hashlib
 import json
 
+from .components.audit_log import AuditLog
 from .components.auth_manager import AuthManager, AuthToken, SecurityLevel, AuthResult
 from .token_transformer import TokenTransformResult, RouteType
 
@@ -27,7 +28,7 @@ class AuditEventType(Enum):
     PERMISSION_CHECK = "permission_check"
 
 
-@dataclass
+@dataclass(slots=True)
 class AuditLogEntry:
     """Entry in the audit log."""
     
@@ -70,27 +71,31 @@ class SecurityTransformer:
     Features:
     - Auth validation pipeline
     - Authorization checks
-    - Audit logging
+    - Audit logging to a ring buffer indexed by event type and user,
+      optionally spilling older entries to disk
     - Security level enforcement
     """
     
     def __init__(
         self,
         auth_manager: Optional[AuthManager] = None,
-        audit_log_size: int = 10000
+        audit_log_size: int = 10000,
+        audit_spill_dir: Optional[str] = None
     ):
         """
         Initialize security transformer.
         
         Args:
             auth_manager: Auth manager instance
-            audit_log_size: Maximum audit log entries
+            audit_log_size: Maximum audit log entries in memory
+            audit_spill_dir: Directory keeping entries beyond audit_log_size
+                in segment files (None: they are dropped)
         """
         self.auth_manager = auth_manager or AuthManager()
         self.audit_log_size = audit_log_size
         
         # Audit log
-        self._audit_log: List[AuditLogEntry] = []
+        self._audit_log = AuditLog(capacity=audit_log_size, spill_dir=audit_spill_dir)
         
         # Security policies
         self._policies: Dict[str, Dict[str, Any]] = {}
@@ -360,10 +365,6 @@ class SecurityTransformer:
         
         self._audit_log.append(entry)
         
-        # Trim log if too large
-        if len(self._audit_log) > self.audit_log_size:
-            self._audit_log = self._audit_log[-self.audit_log_size:]
-    
     def get_audit_log(
         self,
         event_type: Optional[AuditEventType] = None,
@@ -371,7 +372,7 @@ class SecurityTransformer:
         limit: int = 100
     ) -> List[Dict[str, Any]]:
         """
-        Get audit log entries.
+        Get the newest audit log entries.
         
         Args:
             event_type: Filter by event type
@@ -379,17 +380,14 @@ class SecurityTransformer:
             limit: Maximum entries to return
             
         Returns:
-            List of audit log entries
+            List of audit log entries, oldest first
         """
-        entries = self._audit_log
-        
-        if event_type:
-            entries = [e for e in entries if e.event_type == event_type]
-        
-        if user_id:
-            entries = [e for e in entries if e.user_id == user_id]
-        
-        return [e.to_dict() for e in entries[-limit:]]
+        entries = self._audit_log.newest(
+            limit,
+            event_type=event_type or None,
+            user_id=user_id or None
+        )
+        return [e.to_dict() for e in entries]
     
     def get_security_summary(
         self,
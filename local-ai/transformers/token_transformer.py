@@ -7,9 +7,13 @@ Main token processor with deterministic routing logic.
 from typing import Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
+import numpy as np
 
+from utils.keyword_matcher import compiled_keywords
 from .components.smart_tokenizer import SmartTokenizer, Token, TokenCategory
 from .components.multi_head_attention import MultiHeadAttention, AttentionOutput
+from .components.lru_cache import LRUCache, digest_key
+from .components.tokenizer_pool import TokenizerPool
 
 
 class RouteType(Enum):
@@ -52,6 +56,8 @@ class TokenTransformer:
     - Attention-based context analysis
     - Deterministic routing logic
     - Confidence calculation
+    - Batch processing with one attention and routing pass per batch
+    - Optional tokenization in worker processes; caches stay in this one
     """
     
     # Thresholds for routing decisions
@@ -59,10 +65,24 @@ class TokenTransformer:
     SECURITY_THRESHOLD = 0.5
     LOCAL_THRESHOLD = 0.7
     
+    # Token values that strengthen an API or security route
+    HTTP_PATTERNS = ("http", "request", "fetch", "api")
+    AUTH_PATTERNS = ("auth", "token", "password", "key")
+    _patterns = compiled_keywords(lambda cls: {"http": cls.HTTP_PATTERNS, "auth": cls.AUTH_PATTERNS})
+    
+    # Routes scored by _route_batch, in tie-breaking order
+    _ROUTES = (RouteType.LOCAL, RouteType.API, RouteType.SECURITY, RouteType.DATA)
+    _CATEGORIES = tuple(TokenCategory)
+    _CATEGORY_INDEX = {category: i for i, category in enumerate(_CATEGORIES)}
+    
     def __init__(
         self,
         embedding_dim: int = 64,
-        num_attention_heads: int = 4
+        num_attention_heads: int = 4,
+        cache_size: int = 1024,
+        cache_max_bytes: Optional[int] = 64 * 1024 * 1024,
+        cache_ttl_seconds: Optional[float] = None,
+        workers: Optional[int] = None
     ):
         """
         Initialize token transformer.
@@ -70,15 +90,29 @@ class TokenTransformer:
         Args:
             embedding_dim: Dimension for token embeddings
             num_attention_heads: Number of attention heads
+            cache_size: Maximum cached results (also used for the tokenizer)
+            cache_max_bytes: Maximum footprint of cached results
+            cache_ttl_seconds: Lifetime of cached results (None: no expiry)
+            workers: Worker processes to tokenize in (None or 0: tokenize
+                in this process)
         """
-        self.tokenizer = SmartTokenizer()
+        self.tokenizer = SmartTokenizer(
+            cache_size=cache_size,
+            cache_max_bytes=cache_max_bytes // 2 if cache_max_bytes else None,
+            cache_ttl_seconds=cache_ttl_seconds
+        )
         self.attention = MultiHeadAttention(
             embedding_dim=embedding_dim,
             num_heads=num_attention_heads
         )
+        self.pool = TokenizerPool(max_workers=workers) if workers else None
         
-        # Cache for processed results
-        self._cache: Dict[int, TokenTransformResult] = {}
+        # Cache for processed results, keyed by digest of (text, language)
+        self._cache: LRUCache[bytes, TokenTransformResult] = LRUCache(
+            max_entries=cache_size,
+            max_bytes=cache_max_bytes,
+            ttl_seconds=cache_ttl_seconds
+        )
         
         # Metrics
         self._metrics = {
@@ -89,178 +123,246 @@ class TokenTransformer:
             "hybrid_routes": 0
         }
     
-    def process(self, input_text: str, language: str = "python") -> TokenTransformResult:
+    def process(
+        self,
+        input_text: str,
+        language: str = "python",
+        document_id: Optional[str] = None
+    ) -> TokenTransformResult:
         """
         Process input text through the token transformer.
         
         Args:
             input_text: Text to process
             language: Programming language for tokenization
+            document_id: Identifies resubmissions of the same file, so only
+                its changed top-level statements are re-tokenized
             
         Returns:
             TokenTransformResult with routing decision
         """
-        # Check cache
-        cache_key = hash(input_text)
-        if cache_key in self._cache:
-            return self._cache[cache_key]
+        return self.process_batch([input_text], language, [document_id])[0]
+    
+    def process_batch(
+        self,
+        inputs: List[str],
+        language: str = "python",
+        document_ids: Optional[List[Optional[str]]] = None
+    ) -> List[TokenTransformResult]:
+        """
+        Process several inputs; equivalent to process() on each in turn.
         
-        # Tokenize
-        tokens = self.tokenizer.tokenize(input_text, language)
+        Cached inputs are answered from the cache and repeated inputs are
+        processed once, their repeats being cache hits on the first result
+        as they would be in a loop. The rest are tokenized together (spread
+        over the worker processes, with workers set), then share one
+        attention pass (short inputs padded into a single stacked matmul)
+        and one vectorized routing pass; each result is cached and counted
+        in the metrics on its own.
         
-        # Apply attention
-        attention_output = self.attention.forward(tokens)
+        Args:
+            inputs: Texts to process
+            language: Programming language for tokenization
+            document_ids: Per-input document ids (see process), or None
+            
+        Returns:
+            One TokenTransformResult per input, in order
+        """
+        results: List[Optional[TokenTransformResult]] = [None] * len(inputs)
         
-        # Determine routing
-        routing_decision = self._determine_routing(tokens, attention_output)
+        # Check cache; cache misses -> positions of every copy in the batch
+        pending: Dict[bytes, List[int]] = {}
+        for i, input_text in enumerate(inputs):
+            cache_key = digest_key(input_text, language)
+            if cache_key in pending:
+                pending[cache_key].append(i)
+                continue
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                results[i] = cached
+            else:
+                pending[cache_key] = [i]
         
-        # Calculate overall confidence
-        confidence = self._calculate_confidence(tokens, attention_output, routing_decision)
+        if not pending:
+            return results
         
-        # Create result
-        result = TokenTransformResult(
-            original_input=input_text,
-            tokens=tokens,
-            attention_output=attention_output,
-            routing_decision=routing_decision,
-            confidence=confidence
+        # Tokenize (in the worker processes, if there is a pool)
+        first = [positions[0] for positions in pending.values()]
+        token_lists = self.tokenizer.tokenize_batch(
+            [inputs[i] for i in first],
+            language,
+            [document_ids[i] for i in first] if document_ids else None,
+            pool=self.pool
         )
         
-        # Update metrics
-        self._update_metrics(routing_decision)
+        # Apply attention
+        attention_outputs = self.attention.forward_batch(token_lists)
+        
+        # Determine routing and overall confidence
+        routed = self._route_batch(token_lists, attention_outputs)
         
-        # Cache result
-        self._cache[cache_key] = result
+        for (cache_key, positions), tokens, attention_output, (routing_decision, confidence) in zip(
+            pending.items(), token_lists, attention_outputs, routed
+        ):
+            # Create result
+            result = TokenTransformResult(
+                original_input=inputs[positions[0]],
+                tokens=tokens,
+                attention_output=attention_output,
+                routing_decision=routing_decision,
+                confidence=confidence
+            )
+            
+            # Update metrics
+            self._update_metrics(routing_decision)
+            
+            # Cache result
+            self._cache.put(cache_key, result)
+            results[positions[0]] = result
+            
+            for i in positions[1:]:
+                cached = self._cache.get(cache_key)
+                if cached is None:
+                    # Not cacheable (e.g. over max_bytes): counted as processed again
+                    self._update_metrics(routing_decision)
+                    cached = result
+                results[i] = cached
         
-        return result
+        return results
     
-    def _determine_routing(
+    def _route_batch(
         self,
-        tokens: List[Token],
-        attention: AttentionOutput
-    ) -> RoutingDecision:
+        token_lists: List[List[Token]],
+        attention_outputs: List[AttentionOutput]
+    ) -> List[Tuple[RoutingDecision, float]]:
         """
-        Determine routing based on token analysis.
+        Determine routing and overall confidence for a batch of inputs.
+        
+        Uses deterministic rules based on token categories and attention
+        patterns. Scores for every input are computed together on
+        (inputs, categories) count matrices; only the indicator strings
+        are assembled per input.
         
-        Uses deterministic rules based on token categories and attention patterns.
+        Returns:
+            (routing decision, confidence) per input
         """
-        indicators: List[str] = []
-        scores: Dict[RouteType, float] = {
-            RouteType.LOCAL: 0.0,
-            RouteType.API: 0.0,
-            RouteType.SECURITY: 0.0,
-            RouteType.DATA: 0.0
-        }
+        batch = len(token_lists)
+        categories = self._CATEGORIES
+        lengths = np.array([len(tokens) for tokens in token_lists])
+        flat = [token for tokens in token_lists for token in tokens]
+        owner = np.repeat(np.arange(batch), lengths)
         
-        # Analyze token categories
-        category_summary = self.tokenizer.get_category_summary(tokens)
-        total_tokens = len(tokens) if tokens else 1
+        # Token categories per input
+        category_index = self._CATEGORY_INDEX
+        codes = np.fromiter((category_index[t.category] for t in flat), dtype=np.intp, count=len(flat))
+        counts = np.bincount(
+            owner * len(categories) + codes, minlength=batch * len(categories)
+        ).reshape(batch, len(categories))
+        total_tokens = np.maximum(lengths, 1)
         
-        # API indicators
-        api_count = category_summary.get(TokenCategory.API, 0)
-        if api_count > 0:
-            api_ratio = api_count / total_tokens
-            scores[RouteType.API] += api_ratio * 0.5
-            indicators.append(f"api_tokens:{api_count}")
-            
-            # Check for HTTP-related patterns
-            http_tokens = [t for t in tokens if any(
-                kw in t.value.lower() for kw in ["http", "request", "fetch", "api"]
-            )]
-            if http_tokens:
-                scores[RouteType.API] += 0.3
-                indicators.append("http_patterns_found")
+        api_count = counts[:, category_index[TokenCategory.API]]
+        security_count = counts[:, category_index[TokenCategory.SECURITY]]
+        data_count = counts[:, category_index[TokenCategory.DATA]]
+        local_count = (
+            counts[:, category_index[TokenCategory.GENERAL]] +
+            counts[:, category_index[TokenCategory.FUNCTION]]
+        )
         
-        # Security indicators
-        security_count = category_summary.get(TokenCategory.SECURITY, 0)
-        if security_count > 0:
-            security_ratio = security_count / total_tokens
-            scores[RouteType.SECURITY] += security_ratio * 0.5
-            indicators.append(f"security_tokens:{security_count}")
-            
-            # Check for auth-related patterns
-            auth_tokens = [t for t in tokens if any(
-                kw in t.value.lower() for kw in ["auth", "token", "password", "key"]
-            )]
-            if auth_tokens:
-                scores[RouteType.SECURITY] += 0.3
-                indicators.append("auth_patterns_found")
+        # HTTP- and auth-related token values; keywords cannot span the
+        # newline, so one scan per input checks all of its tokens
+        http_found = np.zeros(batch, dtype=bool)
+        auth_found = np.zeros(batch, dtype=bool)
+        for i in np.flatnonzero((api_count > 0) | (security_count > 0)).tolist():
+            found = self._patterns.found("\n".join(t.value for t in token_lists[i]))
+            http_found[i] = bool(found["http"])
+            auth_found[i] = bool(found["auth"])
         
-        # Data indicators
-        data_count = category_summary.get(TokenCategory.DATA, 0)
-        if data_count > 0:
-            data_ratio = data_count / total_tokens
-            scores[RouteType.DATA] += data_ratio * 0.4
-            indicators.append(f"data_tokens:{data_count}")
+        dominant = np.array([output.dominant_category.value for output in attention_outputs])
+        attention_confidence = np.array([output.confidence for output in attention_outputs])
         
-        # Local processing indicators (general code)
-        general_count = category_summary.get(TokenCategory.GENERAL, 0)
-        function_count = category_summary.get(TokenCategory.FUNCTION, 0)
+        # Scores, one column per route in ROUTES order
+        scores = np.zeros((batch, len(self._ROUTES)))
+        local, api, security, data = (scores[:, j] for j in range(len(self._ROUTES)))
         
-        local_count = general_count + function_count
-        if local_count > 0:
-            local_ratio = local_count / total_tokens
-            scores[RouteType.LOCAL] += local_ratio * 0.4
-            indicators.append(f"local_tokens:{local_count}")
+        api += np.where(api_count > 0, api_count / total_tokens * 0.5, 0.0)
+        api += np.where((api_count > 0) & http_found, 0.3, 0.0)
+        security += np.where(security_count > 0, security_count / total_tokens * 0.5, 0.0)
+        security += np.where((security_count > 0) & auth_found, 0.3, 0.0)
+        data += np.where(data_count > 0, data_count / total_tokens * 0.4, 0.0)
+        local += np.where(local_count > 0, local_count / total_tokens * 0.4, 0.0)
         
         # Attention-based adjustments
-        if attention.dominant_category == TokenCategory.API:
-            scores[RouteType.API] += 0.2
-            indicators.append("attention_dominant:api")
-        elif attention.dominant_category == TokenCategory.SECURITY:
-            scores[RouteType.SECURITY] += 0.2
-            indicators.append("attention_dominant:security")
+        api += np.where(dominant == TokenCategory.API.value, 0.2, 0.0)
+        security += np.where(dominant == TokenCategory.SECURITY.value, 0.2, 0.0)
         
         # Confidence-based adjustment
-        scores[RouteType.LOCAL] += attention.confidence * 0.2
-        
-        # Determine primary route
-        primary_route = max(scores, key=scores.get)
-        primary_score = scores[primary_route]
+        local += attention_confidence * 0.2
         
-        # Check for hybrid routing (multiple high scores)
-        high_scores = [rt for rt, score in scores.items() if score >= 0.3]
-        if len(high_scores) > 1 and primary_score < 0.6:
-            primary_route = RouteType.HYBRID
-            indicators.append(f"multiple_routes:{','.join(rt.value for rt in high_scores)}")
+        # Primary route (the first on ties); hybrid when several routes
+        # score high and none decisively
+        primary = np.argmax(scores, axis=1)
+        primary_score = scores[np.arange(batch), primary]
+        high = scores >= 0.3
+        hybrid = (high.sum(axis=1) > 1) & (primary_score < 0.6)
         
-        return RoutingDecision(
-            route_type=primary_route,
-            confidence=primary_score,
-            indicators=indicators,
-            metadata={
-                "scores": {rt.value: score for rt, score in scores.items()},
-                "category_summary": {cat.value: count for cat, count in category_summary.items()},
-                "total_tokens": total_tokens
-            }
+        # Overall confidence from average token clarity, attention and routing
+        clarity = np.fromiter((t.clarity_score for t in flat), dtype=np.float64, count=len(flat))
+        avg_clarity = np.bincount(owner, weights=clarity, minlength=batch) / total_tokens
+        confidence = np.clip(
+            avg_clarity * 0.3 + attention_confidence * 0.3 + primary_score * 0.4, 0.0, 1.0
         )
-    
-    def _calculate_confidence(
-        self,
-        tokens: List[Token],
-        attention: AttentionOutput,
-        routing: RoutingDecision
-    ) -> float:
-        """Calculate overall processing confidence."""
-        if not tokens:
-            return 0.0
-        
-        # Component weights
-        token_clarity_weight = 0.3
-        attention_confidence_weight = 0.3
-        routing_confidence_weight = 0.4
-        
-        # Average token clarity
-        avg_clarity = sum(t.clarity_score for t in tokens) / len(tokens)
+        confidence[lengths == 0] = 0.0
         
-        # Weighted confidence
-        confidence = (
-            avg_clarity * token_clarity_weight +
-            attention.confidence * attention_confidence_weight +
-            routing.confidence * routing_confidence_weight
-        )
+        # Indicator strings and results, per input
+        route_names = [rt.value for rt in self._ROUTES]
+        category_names = [category.value for category in categories]
+        routed = []
+        for (n_api, n_security, n_data, n_local, http, auth, dominant_value, route, is_hybrid,
+             high_row, score_row, count_row, total, route_confidence, overall) in zip(
+            api_count.tolist(), security_count.tolist(), data_count.tolist(), local_count.tolist(),
+            http_found.tolist(), auth_found.tolist(), dominant.tolist(), primary.tolist(),
+            hybrid.tolist(), high.tolist(), scores.tolist(), counts.tolist(),
+            total_tokens.tolist(), primary_score.tolist(), confidence.tolist()
+        ):
+            indicators: List[str] = []
+            if n_api:
+                indicators.append(f"api_tokens:{n_api}")
+                if http:
+                    indicators.append("http_patterns_found")
+            if n_security:
+                indicators.append(f"security_tokens:{n_security}")
+                if auth:
+                    indicators.append("auth_patterns_found")
+            if n_data:
+                indicators.append(f"data_tokens:{n_data}")
+            if n_local:
+                indicators.append(f"local_tokens:{n_local}")
+            if dominant_value == TokenCategory.API.value:
+                indicators.append("attention_dominant:api")
+            elif dominant_value == TokenCategory.SECURITY.value:
+                indicators.append("attention_dominant:security")
+            
+            route_type = self._ROUTES[route]
+            if is_hybrid:
+                route_type = RouteType.HYBRID
+                high_routes = [name for name, is_high in zip(route_names, high_row) if is_high]
+                indicators.append(f"multiple_routes:{','.join(high_routes)}")
+            
+            routing = RoutingDecision(
+                route_type=route_type,
+                confidence=route_confidence,
+                indicators=indicators,
+                metadata={
+                    "scores": dict(zip(route_names, score_row)),
+                    "category_summary": {
+                        name: count for name, count in zip(category_names, count_row) if count
+                    },
+                    "total_tokens": total
+                }
+            )
+            routed.append((routing, overall))
         
-        return min(max(confidence, 0.0), 1.0)
+        return routed
     
     def _update_metrics(self, routing: RoutingDecision) -> None:
         """Update processing metrics."""
@@ -305,9 +407,18 @@ class TokenTransformer:
         """Get transformer metrics."""
         return {
             **self._metrics,
-            "cache_size": len(self._cache)
+            "cache_size": len(self._cache),
+            "cache": self._cache.get_stats(),
+            "tokenizer_cache": self.tokenizer.get_cache_stats(),
+            "tokenizer_pool": self.pool.get_stats() if self.pool else None
         }
     
     def clear_cache(self) -> None:
-        """Clear the processing cache."""
+        """Clear the processing and tokenizer caches."""
         self._cache.clear()
+        self.tokenizer.clear_cache()
+    
+    def shutdown(self) -> None:
+        """Shut down the tokenizer worker processes, if any."""
+        if self.pool is not None:
+            self.pool.shutdown()
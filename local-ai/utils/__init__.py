@@ -1,10 +1,30 @@
 """DevTeam6 Local AI - Utilities Package"""
-from .chunking import chunk_text, chunk_document
-from .formatting import format_context, format_sources
+from typing import TYPE_CHECKING
+
+from .lazy_imports import lazy_exports
+
+if TYPE_CHECKING:
+    from .chunking import chunk_text, chunk_document, iter_chunks, chunk_file
+    from .formatting import format_context, format_sources
+    from .keyword_matcher import KeywordMatcher
+
+# Submodules are imported on first attribute access
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "chunk_text": ".chunking",
+    "chunk_document": ".chunking",
+    "iter_chunks": ".chunking",
+    "chunk_file": ".chunking",
+    "format_context": ".formatting",
+    "format_sources": ".formatting",
+    "KeywordMatcher": ".keyword_matcher",
+})
 
 __all__ = [
     "chunk_text",
     "chunk_document",
+    "iter_chunks",
+    "chunk_file",
     "format_context",
     "format_sources",
+    "KeywordMatcher",
 ]
@@ -4,8 +4,15 @@ DevTeam6 Local AI - Text Chunking Utilities
 Functions for splitting text into chunks for embedding.
 """
 
-from typing import List, Dict, Any, Optional
+from typing import Callable, Iterable, Iterator, List, Dict, Any, NamedTuple, Optional, TextIO, Union
 from dataclasses import dataclass
+from pathlib import Path
+import ast
+import io
+import itertools
+import re
+
+TokenCounter = Callable[[str], int]
 
 
 @dataclass
@@ -78,9 +85,11 @@ def chunk_text(
             )
             index += 1
 
-        # Move start with overlap
-        start = end - chunk_overlap
-        if start <= 0 or start >= len(text):
+        # Move start with overlap, always making progress (a separator
+        # close to the start would otherwise move it backwards forever)
+        next_start = end - chunk_overlap
+        start = next_start if next_start > start else end
+        if start >= len(text):
             break
 
     # Update total chunks
@@ -141,3 +150,510 @@ def merge_chunks(chunks: List[TextChunk], separator: str = "\n\n") -> str:
     # Sort by index
     sorted_chunks = sorted(chunks, key=lambda c: c.index)
     return separator.join(c.content for c in sorted_chunks)
+
+
+# ---------------------------------------------------------------------------
+# Streaming, token-sized chunking
+# ---------------------------------------------------------------------------
+
+
+def approx_token_count(text: str) -> int:
+    """
+    Estimate the token count of text.
+
+    Uses ~4 characters per token, typical for BPE embedding models on
+    English text and code. Pass a real tokenizer as ``token_counter``
+    (e.g. ``lambda s: len(tokenizer.encode(s))``) for exact sizing.
+    """
+    return (len(text) + 3) // 4
+
+
+class _Segment(NamedTuple):
+    """A run of text the packer keeps together when it fits."""
+
+    text: str
+    start: int
+    tokens: int
+    boundary: bool = False  # Start a new chunk here
+    meta: Optional[Dict[str, Any]] = None
+
+
+class _SegmentBuilder:
+    """Accumulates lines into segments no larger than ``max_tokens``."""
+
+    def __init__(self, token_counter: TokenCounter, max_tokens: int):
+        self.token_counter = token_counter
+        self.max_tokens = max_tokens
+        self.offset = 0
+        self._lines: List[str] = []
+        self._start = 0
+        self._tokens = 0
+        self._has_text = False
+        self._boundary = False
+        self._meta: Optional[Dict[str, Any]] = None
+
+    def begin(self, boundary: bool, meta: Optional[Dict[str, Any]]) -> Optional[_Segment]:
+        """End the current segment and mark how the next one starts."""
+        segment = self.flush()
+        self._boundary = boundary
+        self._meta = meta
+        return segment
+
+    def annotate(self, meta: Optional[Dict[str, Any]]) -> None:
+        """Set the metadata of the current segment."""
+        self._meta = meta
+
+    def add(self, line: str) -> Optional[_Segment]:
+        """Add a line; returns a finished segment when the size limit is hit."""
+        tokens = self.token_counter(line)
+        segment = None
+        if self._has_text and self._tokens + tokens > self.max_tokens:
+            segment = self.flush()
+        if not self._lines:
+            self._start = self.offset
+        self._lines.append(line)
+        self._tokens += tokens
+        self._has_text = self._has_text or bool(line.strip())
+        self.offset += len(line)
+        return segment
+
+    def flush(self) -> Optional[_Segment]:
+        """End the current segment."""
+        if not self._lines:
+            return None
+        segment = _Segment(
+            "".join(self._lines), self._start, self._tokens, self._boundary, self._meta
+        )
+        self._lines = []
+        self._tokens = 0
+        self._has_text = False
+        self._boundary = False
+        return segment
+
+
+def _read_lines(stream: TextIO, max_line_chars: int) -> Iterator[str]:
+    """Read lines, cutting any line longer than ``max_line_chars``."""
+    while True:
+        line = stream.readline(max_line_chars)
+        if not line:
+            return
+        yield line
+
+
+def _split_lines(text: str) -> List[str]:
+    """
+    Split text into lines, keeping their endings.
+
+    Only LF, CRLF and CR end a line, as for ``ast`` line numbers;
+    ``str.splitlines`` would also split on form feeds and other
+    separators.
+    """
+    return io.StringIO(text, newline="").readlines()
+
+
+def _text_segments(
+    lines: Iterable[str],
+    token_counter: TokenCounter,
+    max_tokens: int,
+) -> Iterator[_Segment]:
+    """Split plain text into paragraphs (runs of lines ending in a blank line)."""
+    builder = _SegmentBuilder(token_counter, max_tokens)
+    for line in lines:
+        segment = builder.add(line)
+        if segment:
+            yield segment
+        if not line.strip():
+            segment = builder.flush()
+            if segment:
+                yield segment
+    segment = builder.flush()
+    if segment:
+        yield segment
+
+
+_HEADING = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+_FENCE = re.compile(r"^\s*(```|~~~)")
+
+
+def _markdown_segments(
+    lines: Iterable[str],
+    token_counter: TokenCounter,
+    max_tokens: int,
+    split_level: int = 2,
+) -> Iterator[_Segment]:
+    """
+    Split Markdown into paragraphs, starting a new chunk at headings.
+
+    Headings at ``split_level`` or above always start a new chunk; deeper
+    headings start a new segment that may share a chunk. Blank lines and
+    ``#`` lines inside fenced code blocks are not split points. Every
+    segment carries its heading path as ``section`` metadata.
+    """
+    builder = _SegmentBuilder(token_counter, max_tokens)
+    headings: List[str] = []
+    meta: Optional[Dict[str, Any]] = None
+    in_fence = False
+    for line in lines:
+        if ("`" in line or "~" in line) and _FENCE.match(line):
+            in_fence = not in_fence
+        elif not in_fence and line[:1] == "#":
+            match = _HEADING.match(line)
+            if match:
+                level = len(match.group(1))
+                del headings[level - 1:]
+                headings.extend([""] * (level - 1 - len(headings)))
+                headings.append(match.group(2))
+                meta = {"section": " > ".join(h for h in headings if h)}
+                segment = builder.begin(level <= split_level, meta)
+                if segment:
+                    yield segment
+        segment = builder.add(line)
+        if segment:
+            yield segment
+        if not in_fence and not line.strip():
+            segment = builder.begin(False, meta)
+            if segment:
+                yield segment
+    segment = builder.flush()
+    if segment:
+        yield segment
+
+
+def _python_segments(
+    source: str,
+    token_counter: TokenCounter,
+    max_tokens: int,
+) -> Iterator[_Segment]:
+    """
+    Split Python source at top-level definitions using the AST.
+
+    Each top-level function or class is one segment, together with the
+    comments and decorators above it; runs of other statements (imports,
+    constants) are grouped. A class too large for one chunk is split into
+    its header and one segment per method. Falls back to line-based
+    splitting if the source does not parse.
+    """
+    try:
+        tree = ast.parse(source)
+    except SyntaxError:
+        yield from _python_line_segments(io.StringIO(source), token_counter, max_tokens)
+        return
+
+    lines = _split_lines(source)
+    offsets = [0]
+    for line in lines:
+        offsets.append(offsets[-1] + len(line))
+
+    def segment(first: int, last: int, meta: Optional[Dict[str, Any]]) -> _Segment:
+        # first/last are 0-based line indexes, last exclusive
+        text = "".join(lines[first:last])
+        return _Segment(text, offsets[first], token_counter(text), False, meta)
+
+    def start_line(node: ast.AST) -> int:
+        decorators = getattr(node, "decorator_list", [])
+        return min([node.lineno] + [d.lineno for d in decorators]) - 1
+
+    definitions = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+    cursor = 0  # first line not yet emitted
+    plain_end: Optional[int] = None  # end of a pending run of plain statements
+
+    for node in tree.body:
+        if not isinstance(node, definitions):
+            plain_end = node.end_lineno
+            continue
+
+        if plain_end is not None:
+            yield segment(cursor, plain_end, None)
+            cursor, plain_end = plain_end, None
+        # Comments and blank lines since the last statement go with the definition
+        first = cursor
+        meta = {"symbol": node.name}
+        whole = segment(first, node.end_lineno, meta)
+        cursor = node.end_lineno
+
+        methods = [n for n in node.body if isinstance(n, definitions)]
+        if not (isinstance(node, ast.ClassDef) and whole.tokens > max_tokens and methods):
+            yield whole
+            continue
+        position = start_line(methods[0])
+        yield segment(first, position, meta)
+        for method in methods:
+            method_start = start_line(method)
+            if method_start > position:
+                # Class-level statements between methods
+                yield segment(position, method_start, meta)
+            yield segment(
+                method_start, method.end_lineno, {"symbol": f"{node.name}.{method.name}"}
+            )
+            position = method.end_lineno
+        if position < node.end_lineno:
+            yield segment(position, node.end_lineno, meta)
+
+    if cursor < len(lines):
+        yield segment(cursor, len(lines), None)
+
+
+_PY_DEFINITION = re.compile(r"(?:async\s+def|def|class)\s+(\w+)")
+
+
+def _python_line_segments(
+    lines: Iterable[str],
+    token_counter: TokenCounter,
+    max_tokens: int,
+) -> Iterator[_Segment]:
+    """
+    Split Python source at top-level definitions without parsing it.
+
+    Streaming fallback for sources too large (or too broken) for the AST:
+    a new segment starts at each unindented ``def``/``class`` line or the
+    decorators above it.
+    """
+    builder = _SegmentBuilder(token_counter, max_tokens)
+    decorated = False
+    for line in lines:
+        head = line[:1]
+        if head == "@":
+            if not decorated:
+                segment = builder.begin(False, None)
+                if segment:
+                    yield segment
+                decorated = True
+        elif head in ("d", "c", "a"):
+            match = _PY_DEFINITION.match(line)
+            if match:
+                meta = {"symbol": match.group(1)}
+                if decorated:
+                    builder.annotate(meta)
+                else:
+                    segment = builder.begin(False, meta)
+                    if segment:
+                        yield segment
+                decorated = False
+        segment = builder.add(line)
+        if segment:
+            yield segment
+    segment = builder.flush()
+    if segment:
+        yield segment
+
+
+_WORD = re.compile(r"\S+\s*|\s+")
+
+
+def _split_oversized(
+    segment: _Segment,
+    token_counter: TokenCounter,
+    max_tokens: int,
+) -> Iterator[_Segment]:
+    """Break a segment larger than ``max_tokens`` into lines, then words."""
+    position = segment.start
+    boundary = segment.boundary
+    for line in _split_lines(segment.text):
+        tokens = token_counter(line)
+        if tokens <= max_tokens:
+            pieces = [(line, tokens)]
+        else:
+            pieces = []
+            for match in _WORD.finditer(line):
+                word = match.group()
+                word_tokens = token_counter(word)
+                if word_tokens <= max_tokens:
+                    pieces.append((word, word_tokens))
+                    continue
+                # A single "word" longer than a chunk: cut it by characters
+                step = max(1, len(word) * max_tokens // word_tokens)
+                for i in range(0, len(word), step):
+                    pieces.append((word[i:i + step], token_counter(word[i:i + step])))
+        for text, tokens in pieces:
+            yield _Segment(text, position, tokens, boundary, segment.meta)
+            position += len(text)
+            boundary = False
+
+
+def _pack(
+    segments: Iterable[_Segment],
+    token_counter: TokenCounter,
+    max_tokens: int,
+    overlap_tokens: int,
+) -> Iterator[TextChunk]:
+    """Greedily pack segments into chunks of at most ``max_tokens``."""
+    current: List[_Segment] = []
+    tokens = 0
+    meta: Optional[Dict[str, Any]] = None
+    index = 0
+
+    def emit() -> Optional[TextChunk]:
+        nonlocal index
+        content = "".join(s.text for s in current).strip()
+        if not content:
+            return None
+        last = current[-1]
+        chunk = TextChunk(
+            content=content,
+            index=index,
+            start_char=current[0].start,
+            end_char=last.start + len(last.text),
+            metadata={"chunk_index": index, "token_count": tokens, **(meta or {})},
+        )
+        index += 1
+        return chunk
+
+    for segment in segments:
+        pieces = (
+            _split_oversized(segment, token_counter, max_tokens)
+            if segment.tokens > max_tokens else (segment,)
+        )
+        for piece in pieces:
+            if current and (piece.boundary or tokens + piece.tokens > max_tokens):
+                chunk = emit()
+                if chunk:
+                    yield chunk
+                # Carry trailing segments into the next chunk as overlap
+                carry: List[_Segment] = []
+                carried = 0
+                if not piece.boundary:
+                    for previous in reversed(current):
+                        if carried + previous.tokens > overlap_tokens:
+                            break
+                        carry.insert(0, previous)
+                        carried += previous.tokens
+                if carried + piece.tokens > max_tokens:
+                    carry, carried = [], 0
+                current, tokens, meta = carry, carried, None
+            if meta is None:
+                meta = piece.meta
+            current.append(piece)
+            tokens += piece.tokens
+
+    if current:
+        chunk = emit()
+        if chunk:
+            yield chunk
+
+
+STRATEGIES = ("text", "markdown", "python")
+
+_SUFFIX_STRATEGIES = {".md": "markdown", ".markdown": "markdown", ".py": "python"}
+
+
+def strategy_for(path: Union[str, Path]) -> str:
+    """Pick a chunking strategy from a file name."""
+    return _SUFFIX_STRATEGIES.get(Path(path).suffix.lower(), "text")
+
+
+def iter_chunks(
+    stream: Union[str, TextIO],
+    max_tokens: int = 512,
+    overlap_tokens: int = 50,
+    token_counter: TokenCounter = approx_token_count,
+    strategy: str = "text",
+    max_line_chars: int = 65536,
+    max_ast_chars: int = 1_000_000,
+) -> Iterator[TextChunk]:
+    """
+    Split text into token-sized chunks, lazily.
+
+    Text is read line by line, so memory stays bounded by the chunk size
+    (and ``max_line_chars`` for files without newlines) however large the
+    input is. The ``python`` strategy reads sources up to
+    ``max_ast_chars`` whole to parse them; larger ones are split line by
+    line at unindented definitions instead.
+
+    Chunks end at structure boundaries when they can: paragraphs for
+    ``text``, headings and paragraphs for ``markdown`` (outside code
+    fences), top-level definitions and methods for ``python``. Headings of
+    level 1-2 always start a new chunk. Pieces too large for one chunk are
+    split by lines, then words.
+
+    Unlike ``chunk_text``, ``total_chunks`` is not known up front and is
+    not set; ``token_count`` is, along with ``section`` (Markdown) or
+    ``symbol`` (Python) where available.
+
+    Args:
+        stream: Text or a readable text stream
+        max_tokens: Maximum tokens per chunk (use the embedding model's limit)
+        overlap_tokens: Tokens of trailing segments repeated in the next chunk
+        token_counter: Function returning the token count of a string
+        strategy: "text", "markdown" or "python"
+        max_line_chars: Longest line read at once
+        max_ast_chars: Largest Python source parsed with the AST
+
+    Yields:
+        TextChunk objects with character offsets into the input
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unknown chunking strategy: {strategy}")
+    if isinstance(stream, str):
+        stream = io.StringIO(stream)
+
+    if strategy == "python":
+        head = stream.read(max_ast_chars)
+        if len(head) < max_ast_chars:
+            segments = _python_segments(head, token_counter, max_tokens)
+        else:
+            # Too large to parse in bounded memory; finish the cut line first
+            lines = itertools.chain(
+                io.StringIO(head + stream.readline()), _read_lines(stream, max_line_chars)
+            )
+            segments = _python_line_segments(lines, token_counter, max_tokens)
+    elif strategy == "markdown":
+        segments = _markdown_segments(
+            _read_lines(stream, max_line_chars), token_counter, max_tokens
+        )
+    else:
+        segments = _text_segments(_read_lines(stream, max_line_chars), token_counter, max_tokens)
+
+    yield from _pack(segments, token_counter, max_tokens, overlap_tokens)
+
+
+def chunk_file(
+    path: Union[str, Path],
+    strategy: Optional[str] = None,
+    encoding: str = "utf-8",
+    **kwargs: Any,
+) -> Iterator[TextChunk]:
+    """
+    Stream chunks from a file.
+
+    Args:
+        path: File to read
+        strategy: Chunking strategy (default: chosen from the file suffix)
+        encoding: File encoding
+        **kwargs: Passed to iter_chunks
+
+    Yields:
+        TextChunk objects
+    """
+    with open(path, encoding=encoding, errors="replace") as stream:
+        yield from iter_chunks(stream, strategy=strategy or strategy_for(path), **kwargs)
+
+
+def iter_document_chunks(
+    stream: Union[str, TextIO],
+    title: Optional[str] = None,
+    source: Optional[str] = None,
+    **kwargs: Any,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Streaming counterpart of chunk_document.
+
+    Args:
+        stream: Text or a readable text stream
+        title: Document title
+        source: Document source
+        **kwargs: Passed to iter_chunks
+
+    Yields:
+        Chunk dictionaries ready for storage
+    """
+    for chunk in iter_chunks(stream, **kwargs):
+        yield {
+            "content": chunk.content,
+            "metadata": {
+                **chunk.metadata,
+                "title": title,
+                "source": source,
+                "start_char": chunk.start_char,
+                "end_char": chunk.end_char,
+            },
+        }
@@ -0,0 +1,205 @@
+"""
+DevTeam6 Local AI - Keyword Matcher
+
+Compiled multi-keyword substring matching for category indicator sets.
+"""
+
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, List, Mapping, NamedTuple, Optional, Set, Tuple
+import re
+
+
+class KeywordMatch(NamedTuple):
+    """One occurrence of a keyword (spelled as given) in the matched text."""
+
+    keyword: str
+    category: Hashable
+    start: int
+    end: int
+
+
+def _trie_pattern(keywords: Iterable[str]) -> str:
+    """
+    Build a regex alternation of literal keywords, factored as a trie.
+
+    Keywords sharing a prefix share a branch ("db|data|database" becomes
+    "d(?:ata(?:base)?|b)"), so the engine tests each prefix once.
+    Longer keywords are tried before their own prefixes, so a match at a
+    position is the longest keyword starting there.
+    """
+    trie: Dict[str, dict] = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: Dict[str, dict]) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return "(?:" + body + ")?" if "" in node else body
+
+    return build(trie)
+
+
+class KeywordMatcher:
+    """
+    Substring matcher for several keyword sets, compiled once.
+
+    Replaces scanning every keyword with ``keyword in text``: each query
+    is a single pass of a compiled regex, whatever the number of keywords.
+
+    Features:
+    - Category precedence: categories are checked in the order given, so
+      ``first_category`` returns what the equivalent chain of
+      ``any(k in text for k in keywords)`` checks would
+    - Match positions for every occurrence of every keyword, overlapping
+      ones included, like repeated ``str.find`` calls
+    - Distinct keywords found per category
+    - Case-insensitive by default (keywords and text are lowercased)
+
+    Keywords are literal strings and are reported as given; a keyword
+    listed under several categories is reported under each of them.
+    """
+
+    def __init__(self, categories: Mapping[Hashable, Iterable[str]], ignore_case: bool = True):
+        """
+        Compile the matcher.
+
+        Args:
+            categories: Category -> keywords, highest precedence first
+            ignore_case: Lowercase keywords and text before matching
+        """
+        self.ignore_case = ignore_case
+        self.categories: Tuple[Hashable, ...] = tuple(categories)
+
+        # normalized keyword -> ((category, keyword as given), ...)
+        owners: Dict[str, List[Tuple[Hashable, str]]] = {}
+        self._keywords: Dict[Hashable, Set[str]] = {}
+        for category, keywords in categories.items():
+            keywords = {k for k in keywords if k}
+            self._keywords[category] = {self._normalize(k) for k in keywords}
+            for keyword in keywords:
+                owners.setdefault(self._normalize(keyword), []).append((category, keyword))
+        self._owners = {keyword: tuple(entries) for keyword, entries in owners.items()}
+
+        # One lazy ".*?" scan per category, alternated in precedence order:
+        # a category only wins if no earlier one matches anywhere, and the
+        # empty group after it tells which one did.
+        precedence = "|".join(
+            ".*?" + _trie_pattern(self._keywords[category]) + "()"
+            for category in self.categories
+            if self._keywords[category]
+        )
+        self._group_category = [c for c in self.categories if self._keywords[c]]
+        self._precedence = re.compile(precedence, re.DOTALL) if precedence else None
+
+        # A zero-width lookahead finds the longest keyword at every
+        # position; the shorter ones there are its keyword prefixes.
+        self._any = re.compile(_trie_pattern(owners)) if owners else None
+        self._overlapping = re.compile("(?=(" + _trie_pattern(owners) + "))") if owners else None
+        self._prefixes: Dict[str, Tuple[str, ...]] = {
+            keyword: tuple(sorted(
+                (other for other in owners if keyword.startswith(other)),
+                key=len,
+                reverse=True,
+            ))
+            for keyword in owners
+        }
+
+    def _normalize(self, text: str) -> str:
+        return text.lower() if self.ignore_case else text
+
+    def first_category(self, text: str, default: Optional[Hashable] = None) -> Optional[Hashable]:
+        """
+        Get the highest-precedence category with a keyword in the text.
+
+        Args:
+            text: Text to search
+            default: Returned when no keyword occurs
+
+        Returns:
+            Matching category or default
+        """
+        if self._precedence is None:
+            return default
+        match = self._precedence.match(self._normalize(text))
+        if match is None:
+            return default
+        return self._group_category[match.lastindex - 1]
+
+    def contains_any(self, text: str) -> bool:
+        """Check whether any keyword of any category occurs in the text."""
+        return self._any is not None and self._any.search(self._normalize(text)) is not None
+
+    def finditer(self, text: str) -> Iterator[KeywordMatch]:
+        """
+        Find every occurrence of every keyword.
+
+        Matches are ordered by start position, then longest keyword first,
+        then category precedence. Positions index into the lowercased
+        text, which has the same length as ``text`` for ASCII input.
+
+        Args:
+            text: Text to search
+
+        Yields:
+            KeywordMatch for each (keyword, category, position)
+        """
+        if self._overlapping is None:
+            return
+        for match in self._overlapping.finditer(self._normalize(text)):
+            start = match.start()
+            for keyword in self._prefixes[match.group(1)]:
+                for category, given in self._owners[keyword]:
+                    yield KeywordMatch(given, category, start, start + len(keyword))
+
+    def found(self, text: str) -> Dict[Hashable, Set[str]]:
+        """
+        Get the distinct keywords occurring in the text, per category.
+
+        Args:
+            text: Text to search
+
+        Returns:
+            Category -> keywords found (every category present, possibly empty)
+        """
+        found: Dict[Hashable, Set[str]] = {category: set() for category in self.categories}
+        for keyword, category, _, _ in self.finditer(text):
+            found[category].add(keyword)
+        return found
+
+
+class compiled_keywords:
+    """
+    Class attribute holding a KeywordMatcher, compiled on first use.
+
+    Compiling takes milliseconds, so it is not done at import time; each
+    class (subclasses included) compiles its own keyword sets once.
+
+    Example:
+        class Tokenizer:
+            KEYWORDS = {"api": {"request", "url"}, "data": {"query"}}
+            _matcher = compiled_keywords(lambda cls: cls.KEYWORDS)
+    """
+
+    def __init__(self, categories: Callable[[type], Mapping[Hashable, Iterable[str]]], ignore_case: bool = True):
+        """
+        Args:
+            categories: Builds the category -> keywords mapping from the class
+            ignore_case: Passed to KeywordMatcher
+        """
+        self.categories = categories
+        self.ignore_case = ignore_case
+        self.attr = "_compiled_keywords"
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.attr = f"_{name}_compiled"
+
+    def __get__(self, obj: Any, owner: type) -> KeywordMatcher:
+        matcher = owner.__dict__.get(self.attr)
+        if matcher is None:
+            matcher = KeywordMatcher(self.categories(owner), self.ignore_case)
+            setattr(owner, self.attr, matcher)
+        return matcher
@@ -0,0 +1,50 @@
+"""
+DevTeam6 Local AI - Lazy Imports
+
+Helpers for package ``__init__`` modules that load submodules on first use.
+"""
+
+from typing import Callable, Dict, List, Tuple
+import importlib
+import sys
+
+
+def lazy_exports(
+    package: str,
+    exports: Dict[str, str],
+) -> Tuple[Callable[[str], object], Callable[[], List[str]]]:
+    """
+    Build module ``__getattr__``/``__dir__`` hooks for lazy package exports.
+
+    Usage in a package ``__init__``::
+
+        __getattr__, __dir__ = lazy_exports(__name__, {
+            "MemorySystem": ".memory_system",  # class from a submodule
+            "supervised": ".supervised",        # the submodule itself
+        })
+
+    An export named like its module's last component is the module itself;
+    anything else is an attribute of that module. The resolved value is
+    cached in the package namespace, so later lookups cost nothing.
+
+    Args:
+        package: The package's ``__name__``
+        exports: Public name -> relative module path
+
+    Returns:
+        (__getattr__, __dir__) for the package module
+    """
+
+    def __getattr__(name: str) -> object:
+        module_name = exports.get(name)
+        if module_name is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        module = importlib.import_module(module_name, package)
+        value = module if module_name.rsplit(".", 1)[-1] == name else getattr(module, name)
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(vars(sys.modules[package])) | set(exports))
+
+    return __getattr__, __dir__